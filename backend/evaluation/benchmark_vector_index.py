@@ -0,0 +1,232 @@
+"""
+Dense-Vector Index Benchmark
+
+Compares HNSW index profiles (float hnsw vs quantized int8_hnsw) on the
+indexed regulatory corpus. Each profile gets a scratch copy of the
+embeddings (server-side _reindex from the live index); the BAITMAN test
+queries are then run against every profile and num_candidates setting.
+
+Measures and reports:
+- Recall@k against exact (brute-force cosine) kNN on the live index
+- Query latency (mean, median, p95)
+- Index store size and estimated HNSW vector memory
+
+Usage:
+    python backend/evaluation/benchmark_vector_index.py
+    python backend/evaluation/benchmark_vector_index.py --profiles hnsw int8_hnsw \\
+        --num-candidates 50 100 200 --k 10 --m 16 --ef-construction 100
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.search_service import SearchService
+
+BENCH_INDEX_PREFIX = "regulatory_vector_bench"
+VECTOR_BYTES_PER_DIM = {"hnsw": 4, "int8_hnsw": 1}
+
+
+@dataclass
+class ProfileResult:
+    """Recall and latency of one index profile at one num_candidates setting"""
+    profile: str
+    num_candidates: int
+    k: int
+    recall: float
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+    store_bytes: int
+    vector_memory_bytes: int
+
+
+class VectorIndexBenchmark:
+    """Recall-vs-latency benchmark for dense-vector index profiles"""
+
+    def __init__(self, k: int = 10, repeats: int = 3):
+        """
+        Initialize the benchmark.
+
+        Args:
+            k: Neighbours retrieved per query
+            repeats: Timed runs per query (after one warm-up run)
+        """
+        self.search_service = SearchService()
+        self.es = self.search_service.es
+        self.k = k
+        self.repeats = repeats
+
+        test_file = Path(__file__).parent / "BAITMAN_test_queries.json"
+        with open(test_file, 'r') as f:
+            self.queries = [q['query'] for q in json.load(f)['test_queries']]
+        self.query_vectors = self.search_service.encode_queries(self.queries)
+
+    def build_profile_index(self, profile: str) -> str:
+        """Create a scratch index for the profile and copy the embeddings into it"""
+        index_name = f"{BENCH_INDEX_PREFIX}_{profile}"
+        if self.es.indices.exists(index=index_name):
+            self.es.indices.delete(index=index_name)
+
+        body = self.search_service.build_index_body(vector_index_type=profile)
+        applied = body['mappings']['properties']['embedding']['index_options']['type']
+        if applied != profile:
+            raise RuntimeError(f"Cluster does not support {profile} (would fall back to {applied})")
+        self.es.indices.create(index=index_name, body=body)
+
+        print(f"  Copying embeddings into {index_name}...")
+        self.es.options(request_timeout=3600).reindex(
+            source={"index": SearchService.INDEX_NAME, "_source": ["embedding", "document_type"]},
+            dest={"index": index_name},
+            wait_for_completion=True,
+            refresh=True
+        )
+        # Single segment so every profile is searched over one HNSW graph
+        self.es.options(request_timeout=3600).indices.forcemerge(index=index_name, max_num_segments=1)
+        return index_name
+
+    def exact_neighbours(self) -> List[List[str]]:
+        """Brute-force cosine top-k on the live index (ground truth)"""
+        truth = []
+        for vector in self.query_vectors:
+            response = self.es.search(index=SearchService.INDEX_NAME, body={
+                "size": self.k,
+                "_source": False,
+                "query": {
+                    "script_score": {
+                        "query": {"exists": {"field": "embedding"}},
+                        "script": {
+                            "source": "cosineSimilarity(params.query_vector, 'embedding') + 1.0",
+                            "params": {"query_vector": vector}
+                        }
+                    }
+                }
+            })
+            truth.append([hit['_id'] for hit in response['hits']['hits']])
+        return truth
+
+    def run_profile(self, profile: str, index_name: str, num_candidates: int,
+                    truth: List[List[str]]) -> ProfileResult:
+        """Run every query against one profile index and score it"""
+        latencies = []
+        recalls = []
+        for vector, expected in zip(self.query_vectors, truth):
+            body = {
+                "knn": {
+                    "field": "embedding",
+                    "query_vector": vector,
+                    "k": self.k,
+                    "num_candidates": max(num_candidates, self.k)
+                },
+                "size": self.k,
+                "_source": False
+            }
+            self.es.search(index=index_name, body=body)  # Warm-up
+            for _ in range(self.repeats):
+                start = time.perf_counter()
+                response = self.es.search(index=index_name, body=body)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            found = {hit['_id'] for hit in response['hits']['hits']}
+            if expected:
+                recalls.append(len(found & set(expected)) / len(expected))
+
+        stats = self.es.indices.stats(index=index_name, metric="store,docs")['indices'][index_name]['total']
+        doc_count = stats['docs']['count']
+        dims = len(self.query_vectors[0]) if self.query_vectors else 0
+        latencies.sort()
+
+        return ProfileResult(
+            profile=profile,
+            num_candidates=num_candidates,
+            k=self.k,
+            recall=statistics.mean(recalls) if recalls else 0.0,
+            mean_ms=statistics.mean(latencies),
+            median_ms=statistics.median(latencies),
+            p95_ms=latencies[int(len(latencies) * 0.95) - 1] if len(latencies) > 1 else latencies[0],
+            store_bytes=stats['store']['size_in_bytes'],
+            # Raw vectors held off-heap by HNSW (int8 keeps a float per vector for its correction)
+            vector_memory_bytes=doc_count * (dims * VECTOR_BYTES_PER_DIM[profile]
+                                             + (4 if profile == "int8_hnsw" else 0))
+        )
+
+    def run(self, profiles: List[str], candidate_settings: List[int],
+            keep_indices: bool = False) -> List[ProfileResult]:
+        """Benchmark every profile at every num_candidates setting"""
+        print(f"Computing exact top-{self.k} for {len(self.queries)} queries...")
+        truth = self.exact_neighbours()
+
+        results = []
+        for profile in profiles:
+            print(f"\nProfile: {profile}")
+            index_name = self.build_profile_index(profile)
+            try:
+                for num_candidates in candidate_settings:
+                    result = self.run_profile(profile, index_name, num_candidates, truth)
+                    results.append(result)
+                    self.print_result(result)
+            finally:
+                if not keep_indices:
+                    self.es.indices.delete(index=index_name)
+        return results
+
+    @staticmethod
+    def print_result(result: ProfileResult):
+        """Print one result row"""
+        print(f"  num_candidates={result.num_candidates:<5} "
+              f"recall@{result.k}={result.recall:.3f}  "
+              f"mean={result.mean_ms:.1f}ms  p50={result.median_ms:.1f}ms  p95={result.p95_ms:.1f}ms  "
+              f"store={result.store_bytes / 1_048_576:.1f}MB  "
+              f"vectors~{result.vector_memory_bytes / 1_048_576:.1f}MB")
+
+
+def main():
+    """Run the vector index benchmark"""
+    parser = argparse.ArgumentParser(description="Compare dense-vector index profiles (recall vs latency)")
+    parser.add_argument('--profiles', nargs='+', default=list(SearchService.VECTOR_INDEX_TYPES),
+                        choices=SearchService.VECTOR_INDEX_TYPES, help='Index profiles to compare')
+    parser.add_argument('--num-candidates', nargs='+', type=int, default=[50, 100, 200],
+                        help='num_candidates settings to test')
+    parser.add_argument('--k', type=int, default=10, help='Neighbours per query (default: 10)')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed runs per query (default: 3)')
+    parser.add_argument('--m', type=int, default=None, help='HNSW m (default: HNSW_M)')
+    parser.add_argument('--ef-construction', type=int, default=None,
+                        help='HNSW ef_construction (default: HNSW_EF_CONSTRUCTION)')
+    parser.add_argument('--keep-indices', action='store_true', help='Keep the scratch indices')
+    parser.add_argument('--output', type=str, default=None, help='Write results as JSON')
+    args = parser.parse_args()
+
+    benchmark = VectorIndexBenchmark(k=args.k, repeats=args.repeats)
+    if args.m:
+        benchmark.search_service.hnsw_m = args.m
+    if args.ef_construction:
+        benchmark.search_service.hnsw_ef_construction = args.ef_construction
+
+    print("=" * 80)
+    print(f"Vector index benchmark (m={benchmark.search_service.hnsw_m}, "
+          f"ef_construction={benchmark.search_service.hnsw_ef_construction})")
+    print("=" * 80)
+    results = benchmark.run(args.profiles, args.num_candidates, keep_indices=args.keep_indices)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(),
+                "m": benchmark.search_service.hnsw_m,
+                "ef_construction": benchmark.search_service.hnsw_ef_construction,
+                "results": [asdict(result) for result in results]
+            }, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
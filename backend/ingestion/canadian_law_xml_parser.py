@@ -1133,6 +1133,28 @@ class CanadianLawXMLParser:
         return cross_references
 
 
+_worker_parser: Optional[CanadianLawXMLParser] = None
+
+
+def parse_xml_file(xml_path: str) -> ParsedRegulation:
+    """
+    Parse one XML file with a per-process parser instance.
+
+    Module-level so it can be submitted to a ProcessPoolExecutor; the parser
+    keeps per-document namespace state, so each worker process reuses its own.
+
+    Args:
+        xml_path: Path to XML file
+
+    Returns:
+        ParsedRegulation object with structured data
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = CanadianLawXMLParser()
+    return _worker_parser.parse_file(xml_path)
+
+
 def test_parser():
     """Test the parser with sample XML."""
     sample_xml = """<?xml version="1.0" encoding="UTF-8"?>
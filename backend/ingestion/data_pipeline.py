@@ -7,13 +7,15 @@ import logging
 import os
 import sys
 import hashlib
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import json
 
 from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import sessionmaker
 
 # Add parent directory to path for imports
@@ -25,7 +27,7 @@ from services.graph_builder import GraphBuilder
 from services.graph_service import GraphService
 from services.search_service import SearchService
 from utils.neo4j_indexes import setup_neo4j_constraints
-from ingestion.canadian_law_xml_parser import CanadianLawXMLParser, ParsedRegulation
+from ingestion.canadian_law_xml_parser import CanadianLawXMLParser, ParsedRegulation, parse_xml_file
 from config.program_mappings import get_program_detector
 
 logger = logging.getLogger(__name__)
@@ -67,6 +69,17 @@ class DataIngestionPipeline:
         self.xml_parser = CanadianLawXMLParser()
         self.program_detector = get_program_detector()
         
+        # Pipelined ingestion: XML parsing runs in a process pool and feeds a
+        # single DB writer through a bounded queue (1 worker = serial parsing)
+        self.parse_workers = int(os.getenv("INGEST_PARSE_WORKERS", "1"))
+        self.parse_queue_size = int(os.getenv("INGEST_QUEUE_SIZE", "32"))
+        
+        # Streaming Elasticsearch sync: rows fetched per server-side cursor round
+        # trip, documents per bulk request, and the resume checkpoint file
+        self.sync_fetch_size = int(os.getenv("ES_SYNC_FETCH_SIZE", "500"))
+        self.sync_batch_size = int(os.getenv("ES_SYNC_BATCH_SIZE", "500"))
+        self.sync_checkpoint_path = os.getenv("ES_SYNC_CHECKPOINT", "data/es_sync_checkpoint.json")
+        
         # Create data directory
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
@@ -113,7 +126,8 @@ class DataIngestionPipeline:
         limit: Optional[int] = None,
         force: bool = False,
         clear_postgres: bool = False,
-        postgres_only: bool = False
+        postgres_only: bool = False,
+        parse_workers: Optional[int] = None
     ):
         """
         Ingest all XML files from a directory (including subdirectories).
@@ -125,6 +139,8 @@ class DataIngestionPipeline:
             force: If True, skip duplicate checking and re-ingest all files
             clear_postgres: If True, clear PostgreSQL before ingestion (batched deletion)
             postgres_only: If True, only rebuild PostgreSQL (skip Neo4j and Elasticsearch)
+            parse_workers: XML parser processes (default: INGEST_PARSE_WORKERS); more
+                than 1 parses files in a process pool while a single writer stores them
         """
         xml_path = Path(xml_dir)
         
@@ -218,50 +234,19 @@ class DataIngestionPipeline:
         
         self.stats['total_files'] = len(xml_files)
         
-        # Process each file
-        for i, xml_file in enumerate(xml_files, 1):
-            logger.info(f"[{i}/{len(xml_files)}] Processing {xml_file.name}")
-            
-            try:
-                await self.ingest_xml_file(str(xml_file), force=force)
-                self.stats['successful'] += 1
-                
-                # Commit after successful ingestion
-                try:
-                    self.db.commit()
-                    logger.debug(f"Committed {xml_file.name} successfully")
-                except Exception as commit_error:
-                    logger.error(f"Failed to commit after {xml_file.name}: {commit_error}")
-                    self.db.rollback()
-                    self.stats['failed'] += 1
-                    self.stats['successful'] -= 1  # Revert the success count
-                    # Continue processing other files
-                    
-            except Exception as e:
-                logger.error(f"Failed to ingest {xml_file.name}: {e}", exc_info=True)
-                self.stats['failed'] += 1
+        workers = parse_workers if parse_workers is not None else self.parse_workers
+        if workers > 1 and len(xml_files) > 1:
+            await self._ingest_files_pipelined(xml_files, force=force, workers=workers)
+        else:
+            # Process each file
+            for i, xml_file in enumerate(xml_files, 1):
+                logger.info(f"[{i}/{len(xml_files)}] Processing {xml_file.name}")
+                await self._ingest_and_commit(xml_file, self.ingest_xml_file(str(xml_file), force=force))
                 
-                # Rollback the failed transaction to clean up the session
-                try:
-                    self.db.rollback()
-                    logger.debug(f"Rolled back failed transaction for {xml_file.name}")
-                except Exception as rollback_error:
-                    logger.error(f"Rollback also failed: {rollback_error}")
-                    # Session is in bad state, try to recover by starting fresh
-                    try:
-                        self.db.close()
-                        # Reopen session using the session maker from database module
-                        from database import SessionLocal
-                        self.db = SessionLocal()
-                        logger.info("Recovered database session after rollback failure")
-                    except Exception as recovery_error:
-                        logger.critical(f"Failed to recover session: {recovery_error}")
-                        raise
-            
-            # Log progress every 10 files
-            if i % 10 == 0:
-                logger.info(f"Progress: {i}/{len(xml_files)} files processed")
-                self._log_stats()
+                # Log progress every 10 files
+                if i % 10 == 0:
+                    logger.info(f"Progress: {i}/{len(xml_files)} files processed")
+                    self._log_stats()
         
         # Final commit to ensure all data is persisted
         try:
@@ -361,10 +346,108 @@ class DataIngestionPipeline:
         logger.info("=" * 60)
         self._log_stats()
     
+    async def _ingest_files_pipelined(self, xml_files: List[Path], force: bool, workers: int):
+        """
+        Parse XML files in a process pool and store them from a single writer.
+        
+        The producer submits parse jobs in file order and hands the pending
+        futures to the writer through a bounded queue, so at most
+        ``parse_queue_size`` parsed regulations are held in memory when the
+        database is the bottleneck. All database work stays on this session.
+        
+        Args:
+            xml_files: XML files to ingest
+            force: If True, skip duplicate checking and re-ingest
+            workers: Number of parser processes
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.parse_queue_size))
+        logger.info(
+            f"Pipelined ingestion: {workers} parser processes, queue size {queue.maxsize}"
+        )
+        
+        async def produce(pool: ProcessPoolExecutor):
+            for xml_file in xml_files:
+                future = loop.run_in_executor(pool, parse_xml_file, str(xml_file))
+                await queue.put((xml_file, future))  # Blocks while the writer is behind
+            await queue.put(None)
+        
+        async def store(xml_file: Path, future: asyncio.Future):
+            parsed_reg = await future
+            return await self.ingest_xml_file(str(xml_file), force=force, parsed_reg=parsed_reg)
+        
+        pool = ProcessPoolExecutor(max_workers=workers)
+        producer = asyncio.create_task(produce(pool))
+        try:
+            i = 0
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                xml_file, future = item
+                i += 1
+                logger.info(f"[{i}/{len(xml_files)}] Processing {xml_file.name}")
+                await self._ingest_and_commit(xml_file, store(xml_file, future))
+                
+                # Log progress every 10 files
+                if i % 10 == 0:
+                    logger.info(f"Progress: {i}/{len(xml_files)} files processed")
+                    self._log_stats()
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    async def _ingest_and_commit(self, xml_file: Path, ingestion):
+        """
+        Run one file's ingestion and commit it, rolling back on failure.
+        
+        Args:
+            xml_file: File being ingested (for logging)
+            ingestion: Awaitable that ingests the file into the session
+        """
+        try:
+            await ingestion
+            self.stats['successful'] += 1
+            
+            # Commit after successful ingestion
+            try:
+                self.db.commit()
+                logger.debug(f"Committed {xml_file.name} successfully")
+            except Exception as commit_error:
+                logger.error(f"Failed to commit after {xml_file.name}: {commit_error}")
+                self.db.rollback()
+                self.stats['failed'] += 1
+                self.stats['successful'] -= 1  # Revert the success count
+                # Continue processing other files
+                
+        except Exception as e:
+            logger.error(f"Failed to ingest {xml_file.name}: {e}", exc_info=True)
+            self.stats['failed'] += 1
+            
+            # Rollback the failed transaction to clean up the session
+            try:
+                self.db.rollback()
+                logger.debug(f"Rolled back failed transaction for {xml_file.name}")
+            except Exception as rollback_error:
+                logger.error(f"Rollback also failed: {rollback_error}")
+                # Session is in bad state, try to recover by starting fresh
+                try:
+                    self.db.close()
+                    # Reopen session using the session maker from database module
+                    from database import SessionLocal
+                    self.db = SessionLocal()
+                    logger.info("Recovered database session after rollback failure")
+                except Exception as recovery_error:
+                    logger.critical(f"Failed to recover session: {recovery_error}")
+                    raise
+    
     async def ingest_xml_file(
             self, 
             xml_path: str, 
-            force: bool = False
+            force: bool = False,
+            parsed_reg: Optional[ParsedRegulation] = None
             ) -> Dict[str, Any]:
         """
         Ingest a single XML file through the entire pipeline.
@@ -372,6 +455,7 @@ class DataIngestionPipeline:
         Args:
             xml_path: Path to XML file
             force: If True, skip duplicate checking and re-ingest
+            parsed_reg: Already-parsed regulation (pipelined mode); parsed here if None
             
         Returns:
             Dictionary with ingestion results
@@ -397,11 +481,12 @@ class DataIngestionPipeline:
         logger.info(f"Detected language: {language}")
         
         # Stage 1: Parse XML
-        try:
-            parsed_reg = self.xml_parser.parse_file(xml_path)
-        except Exception as e:
-            logger.error(f"XML parsing failed: {e}")
-            raise
+        if parsed_reg is None:
+            try:
+                parsed_reg = self.xml_parser.parse_file(xml_path)
+            except Exception as e:
+                logger.error(f"XML parsing failed: {e}")
+                raise
         
         # Check if already exists (by content hash and title)
         content_hash = self._calculate_content_hash(parsed_reg.full_text)
@@ -541,50 +626,51 @@ class DataIngestionPipeline:
         )
         
         self.db.add(regulation)
-        self.db.flush()  # Get ID
+        self.db.flush()  # Insert the parent row before the bulk child inserts
+        
+        # Build section rows with client-generated UUIDs so the citation map
+        # needs no per-row flush; each table below is one bulk INSERT
+        section_rows = []
+        section_map = {}  # Map section number to section ID
         
-        # Create sections
-        section_map = {}  # Map section number to DB object
+        def add_section_row(number, title, content, extra_metadata):
+            section_id = uuid.uuid4()
+            section_rows.append({
+                'id': section_id,
+                'regulation_id': regulation.id,
+                'section_number': number,
+                'title': title,
+                'content': content,
+                'extra_metadata': extra_metadata
+            })
+            section_map[number] = section_id
         
         for parsed_section in parsed_reg.sections:
-            section = Section(
-                regulation_id=regulation.id,
-                section_number=parsed_section.number,
-                title=parsed_section.title,
-                content=parsed_section.content,
-                extra_metadata={
+            add_section_row(
+                parsed_section.number,
+                parsed_section.title,
+                parsed_section.content,
+                {
                     'level': parsed_section.level,
                     'section_id': parsed_section.section_id
                 }
             )
             
-            self.db.add(section)
-            self.db.flush()
-            
-            section_map[parsed_section.number] = section
-            self.stats['sections_created'] += 1
-            
             # Add subsections as separate sections
             for subsection in parsed_section.subsections:
-                sub = Section(
-                    regulation_id=regulation.id,
-                    section_number=subsection.number,
-                    title=subsection.title,
-                    content=subsection.content,
-                    extra_metadata={
+                add_section_row(
+                    subsection.number,
+                    subsection.title,
+                    subsection.content,
+                    {
                         'level': subsection.level,
                         'section_id': subsection.section_id,
                         'parent_number': parsed_section.number
                     }
                 )
-                
-                self.db.add(sub)
-                self.db.flush()
-                
-                section_map[subsection.number] = sub
-                self.stats['sections_created'] += 1
         
-        # Create amendments
+        # Build amendment rows
+        amendment_rows = []
         for parsed_amendment in parsed_reg.amendments:
             try:
                 amendment_date = datetime.strptime(
@@ -594,35 +680,39 @@ class DataIngestionPipeline:
                 logger.warning(f"Could not parse amendment date: {parsed_amendment.date}")
                 continue
             
-            amendment = Amendment(
-                regulation_id=regulation.id,
-                amendment_type='modified',
-                effective_date=amendment_date,
-                description=parsed_amendment.description,
-                extra_metadata={
+            amendment_rows.append({
+                'id': uuid.uuid4(),
+                'regulation_id': regulation.id,
+                'amendment_type': 'modified',
+                'effective_date': amendment_date,
+                'description': parsed_amendment.description,
+                'extra_metadata': {
                     'bill_number': parsed_amendment.bill_number
                 }
-            )
-            
-            self.db.add(amendment)
-            self.stats['amendments_created'] += 1
+            })
         
-        # Create citations (cross-references)
+        # Build citation rows (cross-references)
+        citation_rows = []
         for parsed_ref in parsed_reg.cross_references:
-            source_section = section_map.get(parsed_ref.source_section)
-            target_section = section_map.get(parsed_ref.target_section)
+            source_section_id = section_map.get(parsed_ref.source_section)
+            target_section_id = section_map.get(parsed_ref.target_section)
             
-            if source_section and target_section:
-                citation = Citation(
-                    section_id=source_section.id,
-                    cited_section_id=target_section.id,
-                    citation_text=parsed_ref.citation_text
-                )
-                
-                self.db.add(citation)
-                self.stats['citations_created'] += 1
+            if source_section_id and target_section_id:
+                citation_rows.append({
+                    'id': uuid.uuid4(),
+                    'section_id': source_section_id,
+                    'cited_section_id': target_section_id,
+                    'citation_text': parsed_ref.citation_text
+                })
+        
+        # Bulk insert (sections first: citations reference them)
+        for model, rows in ((Section, section_rows), (Amendment, amendment_rows), (Citation, citation_rows)):
+            if rows:
+                self.db.execute(insert(model), rows)
         
-        self.db.flush()
+        self.stats['sections_created'] += len(section_rows)
+        self.stats['amendments_created'] += len(amendment_rows)
+        self.stats['citations_created'] += len(citation_rows)
         
         logger.info(f"Stored {len(section_map)} sections, "
                    f"{len(parsed_reg.amendments)} amendments, "
@@ -654,97 +744,179 @@ class DataIngestionPipeline:
         """Get ingestion statistics."""
         return self.stats.copy()
     
-    def sync_regulations_to_elasticsearch(self) -> int:
+    def sync_regulations_to_elasticsearch(
+        self,
+        batch_size: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = True
+    ) -> int:
         """
         Re-index all existing regulations from PostgreSQL to Elasticsearch.
         Useful when Elasticsearch mapping or indexing logic changes.
         
+        Regulations and sections are streamed from server-side cursors and
+        bulk indexed with batched embeddings. After each batch the last fully
+        indexed regulation ID is checkpointed, so an interrupted sync resumes
+        where it stopped.
+        
+        Args:
+            batch_size: Documents per bulk request (default: ES_SYNC_BATCH_SIZE)
+            checkpoint_path: Checkpoint file (default: ES_SYNC_CHECKPOINT)
+            resume: Continue after the checkpointed regulation if present
+        
         Returns:
             Number of regulations indexed
         """
-        logger.info("Re-indexing regulations to Elasticsearch...")
+        batch_size = batch_size or self.sync_batch_size
+        checkpoint = Path(checkpoint_path or self.sync_checkpoint_path)
         
-        regulations = self.db.query(Regulation).all()
-        logger.info(f"Found {len(regulations)} regulations to re-index")
+        after_id = self._read_sync_checkpoint(checkpoint) if resume else None
+        if after_id:
+            logger.info(f"Resuming Elasticsearch sync after regulation {after_id}")
+        else:
+            logger.info("Re-indexing regulations to Elasticsearch...")
         
         indexed_count = 0
+        batch: List[Dict[str, Any]] = []
+        current_regulation = None
         
-        for regulation in regulations:
-            try:
-                # Extract citation and programs from extra_metadata
-                citation = regulation.authority
-                programs = []
-                if regulation.extra_metadata:
-                    citation = (
-                        regulation.extra_metadata.get('chapter') or
-                        regulation.extra_metadata.get('act_number') or
-                        regulation.authority or
-                        regulation.title
+        def flush(completed_regulation) -> None:
+            if batch:
+                success, failed = self.search_service.bulk_index_documents(batch, generate_embeddings=True)
+                self.stats['elasticsearch_indexed'] += success
+                batch.clear()
+                if failed:
+                    # Keep the checkpoint at the last fully indexed batch so the next run resumes here
+                    raise RuntimeError(
+                        f"{failed} documents failed to index; sync stopped before regulation "
+                        f"{completed_regulation} (rerun to resume)"
                     )
-                    programs = regulation.extra_metadata.get('programs', [])
-                
-                # Index the regulation
-                doc = {
-                    'id': str(regulation.id),
-                    'regulation_id': str(regulation.id),
-                    'title': regulation.title,
-                    'content': regulation.full_text,
-                    'document_type': 'regulation',
+            if completed_regulation is not None:
+                self._write_sync_checkpoint(checkpoint, completed_regulation)
+        
+        for regulation_id, doc in self._iter_search_documents(after_id):
+            if regulation_id != current_regulation:
+                # Only flush on regulation boundaries so the checkpoint never splits one
+                if current_regulation is not None:
+                    indexed_count += 1
+                    if len(batch) >= batch_size:
+                        flush(current_regulation)
+                        logger.info(f"Indexed {indexed_count} regulations ({self.stats['elasticsearch_indexed']} documents)")
+                current_regulation = regulation_id
+            batch.append(doc)
+        
+        if current_regulation is not None:
+            indexed_count += 1
+            flush(current_regulation)
+        
+        # Completed: the next sync starts from the beginning
+        checkpoint.unlink(missing_ok=True)
+        
+        logger.info(f"Successfully re-indexed {indexed_count} regulations")
+        return indexed_count
+    
+    def _iter_search_documents(self, after_id: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Lazily build Elasticsearch documents for every regulation and its sections.
+        
+        Regulations and sections are read as two streams ordered by regulation ID
+        (server-side cursors via yield_per) and merged, instead of one section
+        query per regulation. A SQL join would repeat each regulation's full text
+        on every section row.
+        
+        Yields:
+            (regulation_id, document) with each regulation followed by its sections
+        """
+        regulations = self.db.query(Regulation).order_by(Regulation.id)
+        sections = self.db.query(Section).order_by(Section.regulation_id, Section.id)
+        if after_id:
+            after_uuid = uuid.UUID(after_id)
+            regulations = regulations.filter(Regulation.id > after_uuid)
+            sections = sections.filter(Section.regulation_id > after_uuid)
+        
+        section_stream = iter(sections.yield_per(self.sync_fetch_size))
+        section = next(section_stream, None)
+        
+        for regulation in regulations.yield_per(self.sync_fetch_size):
+            regulation_id = str(regulation.id)
+            citation, programs = self._search_citation_and_programs(regulation)
+            yield regulation_id, {
+                'id': regulation_id,
+                'regulation_id': regulation_id,
+                'title': regulation.title,
+                'content': regulation.full_text,
+                'document_type': 'regulation',
+                'jurisdiction': regulation.jurisdiction,
+                'authority': regulation.authority,
+                'citation': citation,
+                'legislation_name': regulation.title,
+                'language': regulation.language or 'en',  # Add language field
+                'effective_date': regulation.effective_date.isoformat() if regulation.effective_date else None,
+                'status': regulation.status,
+                'programs': programs,  # Add programs field
+                'metadata': regulation.extra_metadata or {}
+            }
+            
+            # Sections of regulations that no longer exist sort before this one
+            while section is not None and section.regulation_id < regulation.id:
+                section = next(section_stream, None)
+            
+            while section is not None and section.regulation_id == regulation.id:
+                yield regulation_id, {
+                    'id': str(section.id),
+                    'regulation_id': regulation_id,
+                    'section_id': str(section.id),
+                    'section_number': section.section_number,
+                    'title': section.title or regulation.title,
+                    'content': section.content,
+                    'document_type': 'section',
                     'jurisdiction': regulation.jurisdiction,
                     'authority': regulation.authority,
                     'citation': citation,
                     'legislation_name': regulation.title,
-                    'language': regulation.language or 'en',  # Add language field
-                    'effective_date': regulation.effective_date.isoformat() if regulation.effective_date else None,
-                    'status': regulation.status,
-                    'programs': programs,  # Add programs field
-                    'metadata': regulation.extra_metadata or {}
+                    'regulation_title': regulation.title,
+                    'language': regulation.language or 'en',  # Inherit language from regulation
+                    'programs': programs,  # Inherit programs from regulation
+                    'metadata': section.extra_metadata or {}
                 }
-                
-                self.search_service.index_document(
-                    doc_id=str(regulation.id),
-                    document=doc
-                )
-                
-                # Also re-index all sections for this regulation
-                sections = self.db.query(Section).filter_by(
-                    regulation_id=regulation.id
-                ).all()
-                
-                for section in sections:
-                    section_doc = {
-                        'id': str(section.id),
-                        'regulation_id': str(regulation.id),
-                        'section_id': str(section.id),
-                        'section_number': section.section_number,
-                        'title': section.title or regulation.title,
-                        'content': section.content,
-                        'document_type': 'section',
-                        'jurisdiction': regulation.jurisdiction,
-                        'authority': regulation.authority,
-                        'citation': citation,
-                        'legislation_name': regulation.title,
-                        'regulation_title': regulation.title,
-                        'language': regulation.language or 'en',  # Inherit language from regulation
-                        'programs': programs,  # Inherit programs from regulation
-                        'metadata': section.extra_metadata or {}
-                    }
-                    
-                    self.search_service.index_document(
-                        doc_id=str(section.id),
-                        document=section_doc
-                    )
-                
-                indexed_count += 1
-                
-                if indexed_count % 10 == 0:
-                    logger.info(f"Indexed {indexed_count}/{len(regulations)} regulations")
-                    
-            except Exception as e:
-                logger.error(f"Failed to index regulation {regulation.id}: {e}")
-        
-        logger.info(f"Successfully re-indexed {indexed_count} regulations")
-        return indexed_count
+                section = next(section_stream, None)
+    
+    @staticmethod
+    def _search_citation_and_programs(regulation: Regulation) -> Tuple[str, List[str]]:
+        """Citation and programs indexed with a regulation and its sections"""
+        citation = regulation.authority
+        programs = []
+        if regulation.extra_metadata:
+            citation = (
+                regulation.extra_metadata.get('chapter') or
+                regulation.extra_metadata.get('act_number') or
+                regulation.authority or
+                regulation.title
+            )
+            programs = regulation.extra_metadata.get('programs', [])
+        return citation, programs
+    
+    @staticmethod
+    def _read_sync_checkpoint(checkpoint: Path) -> Optional[str]:
+        """Last fully indexed regulation ID from a previous, interrupted sync"""
+        if not checkpoint.exists():
+            return None
+        try:
+            return json.loads(checkpoint.read_text()).get('last_regulation_id')
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync checkpoint {checkpoint}: {e}")
+            return None
+    
+    @staticmethod
+    def _write_sync_checkpoint(checkpoint: Path, regulation_id: str) -> None:
+        """Record the last fully indexed regulation (atomic replace)"""
+        checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = checkpoint.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps({
+            'last_regulation_id': regulation_id,
+            'updated_at': datetime.now().isoformat()
+        }))
+        tmp_path.replace(checkpoint)
     
     async def validate_ingestion(self) -> Dict[str, Any]:
         """
@@ -808,6 +980,7 @@ async def main():
     parser.add_argument('--force', action='store_true', help='Force re-ingestion, skip duplicate checking')
     parser.add_argument('--clear-postgres', action='store_true', help='Clear PostgreSQL database before ingestion')
     parser.add_argument('--postgres-only', action='store_true', help='Only ingest into PostgreSQL, skip Neo4j and Elasticsearch')
+    parser.add_argument('--parse-workers', type=int, default=None, help='XML parser processes (default: INGEST_PARSE_WORKERS or 1)')
     
     args = parser.parse_args()
     
@@ -859,7 +1032,8 @@ async def main():
             limit=args.limit,
             force=args.force,
             clear_postgres = args.clear_postgres,
-            postgres_only= args.postgres_only
+            postgres_only= args.postgres_only,
+            parse_workers=args.parse_workers
         )
         logger.info("Ingestion completed, now committing main session...")
         
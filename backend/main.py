@@ -2,9 +2,10 @@
 FastAPI application for Regulatory Intelligence Assistant.
 Provides health checks and will include API routes for all services.
 """
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 from sqlalchemy import text
 import os
 from dotenv import load_dotenv
@@ -12,7 +13,7 @@ from typing import Dict, Any
 import logging
 
 # Import database utilities
-from database import get_db, engine
+from database import engine, get_async_engine, get_pool_status, dispose_async_engine
 
 # Import routers
 from routes.compliance import router as compliance_router
@@ -24,6 +25,7 @@ from routes.config import router as config_router
 from routes.suggestions import router as suggestions_router
 from routes.version import router as version_router
 from routes.graph import router as graph_router
+from services.service_container import get_services, shutdown_services
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +34,23 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the shared service container on startup and close it on shutdown."""
+    logger.info("Starting Regulatory Intelligence Assistant API...")
+    logger.info(f"Environment: {os.getenv('APP_ENV', 'development')}")
+    logger.info(f"Debug mode: {os.getenv('DEBUG', 'False')}")
+    services = await run_in_threadpool(get_services)
+    await services.startup()
+    
+    yield
+    
+    logger.info("Shutting down Regulatory Intelligence Assistant API...")
+    await shutdown_services()
+    await dispose_async_engine()
+    engine.dispose()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Regulatory Intelligence Assistant API",
@@ -39,6 +58,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS Configuration
@@ -82,24 +102,42 @@ async def health_check() -> Dict[str, str]:
     return {"status": "healthy", "service": "api"}
 
 
+POSTGRES_VERSION_SQL = text("SELECT version()")
+POSTGRES_TABLE_COUNT_SQL = text("""
+    SELECT COUNT(*) 
+    FROM information_schema.tables 
+    WHERE table_schema = 'public'
+""")
+
+
+def _postgres_info() -> tuple:
+    """Query version and table count on a pooled sync connection."""
+    with engine.connect() as conn:
+        version = conn.execute(POSTGRES_VERSION_SQL).scalar()
+        table_count = conn.execute(POSTGRES_TABLE_COUNT_SQL).scalar()
+    return version, table_count
+
+
+async def _postgres_info_async() -> tuple:
+    """Query version and table count on the async (asyncpg) engine."""
+    async with get_async_engine().connect() as conn:
+        version = (await conn.execute(POSTGRES_VERSION_SQL)).scalar()
+        table_count = (await conn.execute(POSTGRES_TABLE_COUNT_SQL)).scalar()
+    return version, table_count
+
+
 @app.get("/health/postgres")
-async def health_check_postgres(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def health_check_postgres() -> Dict[str, Any]:
     """
     Health check for PostgreSQL database.
-    Tests connection and returns database info.
+    Tests connection and returns database info and connection pool metrics.
     """
     try:
-        # Test database connection with a simple query
-        result = db.execute(text("SELECT version()"))
-        version = result.scalar()
-        
-        # Get table count
-        result = db.execute(text("""
-            SELECT COUNT(*) 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-        """))
-        table_count = result.scalar()
+        # Use the async engine when enabled; otherwise keep the sync queries off the event loop
+        if get_async_engine() is not None:
+            version, table_count = await _postgres_info_async()
+        else:
+            version, table_count = await run_in_threadpool(_postgres_info)
         
         return {
             "status": "healthy",
@@ -107,6 +145,7 @@ async def health_check_postgres(db: Session = Depends(get_db)) -> Dict[str, Any]
             "database": os.getenv("POSTGRES_DB", "regulatory_db"),
             "tables": table_count,
             "version": version.split()[1] if version else "unknown",
+            "pool": get_pool_status(),
         }
     except Exception as e:
         logger.error(f"PostgreSQL health check failed: {e}")
@@ -255,7 +294,7 @@ async def health_check_redis() -> Dict[str, Any]:
 
 
 @app.get("/health/all")
-async def health_check_all(db: Session = Depends(get_db)) -> Dict[str, Any]:
+async def health_check_all() -> Dict[str, Any]:
     """
     Comprehensive health check for all services.
     Returns status of PostgreSQL, Neo4j, Elasticsearch, and Redis.
@@ -265,7 +304,7 @@ async def health_check_all(db: Session = Depends(get_db)) -> Dict[str, Any]:
     
     # PostgreSQL
     try:
-        postgres = await health_check_postgres(db)
+        postgres = await health_check_postgres()
         services["postgres"] = postgres
     except HTTPException as e:
         services["postgres"] = {"status": "unhealthy", "error": e.detail}
@@ -301,22 +340,6 @@ async def health_check_all(db: Session = Depends(get_db)) -> Dict[str, Any]:
     }
 
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Application startup event."""
-    logger.info("Starting Regulatory Intelligence Assistant API...")
-    logger.info(f"Environment: {os.getenv('APP_ENV', 'development')}")
-    logger.info(f"Debug mode: {os.getenv('DEBUG', 'False')}")
-
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Application shutdown event."""
-    logger.info("Shutting down Regulatory Intelligence Assistant API...")
-
-
 if __name__ == "__main__":
     import uvicorn
     
@@ -12,7 +12,7 @@ Author: Developer 2 (AI/ML Engineer)
 Created: 2025-11-22
 """
 
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -25,6 +25,7 @@ from utils.regulatory_batch import (
     RAGBatchItem,
     NLPBatchItem
 )
+from services.service_container import get_batch_api
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,8 +34,7 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(prefix="/api/batch", tags=["Batch Operations"])
 
-# Initialize batch API
-batch_api = RegulatoryBatchAPI()
+# Batch API is injected from the shared service container (built on first use)
 
 
 # === Request/Response Models ===
@@ -163,7 +163,10 @@ class BatchResultResponse(BaseModel):
 # === API Endpoints ===
 
 @router.post("/documents/index", response_model=BatchResultResponse, status_code=status.HTTP_200_OK)
-async def batch_index_documents(request: DocumentBatchRequest):
+async def batch_index_documents(
+    request: DocumentBatchRequest,
+    batch_api: RegulatoryBatchAPI = Depends(get_batch_api)
+):
     """
     Index multiple regulatory documents in batch
 
@@ -214,7 +217,10 @@ async def batch_index_documents(request: DocumentBatchRequest):
 
 
 @router.post("/search", response_model=BatchResultResponse, status_code=status.HTTP_200_OK)
-async def batch_search(request: SearchBatchRequest):
+async def batch_search(
+    request: SearchBatchRequest,
+    batch_api: RegulatoryBatchAPI = Depends(get_batch_api)
+):
     """
     Execute multiple search queries in batch
 
@@ -261,7 +267,10 @@ async def batch_search(request: SearchBatchRequest):
 
 
 @router.post("/rag/answer", response_model=BatchResultResponse, status_code=status.HTTP_200_OK)
-async def batch_answer_questions(request: RAGBatchRequest):
+async def batch_answer_questions(
+    request: RAGBatchRequest,
+    batch_api: RegulatoryBatchAPI = Depends(get_batch_api)
+):
     """
     Answer multiple questions using RAG in batch
 
@@ -309,7 +318,10 @@ async def batch_answer_questions(request: RAGBatchRequest):
 
 
 @router.post("/nlp/process", response_model=BatchResultResponse, status_code=status.HTTP_200_OK)
-async def batch_nlp_processing(request: NLPBatchRequest):
+async def batch_nlp_processing(
+    request: NLPBatchRequest,
+    batch_api: RegulatoryBatchAPI = Depends(get_batch_api)
+):
     """
     Process multiple texts with NLP in batch
 
@@ -359,7 +371,8 @@ async def batch_nlp_processing(request: NLPBatchRequest):
 @router.get("/jobs/{job_id}/progress", response_model=BatchProgressResponse)
 async def get_batch_job_progress(
     job_id: str,
-    job_type: str = "document"
+    job_type: str = "document",
+    batch_api: RegulatoryBatchAPI = Depends(get_batch_api)
 ):
     """
     Get progress for a batch job
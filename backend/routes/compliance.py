@@ -14,16 +14,17 @@ from schemas.compliance_rules import (
 )
 from services.compliance_checker import ComplianceChecker
 from services.graph_service import GraphService
-from utils.neo4j_client import Neo4jClient
+from services.service_container import get_shared_graph_service
 
 
 router = APIRouter(prefix="/api/compliance", tags=["compliance"])
 
 
-def get_compliance_checker(db: Session = Depends(get_db)) -> ComplianceChecker:
+def get_compliance_checker(
+    db: Session = Depends(get_db),
+    graph_service: GraphService = Depends(get_shared_graph_service)
+) -> ComplianceChecker:
     """Dependency to get compliance checker instance."""
-    neo4j_client = Neo4jClient()
-    graph_service = GraphService(neo4j_client)
     return ComplianceChecker(db, graph_service)
 
 
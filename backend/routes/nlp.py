@@ -11,7 +11,7 @@ Author: Developer 2 (AI/ML Engineer)
 Created: 2025-11-22
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
 from datetime import datetime
@@ -29,13 +29,14 @@ from services.query_parser import (
     ParsedQuery,
     parse_legal_query
 )
+from services.service_container import get_query_parser
 
 # Create router
 router = APIRouter(prefix="/api/nlp", tags=["NLP"])
 
 # Initialize NLP services (singleton pattern)
+# (the query parser is injected from the shared service container)
 entity_extractor = LegalEntityExtractor(use_spacy=False)
-query_parser = LegalQueryParser(use_spacy=False)
 query_expander = QueryExpander()
 
 
@@ -225,7 +226,10 @@ async def extract_entities_endpoint(request: EntityExtractionRequest):
 
 
 @router.post("/parse-query", response_model=ParsedQueryResponse)
-async def parse_query_endpoint(request: QueryParseRequest):
+async def parse_query_endpoint(
+    request: QueryParseRequest,
+    query_parser: LegalQueryParser = Depends(get_query_parser)
+):
     """
     Parse a natural language query to extract intent, entities, and keywords.
 
@@ -281,7 +285,10 @@ async def parse_query_endpoint(request: QueryParseRequest):
 
 
 @router.post("/parse-queries-batch", response_model=BatchQueryParseResponse)
-async def parse_queries_batch_endpoint(request: BatchQueryParseRequest):
+async def parse_queries_batch_endpoint(
+    request: BatchQueryParseRequest,
+    query_parser: LegalQueryParser = Depends(get_query_parser)
+):
     """
     Parse multiple queries in batch for efficient processing.
 
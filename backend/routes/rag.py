@@ -3,6 +3,7 @@ RAG API Routes - REST Endpoints for Legal Question Answering
 
 This module provides REST API endpoints for RAG-based Q&A:
 - Question answering with citations
+- Streaming answers (Server-Sent Events)
 - Confidence scoring
 - Cache management
 - Health checks
@@ -11,26 +12,26 @@ Author: Developer 2 (AI/ML Engineer)
 Created: 2025-11-22
 """
 
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime
+import asyncio
+import json
 import logging
 
-from database import SessionLocal
-from services.rag_service import RAGService, RAGAnswer
+from services.rag_service import RAGService, RAGAnswer, RAGStreamEvent, QueryContext
 from services.query_history_service import QueryHistoryService
-from services.query_parser import LegalQueryParser
+from services.service_container import get_rag_service
 
 logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter(prefix="/api/rag", tags=["RAG"])
 
-# Initialize services (singleton pattern)
-rag_service = RAGService()
+# RAG service is injected from the shared service container
 query_history_service = QueryHistoryService()
-query_parser = LegalQueryParser(use_spacy=False)
 
 
 # Pydantic models for request/response
@@ -105,10 +106,85 @@ class BatchAnswerResponse(BaseModel):
     total_processing_time_ms: float
 
 
+def _query_history_fields(query_context: QueryContext, rag_answer: RAGAnswer) -> Dict[str, Any]:
+    """Query history columns for an answered question, from the request's QueryContext"""
+    parsed = query_context.parsed_query
+    return {
+        "query": query_context.question,
+        "entities": query_history_service.extract_entities_from_parsed_query(parsed),
+        "intent": parsed.intent.value if parsed else rag_answer.intent,
+        "results": query_history_service.format_rag_results(rag_answer),
+    }
+
+
+async def _log_query_history(query_context: QueryContext, rag_answer: RAGAnswer) -> None:
+    """
+    Record an answered question in the query history.
+
+    Reuses the request's QueryContext instead of parsing the question again.
+    Failures are logged and never surface to the caller.
+    """
+    try:
+        fields = _query_history_fields(query_context, rag_answer)
+    except Exception as e:
+        logger.error(f"Failed to log query history: {e}")
+        return
+    await query_history_service.record_query_async(**fields)
+
+
+def _format_citations(citations: List[Any]) -> List[CitationResponse]:
+    """Convert RAG citations to response models"""
+    return [
+        CitationResponse(
+            text=c.text,
+            document_id=c.document_id,
+            document_title=c.document_title,
+            section=c.section,
+            confidence=c.confidence
+        )
+        for c in citations
+    ]
+
+
+def _format_source_documents(documents: List[Dict[str, Any]]) -> List[SourceDocumentResponse]:
+    """Convert context documents to response models with a short content preview"""
+    return [
+        SourceDocumentResponse(
+            id=doc['id'],
+            title=doc['title'],
+            citation=doc.get('citation'),
+            section_number=doc.get('section_number'),
+            score=doc['score'],
+            content_preview=doc.get('content', '')[:200] + "..." if len(doc.get('content', '')) > 200 else doc.get('content', '')
+        )
+        for doc in documents
+    ]
+
+
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Serialize one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _stream_event_payload(event: RAGStreamEvent) -> Dict[str, Any]:
+    """Make a RAG stream event JSON-friendly (same shapes as the /ask response)"""
+    data = dict(event.data)
+    if event.event == 'metadata':
+        data['source_documents'] = [
+            doc.model_dump() for doc in _format_source_documents(data.get('source_documents') or [])
+        ]
+    elif event.event == 'citations':
+        data['citations'] = [c.model_dump() for c in _format_citations(data.get('citations') or [])]
+    return data
+
+
 # API Endpoints
 
 @router.post("/ask", response_model=AnswerResponse)
-async def ask_question(request: QuestionRequest):
+async def ask_question(
+    request: QuestionRequest,
+    rag_service: RAGService = Depends(get_rag_service)
+):
     """
     Ask a question and get an AI-generated answer with citations.
 
@@ -127,66 +203,29 @@ async def ask_question(request: QuestionRequest):
 
     Returns answer with citations, confidence score, and source documents.
     """
-    db = SessionLocal()
     try:
         start_time = datetime.now()
 
-        # Generate answer
-        rag_answer = rag_service.answer_question(
+        # Parse once; the context is shared by the RAG pipeline and history logging
+        query_context = rag_service.build_query_context(request.question)
+
+        # Generate answer without blocking the event loop
+        rag_answer = await rag_service.answer_question_async(
             question=request.question,
             filters=request.filters,
             num_context_docs=request.num_context_docs,
             use_cache=request.use_cache,
             temperature=request.temperature,
-            max_tokens=request.max_tokens
+            max_tokens=request.max_tokens,
+            query_context=query_context
         )
 
-        # Format citations
-        citations = [
-            CitationResponse(
-                text=c.text,
-                document_id=c.document_id,
-                document_title=c.document_title,
-                section=c.section,
-                confidence=c.confidence
-            )
-            for c in rag_answer.citations
-        ]
-
-        # Format source documents
-        source_docs = [
-            SourceDocumentResponse(
-                id=doc['id'],
-                title=doc['title'],
-                citation=doc.get('citation'),
-                section_number=doc.get('section_number'),
-                score=doc['score'],
-                content_preview=doc.get('content', '')[:200] + "..." if len(doc.get('content', '')) > 200 else doc.get('content', '')
-            )
-            for doc in rag_answer.source_documents
-        ]
+        # Format citations and source documents
+        citations = _format_citations(rag_answer.citations)
+        source_docs = _format_source_documents(rag_answer.source_documents)
 
         # Log query history (non-blocking)
-        try:
-            user = query_history_service.get_default_citizen_user(db)
-            if user:
-                # Parse query to extract NLP details
-                parsed = query_parser.parse_query(request.question)
-                entities = query_history_service.extract_entities_from_parsed_query(parsed)
-                intent = parsed.intent.value if parsed else rag_answer.intent
-                
-                formatted_results = query_history_service.format_rag_results(rag_answer)
-                
-                query_history_service.log_query(
-                    db=db,
-                    user_id=user.id,
-                    query=request.question,
-                    entities=entities,
-                    intent=intent,
-                    results=formatted_results
-                )
-        except Exception as e:
-            logger.error(f"Failed to log query history: {e}")
+        await _log_query_history(query_context, rag_answer)
 
         # Build response
         return AnswerResponse(
@@ -208,16 +247,69 @@ async def ask_question(request: QuestionRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Question answering failed: {str(e)}"
         )
-    finally:
-        db.close()
+
+
+@router.post("/ask/stream")
+async def ask_question_stream(
+    request: QuestionRequest,
+    rag_service: RAGService = Depends(get_rag_service)
+):
+    """
+    Ask a question and stream the answer as Server-Sent Events.
+
+    Same inputs as /ask. Events are sent in this order:
+    - **metadata**: intent, tier used and source documents (once retrieval finishes)
+    - **citations**: citations built from the source documents
+    - **token**: answer text chunks as the LLM generates them (`{"text": ...}`)
+    - **error**: sent if no answer could be generated (no context found, LLM
+      unavailable or generation failed) (`{"error": ..., "message": ...}`)
+    - **done**: confidence score, processing time and answer metadata
+
+    Time-to-first-token is bounded by retrieval plus the LLM's first chunk
+    instead of the full generation time.
+    """
+    query_context = rag_service.build_query_context(request.question)
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event in rag_service.answer_question_stream(
+                question=request.question,
+                filters=request.filters,
+                num_context_docs=request.num_context_docs,
+                use_cache=request.use_cache,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+                query_context=query_context
+            ):
+                yield _format_sse(event.event, _stream_event_payload(event))
+                if event.answer is not None:
+                    await _log_query_history(query_context, event.answer)
+        except Exception as e:
+            logger.error(f"Streaming question answering failed: {e}", exc_info=True)
+            yield _format_sse('error', {
+                "error": "stream_failed",
+                "message": f"Question answering failed: {str(e)}"
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering (nginx)
+        }
+    )
 
 
 @router.post("/ask/batch", response_model=BatchAnswerResponse)
-async def ask_questions_batch(request: BatchQuestionRequest):
+async def ask_questions_batch(
+    request: BatchQuestionRequest,
+    rag_service: RAGService = Depends(get_rag_service)
+):
     """
     Ask multiple questions in batch.
 
-    Processes up to 10 questions sequentially, with shared filters and settings.
+    Processes up to 10 questions concurrently, with shared filters and settings.
     Each question is answered independently.
 
     - **questions**: List of questions (1-10)
@@ -227,19 +319,24 @@ async def ask_questions_batch(request: BatchQuestionRequest):
 
     Returns list of answers with individual citations and confidence scores.
     """
-    db = SessionLocal()
     try:
         start_time = datetime.now()
 
         answers = []
 
-        for question in request.questions:
-            rag_answer = rag_service.answer_question(
-                question=question,
+        query_contexts = [rag_service.build_query_context(question) for question in request.questions]
+        rag_answers = await asyncio.gather(*(
+            rag_service.answer_question_async(
+                question=query_context.question,
                 filters=request.filters,
                 num_context_docs=request.num_context_docs,
-                use_cache=request.use_cache
+                use_cache=request.use_cache,
+                query_context=query_context
             )
+            for query_context in query_contexts
+        ))
+
+        for query_context, rag_answer in zip(query_contexts, rag_answers):
 
             # Format for response
             citations = [
@@ -266,26 +363,7 @@ async def ask_questions_batch(request: BatchQuestionRequest):
             ]
 
             # Log query history for each question (non-blocking)
-            try:
-                user = query_history_service.get_default_citizen_user(db)
-                if user:
-                    # Parse query to extract NLP details
-                    parsed = query_parser.parse_query(question)
-                    entities = query_history_service.extract_entities_from_parsed_query(parsed)
-                    intent = parsed.intent.value if parsed else rag_answer.intent
-                    
-                    formatted_results = query_history_service.format_rag_results(rag_answer)
-                    
-                    query_history_service.log_query(
-                        db=db,
-                        user_id=user.id,
-                        query=question,
-                        entities=entities,
-                        intent=intent,
-                        results=formatted_results
-                    )
-            except Exception as e:
-                logger.error(f"Failed to log query history: {e}")
+            await _log_query_history(query_context, rag_answer)
 
             answers.append(AnswerResponse(
                 question=rag_answer.question,
@@ -314,12 +392,10 @@ async def ask_questions_batch(request: BatchQuestionRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Batch question answering failed: {str(e)}"
         )
-    finally:
-        db.close()
 
 
 @router.post("/cache/clear")
-async def clear_cache():
+async def clear_cache(rag_service: RAGService = Depends(get_rag_service)):
     """
     Clear the RAG answer cache.
 
@@ -344,7 +420,7 @@ async def clear_cache():
 
 
 @router.get("/cache/stats")
-async def get_cache_stats():
+async def get_cache_stats(rag_service: RAGService = Depends(get_rag_service)):
     """
     Get statistics about the RAG answer cache.
 
@@ -366,7 +442,7 @@ async def get_cache_stats():
 
 
 @router.get("/health")
-async def rag_health_check():
+async def rag_health_check(rag_service: RAGService = Depends(get_rag_service)):
     """
     Health check for RAG service.
 
@@ -12,26 +12,24 @@ Author: Developer 2 (AI/ML Engineer)
 Created: 2025-11-22
 """
 
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import logging
 
-from database import SessionLocal
 from services.search_service import SearchService
 from services.query_parser import LegalQueryParser
 from services.legal_nlp import EntityType
 from services.query_history_service import QueryHistoryService
+from services.service_container import get_search_service, get_query_parser
 
 logger = logging.getLogger(__name__)
 
 # Create router
 router = APIRouter(prefix="/api/search", tags=["Search"])
 
-# Initialize services (singleton pattern)
-search_service = SearchService()
-query_parser = LegalQueryParser(use_spacy=False)
+# Search service and query parser are injected from the shared service container
 query_history_service = QueryHistoryService()
 
 
@@ -44,6 +42,7 @@ class SearchRequest(BaseModel):
     size: int = Field(10, description="Number of results to return", ge=1, le=100)
     from_: int = Field(0, description="Offset for pagination", ge=0, alias="from")
     parse_query: bool = Field(True, description="Use NLP to parse query and extract filters")
+    highlight: bool = Field(False, description="Return highlighted fragments for the returned hits")
 
     class Config:
         json_schema_extra = {
@@ -159,10 +158,31 @@ class IndexStatsResponse(BaseModel):
     number_of_shards: int
 
 
+async def _log_search_history(query: str, parsed: Any, results: Dict[str, Any]) -> None:
+    """Record a search in the query history; failures are logged and never surface to the caller"""
+    try:
+        entities = query_history_service.extract_entities_from_parsed_query(parsed) if parsed else {}
+        intent = parsed.intent.value if parsed else None
+        formatted_results = query_history_service.format_search_results(results)
+    except Exception as e:
+        logger.error(f"Failed to log query history: {e}")
+        return
+    await query_history_service.record_query_async(
+        query=query,
+        entities=entities,
+        intent=intent,
+        results=formatted_results
+    )
+
+
 # API Endpoints
 
 @router.post("/keyword", response_model=SearchResponse)
-async def keyword_search(request: SearchRequest):
+async def keyword_search(
+    request: SearchRequest,
+    search_service: SearchService = Depends(get_search_service),
+    query_parser: LegalQueryParser = Depends(get_query_parser)
+):
     """
     Perform keyword-based search using BM25 algorithm.
 
@@ -175,7 +195,6 @@ async def keyword_search(request: SearchRequest):
     - **from**: Pagination offset
     - **parse_query**: Use NLP to extract filters from query
     """
-    db = SessionLocal()
     try:
         start_time = datetime.now()
 
@@ -214,30 +233,16 @@ async def keyword_search(request: SearchRequest):
             query=request.query,
             filters=filters,
             size=request.size,
-            from_=request.from_
+            from_=request.from_,
+            source_profile="list",
+            highlight=request.highlight
         )
 
         # Format response
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
 
-        # Log query history (non-blocking)
-        try:
-            user = query_history_service.get_default_citizen_user(db)
-            if user:
-                entities = query_history_service.extract_entities_from_parsed_query(parsed) if parsed else {}
-                intent = parsed.intent.value if parsed else None
-                formatted_results = query_history_service.format_search_results(results)
-                
-                query_history_service.log_query(
-                    db=db,
-                    user_id=user.id,
-                    query=request.query,
-                    entities=entities,
-                    intent=intent,
-                    results=formatted_results
-                )
-        except Exception as e:
-            logger.error(f"Failed to log query history: {e}")
+        # Log query history (off the event loop)
+        await _log_search_history(request.query, parsed, results)
 
         return SearchResponse(
             hits=[SearchResultHit(**hit) for hit in results['hits']],
@@ -253,12 +258,14 @@ async def keyword_search(request: SearchRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Keyword search failed: {str(e)}"
         )
-    finally:
-        db.close()
 
 
 @router.post("/vector", response_model=SearchResponse)
-async def vector_search(request: SearchRequest):
+async def vector_search(
+    request: SearchRequest,
+    search_service: SearchService = Depends(get_search_service),
+    query_parser: LegalQueryParser = Depends(get_query_parser)
+):
     """
     Perform vector-based semantic search using embeddings.
 
@@ -271,7 +278,6 @@ async def vector_search(request: SearchRequest):
     - **from**: Pagination offset
     - **parse_query**: Use NLP to extract filters from query
     """
-    db = SessionLocal()
     try:
         start_time = datetime.now()
 
@@ -305,29 +311,15 @@ async def vector_search(request: SearchRequest):
             query=request.query,
             filters=filters,
             size=request.size,
-            from_=request.from_
+            from_=request.from_,
+            source_profile="list",
+            highlight=request.highlight
         )
 
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
 
-        # Log query history (non-blocking)
-        try:
-            user = query_history_service.get_default_citizen_user(db)
-            if user:
-                entities = query_history_service.extract_entities_from_parsed_query(parsed) if parsed else {}
-                intent = parsed.intent.value if parsed else None
-                formatted_results = query_history_service.format_search_results(results)
-                
-                query_history_service.log_query(
-                    db=db,
-                    user_id=user.id,
-                    query=request.query,
-                    entities=entities,
-                    intent=intent,
-                    results=formatted_results
-                )
-        except Exception as e:
-            logger.error(f"Failed to log query history: {e}")
+        # Log query history (off the event loop)
+        await _log_search_history(request.query, parsed, results)
 
         return SearchResponse(
             hits=[SearchResultHit(**hit) for hit in results['hits']],
@@ -343,12 +335,14 @@ async def vector_search(request: SearchRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Vector search failed: {str(e)}"
         )
-    finally:
-        db.close()
 
 
 @router.post("/hybrid", response_model=SearchResponse)
-async def hybrid_search(request: HybridSearchRequest):
+async def hybrid_search(
+    request: HybridSearchRequest,
+    search_service: SearchService = Depends(get_search_service),
+    query_parser: LegalQueryParser = Depends(get_query_parser)
+):
     """
     Perform hybrid search combining keyword and vector search.
 
@@ -362,7 +356,6 @@ async def hybrid_search(request: HybridSearchRequest):
     - **size**: Number of results (1-100)
     - **parse_query**: Use NLP to extract filters from query
     """
-    db = SessionLocal()
     try:
         start_time = datetime.now()
 
@@ -399,29 +392,15 @@ async def hybrid_search(request: HybridSearchRequest):
             size=request.size,
             from_=request.from_,
             keyword_weight=request.keyword_weight,
-            vector_weight=request.vector_weight
+            vector_weight=request.vector_weight,
+            source_profile="list",
+            highlight=request.highlight
         )
 
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
 
-        # Log query history (non-blocking)
-        try:
-            user = query_history_service.get_default_citizen_user(db)
-            if user:
-                entities = query_history_service.extract_entities_from_parsed_query(parsed) if parsed else {}
-                intent = parsed.intent.value if parsed else None
-                formatted_results = query_history_service.format_search_results(results)
-                
-                query_history_service.log_query(
-                    db=db,
-                    user_id=user.id,
-                    query=request.query,
-                    entities=entities,
-                    intent=intent,
-                    results=formatted_results
-                )
-        except Exception as e:
-            logger.error(f"Failed to log query history: {e}")
+        # Log query history (off the event loop)
+        await _log_search_history(request.query, parsed, results)
 
         return SearchResponse(
             hits=[SearchResultHit(**hit) for hit in results['hits']],
@@ -436,12 +415,10 @@ async def hybrid_search(request: HybridSearchRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Hybrid search failed: {str(e)}"
         )
-    finally:
-        db.close()
 
 
 @router.get("/document/{doc_id}")
-async def get_document(doc_id: str):
+async def get_document(doc_id: str, search_service: SearchService = Depends(get_search_service)):
     """
     Retrieve a single document by ID.
 
@@ -471,8 +448,9 @@ async def get_document(doc_id: str):
         )
 
 
+# Plain def: the blocking ORM queries run in FastAPI's threadpool, not on the event loop
 @router.get("/regulation/{regulation_id}")
-async def get_regulation(regulation_id: str):
+def get_regulation(regulation_id: str):
     """
     Get full regulation details including all sections.
 
@@ -549,7 +527,7 @@ async def get_regulation(regulation_id: str):
 
 
 @router.get("/regulation/{regulation_id}/amendments")
-async def get_regulation_amendments(regulation_id: str):
+def get_regulation_amendments(regulation_id: str):
     """
     Get all amendments for a regulation.
 
@@ -604,7 +582,10 @@ async def get_regulation_amendments(regulation_id: str):
 
 
 @router.post("/index", response_model=IndexResponse)
-async def index_document(request: DocumentIndexRequest):
+async def index_document(
+    request: DocumentIndexRequest,
+    search_service: SearchService = Depends(get_search_service)
+):
     """
     Index a single regulatory document.
 
@@ -654,7 +635,10 @@ async def index_document(request: DocumentIndexRequest):
 
 
 @router.post("/index/bulk", response_model=BulkIndexResponse)
-async def bulk_index_documents(request: BulkIndexRequest):
+async def bulk_index_documents(
+    request: BulkIndexRequest,
+    search_service: SearchService = Depends(get_search_service)
+):
     """
     Bulk index multiple documents for efficient processing.
 
@@ -695,7 +679,7 @@ async def bulk_index_documents(request: BulkIndexRequest):
 
 
 @router.delete("/document/{doc_id}")
-async def delete_document(doc_id: str):
+async def delete_document(doc_id: str, search_service: SearchService = Depends(get_search_service)):
     """
     Delete a document from the index.
 
@@ -725,7 +709,10 @@ async def delete_document(doc_id: str):
 
 
 @router.post("/index/create")
-async def create_index(force_recreate: bool = Query(False)):
+async def create_index(
+    force_recreate: bool = Query(False),
+    search_service: SearchService = Depends(get_search_service)
+):
     """
     Create or recreate the Elasticsearch index.
 
@@ -755,7 +742,7 @@ async def create_index(force_recreate: bool = Query(False)):
 
 
 @router.get("/stats", response_model=IndexStatsResponse)
-async def get_index_stats():
+async def get_index_stats(search_service: SearchService = Depends(get_search_service)):
     """
     Get statistics about the search index.
 
@@ -782,7 +769,7 @@ async def get_index_stats():
 
 
 @router.get("/health")
-async def search_health_check():
+async def search_health_check(search_service: SearchService = Depends(get_search_service)):
     """
     Health check for search service.
 
@@ -811,7 +798,8 @@ async def search_health_check():
 @router.get("/analyze")
 async def analyze_query(
     query: str = Query(..., description="Query to analyze"),
-    extract_filters: bool = Query(True, description="Extract filters from query")
+    extract_filters: bool = Query(True, description="Extract filters from query"),
+    query_parser: LegalQueryParser = Depends(get_query_parser)
 ):
     """
     Analyze a query using NLP without performing search.
@@ -7,10 +7,17 @@ Usage:
     # Incremental update (default) - updates existing documents, adds new ones
     python backend/scripts/reindex_elasticsearch.py
     
-    # Full recreation - deletes and rebuilds index from scratch
+    # Full rebuild - loads a fresh versioned index, then swaps the alias (no downtime)
     python backend/scripts/reindex_elasticsearch.py --force-recreate
+    
+    # Encode embeddings on all CPU cores
+    python backend/scripts/reindex_elasticsearch.py --multi-process
+    
+    # Also build the passage index used for passage-level retrieval
+    python backend/scripts/reindex_elasticsearch.py --passages
 """
 import argparse
+import os
 import sys
 from pathlib import Path
 
@@ -54,19 +61,26 @@ Examples:
   # Incremental update (default) - updates existing documents, adds new ones
   python backend/scripts/reindex_elasticsearch.py
   
-  # Full recreation - deletes and rebuilds index from scratch
-  python backend/scripts/reindex_elasticsearch.py --force-recreate
+  # Full rebuild into a new index behind the alias, with 4 bulk threads
+  python backend/scripts/reindex_elasticsearch.py --force-recreate --bulk-threads 4
+  
+  # Larger embedding mini-batches, encoded on all CPU cores
+  python backend/scripts/reindex_elasticsearch.py --embedding-batch-size 128 --multi-process
+  
+  # Also chunk documents into the passage index
+  python backend/scripts/reindex_elasticsearch.py --passages
   
 Notes:
-  - Incremental mode is faster and safer (no downtime)
-  - Use --force-recreate when mappings change or for complete reset
+  - Incremental mode updates the live index in place
+  - Use --force-recreate when mappings change or for complete reset; search keeps
+    using the old index until the new one is loaded and the alias is swapped
   - Documents with same ID will be updated automatically
         """
     )
     parser.add_argument(
         '--force-recreate',
         action='store_true',
-        help='Delete and recreate the index (default: update existing index)'
+        help='Rebuild into a new index and swap the alias when done (default: update existing index)'
     )
     parser.add_argument(
         '--batch-size',
@@ -74,6 +88,34 @@ Notes:
         default=2500,
         help='Number of documents to index in each batch (default: 2500)'
     )
+    parser.add_argument(
+        '--embedding-batch-size',
+        type=int,
+        default=None,
+        help='Mini-batch size for embedding generation (default: EMBEDDING_BATCH_SIZE or 64)'
+    )
+    parser.add_argument(
+        '--multi-process',
+        action='store_true',
+        help='Encode embeddings with a multi-process pool (CPU only)'
+    )
+    parser.add_argument(
+        '--bulk-threads',
+        type=int,
+        default=None,
+        help='parallel_bulk worker threads (default: ES_BULK_THREADS or 1)'
+    )
+    parser.add_argument(
+        '--keep-old-index',
+        action='store_true',
+        help='Keep the previous index after the alias swap (for rollback)'
+    )
+    parser.add_argument(
+        '--passages',
+        action='store_true',
+        default=os.getenv("PASSAGE_INDEX_ENABLED", "false").lower() == "true",
+        help='Also index overlapping passages into the passage index (default: PASSAGE_INDEX_ENABLED)'
+    )
     args = parser.parse_args()
     
     print("=" * 80)
@@ -83,24 +125,52 @@ Notes:
     # Initialize services
     db = SessionLocal()
     search_service = SearchService()
+    if args.embedding_batch_size:
+        search_service.embedding_batch_size = args.embedding_batch_size
+    if args.multi_process:
+        search_service.embedding_multi_process = True
+    if args.bulk_threads:
+        search_service.bulk_threads = args.bulk_threads
+    
+    # Target indices: None writes through the alias (incremental mode)
+    target_index = None
+    passage_target_index = None
     
-    # Ensure index exists with proper mappings
     if args.force_recreate:
-        print("\n⚠️  FORCE RECREATE MODE: Deleting and recreating index...")
-        print("    This will cause temporary search downtime.")
+        print("\n✓ FULL REBUILD MODE: Loading a new index behind the alias...")
+        print("    Search keeps using the current index until the alias is swapped.")
+        target_index = search_service.create_versioned_index()
+        if not target_index:
+            print("\n❌ ERROR: Failed to create new index. Exiting.")
+            return
+        print(f"✓ Created {target_index} (refresh disabled, no replicas during load)")
+        if args.passages:
+            passage_target_index = search_service.create_versioned_index(
+                alias=search_service.PASSAGE_INDEX_NAME,
+                extra_properties=search_service.PASSAGE_PROPERTIES
+            )
+            if not passage_target_index:
+                print("\n❌ ERROR: Failed to create new passage index. Exiting.")
+                search_service.es.indices.delete(index=target_index)
+                return
+            print(f"✓ Created {passage_target_index}")
     else:
         print("\n✓ INCREMENTAL UPDATE MODE: Updating existing index...")
         print("    Index will remain searchable during re-indexing.")
         print("    Documents with same ID will be updated automatically.")
-    
-    if not search_service.create_index(force_recreate=args.force_recreate):
-        print("\n❌ ERROR: Failed to create/update index. Exiting.")
-        return
-    
-    if args.force_recreate:
-        print("✓ Index recreated successfully with custom mappings")
-    else:
+        
+        if not search_service.create_index(force_recreate=False):
+            print("\n❌ ERROR: Failed to create/update index. Exiting.")
+            return
         print("✓ Index ready for updates")
+        
+        if args.passages and not search_service.create_passage_index(force_recreate=False):
+            print("\n❌ ERROR: Failed to create/update passage index. Exiting.")
+            return
+    
+    if args.passages:
+        print(f"✓ Passage indexing enabled ({search_service.passage_max_words} words per passage, "
+              f"{search_service.passage_overlap_words} overlap)")
     
     try:
         # Get all regulations
@@ -114,16 +184,19 @@ Notes:
         indexed_sections = 0
         total_docs = 0
         failed_docs = 0
+        total_passages = 0
+        failed_passages = 0
         
         def flush_batch():
             """Flush the current batch to Elasticsearch"""
-            nonlocal total_docs, failed_docs
+            nonlocal total_docs, failed_docs, total_passages, failed_passages
             if not batch:
                 return
             
             success, failed = search_service.bulk_index_documents(
                 documents=batch,
-                generate_embeddings=True
+                generate_embeddings=True,
+                index_name=target_index
             )
             total_docs += success
             failed_docs += failed
@@ -131,6 +204,18 @@ Notes:
             if failed > 0:
                 print(f"   ⚠️  Batch had {failed} failures")
             
+            if args.passages:
+                success, failed = search_service.bulk_index_passages(
+                    documents=batch,
+                    generate_embeddings=True,
+                    replace_existing=not args.force_recreate,
+                    index_name=passage_target_index
+                )
+                total_passages += success
+                failed_passages += failed
+                if failed > 0:
+                    print(f"   ⚠️  Passage batch had {failed} failures")
+            
             batch.clear()
         
         for i, regulation in enumerate(regulations, 1):
@@ -220,6 +305,23 @@ Notes:
             print(f"\nFlushing final batch of {len(batch)} documents...")
             flush_batch()
         
+        # Publish the rebuilt indices: restore refresh/replicas, then swap the aliases
+        if target_index:
+            if total_docs == 0:
+                raise RuntimeError("No documents were indexed; keeping the current index")
+            if not (search_service.finalize_versioned_index(target_index) and
+                    search_service.swap_alias(target_index, delete_old=not args.keep_old_index)):
+                raise RuntimeError(f"Failed to publish {target_index}")
+            print(f"✓ Alias {search_service.INDEX_NAME} now points to {target_index}")
+            target_index = None  # Published; nothing to clean up
+        if passage_target_index:
+            alias = search_service.PASSAGE_INDEX_NAME
+            if not (search_service.finalize_versioned_index(passage_target_index) and
+                    search_service.swap_alias(passage_target_index, alias, delete_old=not args.keep_old_index)):
+                raise RuntimeError(f"Failed to publish {passage_target_index}")
+            print(f"✓ Alias {alias} now points to {passage_target_index}")
+            passage_target_index = None
+        
         print("\n" + "=" * 80)
         print("Re-indexing complete!")
         print("=" * 80)
@@ -228,14 +330,30 @@ Notes:
         print(f"✓ Successfully indexed: {total_docs} documents")
         if failed_docs > 0:
             print(f"⚠️  Failed: {failed_docs} documents")
+        if args.passages:
+            print(f"✓ Indexed passages: {total_passages}")
+            if failed_passages > 0:
+                print(f"⚠️  Failed: {failed_passages} passages")
         print(f"\nBatch size used: {args.batch_size} documents per batch")
+        print(f"Embedding batch size: {search_service.embedding_batch_size}"
+              f"{' (multi-process)' if search_service.embedding_multi_process else ''}")
+        if search_service._embedding_cache is not None:
+            cache_stats = search_service._embedding_cache.stats()
+            print(f"Embedding cache: {cache_stats['hits']} reused, {cache_stats['misses']} encoded "
+                  f"({cache_stats['vectors']} vectors stored)")
         print("Note: Existing documents with same ID were updated automatically.")
         print("=" * 80)
         
     except Exception as e:
         print(f"Error during re-indexing: {str(e)}")
+        # Drop a partially loaded rebuild; the aliases still point at the old indices
+        for index_name in (target_index, passage_target_index):
+            if index_name:
+                print(f"Deleting unpublished index {index_name}")
+                search_service.es.indices.delete(index=index_name, ignore_unavailable=True)
         raise
     finally:
+        search_service.stop_embedding_pool()
         db.close()
 
 if __name__ == '__main__':
@@ -12,7 +12,8 @@ import os
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Any, Union, Tuple, TYPE_CHECKING
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Any, Union, Tuple, TYPE_CHECKING
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass
@@ -76,6 +77,14 @@ GEMINI_PRICING = {
     }
 }
 
+# Safety settings - allow most content for legal/regulatory text
+SAFETY_SETTINGS = {
+    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+}
+
 
 class GeminiClient:
     """
@@ -362,6 +371,67 @@ class GeminiClient:
             logger.error(f"Failed to extract usage metrics: {e}", exc_info=True)
             return None
 
+    def _build_generation_config(
+        self,
+        temperature: float,
+        max_tokens: Optional[int],
+        top_p: float,
+        top_k: int,
+        stop_sequences: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Build the generation config shared by the sync and async generate paths"""
+        generation_config = {
+            "temperature": temperature,
+            "top_p": top_p,
+            "top_k": top_k,
+        }
+
+        if max_tokens:
+            generation_config["max_output_tokens"] = max_tokens
+
+        if stop_sequences:
+            generation_config["stop_sequences"] = stop_sequences
+
+        return generation_config
+
+    def _text_from_generation(self, response) -> str:
+        """Log usage for a generate_content response and return its text (raises if empty)"""
+        # Log usage metrics for transparency
+        self._log_usage_metrics(response, operation="generate_content")
+
+        # Extract text with detailed logging
+        extracted_text = self._extract_text_from_response(response)
+
+        if extracted_text:
+            logger.info(f"✅ Successfully extracted {len(extracted_text)} characters from Gemini response")
+            return extracted_text
+
+        logger.error(f"❌ Failed to extract text from Gemini response - response may be blocked or empty")
+        raise ValueError("Failed to extract text from response")
+
+    def _build_context_prompt(
+        self,
+        query: str,
+        context: Union[str, List[str]],
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """Build the full prompt for a context-grounded generation"""
+        if isinstance(context, list):
+            context_str = "\n\n".join(context)
+        else:
+            context_str = context
+
+        prompt_parts = []
+
+        if system_prompt:
+            prompt_parts.append(f"System Instructions:\n{system_prompt}\n")
+
+        prompt_parts.append(f"Context:\n{context_str}\n")
+        prompt_parts.append(f"Question: {query}\n")
+        prompt_parts.append("Answer based on the provided context:")
+
+        return "\n".join(prompt_parts)
+
     def generate_content(
         self,
         prompt: str,
@@ -397,46 +467,18 @@ class GeminiClient:
             )
             return None, error
 
+        generation_config = self._build_generation_config(
+            temperature, max_tokens, top_p, top_k, stop_sequences
+        )
+
         # Define the operation to retry
         def _generate_operation():
-            generation_config = {
-                "temperature": temperature,
-                "top_p": top_p,
-                "top_k": top_k,
-            }
-
-            if max_tokens:
-                generation_config["max_output_tokens"] = max_tokens
-
-            if stop_sequences:
-                generation_config["stop_sequences"] = stop_sequences
-
-            # Safety settings - allow most content for legal/regulatory text
-            safety_settings = {
-                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-            }
-
             response = self.model.generate_content(
                 prompt,
                 generation_config=generation_config,
-                safety_settings=safety_settings
+                safety_settings=SAFETY_SETTINGS
             )
-
-            # Log usage metrics for transparency
-            self._log_usage_metrics(response, operation="generate_content")
-
-            # Extract text with detailed logging
-            extracted_text = self._extract_text_from_response(response)
-            
-            if extracted_text:
-                logger.info(f"✅ Successfully extracted {len(extracted_text)} characters from Gemini response")
-                return extracted_text
-            else:
-                logger.error(f"❌ Failed to extract text from Gemini response - response may be blocked or empty")
-                raise ValueError("Failed to extract text from response")
+            return self._text_from_generation(response)
         
         # Execute with retry logic
         result, error = self._exponential_backoff_retry(
@@ -737,30 +779,249 @@ class GeminiClient:
             )
             return None, error
 
-        # Build prompt with context
-        if isinstance(context, list):
-            context_str = "\n\n".join(context)
-        else:
-            context_str = context
+        prompt = self._build_context_prompt(query, context, system_prompt)
 
-        prompt_parts = []
+        return self.generate_content(
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_retries=max_retries
+        )
 
-        if system_prompt:
-            prompt_parts.append(f"System Instructions:\n{system_prompt}\n")
+    # ============================================
+    # ASYNC API (used by async FastAPI routes)
+    # ============================================
 
-        prompt_parts.append(f"Context:\n{context_str}\n")
-        prompt_parts.append(f"Question: {query}\n")
-        prompt_parts.append("Answer based on the provided context:")
+    async def is_available_async(self) -> bool:
+        """Async counterpart of is_available (no I/O needed for Gemini)"""
+        return self.available
 
-        prompt = "\n".join(prompt_parts)
+    async def _exponential_backoff_retry_async(
+        self,
+        operation_func,
+        max_retries: int = 3,
+        initial_delay: float = 1.0,
+        max_delay: float = 60.0,
+        backoff_multiplier: float = 2.0
+    ) -> Tuple[Optional[Any], Optional[GeminiError]]:
+        """
+        Async counterpart of _exponential_backoff_retry.
 
-        return self.generate_content(
+        Args:
+            operation_func: Coroutine function to execute (should raise exceptions on failure)
+            max_retries: Maximum number of retry attempts
+            initial_delay: Initial delay in seconds before first retry
+            max_delay: Maximum delay between retries
+            backoff_multiplier: Multiplier for exponential backoff
+
+        Returns:
+            Tuple of (result, error). If successful, error is None. If failed after all retries, result is None.
+        """
+        last_error = None
+        delay = initial_delay
+
+        for attempt in range(max_retries + 1):  # +1 for initial attempt
+            try:
+                result = await operation_func()
+
+                if attempt > 0:
+                    logger.info(f"✅ Operation succeeded after {attempt} retry attempt(s)")
+
+                return result, None
+
+            except Exception as e:
+                gemini_error = self._classify_error(e)
+                last_error = gemini_error
+
+                logger.warning(
+                    f"⚠️  Gemini API error (attempt {attempt + 1}/{max_retries + 1}): "
+                    f"{gemini_error.error_type} - {gemini_error.message}"
+                )
+
+                if not gemini_error.is_retryable:
+                    logger.error(f"❌ Error is not retryable: {gemini_error.error_type}")
+                    return None, gemini_error
+
+                if attempt >= max_retries:
+                    logger.error(f"❌ Max retries ({max_retries}) exhausted")
+                    return None, gemini_error
+
+                if gemini_error.retry_after_seconds:
+                    actual_delay = min(gemini_error.retry_after_seconds, max_delay)
+                else:
+                    actual_delay = min(delay, max_delay)
+
+                logger.info(f"🔄 Retrying in {actual_delay:.1f} seconds...")
+                await asyncio.sleep(actual_delay)
+
+                delay *= backoff_multiplier
+
+        return None, last_error
+
+    async def generate_content_async(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        top_p: float = 0.95,
+        top_k: int = 40,
+        stop_sequences: Optional[List[str]] = None,
+        max_retries: int = 3
+    ) -> Tuple[Optional[str], Optional[GeminiError]]:
+        """
+        Async counterpart of generate_content using the SDK's native async call.
+
+        Returns:
+            Tuple of (generated_text, error). If successful, error is None.
+            If failed, generated_text is None and error contains details.
+        """
+        if not self.available:
+            logger.error("Gemini API not available")
+            error = GeminiError(
+                error_type="unavailable",
+                message="The AI service is not configured. Please contact support.",
+                is_retryable=False
+            )
+            return None, error
+
+        generation_config = self._build_generation_config(
+            temperature, max_tokens, top_p, top_k, stop_sequences
+        )
+
+        async def _generate_operation():
+            response = await self.model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                safety_settings=SAFETY_SETTINGS
+            )
+            return self._text_from_generation(response)
+
+        return await self._exponential_backoff_retry_async(
+            operation_func=_generate_operation,
+            max_retries=max_retries
+        )
+
+    async def generate_with_context_async(
+        self,
+        query: str,
+        context: Union[str, List[str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3
+    ) -> Tuple[Optional[str], Optional[GeminiError]]:
+        """Async counterpart of generate_with_context (used by the async RAG path)"""
+        if not self.available:
+            error = GeminiError(
+                error_type="unavailable",
+                message="The AI service is not configured. Please contact support.",
+                is_retryable=False
+            )
+            return None, error
+
+        prompt = self._build_context_prompt(query, context, system_prompt)
+
+        return await self.generate_content_async(
             prompt=prompt,
             temperature=temperature,
             max_tokens=max_tokens,
             max_retries=max_retries
         )
 
+    async def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        top_p: float = 0.95,
+        top_k: int = 40,
+        stop_sequences: Optional[List[str]] = None,
+        max_retries: int = 3
+    ) -> AsyncIterator[Union[str, GeminiError]]:
+        """
+        Stream generated text chunks as Gemini produces them.
+
+        Yields str chunks. A failure is reported by yielding a single GeminiError
+        as the last item; retries (with exponential backoff) only happen before
+        the first chunk is sent.
+        """
+        if not self.available:
+            logger.error("Gemini API not available")
+            yield GeminiError(
+                error_type="unavailable",
+                message="The AI service is not configured. Please contact support.",
+                is_retryable=False
+            )
+            return
+
+        generation_config = self._build_generation_config(
+            temperature, max_tokens, top_p, top_k, stop_sequences
+        )
+
+        delay = 1.0
+        for attempt in range(max_retries + 1):
+            streamed = False
+            try:
+                response = await self.model.generate_content_async(
+                    prompt,
+                    generation_config=generation_config,
+                    safety_settings=SAFETY_SETTINGS,
+                    stream=True
+                )
+                async for chunk in response:
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # Chunk without text parts (e.g. safety or finish metadata)
+                        continue
+                    if text:
+                        streamed = True
+                        yield text
+
+                if not streamed:
+                    raise ValueError("Failed to extract text from response")
+                self._log_usage_metrics(response, operation="generate_stream")
+                return
+
+            except Exception as e:
+                gemini_error = self._classify_error(e)
+                if streamed or not gemini_error.is_retryable or attempt >= max_retries:
+                    logger.error(f"❌ Gemini stream failed: {gemini_error.error_type} - {gemini_error.message}")
+                    yield gemini_error
+                    return
+
+                actual_delay = min(gemini_error.retry_after_seconds or delay, 60.0)
+                logger.warning(
+                    f"⚠️  Gemini stream error (attempt {attempt + 1}/{max_retries + 1}), "
+                    f"retrying in {actual_delay:.1f} seconds: {gemini_error.message}"
+                )
+                await asyncio.sleep(actual_delay)
+                delay *= 2.0
+
+    async def generate_with_context_stream(
+        self,
+        query: str,
+        context: Union[str, List[str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3
+    ) -> AsyncIterator[Union[str, GeminiError]]:
+        """Streaming counterpart of generate_with_context (used by the streaming RAG path)"""
+        prompt = self._build_context_prompt(query, context, system_prompt)
+
+        async for item in self.generate_stream(
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_retries=max_retries
+        ):
+            yield item
+
+    async def aclose(self) -> None:
+        """Release async resources (the Gemini SDK manages its own transport)"""
+        return None
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check health of Gemini API connection.
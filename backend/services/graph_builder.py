@@ -8,10 +8,12 @@ from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import Session
 import uuid
 import logging
+import os
 import re
 
 from models import Regulation, Section, Amendment
 from utils.neo4j_client import Neo4jClient
+from services.graph_service import match_document_by_id
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +30,20 @@ class GraphBuilder:
         re.compile(r"when\s+(?:a|an|the)\s+([^.]{10,100})", re.IGNORECASE),
     ]
     
+    # Relationship weights for the materialized related-document lists
+    # (cross-document links outrank structural ones)
+    RELATED_TYPE_WEIGHTS = {
+        "IMPLEMENTS": 1.0,
+        "ENACTED_UNDER": 1.0,
+        "INTERPRETS": 1.0,
+        "REFERENCES": 0.8,
+        "PART_OF": 0.5,
+        "HAS_SECTION": 0.4,
+    }
+    # Second hops only follow cross-document links, so an act's list holds
+    # what its sections reference rather than its sections' siblings
+    RELATED_SECOND_HOP_TYPES = ("IMPLEMENTS", "ENACTED_UNDER", "INTERPRETS", "REFERENCES")
+    
     def __init__(self, db: Session, neo4j_client: Neo4jClient, batch_size: int = 2500):
         """
         Initialize graph builder.
@@ -50,6 +66,15 @@ class GraphBuilder:
         self._node_batches: Dict[str, List[Dict[str, Any]]] = {}  # label -> list of node properties
         self._relationship_batches: List[Dict[str, Any]] = []  # list of relationship definitions
         
+        # Slim nodes keep only a short text snippet; full text stays in PostgreSQL
+        # and is hydrated for final results (PostgresSearchService.fetch_document_texts)
+        self.slim_nodes = os.getenv("GRAPH_SLIM_NODES", "false").lower() == "true"
+        self.node_snippet_chars = int(os.getenv("GRAPH_NODE_SNIPPET_CHARS", "500"))
+        
+        # Materialized related-document lists (see materialize_related_documents)
+        self.related_top_n = int(os.getenv("GRAPH_RELATED_TOP_N", "20"))
+        self.related_batch_size = int(os.getenv("GRAPH_RELATED_BATCH_SIZE", "500"))
+        
         # Ensure fulltext indexes exist for graph search functionality
         self._ensure_fulltext_indexes()
     
@@ -242,10 +267,13 @@ class GraphBuilder:
         logger.debug("All batches flushed")
     
     
-    def build_document_graph(self, regulation_id: uuid.UUID) -> Dict[str, Any]:
+    def build_document_graph(self, regulation_id: uuid.UUID, refresh_related: bool = True) -> Dict[str, Any]:
         """
         Build graph for a single regulation with optimized SQL and Batching.
         Accepts either a UUID (and fetches it efficiently) or a pre-fetched object.
+        
+        With refresh_related, the related-document lists of the regulation,
+        its sections and their direct neighbours are recomputed afterwards.
         """
         # 1. OPTIMIZED SQL LOADING
         # UUID, fetch it with eager loading to stop N+1 queries
@@ -283,6 +311,9 @@ class GraphBuilder:
             self.flush_all_batches()
             
             logger.info(f"Graph built successfully for {regulation.title}")
+            
+            if refresh_related:
+                self.refresh_related_documents(regulation.id)
             return self.stats
             
         except Exception as e:
@@ -293,6 +324,17 @@ class GraphBuilder:
             self._relationship_batches = []
             raise
 
+    def _node_text(self, text: Optional[str]) -> str:
+        """
+        Text stored on a graph node: the full text, or in slim mode only its
+        opening (cut at a word boundary) for full-text matching and previews.
+        """
+        if not text:
+            return ""
+        if not self.slim_nodes or len(text) <= self.node_snippet_chars:
+            return text
+        return text[:self.node_snippet_chars].rsplit(' ', 1)[0]
+    
     def _create_regulation_node(self, regulation: Regulation) -> None:
         """
         Queue a Legislation or Regulation node for batch creation.
@@ -314,7 +356,7 @@ class GraphBuilder:
         if regulation.effective_date:
             properties["effective_date"] = regulation.effective_date.isoformat()
         if regulation.full_text and len(regulation.full_text) < 1000000:
-            properties["full_text"] = regulation.full_text
+            properties["full_text"] = self._node_text(regulation.full_text)
         if regulation.extra_metadata:
             # Note: _add_node_to_batch handles JSON serialization for dicts automatically
             properties["metadata"] = regulation.extra_metadata
@@ -379,7 +421,7 @@ class GraphBuilder:
             properties = {
                 "id": section_id_str,
                 "section_number": section.section_number,
-                "content": section.content if section.content else "",
+                "content": self._node_text(section.content),
                 "level": 0,
                 "created_at": current_time,
                 "citation": f"{reg_title_short} Section {section.section_number}"
@@ -981,7 +1023,7 @@ class GraphBuilder:
             if regulation.effective_date:
                 reg_properties["effective_date"] = regulation.effective_date.isoformat()
             if regulation.full_text and len(regulation.full_text) < 1000000:
-                reg_properties["full_text"] = regulation.full_text
+                reg_properties["full_text"] = self._node_text(regulation.full_text)
             if regulation.extra_metadata:
                 reg_properties["metadata"] = regulation.extra_metadata
             
@@ -993,7 +1035,7 @@ class GraphBuilder:
                 properties = {
                     "id": str(section.id),
                     "section_number": section.section_number,
-                    "content": section.content if section.content else "",
+                    "content": self._node_text(section.content),
                     "level": 0,
                     "created_at": datetime.utcnow().isoformat()
                 }
@@ -1104,7 +1146,7 @@ class GraphBuilder:
                 # Pass the ID! 
                 # Our new build_document_graph will receive this ID, 
                 # perform a 'joinedload' query, and fetch data instantly.
-                doc_stats = self.build_document_graph(reg_id)
+                doc_stats = self.build_document_graph(reg_id, refresh_related=False)
                 
                 overall_stats["successful"] += 1
                 overall_stats["total_nodes"] += doc_stats["nodes_created"]
@@ -1132,6 +1174,14 @@ class GraphBuilder:
             logger.error(f"Error linking documents: {e}")
             overall_stats["errors"].append(f"Inter-document linking error: {e}")
 
+        # 4. Related-document lists for the whole graph, once everything is linked
+        try:
+            overall_stats["related_lists_updated"] = self.materialize_related_documents()
+        except Exception as e:
+            logger.error(f"Error materializing related documents: {e}")
+            overall_stats["related_lists_updated"] = 0
+            overall_stats["errors"].append(f"Related documents error: {e}")
+
         return overall_stats
     
     def create_inter_document_relationships(self):
@@ -1149,6 +1199,120 @@ class GraphBuilder:
         
         logger.info("Inter-document relationships complete")
     
+    # ============================================
+    # MATERIALIZED RELATED DOCUMENTS
+    # ============================================
+    
+    def _related_documents_cypher(self) -> str:
+        """
+        Compute and store the top-N related documents of a batch of seed nodes.
+        
+        Lists are stored as parallel node properties (related_ids,
+        related_types, related_depths, related_scores). Paths are one hop over
+        any document relationship, or two hops where the second follows a
+        cross-document link; each path scores its relationship weight divided
+        by its length, and scores are normalised so the best neighbour is 1.0.
+        """
+        all_types = "|".join(self.RELATED_TYPE_WEIGHTS)
+        second_hop_types = "|".join(self.RELATED_SECOND_HOP_TYPES)
+        return f"""
+        UNWIND $ids AS seed_id
+        {match_document_by_id('seed', 'seed_id')}
+        // Reset first so nodes that lost all their links get an empty list
+        SET seed.related_ids = [], seed.related_types = [],
+            seed.related_depths = [], seed.related_scores = []
+        WITH seed
+        CALL {{
+            WITH seed
+            MATCH (seed)-[r:{all_types}]-(related)
+            WHERE related:Legislation OR related:Regulation OR related:Section
+            RETURN related, type(r) AS rel_type, 1 AS hops
+            UNION ALL
+            WITH seed
+            MATCH (seed)-[:{all_types}]-(hop)-[r:{second_hop_types}]-(related)
+            WHERE related <> seed AND (related:Legislation OR related:Regulation OR related:Section)
+            RETURN related, type(r) AS rel_type, 2 AS hops
+        }}
+        WITH seed, related, rel_type, hops, $weights[rel_type] / hops AS weight
+        ORDER BY weight DESC
+        WITH seed, related, head(collect(rel_type)) AS rel_type, min(hops) AS hops, sum(weight) AS score
+        ORDER BY score DESC
+        WITH seed, collect({{id: related.id, type: rel_type, hops: hops, score: score}})[..$top_n] AS top
+        SET seed.related_ids = [t IN top | t.id],
+            seed.related_types = [t IN top | t.type],
+            seed.related_depths = [t IN top | t.hops],
+            seed.related_scores = [t IN top | t.score / top[0].score],
+            seed.related_updated_at = datetime()
+        """
+    
+    def materialize_related_documents(self, node_ids: Optional[List[str]] = None) -> int:
+        """
+        Precompute ranked related-document lists for document nodes.
+        
+        Tier 3 traversal and RAG graph enhancement read these lists instead of
+        running variable-length traversals at query time.
+        
+        Args:
+            node_ids: Legislation/Regulation/Section IDs to refresh (default: all)
+        
+        Returns:
+            Number of nodes whose lists were written
+        """
+        if node_ids is None:
+            rows = self.neo4j.execute_query("""
+            MATCH (n)
+            WHERE n:Legislation OR n:Regulation OR n:Section
+            RETURN n.id as id
+            """)
+            node_ids = [row["id"] for row in rows if row.get("id")]
+        
+        logger.info(f"Materializing related documents for {len(node_ids)} nodes (top {self.related_top_n})...")
+        query = self._related_documents_cypher()
+        updated = 0
+        for start in range(0, len(node_ids), self.related_batch_size):
+            batch = node_ids[start:start + self.related_batch_size]
+            try:
+                self.neo4j.execute_write(query, {
+                    "ids": batch,
+                    "weights": self.RELATED_TYPE_WEIGHTS,
+                    "top_n": self.related_top_n
+                })
+                updated += len(batch)
+            except Exception as e:
+                logger.error(f"Error materializing related documents (batch at {start}): {e}")
+                self.stats["errors"].append(f"Related documents error: {e}")
+        
+        logger.info(f"✓ Related-document lists written for {updated} nodes")
+        return updated
+    
+    def refresh_related_documents(self, regulation_id: uuid.UUID) -> int:
+        """
+        Incrementally refresh related-document lists after a regulation is (re)built.
+        
+        Covers the document, its sections and their direct neighbours; lists
+        that only reach the document over two hops are picked up by the next
+        full materialize_related_documents run.
+        """
+        try:
+            rows = self.neo4j.execute_query(f"""
+            WITH $id AS doc_id
+            {match_document_by_id('doc', 'doc_id')}
+            OPTIONAL MATCH (doc)-[:HAS_SECTION]->(section:Section)
+            WITH doc, collect(section) AS sections
+            UNWIND [doc] + sections AS node
+            OPTIONAL MATCH (node)-[:{"|".join(self.RELATED_TYPE_WEIGHTS)}]-(neighbour)
+            WHERE neighbour:Legislation OR neighbour:Regulation OR neighbour:Section
+            WITH collect(DISTINCT node.id) + collect(DISTINCT neighbour.id) AS ids
+            UNWIND ids AS id
+            RETURN DISTINCT id
+            """, {"id": str(regulation_id)})
+            return self.materialize_related_documents([row["id"] for row in rows if row.get("id")])
+        except Exception as e:
+            # Stale lists are tolerable; never fail the graph build over them
+            logger.error(f"Error refreshing related documents for {regulation_id}: {e}")
+            self.stats["errors"].append(f"Related documents refresh error: {e}")
+            return 0
+    
     def _link_regulations_to_legislation(self):
         """Link Regulation nodes to Legislation nodes they implement using batching."""
         logger.info("Linking Regulations to Legislation...")
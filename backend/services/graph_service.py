@@ -4,8 +4,10 @@ Provides high-level operations for creating and querying regulatory entities.
 """
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, date
+import asyncio
 import uuid
 import logging
+import os
 import re
 
 from utils.neo4j_client import get_neo4j_client, Neo4jClient
@@ -21,9 +23,36 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def match_document_by_id(variable: str, id_expr: str) -> str:
+    """
+    Cypher subquery binding a document node by id.
+    
+    One branch per document label, so each lookup goes through that label's
+    id uniqueness constraint instead of a label-less scan.
+    """
+    return "\n        ".join([
+        "CALL {",
+        f"    WITH {id_expr}",
+        f"    MATCH ({variable}:Legislation {{id: {id_expr}}}) RETURN {variable}",
+        "    UNION",
+        f"    WITH {id_expr}",
+        f"    MATCH ({variable}:Regulation {{id: {id_expr}}}) RETURN {variable}",
+        "    UNION",
+        f"    WITH {id_expr}",
+        f"    MATCH ({variable}:Section {{id: {id_expr}}}) RETURN {variable}",
+        "}",
+    ])
+
+
 class GraphService:
     """Service for managing the regulatory knowledge graph."""
     
+    # Relationships followed by expand_neighbors between document nodes
+    DOCUMENT_RELATIONSHIP_TYPES = (
+        "REFERENCES", "IMPLEMENTS", "ENACTED_UNDER", "INTERPRETS",
+        "AMENDED_BY", "HAS_SECTION", "PART_OF"
+    )
+    
     def __init__(self, client: Optional[Neo4jClient] = None):
         """
         Initialize graph service.
@@ -33,6 +62,8 @@ class GraphService:
         """
         self.client = client or get_neo4j_client()
         self._indexes_checked = False
+        # Read the related-document lists materialized by GraphBuilder
+        self.precomputed_related_enabled = os.getenv("GRAPH_PRECOMPUTED_RELATED", "true").lower() == "true"
     
     # ============================================
     # LEGISLATION OPERATIONS
@@ -693,61 +724,6 @@ class GraphService:
     # RAG-SPECIFIC SEARCH OPERATIONS (Tier 3)
     # ============================================
     
-    def _extract_snippet(self, text: str, query_terms: List[str], max_length: int = 500) -> Tuple[str, bool]:
-        """
-        Extract a relevant snippet from text containing query terms.
-        
-        Args:
-            text: Full text to extract from
-            query_terms: List of query terms to highlight
-            max_length: Maximum snippet length
-            
-        Returns:
-            Tuple of (snippet with highlights, found_match)
-        """
-        if not text:
-            return '', False
-        
-        text_lower = text.lower()
-        
-        # Find first occurrence of any query term
-        best_pos = -1
-        matched_term = None
-        
-        for term in query_terms:
-            term_lower = term.lower()
-            pos = text_lower.find(term_lower)
-            if pos != -1 and (best_pos == -1 or pos < best_pos):
-                best_pos = pos
-                matched_term = term
-        
-        if best_pos == -1:
-            # No match found, return beginning
-            snippet = text[:max_length]
-            if len(text) > max_length:
-                snippet += '...'
-            return snippet, False
-        
-        # Extract context around the match
-        start = max(0, best_pos - max_length // 2)
-        end = min(len(text), start + max_length)
-        
-        snippet = text[start:end]
-        
-        # Add ellipsis
-        if start > 0:
-            snippet = '...' + snippet
-        if end < len(text):
-            snippet += '...'
-        
-        # Highlight all query terms
-        for term in query_terms:
-            # Use regex for case-insensitive replacement
-            pattern = re.compile(re.escape(term), re.IGNORECASE)
-            snippet = pattern.sub(lambda m: f'<mark>{m.group(0)}</mark>', snippet)
-        
-        return snippet, True
-    
     def _sanitize_lucene_query(self, query: str) -> str:
         """
         Sanitize query text for Lucene full-text search.
@@ -860,155 +836,294 @@ class GraphService:
                 logger.error(f"Fallback search also failed: {fallback_error}")
                 return []
     
-    def _fulltext_search(
+    async def semantic_search_for_rag_async(
         self,
         query: str,
-        limit: int,
-        language: str
+        limit: int = 20,
+        language: str = 'en'
     ) -> List[Dict[str, Any]]:
         """
-        Perform full-text search using Neo4j indexes.
+        Async variant of semantic_search_for_rag used by the async RAG pipeline.
         
-        Args:
-            query: Search query text
-            limit: Maximum number of results
-            language: Language filter
+        The CONTAINS fallback is a label scan on the sync driver, so it runs
+        in a worker thread.
+        """
+        if not self._indexes_checked:
+            await asyncio.to_thread(self._ensure_fulltext_indexes)
+            self._indexes_checked = True
+        
+        try:
+            results = await self._fulltext_search_async(query, limit, language)
             
-        Returns:
-            List of matching documents
+            if not results:
+                logger.warning(f"Full-text search returned 0 results, trying fallback CONTAINS search")
+                results = await asyncio.to_thread(self._fallback_contains_search, query, limit, language)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Neo4j semantic search failed: {e}")
+            try:
+                return await asyncio.to_thread(self._fallback_contains_search, query, limit, language)
+            except Exception as fallback_error:
+                logger.error(f"Fallback search also failed: {fallback_error}")
+                return []
+    
+    # Characters of each Tier 3 hit returned by Neo4j: a snippet window
+    # around the first query term match, and the opening as wider context
+    FULLTEXT_SNIPPET_CHARS = 1500
+    FULLTEXT_CONTEXT_CHARS = 3000
+    
+    def _fulltext_branches(self) -> List[Tuple[str, str, str, bool]]:
         """
-        # Sanitize query to prevent Lucene syntax errors
-        sanitized_query = self._sanitize_lucene_query(query)
+        Per-index full-text subqueries behind the Tier 3 search.
         
-        leg_results = []
-        reg_results = []
+        Each branch returns the raw body as ``text``; it is only cut down by
+        _fulltext_projection, so whole documents never leave the server.
         
-        # Try searching Legislation nodes (if any exist)
-        try:
-            legislation_query = """
+        Returns:
+            List of (label, index_name, cypher, repair_on_missing_index) tuples.
+            Legislation nodes are optional, so a missing legislation index is
+            not treated as an error.
+        """
+        legislation_branch = """
             CALL db.index.fulltext.queryNodes('legislation_fulltext', $query)
             YIELD node, score
             WHERE node.language = $language OR $language = 'all'
-            RETURN 
+            WITH node, score
+            ORDER BY score DESC
+            LIMIT $limit
+            RETURN
                 node.id as id,
                 node.title as title,
-                node.full_text as content,
-                node.act_number as citation,
+                node.full_text as text,
+                coalesce(node.act_number, '') as citation,
                 '' as section_number,
-                node.jurisdiction as jurisdiction,
+                coalesce(node.jurisdiction, '') as jurisdiction,
                 'legislation' as document_type,
-                score
-            ORDER BY score DESC
-            LIMIT $limit
-            """
-            
-            leg_results = self.client.execute_query(
-                legislation_query,
-                {"query": sanitized_query, "limit": limit // 3, "language": language}
-            )
-        except Exception as e:
-            logger.debug(f"Legislation search returned no results or index missing: {e}")
-            leg_results = []
+                score"""
         
-        # Search Regulation nodes (primary data source)
-        try:
-            regulation_query = """
+        # Regulation nodes are the primary data source
+        regulation_branch = """
             CALL db.index.fulltext.queryNodes('regulation_fulltext', $query)
             YIELD node, score
             WHERE node.language = $language OR $language = 'all'
-            RETURN 
+            WITH node, score
+            ORDER BY score DESC
+            LIMIT $limit
+            RETURN
                 node.id as id,
                 node.title as title,
-                node.full_text as content,
+                node.full_text as text,
                 coalesce(node.act_number, '') as citation,
                 '' as section_number,
                 coalesce(node.jurisdiction, '') as jurisdiction,
                 'regulation' as document_type,
-                score
-            ORDER BY score DESC
-            LIMIT $limit
-            """
-            
-            reg_results = self.client.execute_query(
-                regulation_query,
-                {"query": sanitized_query, "limit": limit // 3, "language": language}
-            )
-        except Exception as e:
-            if "regulation_fulltext" in str(e):
-                logger.error(f"Neo4j regulation search failed: {e}")
-                logger.info("Attempting to create missing fulltext indexes...")
-                if self._ensure_fulltext_indexes():
-                    try:
-                        reg_results = self.client.execute_query(
-                            regulation_query,
-                            {"query": sanitized_query, "limit": limit // 3, "language": language}
-                        )
-                    except Exception as retry_error:
-                        logger.error(f"Regulation search failed after index creation: {retry_error}")
-                        reg_results = []
-                else:
-                    logger.error(f"Failed to create fulltext indexes")
-                    reg_results = []
-            else:
-                logger.error(f"Neo4j regulation search failed: {e}")
-                reg_results = []
+                score"""
         
-        # Search section nodes
-        sec_results = []
-        try:
-            section_query = """
+        section_branch = """
             CALL db.index.fulltext.queryNodes('section_fulltext', $query)
             YIELD node, score
             MATCH (node)-[:HAS_SECTION|PART_OF]-(parent)
             WHERE (parent:Regulation OR parent:Legislation)
             AND (parent.language = $language OR $language = 'all')
-            RETURN 
+            WITH node, score, head(collect(parent)) as parent
+            ORDER BY score DESC
+            LIMIT $limit
+            RETURN
                 node.id as id,
                 node.title as title,
-                node.content as content,
+                node.content as text,
                 coalesce(parent.act_number, '') as citation,
                 node.section_number as section_number,
                 coalesce(parent.jurisdiction, '') as jurisdiction,
                 'section' as document_type,
-                score
-            ORDER BY score DESC
-            LIMIT $limit
-            """
-            
-            sec_results = self.client.execute_query(
-                section_query,
-                {"query": sanitized_query, "limit": limit // 3, "language": language}
-            )
+                score"""
+        
+        return [
+            ('legislation', 'legislation_fulltext', legislation_branch, False),
+            ('regulation', 'regulation_fulltext', regulation_branch, True),
+            ('section', 'section_fulltext', section_branch, False),
+        ]
+    
+    def _fulltext_projection(self, subquery: str, extra_columns: Tuple[str, ...] = ()) -> str:
+        """
+        Rank, cap and trim full-text hits server-side.
+        
+        Finds the first occurrence of any (lowercased) query term and returns
+        a bounded window around it plus the document opening, instead of the
+        full body. ``extra_columns`` are passed through from the subquery.
+        """
+        columns = ", ".join(("id", "title", "citation", "section_number", "jurisdiction",
+                             "document_type", "score") + extra_columns)
+        return f"""
+        CALL {{{subquery}
+        }}
+        WITH {columns},
+             coalesce(text, '') as text
+        ORDER BY score DESC
+        LIMIT $limit
+        WITH *, toLower(text) as lowered
+        WITH *, reduce(pos = -1, term IN $terms |
+            CASE WHEN lowered CONTAINS term AND (pos = -1 OR size(split(lowered, term)[0]) < pos)
+                 THEN size(split(lowered, term)[0]) ELSE pos END) as match_position
+        WITH *, CASE WHEN match_position > $snippet_chars / 2
+                     THEN match_position - $snippet_chars / 2 ELSE 0 END as snippet_start
+        RETURN
+            {columns},
+            substring(text, snippet_start, $snippet_chars) as snippet,
+            snippet_start,
+            match_position,
+            size(text) as text_length,
+            substring(text, 0, $context_chars) as full_content
+        ORDER BY score DESC
+        """
+    
+    def _fulltext_union_cypher(self) -> str:
+        """All full-text indexes in one query, with a single result cap."""
+        return self._fulltext_projection(
+            "\n            UNION ALL".join(branch for _, _, branch, _ in self._fulltext_branches())
+        )
+    
+    def _fulltext_query_specs(self) -> List[Tuple[str, str, str, bool]]:
+        """
+        Per-index Tier 3 queries, used when the unioned query fails.
+        
+        Returns:
+            List of (label, index_name, cypher, repair_on_missing_index) tuples
+        """
+        return [
+            (label, index_name, self._fulltext_projection(branch), repair)
+            for label, index_name, branch, repair in self._fulltext_branches()
+        ]
+    
+    def _fulltext_params(self, sanitized_query: str, limit: int) -> Dict[str, Any]:
+        """Parameters shared by the unioned and per-index full-text queries."""
+        return {
+            "query": sanitized_query,
+            "limit": limit,
+            "terms": [term.lower() for term in self._fulltext_terms(sanitized_query)],
+            "snippet_chars": self.FULLTEXT_SNIPPET_CHARS,
+            "context_chars": self.FULLTEXT_CONTEXT_CHARS,
+        }
+    
+    @staticmethod
+    def _fulltext_terms(sanitized_query: str) -> List[str]:
+        """Query terms of a sanitized Lucene query (used for snippets and highlighting)."""
+        return list(dict.fromkeys(w.strip() for w in sanitized_query.split(' OR ') if w.strip()))
+    
+    def _log_fulltext_error(self, label: str, index_name: str, error: Exception) -> None:
+        """Log a failed full-text query at the level appropriate for its label."""
+        if label == 'legislation':
+            logger.debug(f"Legislation search returned no results or index missing: {error}")
+        elif index_name in str(error) and label == 'section':
+            logger.error(f"Neo4j section search failed: {error}")
+            logger.info("Section fulltext index missing, using fallback search")
+        else:
+            logger.error(f"Neo4j {label} search failed: {error}")
+    
+    def _run_fulltext_query(
+        self,
+        spec: Tuple[str, str, str, bool],
+        params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Run one full-text query, recreating its index once if it is missing."""
+        label, index_name, cypher, repair = spec
+        try:
+            return self.client.execute_query(cypher, params)
         except Exception as e:
-            if "section_fulltext" in str(e):
-                logger.error(f"Neo4j section search failed: {e}")
-                logger.info("Section fulltext index missing, using fallback search")
-                sec_results = []
-            else:
-                logger.error(f"Neo4j section search failed: {e}")
-                sec_results = []
+            self._log_fulltext_error(label, index_name, e)
+            if not (repair and index_name in str(e)):
+                return []
+            logger.info("Attempting to create missing fulltext indexes...")
+            if not self._ensure_fulltext_indexes():
+                logger.error(f"Failed to create fulltext indexes")
+                return []
+            try:
+                return self.client.execute_query(cypher, params)
+            except Exception as retry_error:
+                logger.error(f"{label.capitalize()} search failed after index creation: {retry_error}")
+                return []
+    
+    async def _run_fulltext_query_async(
+        self,
+        spec: Tuple[str, str, str, bool],
+        params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Async variant of _run_fulltext_query."""
+        label, index_name, cypher, repair = spec
+        try:
+            return await self.client.execute_query_async(cypher, params)
+        except Exception as e:
+            self._log_fulltext_error(label, index_name, e)
+            if not (repair and index_name in str(e)):
+                return []
+            logger.info("Attempting to create missing fulltext indexes...")
+            if not await asyncio.to_thread(self._ensure_fulltext_indexes):
+                logger.error(f"Failed to create fulltext indexes")
+                return []
+            try:
+                return await self.client.execute_query_async(cypher, params)
+            except Exception as retry_error:
+                logger.error(f"{label.capitalize()} search failed after index creation: {retry_error}")
+                return []
+    
+    @staticmethod
+    def _highlight_pattern(terms: List[str]) -> Optional["re.Pattern"]:
+        """One alternation over the terms, longest first, so overlapping terms are not marked twice."""
+        terms = sorted(set(terms), key=len, reverse=True)
+        return re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE) if terms else None
+    
+    def _format_snippet(self, row: Dict[str, Any], pattern: Optional["re.Pattern"]) -> Tuple[str, bool]:
+        """
+        Finish a server-side snippet (see _fulltext_projection).
         
-        # Combine and format results with snippets
-        documents = []
+        Returns:
+            Tuple of (snippet with ellipses and highlights, found_match)
+        """
+        snippet = row.get('snippet') or ''
+        has_match = row.get('match_position', -1) >= 0
         
-        # Extract query terms for snippet highlighting
-        query_terms = [w.strip() for w in sanitized_query.split(' OR ') if w.strip()]
+        # Add ellipsis where the window cuts the text
+        start = row.get('snippet_start', 0)
+        if start > 0:
+            snippet = '...' + snippet
+        if start + self.FULLTEXT_SNIPPET_CHARS < row.get('text_length', 0):
+            snippet += '...'
+        
+        # Highlight all query terms
+        if has_match and pattern:
+            snippet = pattern.sub(lambda m: f'<mark>{m.group(0)}</mark>', snippet)
+        return snippet, has_match
+    
+    def _format_fulltext_results(
+        self,
+        results: List[Dict[str, Any]],
+        sanitized_query: str,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Combine server-trimmed full-text rows into scored RAG documents with highlights."""
+        documents = []
+        seen_ids = set()
+        pattern = self._highlight_pattern(self._fulltext_terms(sanitized_query))
         
-        for result in leg_results + reg_results + sec_results:
-            content = result.get('content', '')
+        for result in results:
+            doc_id = result.get('id', '')
+            if doc_id in seen_ids:
+                continue
+            seen_ids.add(doc_id)
             
-            # Generate snippet with highlights
-            snippet, has_match = self._extract_snippet(content, query_terms, max_length=1500)
+            snippet, has_match = self._format_snippet(result, pattern)
             
             # Boost score if snippet contains highlighted match
             base_score = float(result.get('score', 0.0))
             adjusted_score = base_score * 1.2 if has_match else base_score
             
             documents.append({
-                'id': result.get('id', ''),
+                'id': doc_id,
                 'title': result.get('title', ''),
                 'content': snippet,
-                'full_content': content[:3000],  # Keep more context for RAG
+                'full_content': result.get('full_content') or '',  # Keep more context for RAG
                 'citation': result.get('citation', ''),
                 'section_number': result.get('section_number', ''),
                 'jurisdiction': result.get('jurisdiction', ''),
@@ -1024,6 +1139,199 @@ class GraphService:
         logger.info(f"Neo4j full-text search found {len(documents)} documents (avg score: {sum(d['score'] for d in documents) / len(documents) if documents else 0:.4f})")
         return documents
     
+    def _fulltext_search(
+        self,
+        query: str,
+        limit: int,
+        language: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform full-text search over all Neo4j full-text indexes in one query.
+        
+        Falls back to one query per index (which tolerates a missing index)
+        if the unioned query fails.
+        
+        Args:
+            query: Search query text
+            limit: Maximum number of results
+            language: Language filter
+            
+        Returns:
+            List of matching documents
+        """
+        # Sanitize query to prevent Lucene syntax errors
+        sanitized_query = self._sanitize_lucene_query(query)
+        params = {**self._fulltext_params(sanitized_query, limit), "language": language}
+        
+        try:
+            results = self.client.execute_query(self._fulltext_union_cypher(), params)
+        except Exception as e:
+            logger.warning(f"Unioned full-text search failed ({e}), querying indexes separately")
+            results = []
+            for spec in self._fulltext_query_specs():
+                results.extend(self._run_fulltext_query(spec, params))
+        
+        return self._format_fulltext_results(results, sanitized_query, limit)
+    
+    async def _fulltext_search_async(
+        self,
+        query: str,
+        limit: int,
+        language: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Async full-text search; one unioned query, or concurrent per-index
+        queries if that fails.
+        
+        Args:
+            query: Search query text
+            limit: Maximum number of results
+            language: Language filter
+            
+        Returns:
+            List of matching documents
+        """
+        sanitized_query = self._sanitize_lucene_query(query)
+        params = {**self._fulltext_params(sanitized_query, limit), "language": language}
+        
+        try:
+            results = await self.client.execute_query_async(self._fulltext_union_cypher(), params)
+        except Exception as e:
+            logger.warning(f"Unioned full-text search failed ({e}), querying indexes separately")
+            per_label = await asyncio.gather(*(
+                self._run_fulltext_query_async(spec, params)
+                for spec in self._fulltext_query_specs()
+            ))
+            results = [row for rows in per_label for row in rows]
+        
+        return self._format_fulltext_results(results, sanitized_query, limit)
+    
+    # Typo-tolerant matching: per-field fuzzy Lucene queries on the full-text
+    # indexes, as (index name, body property) pairs
+    FUZZY_INDEXES = (
+        ('legislation_fulltext', 'full_text'),
+        ('regulation_fulltext', 'full_text'),
+        ('section_fulltext', 'content'),
+    )
+    # Index hits considered per term, field and index
+    FUZZY_CANDIDATES_PER_TERM = 200
+    
+    @staticmethod
+    def _fuzzy_lucene_term(term: str) -> str:
+        """Escape a term for Lucene and allow edits in proportion to its length."""
+        escaped = re.sub(r'([+\-&|!(){}\[\]^"~*?:\\/])', r'\\\1', term)
+        if len(term) >= 8:
+            return f"{escaped}~2"
+        if len(term) >= 4:
+            return f"{escaped}~1"
+        return escaped
+    
+    def _fuzzy_search_cypher(self) -> str:
+        """
+        Index-backed similarity query over Legislation, Regulation and Section nodes.
+        
+        Every term is looked up as a fuzzy query against the title and body
+        fields of each full-text index; a node's title_matches and
+        content_matches are the number of distinct terms that hit each field,
+        scored (3 * title + content) / terms as before. No node text is
+        scanned; only the final hits are trimmed by _fulltext_projection.
+        """
+        branches = []
+        for index_name, body_property in self.FUZZY_INDEXES:
+            for field, prop in (('title', 'title'), ('content', body_property)):
+                branches.append(f"""
+                WITH t
+                CALL db.index.fulltext.queryNodes('{index_name}', '{prop}:(' + t.lucene + ')')
+                YIELD node, score
+                WITH node, score
+                ORDER BY score DESC
+                LIMIT $candidates
+                RETURN node, '{field}' as field""")
+        union = "\n                UNION ALL".join(branches)
+        
+        subquery = f"""
+            UNWIND $fuzzy_terms AS t
+            CALL {{{union}
+            }}
+            WITH node, t.term as term, field
+            WITH node,
+                 count(DISTINCT CASE WHEN field = 'title' THEN term END) as title_count,
+                 count(DISTINCT CASE WHEN field = 'content' THEN term END) as content_count
+            WITH node, title_count, content_count,
+                 (toFloat(title_count) * 3.0 + toFloat(content_count)) / toFloat(size($fuzzy_terms)) as similarity
+            WHERE similarity >= $min_sim
+            
+            // Sections take their language, citation and jurisdiction from the parent document
+            OPTIONAL MATCH (node:Section)-[:HAS_SECTION|PART_OF]-(parent)
+            WHERE parent:Regulation OR parent:Legislation
+            WITH node, title_count, content_count, similarity, head(collect(parent)) as parent
+            WITH node, title_count, content_count, similarity,
+                 CASE WHEN node:Section THEN parent ELSE node END as owner
+            WHERE owner IS NOT NULL AND (owner.language = $language OR $language = 'all')
+            RETURN
+                node.id as id,
+                coalesce(node.title, node.section_number) as title,
+                coalesce(node.full_text, node.content) as text,
+                coalesce(owner.act_number, '') as citation,
+                coalesce(node.section_number, '') as section_number,
+                coalesce(owner.jurisdiction, '') as jurisdiction,
+                toLower(labels(node)[0]) as document_type,
+                similarity as score,
+                title_count as title_matches,
+                content_count as content_matches"""
+        return self._fulltext_projection(subquery, ('title_matches', 'content_matches'))
+    
+    def _fuzzy_search(
+        self,
+        terms: List[str],
+        limit: int,
+        language: str,
+        min_similarity: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Run the index-backed similarity query and format its hits.
+        
+        Raises:
+            Exception: If the query fails (e.g. a full-text index is missing)
+        """
+        if not self._indexes_checked:
+            self._ensure_fulltext_indexes()
+            self._indexes_checked = True
+        
+        results = self.client.execute_query(
+            self._fuzzy_search_cypher(),
+            {
+                'fuzzy_terms': [{'term': term, 'lucene': self._fuzzy_lucene_term(term)} for term in terms],
+                'terms': terms,
+                'limit': limit,
+                'language': language,
+                'min_sim': min_similarity,
+                'candidates': self.FUZZY_CANDIDATES_PER_TERM,
+                'snippet_chars': self.FULLTEXT_SNIPPET_CHARS,
+                'context_chars': self.FULLTEXT_CONTEXT_CHARS,
+            }
+        )
+        
+        pattern = self._highlight_pattern(terms)
+        documents = []
+        for result in results:
+            snippet, _ = self._format_snippet(result, pattern)
+            documents.append({
+                'id': result.get('id', ''),
+                'title': result.get('title', ''),
+                'content': snippet,
+                'full_content': result.get('full_content') or '',
+                'citation': result.get('citation', ''),
+                'section_number': result.get('section_number', ''),
+                'jurisdiction': result.get('jurisdiction', ''),
+                'document_type': result.get('document_type', ''),
+                'score': float(result.get('score', 0.0)),
+                'similarity_type': 'fuzzy',
+                'title_matches': result.get('title_matches', 0),
+                'content_matches': result.get('content_matches', 0)
+            })
+        return documents
+    
     def _fallback_contains_search(
         self,
         query: str,
@@ -1031,10 +1339,11 @@ class GraphService:
         language: str
     ) -> List[Dict[str, Any]]:
         """
-        Fallback search using simple CONTAINS matching.
+        Fallback search when full-text search fails or returns no results.
         
-        This is used when full-text search fails or returns no results.
-        It is less sophisticated but more reliable.
+        Runs the index-backed fuzzy engine (typo tolerant, any term may
+        match). Only if that fails too, e.g. because the full-text indexes
+        are missing, does it scan nodes with CONTAINS matching.
         
         Args:
             query: Search query text
@@ -1073,6 +1382,36 @@ class GraphService:
             logger.warning(f"No search terms extracted from query: '{query}'")
             return []
         
+        terms = list(dict.fromkeys(
+            cleaned for cleaned in (re.sub(r'[^\w-]', '', term.lower()) for term in search_terms) if cleaned
+        ))
+        if terms:
+            try:
+                documents = self._fuzzy_search(terms, limit, language, min_similarity=0.0)
+                logger.info(f"Fallback fuzzy index search found {len(documents)} documents for terms: {terms}")
+                return documents
+            except Exception as e:
+                logger.warning(f"Fuzzy index search failed ({e}), falling back to CONTAINS scan")
+        
+        return self._contains_scan_search(search_terms, limit, language)
+    
+    def _contains_scan_search(
+        self,
+        search_terms: List[str],
+        limit: int,
+        language: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Last-resort search using simple CONTAINS matching (a full label scan).
+        
+        Args:
+            search_terms: Terms to match
+            limit: Maximum number of results
+            language: Language filter
+            
+        Returns:
+            List of matching documents
+        """
         logger.info(f"Fallback CONTAINS search with terms: {search_terms}")
         
         # Build CONTAINS query for each term
@@ -1169,11 +1508,12 @@ class GraphService:
         min_similarity: float = 0.3
     ) -> List[Dict[str, Any]]:
         """
-        Fuzzy similarity search using Levenshtein distance approximation.
+        Typo-tolerant similarity search backed by the full-text indexes.
         
         This is useful for typo-tolerant search when full-text search fails.
-        Uses case-insensitive CONTAINS matching with scoring based on
-        match position and frequency.
+        Each term is matched as a fuzzy Lucene query (edit distance 1 for
+        terms of 4-7 characters, 2 from 8) against titles and bodies; documents
+        are scored by how many terms hit the title (weighted 3x) and body.
         
         Args:
             query: Search query text
@@ -1186,7 +1526,9 @@ class GraphService:
         """
         # Extract search terms
         query_lower = query.lower()
-        terms = [t.strip() for t in query_lower.split() if len(t.strip()) > 2]
+        terms = list(dict.fromkeys(
+            cleaned for cleaned in (re.sub(r'[^\w-]', '', t) for t in query_lower.split()) if len(cleaned) > 2
+        ))
         
         if not terms:
             logger.warning(f"No valid search terms for similarity search: '{query}'")
@@ -1194,100 +1536,8 @@ class GraphService:
         
         logger.info(f"Similarity search for terms: {terms}")
         
-        # Build similarity query
-        # Score based on: title match (high), content match (medium), term frequency
-        similarity_query = """
-        WITH $terms AS search_terms, $min_sim AS min_similarity, $language AS lang
-        
-        // Search in Regulations (primary data source)
-        MATCH (r:Regulation)
-        WHERE r.language = lang OR lang = 'all'
-        WITH r, search_terms, min_similarity,
-            size([term IN search_terms WHERE toLower(r.title) CONTAINS term]) AS title_count,
-            size([term IN search_terms WHERE toLower(coalesce(r.full_text, '')) CONTAINS term]) AS content_count,
-            size(search_terms) AS total_terms
-        WHERE (title_count + content_count) > 0
-        WITH r,
-            (toFloat(title_count) * 3.0 + toFloat(content_count)) / toFloat(total_terms) AS similarity,
-            title_count, content_count
-        WHERE similarity >= min_similarity
-        
-        RETURN
-            r.id as id,
-            r.title as title,
-            r.full_text as content,
-            coalesce(r.act_number, '') as citation,
-            '' as section_number,
-            coalesce(r.jurisdiction, '') as jurisdiction,
-            'regulation' as document_type,
-            similarity as score,
-            title_count as title_matches,
-            content_count as content_matches
-        
-        UNION ALL
-        
-        // Search in Sections
-        MATCH (s:Section)-[:HAS_SECTION|PART_OF]-(parent)
-        WHERE (parent:Regulation OR parent:Legislation)
-        AND (parent.language = $language OR $language = 'all')
-        WITH s, parent, $terms AS search_terms, $min_sim AS min_similarity,
-            size([term IN $terms WHERE toLower(coalesce(s.title, '')) CONTAINS term]) AS title_count,
-            size([term IN $terms WHERE toLower(coalesce(s.content, '')) CONTAINS term]) AS content_count,
-            size($terms) AS total_terms
-        WHERE (title_count + content_count) > 0
-        WITH s, parent,
-            (toFloat(title_count) * 3.0 + toFloat(content_count)) / toFloat(total_terms) AS similarity,
-            title_count, content_count
-        WHERE similarity >= min_similarity
-        
-        RETURN
-            s.id as id,
-            coalesce(s.title, s.section_number) as title,
-            s.content as content,
-            coalesce(parent.act_number, '') as citation,
-            s.section_number as section_number,
-            coalesce(parent.jurisdiction, '') as jurisdiction,
-            'section' as document_type,
-            similarity as score,
-            title_count as title_matches,
-            content_count as content_matches
-        
-        ORDER BY score DESC
-        LIMIT $limit
-        """
-        
         try:
-            results = self.client.execute_query(
-                similarity_query,
-                {
-                    'terms': terms,
-                    'limit': limit,
-                    'language': language,
-                    'min_sim': min_similarity
-                }
-            )
-            
-            # Format results with snippets
-            documents = []
-            for result in results:
-                content = result.get('content', '')
-                snippet, has_match = self._extract_snippet(content, terms, max_length=1500)
-                
-                documents.append({
-                    'id': result.get('id', ''),
-                    'title': result.get('title', ''),
-                    'content': snippet,
-                    'full_content': content[:3000],
-                    'citation': result.get('citation', ''),
-                    'section_number': result.get('section_number', ''),
-                    'jurisdiction': result.get('jurisdiction', ''),
-                    'document_type': result.get('document_type', ''),
-                    'score': float(result.get('score', 0.0)),
-                    'similarity_type': 'fuzzy',
-                    'title_matches': result.get('title_matches', 0),
-                    'content_matches': result.get('content_matches', 0)
-                })
-            
+            documents = self._fuzzy_search(terms, limit, language, min_similarity)
             logger.info(f"Similarity search found {len(documents)} documents (min_similarity={min_similarity})")
             return documents
             
@@ -1295,6 +1545,66 @@ class GraphService:
             logger.error(f"Neo4j similarity search failed: {e}")
             return []
     
+    def _traversal_cypher(self, max_depth: int) -> str:
+        """Seed full-text lookup followed by a variable-length traversal."""
+        return f"""
+        CALL db.index.fulltext.queryNodes('legislation_fulltext', $query)
+        YIELD node, score
+        WITH node, score
+        ORDER BY score DESC
+        LIMIT 5
+        
+        // Traverse relationships to find related nodes
+        MATCH path = (node)-[*1..{max_depth}]-(related)
+        WHERE related:Legislation OR related:Section OR related:Regulation
+        
+        RETURN DISTINCT
+            related.id as id,
+            related.title as title,
+            substring(COALESCE(related.full_text, related.content, ''), 0, 1500) as content,
+            COALESCE(related.act_number, '') as citation,
+            COALESCE(related.section_number, '') as section_number,
+            COALESCE(related.jurisdiction, '') as jurisdiction,
+            labels(related)[0] as document_type,
+            length(path) as depth,
+            score as seed_score
+        ORDER BY depth ASC, seed_score DESC
+        LIMIT $limit
+        """
+    
+    def _format_traversal_results(
+        self,
+        results: List[Dict[str, Any]],
+        max_depth: int
+    ) -> List[Dict[str, Any]]:
+        """Format traversal rows, scoring closer documents higher."""
+        documents = []
+        for result in results:
+            # Calculate relevance score (closer = higher score)
+            depth = result.get('depth', max_depth)
+            seed_score = result.get('seed_score', 0.0)
+            relevance_score = seed_score * (1.0 / (depth + 1))
+            
+            documents.append({
+                'id': result.get('id', ''),
+                'title': result.get('title', ''),
+                'content': (result.get('content') or '')[:1500],
+                'citation': result.get('citation', ''),
+                'section_number': result.get('section_number', ''),
+                'jurisdiction': result.get('jurisdiction', ''),
+                'document_type': result.get('document_type', '').lower(),
+                'score': relevance_score,
+                'traversal_depth': depth
+            })
+        
+        logger.info(f"Neo4j traversal found {len(documents)} related documents")
+        return documents
+    
+    @staticmethod
+    def _precomputed_traversal_params(query: str, max_depth: int, limit: int) -> Dict[str, Any]:
+        """Parameters for _precomputed_traversal_cypher."""
+        return {"query": query, "exclude_ids": [], "limit": limit, "max_depth": max_depth}
+    
     def find_related_documents_by_traversal(
         self,
         seed_query: str,
@@ -1304,9 +1614,11 @@ class GraphService:
         """
         Find related documents by traversing graph relationships.
         
-        This method starts with a seed search, then traverses relationships
-        (REFERENCES, IMPLEMENTS, HAS_SECTION) to find connected documents.
-        Useful when direct text search fails but there are related documents.
+        This method starts with a seed search, then reads the seeds'
+        related-document lists materialized by GraphBuilder. Seeds without a
+        list fall back to traversing relationships (REFERENCES, IMPLEMENTS,
+        HAS_SECTION) live. Useful when direct text search fails but there are
+        related documents.
         
         Args:
             seed_query: Initial search query to find seed nodes
@@ -1320,62 +1632,304 @@ class GraphService:
             # Sanitize query to prevent Lucene syntax errors
             sanitized_query = self._sanitize_lucene_query(seed_query)
             
-            # First, find seed nodes using full-text search
-            seed_query_cypher = f"""
-            CALL db.index.fulltext.queryNodes('legislation_fulltext', $query)
-            YIELD node, score
-            WITH node, score
-            ORDER BY score DESC
-            LIMIT 5
+            results = []
+            if self.precomputed_related_enabled:
+                results = self.client.execute_query(
+                    self._precomputed_traversal_cypher(),
+                    self._precomputed_traversal_params(sanitized_query, max_depth, limit)
+                )
+            if not results:
+                results = self.client.execute_query(
+                    self._traversal_cypher(max_depth),
+                    {"query": sanitized_query, "limit": limit}
+                )
+            return self._format_traversal_results(results, max_depth)
             
-            // Traverse relationships to find related nodes
-            MATCH path = (node)-[*1..{max_depth}]-(related)
-            WHERE related:Legislation OR related:Section OR related:Regulation
+        except Exception as e:
+            logger.error(f"Neo4j relationship traversal failed: {e}")
+            return []
+    
+    async def find_related_documents_by_traversal_async(
+        self,
+        seed_query: str,
+        max_depth: int = 2,
+        limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """Async variant of find_related_documents_by_traversal."""
+        try:
+            sanitized_query = self._sanitize_lucene_query(seed_query)
             
-            RETURN DISTINCT
-                related.id as id,
-                related.title as title,
-                COALESCE(related.full_text, related.content) as content,
-                COALESCE(related.act_number, '') as citation,
-                COALESCE(related.section_number, '') as section_number,
-                COALESCE(related.jurisdiction, '') as jurisdiction,
-                labels(related)[0] as document_type,
-                length(path) as depth,
-                score as seed_score
-            ORDER BY depth ASC, seed_score DESC
-            LIMIT $limit
-            """
+            results = []
+            if self.precomputed_related_enabled:
+                results = await self.client.execute_query_async(
+                    self._precomputed_traversal_cypher(),
+                    self._precomputed_traversal_params(sanitized_query, max_depth, limit)
+                )
+            if not results:
+                results = await self.client.execute_query_async(
+                    self._traversal_cypher(max_depth),
+                    {"query": sanitized_query, "limit": limit}
+                )
+            return self._format_traversal_results(results, max_depth)
             
+        except Exception as e:
+            logger.error(f"Neo4j relationship traversal failed: {e}")
+            return []
+    
+    def _expand_neighbors_cypher(self, rel_types: Tuple[str, ...], depth: int) -> str:
+        """
+        ID-anchored neighbourhood expansion for a list of seed document IDs.
+        
+        Seeds are looked up through the per-label id uniqueness constraints
+        (no full-text query); neighbours reached from several seeds are
+        aggregated into one row, weighted by seed rank and hop count.
+        """
+        rel_pattern = "|".join(rel_types)
+        return f"""
+        UNWIND range(0, size($ids) - 1) AS seed_rank
+        WITH seed_rank, $ids[seed_rank] AS seed_id
+        {match_document_by_id('seed', 'seed_id')}
+        MATCH path = (seed)-[:{rel_pattern}*1..{depth}]-(related)
+        WHERE (related:Legislation OR related:Section OR related:Regulation)
+          AND NOT related.id IN $ids
+        
+        // One row per (neighbour, seed) at its shortest distance
+        WITH related, seed_rank, min(length(path)) AS hops,
+             collect(DISTINCT type(last(relationships(path)))) AS hop_types
+        
+        // One row per neighbour, scored across all seeds that reach it
+        WITH related,
+             sum(1.0 / ((seed_rank + 1) * hops)) AS graph_score,
+             min(hops) AS depth,
+             count(*) AS seed_count,
+             reduce(types = [], seed_types IN collect(hop_types) |
+                    types + [t IN seed_types WHERE NOT t IN types]) AS relationship_types
+        
+        RETURN
+            related.id as id,
+            related.title as title,
+            substring(COALESCE(related.full_text, related.content, ''), 0, 1500) as content,
+            COALESCE(related.act_number, '') as citation,
+            COALESCE(related.section_number, '') as section_number,
+            COALESCE(related.jurisdiction, '') as jurisdiction,
+            labels(related)[0] as document_type,
+            depth,
+            graph_score,
+            seed_count,
+            relationship_types
+        ORDER BY graph_score DESC, depth ASC
+        LIMIT $limit
+        """
+    
+    def _expand_neighbors_params(
+        self,
+        rel_types: Optional[List[str]],
+        depth: int
+    ) -> Tuple[Tuple[str, ...], int]:
+        """Validate relationship types (interpolated into the pattern) and clamp depth."""
+        types = tuple(rel_types or self.DOCUMENT_RELATIONSHIP_TYPES)
+        invalid = [t for t in types if not re.fullmatch(r'[A-Z][A-Z0-9_]*', t)]
+        if invalid:
+            raise ValueError(f"Invalid relationship types: {invalid}")
+        return types, max(1, min(depth, 3))
+    
+    def _format_neighbor_results(
+        self,
+        results: List[Dict[str, Any]],
+        num_seeds: int
+    ) -> List[Dict[str, Any]]:
+        """Format expansion rows; scores are normalised to 0-1 by the total seed weight."""
+        max_score = sum(1.0 / rank for rank in range(1, num_seeds + 1)) or 1.0
+        documents = []
+        for result in results:
+            documents.append({
+                'id': result.get('id', ''),
+                'title': result.get('title', ''),
+                'content': (result.get('content') or '')[:1500],
+                'citation': result.get('citation', ''),
+                'section_number': result.get('section_number', ''),
+                'jurisdiction': result.get('jurisdiction', ''),
+                'document_type': (result.get('document_type') or '').lower(),
+                'score': result.get('graph_score', 0.0) / max_score,
+                'traversal_depth': result.get('depth', 1),
+                'seed_count': result.get('seed_count', 1),
+                'relationship_types': result.get('relationship_types') or []
+            })
+        
+        logger.info(f"Neo4j expansion found {len(documents)} neighbours of {num_seeds} seeds")
+        return documents
+    
+    def expand_neighbors(
+        self,
+        ids: List[str],
+        rel_types: Optional[List[str]] = None,
+        depth: int = 1,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Find documents connected to known document IDs in a single query.
+        
+        Seeds are matched by their indexed ``id`` (Legislation, Regulation or
+        Section); neighbours are deduplicated and ranked server-side, favouring
+        documents close to several high-ranked seeds. Seed documents
+        themselves are never returned.
+        
+        Args:
+            ids: Seed document IDs, most relevant first
+            rel_types: Relationship types to follow (default: DOCUMENT_RELATIONSHIP_TYPES)
+            depth: Maximum hops from a seed (1-3)
+            limit: Maximum number of neighbours
+        
+        Returns:
+            Neighbour documents in traversal result format, plus seed_count and
+            relationship_types
+        """
+        if not ids:
+            return []
+        try:
+            types, depth = self._expand_neighbors_params(rel_types, depth)
             results = self.client.execute_query(
-                seed_query_cypher,
-                {"query": sanitized_query, "limit": limit}
+                self._expand_neighbors_cypher(types, depth),
+                {"ids": list(ids), "limit": limit}
             )
+            return self._format_neighbor_results(results, len(ids))
             
-            # Format results
-            documents = []
-            for result in results:
-                # Calculate relevance score (closer = higher score)
-                depth = result.get('depth', max_depth)
-                seed_score = result.get('seed_score', 0.0)
-                relevance_score = seed_score * (1.0 / (depth + 1))
-                
-                documents.append({
-                    'id': result.get('id', ''),
-                    'title': result.get('title', ''),
-                    'content': (result.get('content') or '')[:1500],
-                    'citation': result.get('citation', ''),
-                    'section_number': result.get('section_number', ''),
-                    'jurisdiction': result.get('jurisdiction', ''),
-                    'document_type': result.get('document_type', '').lower(),
-                    'score': relevance_score,
-                    'traversal_depth': depth
-                })
+        except Exception as e:
+            logger.error(f"Neo4j neighbour expansion failed: {e}")
+            return []
+    
+    async def expand_neighbors_async(
+        self,
+        ids: List[str],
+        rel_types: Optional[List[str]] = None,
+        depth: int = 1,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Async variant of expand_neighbors."""
+        if not ids:
+            return []
+        try:
+            types, depth = self._expand_neighbors_params(rel_types, depth)
+            results = await self.client.execute_query_async(
+                self._expand_neighbors_cypher(types, depth),
+                {"ids": list(ids), "limit": limit}
+            )
+            return self._format_neighbor_results(results, len(ids))
             
-            logger.info(f"Neo4j traversal found {len(documents)} related documents")
-            return documents
+        except Exception as e:
+            logger.error(f"Neo4j neighbour expansion failed: {e}")
+            return []
+    
+    def _precomputed_neighbors_cypher(self, seed_clause: str) -> str:
+        """
+        Aggregate the related-document lists materialized by GraphBuilder.
+        
+        ``seed_clause`` binds ``seed`` and a numeric ``seed_weight``; each
+        precomputed entry contributes seed_weight * its stored score.
+        """
+        return f"""
+        {seed_clause}
+        WITH seed, seed_weight
+        WHERE seed.related_ids IS NOT NULL
+        UNWIND range(0, size(seed.related_ids) - 1) AS i
+        WITH seed_weight,
+             seed.related_ids[i] AS related_id,
+             seed.related_types[i] AS rel_type,
+             seed.related_depths[i] AS hops,
+             seed.related_scores[i] AS related_score
+        WHERE hops <= $max_depth AND NOT related_id IN $exclude_ids
+        WITH related_id,
+             sum(seed_weight * related_score) AS graph_score,
+             min(hops) AS depth,
+             count(*) AS seed_count,
+             collect(DISTINCT rel_type) AS relationship_types
+        ORDER BY graph_score DESC, depth ASC
+        LIMIT $limit
+        {match_document_by_id('related', 'related_id')}
+        RETURN
+            related.id as id,
+            related.title as title,
+            substring(COALESCE(related.full_text, related.content, ''), 0, 1500) as content,
+            COALESCE(related.act_number, '') as citation,
+            COALESCE(related.section_number, '') as section_number,
+            COALESCE(related.jurisdiction, '') as jurisdiction,
+            labels(related)[0] as document_type,
+            depth,
+            graph_score,
+            graph_score as seed_score,
+            seed_count,
+            relationship_types
+        ORDER BY graph_score DESC, depth ASC
+        """
+    
+    def _precomputed_by_id_cypher(self) -> str:
+        """Precomputed neighbours of known document IDs, weighted by seed rank."""
+        return self._precomputed_neighbors_cypher(f"""UNWIND range(0, size($ids) - 1) AS seed_rank
+        WITH seed_rank, $ids[seed_rank] AS seed_id
+        {match_document_by_id('seed', 'seed_id')}
+        WITH seed, 1.0 / (seed_rank + 1) AS seed_weight""")
+    
+    def _precomputed_traversal_cypher(self) -> str:
+        """Precomputed neighbours of the top full-text matches, weighted by match score."""
+        return self._precomputed_neighbors_cypher("""CALL db.index.fulltext.queryNodes('legislation_fulltext', $query)
+        YIELD node, score
+        WITH node AS seed, score AS seed_weight
+        ORDER BY seed_weight DESC
+        LIMIT 5""")
+    
+    def find_precomputed_neighbors(
+        self,
+        ids: List[str],
+        limit: int = 10,
+        max_depth: int = 2
+    ) -> List[Dict[str, Any]]:
+        """
+        Read the materialized related-document lists of known document IDs.
+        
+        Same ranking and result format as expand_neighbors, without any
+        traversal at query time. Returns an empty list when the seeds have no
+        materialized lists (or the feature is disabled), so callers can fall
+        back to expand_neighbors.
+        
+        Args:
+            ids: Seed document IDs, most relevant first
+            limit: Maximum number of neighbours
+            max_depth: Maximum precomputed hop count to include
+        
+        Returns:
+            Neighbour documents in expand_neighbors format
+        """
+        if not ids or not self.precomputed_related_enabled:
+            return []
+        try:
+            results = self.client.execute_query(
+                self._precomputed_by_id_cypher(),
+                {"ids": list(ids), "exclude_ids": list(ids), "limit": limit, "max_depth": max_depth}
+            )
+            return self._format_neighbor_results(results, len(ids))
             
         except Exception as e:
-            logger.error(f"Neo4j relationship traversal failed: {e}")
+            logger.error(f"Neo4j precomputed neighbour lookup failed: {e}")
+            return []
+    
+    async def find_precomputed_neighbors_async(
+        self,
+        ids: List[str],
+        limit: int = 10,
+        max_depth: int = 2
+    ) -> List[Dict[str, Any]]:
+        """Async variant of find_precomputed_neighbors."""
+        if not ids or not self.precomputed_related_enabled:
+            return []
+        try:
+            results = await self.client.execute_query_async(
+                self._precomputed_by_id_cypher(),
+                {"ids": list(ids), "exclude_ids": list(ids), "limit": limit, "max_depth": max_depth}
+            )
+            return self._format_neighbor_results(results, len(ids))
+            
+        except Exception as e:
+            logger.error(f"Neo4j precomputed neighbour lookup failed: {e}")
             return []
     
     # ============================================
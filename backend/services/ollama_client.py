@@ -12,9 +12,11 @@ import os
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Union, Tuple
 from datetime import datetime
 from dataclasses import dataclass
+import asyncio
+import httpx
 import requests
 
 # Configure logging
@@ -50,8 +52,15 @@ class OllamaClient:
         self.model_name = model_name or os.getenv("OLLAMA_MODEL", "llama3.2:3b")
         self._session = requests.Session()
         self._session.timeout = 30
+        self._async_client: Optional[httpx.AsyncClient] = None  # Lazy load
         self.available = self._check_availability()
 
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lazy load the shared httpx client used by the async methods"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(base_url=self.host, timeout=30)
+        return self._async_client
+
     def _check_availability(self) -> bool:
         """Internal method to check if Ollama is available"""
         return self.is_available()
@@ -68,6 +77,46 @@ class OllamaClient:
             logger.debug(f"Ollama availability check failed: {e}")
             return False
 
+    def _build_generate_payload(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """Build the request body for the api/generate endpoint"""
+        data = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": stream,  # Only generate_stream asks Ollama for incremental chunks
+            "options": {
+                "temperature": temperature,
+            }
+        }
+
+        if max_tokens:
+            data["options"]["num_predict"] = max_tokens
+
+        return data
+
+    def _build_context_prompt(
+        self,
+        query: str,
+        context: Union[str, List[str]],
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """Build the full prompt for a context-grounded generation"""
+        # Prepare context string
+        if isinstance(context, list):
+            context_str = "\n\n".join(context)
+        else:
+            context_str = context
+
+        # Build prompt with context
+        if system_prompt:
+            return f"{system_prompt}\n\nContext:\n{context_str}\n\nQuery: {query}\n\nAnswer:"
+        return f"Context:\n{context_str}\n\nQuery: {query}\n\nAnswer:"
+
     def _make_request(
         self, 
         endpoint: str, 
@@ -148,18 +197,7 @@ class OllamaClient:
                 retry_after_seconds=10
             )
 
-        # Prepare request data
-        data = {
-            "model": self.model_name,
-            "prompt": prompt,
-            "stream": False,  # Always use non-streaming for simplicity
-            "options": {
-                "temperature": temperature,
-            }
-        }
-        
-        if max_tokens:
-            data["options"]["num_predict"] = max_tokens
+        data = self._build_generate_payload(prompt, temperature, max_tokens)
 
         # Retry logic
         for attempt in range(max_retries):
@@ -202,18 +240,7 @@ class OllamaClient:
         max_retries: int = 3
     ) -> Tuple[Optional[str], Optional[LLMError]]:
         """Generate with context (used by RAG service)"""
-        
-        # Prepare context string
-        if isinstance(context, list):
-            context_str = "\n\n".join(context)
-        else:
-            context_str = context
-
-        # Build prompt with context
-        if system_prompt:
-            full_prompt = f"{system_prompt}\n\nContext:\n{context_str}\n\nQuery: {query}\n\nAnswer:"
-        else:
-            full_prompt = f"Context:\n{context_str}\n\nQuery: {query}\n\nAnswer:"
+        full_prompt = self._build_context_prompt(query, context, system_prompt)
 
         return self.generate_content(
             prompt=full_prompt,
@@ -222,6 +249,224 @@ class OllamaClient:
             max_retries=max_retries
         )
 
+    # ============================================
+    # ASYNC API (used by async FastAPI routes)
+    # ============================================
+
+    async def is_available_async(self) -> bool:
+        """Check if Ollama is running and model is available without blocking the event loop"""
+        try:
+            response = await self._get_async_client().get("/api/tags", timeout=5)
+            if response.status_code == 200:
+                models = response.json().get('models', [])
+                return any(m['name'] == self.model_name for m in models)
+            return False
+        except Exception as e:
+            logger.debug(f"Ollama availability check failed: {e}")
+            return False
+
+    async def _stream_request_async(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        timeout: int = 30
+    ) -> AsyncIterator[Union[str, LLMError]]:
+        """
+        Read Ollama's NDJSON response line by line and yield each text chunk.
+
+        A failure is reported by yielding a single LLMError as the last item.
+        """
+        try:
+            client = self._get_async_client()
+            async with client.stream("POST", f"/{endpoint}", json=data, timeout=timeout) as response:
+                if response.status_code != 200:
+                    body = await response.aread()
+                    error_msg = f"HTTP {response.status_code}: {body.decode('utf-8', errors='replace')}"
+                    yield LLMError(
+                        error_type="network",
+                        message=f"Ollama API request failed: {error_msg}",
+                        is_retryable=True,
+                        original_error=error_msg
+                    )
+                    return
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if chunk.get('response'):
+                        yield chunk['response']
+                    if chunk.get('done', False):
+                        break
+
+        except httpx.TimeoutException:
+            yield LLMError(
+                error_type="network",
+                message="Request to Ollama API timed out",
+                is_retryable=True,
+                retry_after_seconds=5
+            )
+        except httpx.ConnectError:
+            yield LLMError(
+                error_type="network",
+                message="Could not connect to Ollama API. Is Ollama running?",
+                is_retryable=True,
+                retry_after_seconds=10
+            )
+        except Exception as e:
+            yield LLMError(
+                error_type="unknown",
+                message=f"Unexpected error: {str(e)}",
+                is_retryable=False,
+                original_error=str(e)
+            )
+
+    async def _make_request_async(
+        self,
+        endpoint: str,
+        data: Dict[str, Any],
+        timeout: int = 30
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[LLMError]]:
+        """Async counterpart of _make_request using httpx"""
+        parts = []
+        async for item in self._stream_request_async(endpoint, data, timeout):
+            if isinstance(item, LLMError):
+                return None, item
+            parts.append(item)
+        return {'response': "".join(parts)}, None
+
+    async def generate_content_async(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3,
+        **kwargs
+    ) -> Tuple[Optional[str], Optional[LLMError]]:
+        """Generate content using Ollama API without blocking the event loop"""
+
+        if not await self.is_available_async():
+            return None, LLMError(
+                error_type="network",
+                message="Ollama service is not available",
+                is_retryable=True,
+                retry_after_seconds=10
+            )
+
+        data = self._build_generate_payload(prompt, temperature, max_tokens)
+
+        error = None
+        for attempt in range(max_retries):
+            response_data, error = await self._make_request_async("api/generate", data)
+
+            if error is None and response_data:
+                return response_data.get('response'), None
+            if error and error.is_retryable and attempt < max_retries - 1:
+                delay = error.retry_after_seconds or (2 ** attempt)
+                logger.warning(f"Ollama request failed (attempt {attempt + 1}/{max_retries}), retrying in {delay}s: {error.message}")
+                await asyncio.sleep(delay)
+                continue
+            return None, error
+
+        return None, error or LLMError(
+            error_type="unknown",
+            message="Max retries exceeded",
+            is_retryable=False
+        )
+
+    async def generate_with_context_async(
+        self,
+        query: str,
+        context: Union[str, List[str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3
+    ) -> Tuple[Optional[str], Optional[LLMError]]:
+        """Async counterpart of generate_with_context (used by the async RAG path)"""
+        full_prompt = self._build_context_prompt(query, context, system_prompt)
+
+        return await self.generate_content_async(
+            prompt=full_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_retries=max_retries
+        )
+
+    async def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3,
+        **kwargs
+    ) -> AsyncIterator[Union[str, LLMError]]:
+        """
+        Stream generated text chunks as Ollama produces them.
+
+        Yields str chunks. A failure is reported by yielding a single LLMError
+        as the last item; retries only happen before the first chunk is sent.
+        """
+        if not await self.is_available_async():
+            yield LLMError(
+                error_type="network",
+                message="Ollama service is not available",
+                is_retryable=True,
+                retry_after_seconds=10
+            )
+            return
+
+        data = self._build_generate_payload(prompt, temperature, max_tokens, stream=True)
+
+        for attempt in range(max_retries):
+            error = None
+            streamed = False
+            async for item in self._stream_request_async("api/generate", data):
+                if isinstance(item, LLMError):
+                    error = item
+                    break
+                streamed = True
+                yield item
+
+            if error is None:
+                return
+            if not streamed and error.is_retryable and attempt < max_retries - 1:
+                delay = error.retry_after_seconds or (2 ** attempt)
+                logger.warning(f"Ollama stream failed (attempt {attempt + 1}/{max_retries}), retrying in {delay}s: {error.message}")
+                await asyncio.sleep(delay)
+                continue
+            yield error
+            return
+
+    async def generate_with_context_stream(
+        self,
+        query: str,
+        context: Union[str, List[str]],
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        max_retries: int = 3
+    ) -> AsyncIterator[Union[str, LLMError]]:
+        """Streaming counterpart of generate_with_context (used by the streaming RAG path)"""
+        full_prompt = self._build_context_prompt(query, context, system_prompt)
+
+        async for item in self.generate_stream(
+            prompt=full_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_retries=max_retries
+        ):
+            yield item
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
     def health_check(self) -> Dict[str, Any]:
         """Health check for Ollama service"""
         start_time = time.time()
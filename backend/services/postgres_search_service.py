@@ -20,12 +20,13 @@ Updated: 2025-12-19 - Enhanced with better schema integration
 """
 
 import logging
+import uuid
 from typing import Dict, List, Optional, Any
 from sqlalchemy import text, and_, or_
 from sqlalchemy.orm import Session
 from datetime import datetime, date
 
-from database import get_db
+from database import SessionLocal
 from models.models import Regulation, Section
 
 # Configure logging
@@ -121,10 +122,15 @@ class PostgresSearchService:
         return result
     
     def _get_db(self) -> Session:
-        """Get database session"""
+        """Get database session (the injected one, or a new pooled session)"""
         if self.db:
             return self.db
-        return next(get_db())
+        return SessionLocal()
+
+    def _release_db(self, db: Optional[Session]) -> None:
+        """Return a session opened by _get_db to the pool (injected sessions are left open)"""
+        if db is not None and db is not self.db:
+            db.close()
     
     def full_text_search(
         self,
@@ -151,6 +157,7 @@ class PostgresSearchService:
         Returns:
             List of matching documents with scores and optional snippets
         """
+        db = None
         try:
             db = self._get_db()
             
@@ -300,6 +307,8 @@ class PostgresSearchService:
             logger.error(f"PostgreSQL full-text search failed: {e}", exc_info=True)
             # Return empty list on error - don't crash the RAG system
             return []
+        finally:
+            self._release_db(db)
     
     def metadata_only_search(
         self,
@@ -319,6 +328,7 @@ class PostgresSearchService:
         Returns:
             List of documents matching metadata filters, ordered by recency
         """
+        db = None
         try:
             db = self._get_db()
             
@@ -421,6 +431,52 @@ class PostgresSearchService:
         except Exception as e:
             logger.error(f"Metadata-only search failed: {e}", exc_info=True)
             return []
+        finally:
+            self._release_db(db)
+    
+    def fetch_document_texts(self, ids: List[str], max_chars: int = 1500) -> Dict[str, str]:
+        """
+        Batch-fetch regulation/section text for documents returned by the graph.
+        
+        Used to hydrate results when Neo4j stores slim nodes (GRAPH_SLIM_NODES):
+        one round trip for all IDs, whichever table they live in.
+        
+        Args:
+            ids: Regulation and/or section IDs (non-UUID IDs are ignored)
+            max_chars: Characters of text to return per document
+        
+        Returns:
+            Mapping of ID to text (IDs without text are omitted)
+        """
+        valid_ids = []
+        for doc_id in dict.fromkeys(ids):
+            try:
+                valid_ids.append(str(uuid.UUID(str(doc_id))))
+            except ValueError:
+                continue
+        if not valid_ids:
+            return {}
+        
+        db = None
+        try:
+            db = self._get_db()
+            rows = db.execute(text("""
+                SELECT CAST(r.id AS text) AS id, SUBSTRING(r.full_text, 1, :max_chars) AS text
+                FROM regulations r
+                WHERE r.id = ANY(CAST(:ids AS uuid[]))
+                UNION ALL
+                SELECT CAST(s.id AS text) AS id, SUBSTRING(s.content, 1, :max_chars) AS text
+                FROM sections s
+                WHERE s.id = ANY(CAST(:ids AS uuid[]))
+            """), {'ids': valid_ids, 'max_chars': max_chars}).fetchall()
+            
+            return {row.id: row.text for row in rows if row.text}
+            
+        except Exception as e:
+            logger.error(f"Document text hydration failed: {e}")
+            return {}
+        finally:
+            self._release_db(db)
     
     def health_check(self) -> Dict[str, Any]:
         """
@@ -429,6 +485,7 @@ class PostgresSearchService:
         Returns:
             Health status dictionary with document counts and index status
         """
+        db = None
         try:
             db = self._get_db()
             
@@ -470,6 +527,8 @@ class PostgresSearchService:
                 'status': 'unhealthy',
                 'error': str(e)
             }
+        finally:
+            self._release_db(db)
     
     def similarity_search(
         self,
@@ -493,6 +552,7 @@ class PostgresSearchService:
         Returns:
             List of documents with similarity scores
         """
+        db = None
         try:
             db = self._get_db()
             
@@ -610,6 +670,8 @@ class PostgresSearchService:
         except Exception as e:
             logger.error(f"Similarity search failed: {e}", exc_info=True)
             return []
+        finally:
+            self._release_db(db)
 
 
 # Global service instance
@@ -8,14 +8,20 @@ Author: AI Assistant
 Created: 2025-12-23
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
 from uuid import UUID
 from sqlalchemy.orm import Session
 from datetime import datetime
+import asyncio
 import logging
 
+from database import SessionLocal, get_async_sessionmaker
 from models.models import QueryHistory, User
 
+if TYPE_CHECKING:
+    # sqlalchemy.ext.asyncio needs greenlet; only the async engine requires it
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 logger = logging.getLogger(__name__)
 
 
@@ -112,6 +118,141 @@ class QueryHistoryService:
             db.rollback()
             return None
     
+    async def get_default_citizen_user_async(self, db: "AsyncSession") -> Optional[User]:
+        """
+        Async counterpart of get_default_citizen_user.
+        
+        Args:
+            db: Async database session
+            
+        Returns:
+            User object or None if not found
+        """
+        if self._cached_citizen_user is not None:
+            return self._cached_citizen_user
+        
+        try:
+            user = await db.get(User, UUID(self.CITIZEN_USER_ID))
+            
+            if user:
+                self._cached_citizen_user = user
+                logger.info(f"Loaded default citizen user: {user.email}")
+                return user
+            else:
+                logger.warning(f"Default citizen user not found: {self.CITIZEN_USER_ID}")
+                return None
+                
+        except Exception as e:
+            logger.error(f"Error loading default citizen user: {e}")
+            return None
+    
+    async def log_query_async(
+        self,
+        db: "AsyncSession",
+        user_id: UUID,
+        query: str,
+        entities: dict,
+        intent: Optional[str],
+        results: list,
+        rating: Optional[int] = None
+    ) -> Optional[QueryHistory]:
+        """
+        Async counterpart of log_query, for sessions from the asyncpg engine.
+        
+        Returns:
+            QueryHistory object if successful, None otherwise
+        """
+        try:
+            query_history = QueryHistory(
+                user_id=user_id,
+                query=query,
+                entities=entities or {},
+                intent=intent,
+                results=results or [],
+                rating=rating
+            )
+            
+            db.add(query_history)
+            await db.commit()
+            await db.refresh(query_history)
+            
+            logger.debug(
+                f"Logged query: {query[:50]}... | Intent: {intent} | "
+                f"Entities: {len(entities or {})} | Results: {len(results or [])}"
+            )
+            
+            return query_history
+            
+        except Exception as e:
+            logger.error(f"Failed to log query history: {e}")
+            await db.rollback()
+            return None
+    
+    def record_query(
+        self,
+        query: str,
+        entities: dict,
+        intent: Optional[str],
+        results: list
+    ) -> None:
+        """
+        Log a query for the default citizen user in its own session.
+        
+        Blocking; async routes should use record_query_async. Failures are
+        logged and never surface to the caller.
+        """
+        db = SessionLocal()
+        try:
+            user = self.get_default_citizen_user(db)
+            if user:
+                self.log_query(
+                    db=db,
+                    user_id=user.id,
+                    query=query,
+                    entities=entities,
+                    intent=intent,
+                    results=results
+                )
+        except Exception as e:
+            logger.error(f"Failed to log query history: {e}")
+        finally:
+            db.close()
+    
+    async def record_query_async(
+        self,
+        query: str,
+        entities: dict,
+        intent: Optional[str],
+        results: list
+    ) -> None:
+        """
+        Log a query from an async route without blocking the event loop.
+        
+        Uses the asyncpg engine when DB_ASYNC_ENABLED is set, otherwise runs
+        record_query in a worker thread. Opens its own session rather than
+        using the get_async_db dependency, since streaming endpoints log after
+        the response has started.
+        """
+        session_factory = get_async_sessionmaker()
+        if session_factory is None:
+            await asyncio.to_thread(self.record_query, query, entities, intent, results)
+            return
+        
+        try:
+            async with session_factory() as db:
+                user = await self.get_default_citizen_user_async(db)
+                if user:
+                    await self.log_query_async(
+                        db=db,
+                        user_id=user.id,
+                        query=query,
+                        entities=entities,
+                        intent=intent,
+                        results=results
+                    )
+        except Exception as e:
+            logger.error(f"Failed to log query history: {e}")
+    
     def format_search_results(self, search_response: dict) -> list:
         """
         Format search results for storage in query history.
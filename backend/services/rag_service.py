@@ -14,11 +14,14 @@ Created: 2025-11-22
 import os
 import re
 import json
+import time
+import asyncio
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
 import logging
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Union, TYPE_CHECKING
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple, Union, TYPE_CHECKING
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
@@ -36,11 +39,26 @@ from services.postgres_search_service import PostgresSearchService, get_postgres
 from services.graph_service import GraphService, get_graph_service
 from services.graph_relationship_service import GraphRelationshipService
 from config.legal_synonyms import expand_query_with_synonyms
+from config.model_config import get_rag_config
+from utils.cache_optimizer import LRUCache, MultiTierCache
+from utils.context_packer import ContextPacker, estimate_tokens
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Human-readable tier names used in multi-tier search logs
+TIER_DESCRIPTIONS = {
+    1: "optimized Elasticsearch search",
+    2: "relaxed Elasticsearch search",
+    3: "Neo4j graph traversal",
+    4: "PostgreSQL full-text search",
+    5: "metadata-only search (last resort)",
+}
+
+# Floor for the context budget so a long system prompt never leaves the LLM without context
+MIN_CONTEXT_TOKENS = 512
+
 
 @dataclass
 class Citation:
@@ -88,6 +106,57 @@ class RAGAnswer:
             "metadata": self.metadata
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RAGAnswer':
+        """Rebuild an answer serialized with to_dict (e.g. from the answer cache)"""
+        return cls(
+            question=data["question"],
+            answer=data["answer"],
+            citations=[Citation(**c) for c in data.get("citations", [])],
+            confidence_score=data.get("confidence_score", 0.0),
+            source_documents=data.get("source_documents", []),
+            intent=data.get("intent"),
+            processing_time_ms=data.get("processing_time_ms", 0.0),
+            cached=data.get("cached", False),
+            metadata=data.get("metadata", {})
+        )
+
+
+@dataclass
+class QueryContext:
+    """
+    Per-request analysis of a question, computed once and shared by every
+    stage of the pipeline (routing, search tiers, prompt building and
+    query-history logging).
+
+    The search-only fields are filled lazily by RAGService._prepare_search_terms,
+    so cached answers only pay for parsing and language detection.
+    """
+    question: str  # Original question
+    parsed_query: Any  # ParsedQuery from LegalQueryParser
+    language: str  # Detected language of the question ('en' or 'fr')
+    enhanced_query: Optional[str] = None  # Query rewritten for search (tiers 1/2)
+    expanded_query: Optional[str] = None  # Synonym-expanded enhanced query (tier 2)
+    act_names: Optional[List[str]] = None  # Act names from SearchService._extract_act_names
+
+    @property
+    def intent(self) -> str:
+        """Intent value of the parsed query"""
+        return self.parsed_query.intent.value
+
+
+@dataclass
+class RAGStreamEvent:
+    """
+    One event of a streamed answer (see RAGService.answer_question_stream).
+
+    Events arrive in order: 'metadata' and 'citations' once retrieval is done,
+    'token' for each generated chunk, an optional 'error', then 'done'.
+    """
+    event: str  # 'metadata', 'citations', 'token', 'error' or 'done'
+    data: Dict[str, Any] = field(default_factory=dict)  # Event payload
+    answer: Optional[RAGAnswer] = None  # Final RAGAnswer (on 'done' only)
+
 
 class RAGService:
     """
@@ -129,15 +198,54 @@ class RAGService:
         self.postgres_search_service = postgres_search_service or get_postgres_search_service()
         self.graph_service = graph_service or get_graph_service()
 
-        # Simple in-memory cache (would use Redis in production)
-        self.cache: Dict[str, Tuple[RAGAnswer, datetime]] = {}
-        self.cache_ttl = timedelta(hours=24)
+        # Answer cache: per-process LRU (L1) backed by Redis (L2), so cached
+        # answers are shared across workers and survive restarts
+        rag_config = get_rag_config()
+        self.cache_enabled = rag_config.enable_answer_cache
+        self.cache_ttl = timedelta(
+            seconds=int(os.getenv("RAG_CACHE_TTL_SECONDS", str(rag_config.cache_ttl_seconds)))
+        )
+        self.cache_max_entries = int(os.getenv("RAG_CACHE_MAX_ENTRIES", "1000"))
+        ttl_seconds = int(self.cache_ttl.total_seconds())
+        self.cache = MultiTierCache(
+            local_cache=LRUCache(max_size=self.cache_max_entries, default_ttl=ttl_seconds),
+            redis_client=self._create_cache_redis_client(),
+            local_ttl=ttl_seconds,
+            redis_ttl=ttl_seconds,
+            redis_retry_seconds=float(os.getenv("RAG_CACHE_REDIS_RETRY_SECONDS", "30"))
+        )
+        
+        # Context packing: trim context documents to the model's context window
+        # (minus prompt and answer) by keeping the sentences most relevant to the question
+        self.context_packing_enabled = os.getenv("RAG_CONTEXT_PACKING", "true").lower() == "true"
+        self.context_window_tokens = int(
+            os.getenv("RAG_CONTEXT_WINDOW_TOKENS", str(rag_config.context_window_tokens))
+        )
+        self.context_packer = ContextPacker()
+        
+        # Passage retrieval: Tier 1 searches the passage index first (see
+        # reindex_elasticsearch.py --passages) and falls back to whole documents
+        self.passage_retrieval_enabled = os.getenv("RAG_PASSAGE_RETRIEVAL", "false").lower() == "true"
+        
+        # Slim graph nodes (GRAPH_SLIM_NODES): Neo4j only holds a text snippet, so
+        # Tier 3 and graph enhancement results are hydrated from PostgreSQL
+        self.graph_slim_nodes = os.getenv("GRAPH_SLIM_NODES", "false").lower() == "true"
         
         # Multi-tier search metrics
         self.tier_usage_stats = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
         self.zero_result_count = 0
         self.total_queries = 0
 
+        # Speculative tier fan-out: launch tiers 1+2 (optionally 4) concurrently
+        # and take the best-ranked acceptable result. Each speculative tier gets
+        # its own deadline; a tier that misses it counts as empty.
+        self.speculative_tiers_enabled = os.getenv("RAG_SPECULATIVE_TIERS", "false").lower() == "true"
+        self.speculative_include_postgres = os.getenv("RAG_SPECULATIVE_INCLUDE_POSTGRES", "false").lower() == "true"
+        self.tier_deadline_seconds = float(os.getenv("RAG_TIER_DEADLINE_MS", "8000")) / 1000
+        # One bounded pool for every request's speculative tiers (created on first use)
+        self.speculative_max_workers = int(os.getenv("RAG_SPECULATIVE_MAX_WORKERS", "16"))
+        self._speculative_executor: Optional[ThreadPoolExecutor] = None
+
         # Use the same Neo4j driver as graph_service if available, else require explicit driver
         # Try to get Neo4j client from graph_service, fallback to direct import if needed
         neo4j_client = None
@@ -157,30 +265,30 @@ class RAGService:
         num_context_docs: int = 7,  # Optimized: 7 provides best quality-to-noise ratio
         use_cache: bool = True,
         temperature: float = 0.3,
-        max_tokens: int = 8192
+        max_tokens: int = 8192,
+        query_context: Optional[QueryContext] = None
     ) -> 'RAGAnswer':
         """
         Answer a question using RAG or relationship/statistics routing.
+
+        Pass a QueryContext from build_query_context to reuse an existing
+        parse (e.g. when the caller also logs query history).
         """
         start_time = datetime.now()
-        parsed_query = self.query_parser.parse_query(question)
-        combined_filters = filters or {}
-        if 'language' not in combined_filters:
-            detected_lang = self._detect_language(question)
-            combined_filters['language'] = detected_lang
-            logger.info(f"Auto-detected language '{detected_lang}' added to filters")
+        ctx = query_context or self.build_query_context(question)
+        combined_filters = self._with_language_filter(filters, ctx.language)
 
         # Route graph relationship questions to Neo4j
-        if parsed_query.intent == QueryIntent.GRAPH_RELATIONSHIP:
+        if ctx.parsed_query.intent == QueryIntent.GRAPH_RELATIONSHIP:
             logger.info("Detected GRAPH_RELATIONSHIP intent - routing to Neo4j")
             return self._answer_graph_relationship_question(
                 question=question,
-                parsed_query=parsed_query,
+                parsed_query=ctx.parsed_query,
                 filters=combined_filters,
                 start_time=start_time.timestamp()
             )
         # Route statistics questions to database
-        if parsed_query.intent == QueryIntent.STATISTICS:
+        if ctx.parsed_query.intent == QueryIntent.STATISTICS:
             logger.info("Detected STATISTICS intent - routing to database")
             return self._answer_statistics_question(
                 question=question,
@@ -195,8 +303,35 @@ class RAGService:
             num_context_docs=num_context_docs,
             use_cache=use_cache,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            query_context=ctx
+        )
+
+    def build_query_context(self, question: str) -> QueryContext:
+        """
+        Parse the question and detect its language once per request.
+
+        Args:
+            question: User's question
+
+        Returns:
+            QueryContext to pass through answer_question / answer_question_async
+        """
+        return QueryContext(
+            question=question,
+            parsed_query=self.query_parser.parse_query(question),
+            language=self._detect_language(question)
         )
+
+    def _prepare_search_terms(self, ctx: QueryContext) -> QueryContext:
+        """Fill the search-only fields of a QueryContext on first use."""
+        if ctx.enhanced_query is None:
+            ctx.enhanced_query = self._enhance_query_for_search(ctx.question, ctx.parsed_query)
+        if ctx.expanded_query is None:
+            ctx.expanded_query = expand_query_with_synonyms(ctx.enhanced_query, max_expansions=2)
+        if ctx.act_names is None:
+            ctx.act_names = self.search_service._extract_act_names(ctx.question)
+        return ctx
     
     def _answer_graph_relationship_question(
         self,
@@ -375,7 +510,8 @@ Be precise and cite specific sections when possible."""
         num_context_docs: int = 7,  # Optimized: 7 provides best quality-to-noise ratio
         use_cache: bool = True,
         temperature: float = 0.3,
-        max_tokens: int = 8192
+        max_tokens: int = 8192,
+        query_context: Optional[QueryContext] = None
     ) -> RAGAnswer:
         """
         Answer a question using RAG.
@@ -387,6 +523,7 @@ Be precise and cite specific sections when possible."""
             use_cache: Whether to use cached answers
             temperature: LLM temperature (lower = more deterministic)
             max_tokens: Maximum tokens in answer
+            query_context: Parsed query context (built here if not given)
 
         Returns:
             RAGAnswer with generated response and metadata
@@ -401,32 +538,83 @@ Be precise and cite specific sections when possible."""
                 logger.info(f"Returning cached answer for: {question[:50]}...")
                 return cached_answer
 
-        # Parse query to understand intent
-        parsed_query = self.query_parser.parse_query(question)
-        intent = parsed_query.intent.value
-
-        # Use only user-provided filters, NOT auto-extracted filters
-        # Auto-extracted filters cause issues when documents lack metadata
-        combined_filters = filters or {}
-
-        # If no language filter is provided, detect it automatically
-        if 'language' not in combined_filters:
-            detected_lang = self._detect_language(question)
-            combined_filters['language'] = detected_lang
-            logger.info(f"Auto-detected language '{detected_lang}' added to filters")
-
+        # Parse query to understand intent (once per request)
+        ctx = query_context or self.build_query_context(question)
+        parsed_query = ctx.parsed_query
+        combined_filters = self._with_language_filter(filters, ctx.language)
 
         # Retrieve relevant documents with MULTI-TIER SEARCH (Phase 4 Enhancement)
         logger.info(f"🔍 Starting multi-tier search for: {question[:50]}...")
-        
+
         # Use the progressive 5-tier fallback system
         context_docs, tier_metadata = self._multi_tier_search(
             question=question,
             filters=combined_filters,
-            num_context_docs=num_context_docs
+            num_context_docs=num_context_docs,
+            query_context=ctx
         )
+        self._log_tier_outcome(tier_metadata)
         
-        # Log tier usage for monitoring
+        if not context_docs:
+            return self._no_context_answer(question, parsed_query, tier_metadata, start_time)
+
+        # Generate answer using Gemini
+        logger.info(f"Generating answer with {len(context_docs)} context documents...")
+
+        if not self.gemini_client.is_available():
+            return self._llm_unavailable_answer(question, parsed_query, context_docs, start_time)
+
+        system_prompt = self._build_system_prompt(ctx.language, tier_metadata)
+        context, packing_stats = self._pack_context(question, context_docs, system_prompt, max_tokens)
+
+        # Generate with retry logic - returns (text, error)
+        answer_text, gemini_error = self.gemini_client.generate_with_context(
+            query=question,
+            context=context,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
+        rag_answer = self._build_rag_answer(
+            question=question,
+            parsed_query=parsed_query,
+            answer_text=answer_text,
+            llm_error=gemini_error,
+            context_docs=context_docs,
+            tier_metadata=tier_metadata,
+            combined_filters=combined_filters,
+            temperature=temperature,
+            start_time=start_time,
+            packing_stats=packing_stats
+        )
+
+        # Cache successful answers only
+        if use_cache and 'error' not in rag_answer.metadata:
+            self._cache_answer(question, rag_answer)
+
+        return rag_answer
+
+    def _with_language_filter(self, filters: Optional[Dict], detected_lang: str) -> Dict:
+        """
+        Return the user-provided filters with the detected language added if missing.
+
+        Only user-provided filters are used, NOT auto-extracted filters;
+        auto-extracted filters cause issues when documents lack metadata.
+        The caller's dict is copied: batch questions share one filters dict
+        but may be detected in different languages.
+        """
+        combined_filters = dict(filters or {})
+
+        # If no language filter is provided, use the detected one
+        if 'language' not in combined_filters:
+            combined_filters['language'] = detected_lang
+            logger.info(f"Auto-detected language '{detected_lang}' added to filters")
+
+        return combined_filters
+
+    def _log_tier_outcome(self, tier_metadata: Dict[str, Any]) -> None:
+        """Log tier usage for monitoring."""
         tier_used = tier_metadata.get('tier_used')
         if tier_used:
             logger.info(f"✅ Multi-tier search succeeded using Tier {tier_used}")
@@ -434,45 +622,62 @@ Be precise and cite specific sections when possible."""
             logger.info(f"   Total search time: {tier_metadata.get('total_time_ms', 0):.1f}ms")
         else:
             logger.error(f"❌ Multi-tier search failed - all {len(tier_metadata.get('tiers_attempted', []))} tiers exhausted")
-        
-        if not context_docs:
-            # No context found after all 5 tiers
-            return RAGAnswer(
-                question=question,
-                answer="I don't have enough information in the regulatory documents to answer this question. Please try rephrasing your question or contact a legal expert for assistance.",
-                citations=[],
-                confidence_score=0.0,
-                source_documents=[],
-                intent=intent,
-                processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
-                metadata={
-                    "error": "no_context_found",
-                    "multi_tier_metadata": tier_metadata,
-                    "tiers_attempted": tier_metadata.get('tiers_attempted', []),
-                    "all_tiers_exhausted": True
-                }
-            )
 
-        # Build context string
-        context_str = self._build_context_string(context_docs)
+    def _no_context_answer(
+        self,
+        question: str,
+        parsed_query: Any,
+        tier_metadata: Dict[str, Any],
+        start_time: datetime
+    ) -> RAGAnswer:
+        """Answer returned when no context was found after all 5 tiers."""
+        return RAGAnswer(
+            question=question,
+            answer="I don't have enough information in the regulatory documents to answer this question. Please try rephrasing your question or contact a legal expert for assistance.",
+            citations=[],
+            confidence_score=0.0,
+            source_documents=[],
+            intent=parsed_query.intent.value,
+            processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
+            metadata={
+                "error": "no_context_found",
+                "multi_tier_metadata": tier_metadata,
+                "tiers_attempted": tier_metadata.get('tiers_attempted', []),
+                "all_tiers_exhausted": True
+            }
+        )
 
-        # Generate answer using Gemini
-        logger.info(f"Generating answer with {len(context_docs)} context documents...")
+    def _llm_unavailable_answer(
+        self,
+        question: str,
+        parsed_query: Any,
+        context_docs: List[Dict[str, Any]],
+        start_time: datetime
+    ) -> RAGAnswer:
+        """Answer returned when the LLM provider is unavailable."""
+        return RAGAnswer(
+            question=question,
+            answer="The AI question-answering service is currently unavailable. Please try again later or search the documents directly.",
+            citations=[],
+            confidence_score=0.0,
+            source_documents=context_docs,
+            intent=parsed_query.intent.value,
+            processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
+            metadata={"error": "gemini_unavailable"}
+        )
 
-        if not self.gemini_client.is_available():
-            return RAGAnswer(
-                question=question,
-                answer="The AI question-answering service is currently unavailable. Please try again later or search the documents directly.",
-                citations=[],
-                confidence_score=0.0,
-                source_documents=context_docs,
-                intent=intent,
-                processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
-                metadata={"error": "gemini_unavailable"}
-            )
+    def _build_system_prompt(self, detected_lang: str, tier_metadata: Dict[str, Any]) -> str:
+        """
+        Build the system prompt with language and fallback-mode instructions.
 
-        # Detect language and add language instruction
-        detected_lang = self._detect_language(question)
+        Args:
+            detected_lang: Detected language of the question
+            tier_metadata: Multi-tier search metadata
+
+        Returns:
+            Full system prompt for the LLM
+        """
+        # Add language instruction
         language_instruction = ""
         if detected_lang == 'fr':
             language_instruction = "\n\nIMPORTANT: The user asked their question in FRENCH. You MUST respond entirely in FRENCH. Provide a complete French answer."
@@ -485,24 +690,38 @@ Be precise and cite specific sections when possible."""
         if tier_used and tier_used > 1:
             fallback_instruction = f"\n\n🔄 FALLBACK_SEARCH_MODE ACTIVATED (Tier {tier_used}/5): The retrieval system used fallback strategies to find documents. Provide the best available information from these documents, but clearly indicate at the start of your response that the search used fallback methods and the results may not be exact matches. Follow the FALLBACK_SEARCH_MODE format in your instructions."
             logger.info(f"🔄 Added FALLBACK_SEARCH_MODE instruction for Tier {tier_used}")
-        
-        # Generate with retry logic - returns (text, error)
-        answer_text, gemini_error = self.gemini_client.generate_with_context(
-            query=question,
-            context=context_str,
-            system_prompt=self.LEGAL_SYSTEM_PROMPT + language_instruction + fallback_instruction,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
+
+        return self.LEGAL_SYSTEM_PROMPT + language_instruction + fallback_instruction
+
+    def _build_rag_answer(
+        self,
+        question: str,
+        parsed_query: Any,
+        answer_text: Optional[str],
+        llm_error: Any,
+        context_docs: List[Dict[str, Any]],
+        tier_metadata: Dict[str, Any],
+        combined_filters: Dict[str, Any],
+        temperature: float,
+        start_time: datetime,
+        packing_stats: Optional[Dict[str, Any]] = None
+    ) -> RAGAnswer:
+        """
+        Turn an LLM generation result into a RAGAnswer.
+
+        Handles provider errors and empty responses; on success builds
+        citations and the confidence score from the context documents.
+        """
+        intent = parsed_query.intent.value
 
         # Handle errors from Gemini API
-        if gemini_error:
-            logger.error(f"Gemini API error: {gemini_error.error_type} - {gemini_error.message}")
+        if llm_error:
+            logger.error(f"Gemini API error: {llm_error.error_type} - {llm_error.message}")
             
             # Build comprehensive error metadata
             error_metadata = {
-                "error": gemini_error.error_type,
-                "error_details": gemini_error.to_dict(),
+                "error": llm_error.error_type,
+                "error_details": llm_error.to_dict(),
                 "num_context_docs": len(context_docs),
                 "temperature": temperature,
                 "filters_used": combined_filters,
@@ -512,7 +731,7 @@ Be precise and cite specific sections when possible."""
             # Return user-friendly error message
             return RAGAnswer(
                 question=question,
-                answer=gemini_error.message,  # User-friendly message from error classification
+                answer=llm_error.message,  # User-friendly message from error classification
                 citations=[],
                 confidence_score=0.0,
                 source_documents=context_docs,
@@ -546,7 +765,7 @@ Be precise and cite specific sections when possible."""
         )
 
         # Build RAG answer with multi-tier metadata
-        rag_answer = RAGAnswer(
+        return RAGAnswer(
             question=question,
             answer=answer_text,
             citations=citations,
@@ -560,16 +779,11 @@ Be precise and cite specific sections when possible."""
                 "filters_used": combined_filters,
                 "multi_tier_search": tier_metadata,  # Include tier usage stats
                 "tier_used": tier_metadata.get('tier_used'),
-                "search_resilience": f"Tier {tier_metadata.get('tier_used')} of 5"
+                "search_resilience": f"Tier {tier_metadata.get('tier_used')} of 5",
+                "context_packing": packing_stats
             }
         )
 
-        # Cache answer
-        if use_cache:
-            self._cache_answer(question, rag_answer)
-
-        return rag_answer
-
     def _enhance_query_for_search(self, question: str, parsed_query: Any) -> str:
         """
         Enhance the search query for better document retrieval.
@@ -828,7 +1042,8 @@ Be precise and cite specific sections when possible."""
         self,
         question: str,
         filters: Optional[Dict[str, Any]],
-        num_context_docs: int = 10
+        num_context_docs: int = 10,
+        query_context: Optional[QueryContext] = None
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Progressive fallback search across all 5 tiers with SELECTIVE graph enhancement.
@@ -837,6 +1052,12 @@ Be precise and cite specific sections when possible."""
         are found. After a successful tier, it checks if graph enhancement should be
         applied (Selective Enhancement).
         
+        With RAG_SPECULATIVE_TIERS=true, the speculative tiers (1 and 2, plus 4
+        with RAG_SPECULATIVE_INCLUDE_POSTGRES=true) are launched together up
+        front. Results are still evaluated in tier order, so the best-ranked
+        acceptable tier wins, but fallback-heavy queries pay max(tier) latency
+        instead of sum(tier).
+        
         Graph Enhancement Conditions:
         - Query mentions specific sections/acts
         - Intent is INTERPRETATION or COMPLIANCE
@@ -853,233 +1074,247 @@ Be precise and cite specific sections when possible."""
             question: User's question
             filters: Optional filters (will be relaxed progressively)
             num_context_docs: Desired number of context documents
-        
+            query_context: Parsed query context (built here if not given)
+
         Returns:
             Tuple of (documents, metadata)
             metadata includes: tier_used, tiers_attempted, tier_timings, graph_enhanced
         """
-        import time
-        
-        metadata = {
-            'tiers_attempted': [],
-            'tier_used': None,
-            'tier_timings': {},
-            'total_time_ms': 0,
-            'graph_enhanced': False,
-            'enhancement_reason': None
-        }
-        
+        metadata = self._new_tier_metadata()
         total_start = time.time()
         
         # Update total queries counter
         self.total_queries += 1
 
-        # Parse query once for reuse
-        parsed_query = self.query_parser.parse_query(question)
-
-        # Enhance the query for better search
-        enhanced_question = self._enhance_query_for_search(question, parsed_query)
+        # Reuse the request's parse; enhanced/expanded queries are computed once
+        ctx = self._prepare_search_terms(query_context or self.build_query_context(question))
+        parsed_query = ctx.parsed_query
 
-        # Tier 1: Optimized Elasticsearch
-        logger.info("🔍 Tier 1: Trying optimized Elasticsearch search...")
-        tier1_start = time.time()
-
-        tier1_results = self._tier1_elasticsearch_optimized(enhanced_question, filters, num_context_docs)
-        tier1_time = (time.time() - tier1_start) * 1000
-        metadata['tier_timings']['tier_1_ms'] = tier1_time
-        metadata['tiers_attempted'].append(1)
+        tier_runners = {
+            1: lambda: self._tier1_elasticsearch_optimized(ctx.enhanced_query, filters, num_context_docs, act_names=ctx.act_names),
+            2: lambda: self._tier2_elasticsearch_relaxed(ctx.enhanced_query, filters, num_context_docs, expanded_query=ctx.expanded_query),
+            3: lambda: self._tier3_neo4j_graph(question, filters, num_context_docs),
+            4: lambda: self._tier4_postgres_fulltext(question, filters, num_context_docs),
+            5: lambda: self._tier5_metadata_only(filters, num_context_docs),
+        }
         
-        # Quality check for Tier 1
-        if len(tier1_results) >= num_context_docs:
-            is_quality_ok, quality_metrics = self._assess_result_quality(
-                results=tier1_results,
-                question=question,
-                tier=1
-            )
-            metadata['tier_1_quality'] = quality_metrics
-            
-            if is_quality_ok:
-                logger.info(f"✅ Tier 1 SUCCESS: Found {len(tier1_results)} high-quality documents")
+        speculative = self._launch_speculative_tiers(tier_runners, metadata)
+        try:
+            for tier, run_tier in tier_runners.items():
+                if tier in speculative:
+                    tier_results = self._collect_speculative_tier(tier, speculative[tier], metadata)
+                else:
+                    logger.info(f"🔍 Tier {tier}: Trying {TIER_DESCRIPTIONS[tier]}...")
+                    tier_start = time.time()
+                    tier_results = run_tier()
+                    metadata['tier_timings'][f'tier_{tier}_ms'] = (time.time() - tier_start) * 1000
                 
-                # Check if we should apply graph enhancement
-                should_enhance = self._should_apply_graph_enhancement(
-                    question=question,
-                    parsed_query=parsed_query,
-                    tier_results=tier1_results,
-                    tier_num=1
-                )
+                if not self._accept_tier_results(tier, tier_results, question, num_context_docs, metadata):
+                    continue
                 
-                if should_enhance['should_enhance']:
-                    # Apply graph enhancement
-                    enhanced_results = self._apply_graph_enhancement(
-                        base_results=tier1_results[:num_context_docs],
+                # Selective graph enhancement for Elasticsearch tiers
+                if tier in (1, 2):
+                    decision = self._should_apply_graph_enhancement(
                         question=question,
-                        num_additional=3
+                        parsed_query=parsed_query,
+                        tier_results=tier_results,
+                        tier_num=tier
                     )
-                    metadata['graph_enhanced'] = True
-                    metadata['enhancement_reason'] = should_enhance['reason']
-                    metadata['docs_added'] = len(enhanced_results) - len(tier1_results[:num_context_docs])
-                    logger.info(f"🔗 Graph enhancement applied: {metadata['enhancement_reason']}")
-                    logger.info(f"   Added {metadata['docs_added']} related documents via graph traversal")
-                    tier1_results = enhanced_results
+                    if decision['should_enhance']:
+                        base_results = tier_results[:num_context_docs]
+                        enhanced_results = self._apply_graph_enhancement(
+                            base_results=base_results,
+                            question=question,
+                            num_additional=3
+                        )
+                        self._record_graph_enhancement(metadata, decision['reason'], base_results, enhanced_results)
+                        tier_results = enhanced_results
                 
-                metadata['tier_used'] = 1
-                metadata['total_time_ms'] = (time.time() - total_start) * 1000
-                self.tier_usage_stats[1] += 1
-                return tier1_results[:num_context_docs], metadata
-            else:
-                logger.warning(f"⚠️ Tier 1 QUALITY CHECK FAILED: {quality_metrics.get('reason')} - continuing to Tier 2")
-        else:
-            logger.warning(f"⚠️ Tier 1 INSUFFICIENT: Only {len(tier1_results)} documents, need {num_context_docs}")
-        
-        # Tier 2: Relaxed Elasticsearch 
-        logger.info("🔍 Tier 2: Trying relaxed Elasticsearch search...")
-        tier2_start = time.time()
-        tier2_results = self._tier2_elasticsearch_relaxed(enhanced_question, filters, num_context_docs)
-        tier2_time = (time.time() - tier2_start) * 1000
-        metadata['tier_timings']['tier_2_ms'] = tier2_time
-        metadata['tiers_attempted'].append(2)
-        
-        # Log what Elasticsearch returned BEFORE reranking
-        if tier2_results:
+                return self._complete_tier(tier, tier_results, num_context_docs, metadata, total_start)
+            
+            return self._all_tiers_failed(metadata, total_start)
+        finally:
+            # Drop speculative tiers that lost the race and have not started yet
+            for future, _ in speculative.values():
+                future.cancel()
+    
+    def _speculative_tier_order(self) -> List[int]:
+        """Tiers launched up front in speculative mode, in rank order."""
+        if not self.speculative_tiers_enabled:
+            return []
+        tiers = [1, 2]
+        if self.speculative_include_postgres:
+            tiers.append(4)
+        return tiers
+    
+    def _launch_speculative_tiers(
+        self,
+        tier_runners: Dict[int, Any],
+        metadata: Dict[str, Any]
+    ) -> Dict[int, Tuple[Future, float]]:
+        """
+        Submit the speculative tiers to the service's shared thread pool.
+        
+        Returns:
+            {tier: (future, launch_time)}; empty when speculative mode is off.
+        """
+        tiers = self._speculative_tier_order()
+        if not tiers:
+            return {}
+        
+        logger.info(f"⚡ Speculative search: launching tiers {tiers} concurrently")
+        metadata['speculative_tiers'] = tiers
+        if self._speculative_executor is None:
+            self._speculative_executor = ThreadPoolExecutor(
+                max_workers=self.speculative_max_workers, thread_name_prefix="rag-tier"
+            )
+        return {tier: (self._speculative_executor.submit(tier_runners[tier]), time.time()) for tier in tiers}
+    
+    def _collect_speculative_tier(
+        self,
+        tier: int,
+        launched: Tuple[Future, float],
+        metadata: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Wait for a speculative tier until its deadline; a missed deadline counts as no results."""
+        future, launch_time = launched
+        remaining = self.tier_deadline_seconds - (time.time() - launch_time)
+        try:
+            tier_results = future.result(timeout=max(remaining, 0))
+        except FutureTimeoutError:
+            self._record_tier_timeout(tier, metadata)
+            tier_results = []
+        except Exception as e:
+            logger.error(f"Tier {tier} search failed: {e}")
+            tier_results = []
+        metadata['tier_timings'][f'tier_{tier}_ms'] = (time.time() - launch_time) * 1000
+        return tier_results
+    
+    def _record_tier_timeout(self, tier: int, metadata: Dict[str, Any]) -> None:
+        """Record a speculative tier that missed its deadline."""
+        logger.warning(f"⏱️ Tier {tier} exceeded its {self.tier_deadline_seconds * 1000:.0f}ms deadline - treating as empty")
+        metadata.setdefault('tier_timeouts', []).append(tier)
+    
+    def _new_tier_metadata(self) -> Dict[str, Any]:
+        """Fresh metadata dict for one multi-tier search."""
+        return {
+            'tiers_attempted': [],
+            'tier_used': None,
+            'tier_timings': {},
+            'total_time_ms': 0,
+            'graph_enhanced': False,
+            'enhancement_reason': None
+        }
+    
+    def _accept_tier_results(
+        self,
+        tier: int,
+        tier_results: List[Dict[str, Any]],
+        question: str,
+        num_context_docs: int,
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """
+        Quality gate for a single tier.
+        
+        Tier 1 must return a full set of documents, tiers 2-4 at least one,
+        and all three must pass _assess_result_quality. Tier 5 is the last
+        resort and accepts any non-empty result.
+        
+        Records the attempt and quality metrics in metadata.
+        
+        Returns:
+            True if the tier's results should be used
+        """
+        metadata['tiers_attempted'].append(tier)
+        
+        if tier == 2 and tier_results:
+            # Log what Elasticsearch returned BEFORE reranking
             logger.info(f"📊 Tier 2 RAW results from search (top 10):")
-            for i, doc in enumerate(tier2_results[:10], 1):
+            for i, doc in enumerate(tier_results[:10], 1):
                 logger.info(f"  {i}. {doc.get('title', 'Unknown')} ({doc.get('document_type', 'unknown')})")
         
-        # Quality check for Tier 2
-        if len(tier2_results) > 0:
-            is_quality_ok, quality_metrics = self._assess_result_quality(
-                results=tier2_results,
-                question=question,
-                tier=2
-            )
-            metadata['tier_2_quality'] = quality_metrics
-            
-            if is_quality_ok:
-                logger.info(f"✅ Tier 2 SUCCESS: Found {len(tier2_results)} quality documents")
-                
-                # Check if we should apply graph enhancement
-                should_enhance = self._should_apply_graph_enhancement(
-                    question=question,
-                    parsed_query=parsed_query,
-                    tier_results=tier2_results,
-                    tier_num=2
-                )
-                
-                if should_enhance['should_enhance']:
-                    # Apply graph enhancement
-                    enhanced_results = self._apply_graph_enhancement(
-                        base_results=tier2_results[:num_context_docs],
-                        question=question,
-                        num_additional=3
-                    )
-                    metadata['graph_enhanced'] = True
-                    metadata['enhancement_reason'] = should_enhance['reason']
-                    metadata['docs_added'] = len(enhanced_results) - len(tier2_results[:num_context_docs])
-                    logger.info(f"🔗 Graph enhancement applied: {metadata['enhancement_reason']}")
-                    logger.info(f"   Added {metadata['docs_added']} related documents via graph traversal")
-                    tier2_results = enhanced_results
-                
-                metadata['tier_used'] = 2
-                metadata['total_time_ms'] = (time.time() - total_start) * 1000
-                self.tier_usage_stats[2] += 1
-                return tier2_results[:num_context_docs], metadata
-            else:
-                logger.warning(f"⚠️ Tier 2 QUALITY CHECK FAILED: {quality_metrics.get('reason')} - continuing to Tier 3")
-        else:
-            logger.warning("⚠️ Tier 2 FAILED: No results from relaxed search")
-        
-        # Tier 3: Neo4j Graph Traversal
-        logger.info("🔍 Tier 3: Trying Neo4j graph traversal...")
-        tier3_start = time.time()
-        tier3_results = self._tier3_neo4j_graph(question, filters, num_context_docs)
-        tier3_time = (time.time() - tier3_start) * 1000
-        metadata['tier_timings']['tier_3_ms'] = tier3_time
-        metadata['tiers_attempted'].append(3)
-        
-        # Quality check for Tier 3
-        if len(tier3_results) > 0:
-            is_quality_ok, quality_metrics = self._assess_result_quality(
-                results=tier3_results,
-                question=question,
-                tier=3
-            )
-            metadata['tier_3_quality'] = quality_metrics
-            
-            if is_quality_ok:
-                logger.info(f"✅ Tier 3 SUCCESS: Found {len(tier3_results)} quality documents via graph")
-                metadata['tier_used'] = 3
-                metadata['total_time_ms'] = (time.time() - total_start) * 1000
-                self.tier_usage_stats[3] += 1
-                return tier3_results[:num_context_docs], metadata
-            else:
-                logger.warning(f"⚠️ Tier 3 QUALITY CHECK FAILED: {quality_metrics.get('reason')} - continuing to Tier 4")
-        else:
-            logger.warning("⚠️ Tier 3 FAILED: No results from graph traversal")
-        
-        # Tier 4: PostgreSQL Full-Text Search
-        logger.info("🔍 Tier 4: Trying PostgreSQL full-text search...")
-        tier4_start = time.time()
-        tier4_results = self._tier4_postgres_fulltext(question, filters, num_context_docs)
-        tier4_time = (time.time() - tier4_start) * 1000
-        metadata['tier_timings']['tier_4_ms'] = tier4_time
-        metadata['tiers_attempted'].append(4)
-        
-        # Quality check for Tier 4
-        if len(tier4_results) > 0:
-            is_quality_ok, quality_metrics = self._assess_result_quality(
-                results=tier4_results,
-                question=question,
-                tier=4
-            )
-            metadata['tier_4_quality'] = quality_metrics
-            
-            if is_quality_ok:
-                logger.info(f"✅ Tier 4 SUCCESS: Found {len(tier4_results)} quality documents via PostgreSQL FTS")
-                metadata['tier_used'] = 4
-                metadata['total_time_ms'] = (time.time() - total_start) * 1000
-                self.tier_usage_stats[4] += 1
-                return tier4_results[:num_context_docs], metadata
-            else:
-                logger.warning(f"⚠️ Tier 4 QUALITY CHECK FAILED: {quality_metrics.get('reason')} - continuing to Tier 5")
-        else:
-            logger.warning("⚠️ Tier 4 FAILED: No results from PostgreSQL")
-        
-        # Tier 5: Metadata-Only Search (last resort)
-        logger.info("🔍 Tier 5: Trying metadata-only search (last resort)...")
-        tier5_start = time.time()
-        tier5_results = self._tier5_metadata_only(filters, num_context_docs)
-        tier5_time = (time.time() - tier5_start) * 1000
-        metadata['tier_timings']['tier_5_ms'] = tier5_time
-        metadata['tiers_attempted'].append(5)
-        
-        # Tier 5 accepts any results (last resort - no quality check)
-        if len(tier5_results) > 0:
-            logger.warning(f"⚠️ Tier 5 SUCCESS (LOW CONFIDENCE): Found {len(tier5_results)} documents by metadata only")
-            metadata['tier_used'] = 5
+        if tier == 5:
+            # Tier 5 accepts any results (last resort - no quality check)
+            if not tier_results:
+                return False
+            logger.warning(f"⚠️ Tier 5 SUCCESS (LOW CONFIDENCE): Found {len(tier_results)} documents by metadata only")
             metadata['tier_5_quality'] = {
                 "reason": "tier_5_last_resort",
-                "num_results": len(tier5_results),
+                "num_results": len(tier_results),
                 "acceptable": True,
                 "note": "Quality check skipped for last-resort tier"
             }
-            metadata['total_time_ms'] = (time.time() - total_start) * 1000
-            self.tier_usage_stats[5] += 1
-            return tier5_results[:num_context_docs], metadata
+            return True
         
-        # ALL TIERS FAILED
-        logger.error("❌ ALL TIERS FAILED: No documents found across all 5 search tiers")
-        self.zero_result_count += 1
-        metadata['tier_used'] = None
-        metadata['total_time_ms'] = (time.time() - total_start) * 1000
+        min_results = num_context_docs if tier == 1 else 1
+        if len(tier_results) < min_results:
+            if tier == 1:
+                logger.warning(f"⚠️ Tier 1 INSUFFICIENT: Only {len(tier_results)} documents, need {num_context_docs}")
+            else:
+                logger.warning(f"⚠️ Tier {tier} FAILED: No results from {TIER_DESCRIPTIONS[tier]}")
+            return False
         
-        return [], metadata
+        is_quality_ok, quality_metrics = self._assess_result_quality(
+            results=tier_results,
+            question=question,
+            tier=tier
+        )
+        metadata[f'tier_{tier}_quality'] = quality_metrics
+        
+        if not is_quality_ok:
+            logger.warning(f"⚠️ Tier {tier} QUALITY CHECK FAILED: {quality_metrics.get('reason')} - continuing to Tier {tier + 1}")
+            return False
+        
+        logger.info(f"✅ Tier {tier} SUCCESS: Found {len(tier_results)} quality documents via {TIER_DESCRIPTIONS[tier]}")
+        return True
     
-    def _tier1_elasticsearch_optimized(
+    def _record_graph_enhancement(
+        self,
+        metadata: Dict[str, Any],
+        reason: str,
+        base_results: List[Dict[str, Any]],
+        enhanced_results: List[Dict[str, Any]]
+    ) -> None:
+        """Record a graph enhancement in the multi-tier metadata."""
+        metadata['graph_enhanced'] = True
+        metadata['enhancement_reason'] = reason
+        metadata['docs_added'] = len(enhanced_results) - len(base_results)
+        logger.info(f"🔗 Graph enhancement applied: {metadata['enhancement_reason']}")
+        logger.info(f"   Added {metadata['docs_added']} related documents via graph traversal")
+    
+    def _complete_tier(
+        self,
+        tier: int,
+        tier_results: List[Dict[str, Any]],
+        num_context_docs: int,
+        metadata: Dict[str, Any],
+        total_start: float
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Mark a tier as the one used and return its top documents."""
+        metadata['tier_used'] = tier
+        metadata['total_time_ms'] = (time.time() - total_start) * 1000
+        self.tier_usage_stats[tier] += 1
+        return tier_results[:num_context_docs], metadata
+    
+    def _all_tiers_failed(
+        self,
+        metadata: Dict[str, Any],
+        total_start: float
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """Record a search where every tier came back empty or low quality."""
+        logger.error("❌ ALL TIERS FAILED: No documents found across all 5 search tiers")
+        self.zero_result_count += 1
+        metadata['tier_used'] = None
+        metadata['total_time_ms'] = (time.time() - total_start) * 1000
+        return [], metadata
+    
+    def _tier1_elasticsearch_optimized(
         self,
         question: str,
         filters: Optional[Dict[str, Any]],
-        num_docs: int
+        num_docs: int,
+        act_names: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Tier 1: Optimized Elasticsearch search with full hybrid intelligence.
@@ -1103,37 +1338,52 @@ Be precise and cite specific sections when possible."""
             # - Act name extraction
             # - Intelligent boosting (10x title, 5x doc type)
             # - Adaptive weight adjustment
+            if self.passage_retrieval_enabled:
+                search_results = self.search_service.passage_search(
+                    query=question,
+                    filters=search_filters,
+                    size=num_docs,
+                    act_names=act_names
+                )
+                if search_results.get('hits'):
+                    return self._format_tier1_hits(search_results)
+
             search_results = self.search_service.hybrid_search(
                 query=question,  # Use original question, not enhanced
                 filters=search_filters,
-                size=num_docs
+                size=num_docs,
+                act_names=act_names,  # Reuse act names extracted once per request
+                source_profile="rag_context"
                 # Don't override weights - let hybrid_search decide based on intent
             )
             
-            # Format results
-            documents = []
-            for hit in search_results.get('hits', []):
-                doc = hit['source']
-                documents.append({
-                    "id": hit['id'],
-                    "title": doc.get('title', 'Untitled'),
-                    "content": doc.get('content', ''),
-                    "citation": doc.get('citation', ''),
-                    "section_number": doc.get('section_number', ''),
-                    "score": hit['score']
-                })
-            
-            return documents
+            return self._format_tier1_hits(search_results)
             
         except Exception as e:
             logger.error(f"Tier 1 search failed: {e}")
             return []
     
+    def _format_tier1_hits(self, search_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format Tier 1 hybrid search hits as context documents."""
+        documents = []
+        for hit in search_results.get('hits', []):
+            doc = hit['source']
+            documents.append({
+                "id": hit['id'],
+                "title": doc.get('title', 'Untitled'),
+                "content": doc.get('content', ''),
+                "citation": doc.get('citation', ''),
+                "section_number": doc.get('section_number', ''),
+                "score": hit['score']
+            })
+        return documents
+    
     def _tier2_elasticsearch_relaxed(
         self,
         question: str,
         filters: Optional[Dict[str, Any]],
-        num_docs: int
+        num_docs: int,
+        expanded_query: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Tier 2: Relaxed Elasticsearch search with query expansion.
@@ -1145,45 +1395,61 @@ Be precise and cite specific sections when possible."""
         - Increase document limit
         """
         try:
-            # Expand query with synonyms
-            expanded_query = expand_query_with_synonyms(question, max_expansions=2)
-            logger.info(f"Tier 2 expanded query: {expanded_query[:100]}...")
-            
-            # Relax filters - keep only language
-            relaxed_filters = self._relax_filters_progressively(filters, tier=2)
-            
-            # Execute search with adjusted weights
+            # Execute search with expanded query, relaxed filters and adjusted weights
             search_results = self.search_service.hybrid_search(
-                query=expanded_query,
-                filters=relaxed_filters,
-                size=num_docs * 2,  # Get more candidates
-                keyword_weight=0.4,  # Reduce keyword weight
-                vector_weight=0.6    # Increase semantic weight
+                **self._tier2_search_kwargs(question, filters, num_docs, expanded_query)
             )
-            
-            # Format results
-            documents = []
-            for hit in search_results.get('hits', []):
-                doc = hit['source']
-                documents.append({
-                    "id": hit['id'],
-                    "title": doc.get('title', 'Untitled'),
-                    "content": doc.get('content', ''),
-                    "citation": doc.get('citation', ''),
-                    "section_number": doc.get('section_number', ''),
-                    "document_type": doc.get('document_type', 'unknown'),
-                    "regulation_title": doc.get('regulation_title', ''),
-                    "score": hit['score']
-                })
-            
-            logger.debug(f"📦 Tier 2 found {len(documents)} documents from Elasticsearch")
-            
-            return documents
+            return self._format_tier2_hits(search_results)
             
         except Exception as e:
             logger.error(f"Tier 2 search failed: {e}")
             return []
     
+    def _tier2_search_kwargs(
+        self,
+        question: str,
+        filters: Optional[Dict[str, Any]],
+        num_docs: int,
+        expanded_query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build the relaxed hybrid_search arguments used by Tier 2."""
+        # Expand query with synonyms (unless already expanded for this request)
+        if expanded_query is None:
+            expanded_query = expand_query_with_synonyms(question, max_expansions=2)
+        logger.info(f"Tier 2 expanded query: {expanded_query[:100]}...")
+        
+        # Relax filters - keep only language
+        relaxed_filters = self._relax_filters_progressively(filters, tier=2)
+        
+        return {
+            "query": expanded_query,
+            "filters": relaxed_filters,
+            "size": num_docs * 2,  # Get more candidates
+            "keyword_weight": 0.4,  # Reduce keyword weight
+            "vector_weight": 0.6,   # Increase semantic weight
+            "source_profile": "rag_context"
+        }
+    
+    def _format_tier2_hits(self, search_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format Tier 2 hybrid search hits as context documents."""
+        documents = []
+        for hit in search_results.get('hits', []):
+            doc = hit['source']
+            documents.append({
+                "id": hit['id'],
+                "title": doc.get('title', 'Untitled'),
+                "content": doc.get('content', ''),
+                "citation": doc.get('citation', ''),
+                "section_number": doc.get('section_number', ''),
+                "document_type": doc.get('document_type', 'unknown'),
+                "regulation_title": doc.get('regulation_title', ''),
+                "score": hit['score']
+            })
+        
+        logger.debug(f"📦 Tier 2 found {len(documents)} documents from Elasticsearch")
+        
+        return documents
+    
     def _tier3_neo4j_graph(
         self,
         question: str,
@@ -1212,22 +1478,43 @@ Be precise and cite specific sections when possible."""
                 limit=num_docs // 2
             )
             
-            # Combine results (remove duplicates by ID)
-            seen_ids = set()
-            documents = []
-            
-            for doc in semantic_results + traversal_results:
-                if doc['id'] not in seen_ids:
-                    seen_ids.add(doc['id'])
-                    documents.append(doc)
-            
-            logger.info(f"Tier 3 found {len(documents)} documents from Neo4j")
-            return documents
+            return self._hydrate_graph_documents(
+                self._combine_tier3_results(semantic_results, traversal_results)
+            )
             
         except Exception as e:
             logger.error(f"Tier 3 search failed: {e}")
             return []
     
+    def _combine_tier3_results(
+        self,
+        semantic_results: List[Dict[str, Any]],
+        traversal_results: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Combine Tier 3 semantic and traversal results (remove duplicates by ID)."""
+        seen_ids = set()
+        documents = []
+        
+        for doc in semantic_results + traversal_results:
+            if doc['id'] not in seen_ids:
+                seen_ids.add(doc['id'])
+                documents.append(doc)
+        
+        logger.info(f"Tier 3 found {len(documents)} documents from Neo4j")
+        return documents
+    
+    def _hydrate_graph_documents(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Replace slim-node snippets with PostgreSQL text, in one batched query."""
+        if not self.graph_slim_nodes or not documents:
+            return documents
+        
+        texts = self.postgres_search_service.fetch_document_texts([doc['id'] for doc in documents])
+        logger.debug(f"Hydrated {len(texts)}/{len(documents)} graph documents from PostgreSQL")
+        return [
+            {**doc, 'content': texts[doc['id']]} if doc['id'] in texts else doc
+            for doc in documents
+        ]
+    
     def _tier4_postgres_fulltext(
         self,
         question: str,
@@ -1405,7 +1692,9 @@ Be precise and cite specific sections when possible."""
                 }
             },
             'zero_result_count': self.zero_result_count,
-            'zero_result_rate': (self.zero_result_count / self.total_queries) * 100
+            'zero_result_rate': (self.zero_result_count / self.total_queries) * 100,
+            'speculative_tiers': self._speculative_tier_order(),
+            'tier_deadline_ms': self.tier_deadline_seconds * 1000
         }
     
     # ============================================
@@ -1592,8 +1881,10 @@ Be precise and cite specific sections when possible."""
         
         Strategy:
         1. Extract document IDs from base results
-        2. Query Neo4j for REFERENCES, CITES, IMPLEMENTS relationships
-        3. Fetch 2-3 most relevant related documents
+        2. Read the top 3 IDs' precomputed related-document lists (or expand
+           them through REFERENCES, IMPLEMENTS, HAS_SECTION... live) in a
+           single Neo4j query
+        3. Keep the 2-3 best-ranked related documents
         4. Merge with base results (deduplicate by ID)
         5. Return enriched result set
         
@@ -1615,57 +1906,604 @@ Be precise and cite specific sections when possible."""
             
             logger.info(f"🔍 Querying graph for relationships from {len(base_doc_ids)} seed documents...")
             
-            # Query Neo4j for related documents via relationships
-            # Use the first few documents as seeds (top results are most relevant)
-            seed_ids = base_doc_ids[:3]  # Use top 3 as seeds
+            # Read the top results' (most relevant) precomputed related-document
+            # lists; fall back to one ID-anchored live expansion when the graph
+            # has none. Either way neighbours are deduplicated and ranked in Neo4j.
+            seed_ids = base_doc_ids[:3]
+            limit = num_additional + len(base_doc_ids)
+            related_docs = self.graph_service.find_precomputed_neighbors(ids=seed_ids, limit=limit)
+            if not related_docs:
+                related_docs = self.graph_service.expand_neighbors(
+                    ids=seed_ids,
+                    depth=1,  # Only direct relationships
+                    limit=limit
+                )
             
-            related_docs = []
+            enhanced = self._merge_related_documents(base_results, base_doc_ids, related_docs, num_additional)
+            return base_results + self._hydrate_graph_documents(enhanced[len(base_results):])
             
-            for seed_id in seed_ids:
-                # Find documents connected by REFERENCES, CITES, IMPLEMENTS
-                try:
-                    # Use graph service's traversal method
-                    traversal_results = self.graph_service.find_related_documents_by_traversal(
-                        seed_query=seed_id,
-                        max_depth=1,  # Only direct relationships
-                        limit=num_additional
-                    )
-                    
-                    related_docs.extend(traversal_results)
-                    
-                except Exception as e:
-                    logger.warning(f"Graph traversal failed for seed {seed_id}: {e}")
+        except Exception as e:
+            logger.error(f"Graph enhancement failed: {e}")
+            # Return original results on error
+            return base_results
+    
+    def _merge_related_documents(
+        self,
+        base_results: List[Dict[str, Any]],
+        base_doc_ids: List[str],
+        related_docs: List[Dict[str, Any]],
+        num_additional: int
+    ) -> List[Dict[str, Any]]:
+        """Append up to num_additional graph-related documents not already in base results."""
+        # Deduplicate related docs and filter out docs already in base results
+        seen_ids = set(base_doc_ids)
+        unique_related = []
+        
+        for doc in related_docs:
+            doc_id = doc.get('id')
+            if doc_id and doc_id not in seen_ids:
+                seen_ids.add(doc_id)
+                unique_related.append(doc)
+        
+        # Limit to num_additional
+        unique_related = unique_related[:num_additional]
+        
+        logger.info(f"✅ Found {len(unique_related)} unique related documents via graph")
+        
+        # Merge: base results + related documents
+        return base_results + unique_related
+    
+    # ============================================
+    # ASYNC PIPELINE
+    # ============================================
+    
+    async def answer_question_async(
+        self,
+        question: str,
+        filters: Optional[Dict] = None,
+        num_context_docs: int = 7,
+        use_cache: bool = True,
+        temperature: float = 0.3,
+        max_tokens: int = 8192,
+        query_context: Optional[QueryContext] = None
+    ) -> RAGAnswer:
+        """
+        Async counterpart of answer_question used by the API routes.
+        
+        Elasticsearch, Neo4j and the LLM are awaited on their async clients so a
+        slow generation no longer blocks the event loop. PostgreSQL-backed work
+        (tiers 4/5, statistics) and graph relationship lookups still use the
+        sync session/driver and run in a worker thread.
+        """
+        start_time = datetime.now()
+        ctx = query_context or self.build_query_context(question)
+        combined_filters = self._with_language_filter(filters, ctx.language)
+
+        if ctx.parsed_query.intent == QueryIntent.GRAPH_RELATIONSHIP:
+            logger.info("Detected GRAPH_RELATIONSHIP intent - routing to Neo4j")
+            return await asyncio.to_thread(
+                self._answer_graph_relationship_question,
+                question=question,
+                parsed_query=ctx.parsed_query,
+                filters=combined_filters,
+                start_time=start_time.timestamp()
+            )
+        if ctx.parsed_query.intent == QueryIntent.STATISTICS:
+            logger.info("Detected STATISTICS intent - routing to database")
+            return await asyncio.to_thread(
+                self._answer_statistics_question,
+                question=question,
+                filters=combined_filters,
+                start_time=start_time
+            )
+        logger.info("Detected RAG intent - routing to RAG")
+        return await self._answer_with_rag_async(
+            question=question,
+            filters=filters,
+            num_context_docs=num_context_docs,
+            use_cache=use_cache,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            query_context=ctx
+        )
+    
+    async def _answer_with_rag_async(
+        self,
+        question: str,
+        filters: Optional[Dict] = None,
+        num_context_docs: int = 7,
+        use_cache: bool = True,
+        temperature: float = 0.3,
+        max_tokens: int = 8192,
+        query_context: Optional[QueryContext] = None
+    ) -> RAGAnswer:
+        """Async counterpart of _answer_with_rag."""
+        start_time = datetime.now()
+
+        if use_cache:
+            # Redis calls block, so keep them off the event loop
+            cached_answer = await asyncio.to_thread(self._get_cached_answer, question)
+            if cached_answer:
+                cached_answer.cached = True
+                logger.info(f"Returning cached answer for: {question[:50]}...")
+                return cached_answer
+
+        ctx = query_context or self.build_query_context(question)
+        parsed_query = ctx.parsed_query
+        combined_filters = self._with_language_filter(filters, ctx.language)
+
+        logger.info(f"🔍 Starting multi-tier search for: {question[:50]}...")
+        context_docs, tier_metadata = await self._multi_tier_search_async(
+            question=question,
+            filters=combined_filters,
+            num_context_docs=num_context_docs,
+            query_context=ctx
+        )
+        self._log_tier_outcome(tier_metadata)
+
+        if not context_docs:
+            return self._no_context_answer(question, parsed_query, tier_metadata, start_time)
+
+        logger.info(f"Generating answer with {len(context_docs)} context documents...")
+
+        if not await self.gemini_client.is_available_async():
+            return self._llm_unavailable_answer(question, parsed_query, context_docs, start_time)
+
+        system_prompt = self._build_system_prompt(ctx.language, tier_metadata)
+        context, packing_stats = self._pack_context(question, context_docs, system_prompt, max_tokens)
+
+        answer_text, llm_error = await self.gemini_client.generate_with_context_async(
+            query=question,
+            context=context,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+
+        rag_answer = self._build_rag_answer(
+            question=question,
+            parsed_query=parsed_query,
+            answer_text=answer_text,
+            llm_error=llm_error,
+            context_docs=context_docs,
+            tier_metadata=tier_metadata,
+            combined_filters=combined_filters,
+            temperature=temperature,
+            start_time=start_time,
+            packing_stats=packing_stats
+        )
+
+        if use_cache and 'error' not in rag_answer.metadata:
+            await asyncio.to_thread(self._cache_answer, question, rag_answer)
+
+        return rag_answer
+    
+    async def answer_question_stream(
+        self,
+        question: str,
+        filters: Optional[Dict] = None,
+        num_context_docs: int = 7,
+        use_cache: bool = True,
+        temperature: float = 0.3,
+        max_tokens: int = 8192,
+        query_context: Optional[QueryContext] = None
+    ) -> AsyncIterator[RAGStreamEvent]:
+        """
+        Streaming counterpart of answer_question_async.
+
+        Retrieval metadata and citations are emitted as soon as the multi-tier
+        search finishes, then LLM tokens as they are generated, so the client
+        sees the first words long before the full answer is ready. Answers that
+        are not generated token by token (cache hits, graph relationship and
+        statistics questions, no context, LLM unavailable) are emitted as a
+        single token event.
+        """
+        start_time = datetime.now()
+
+        if use_cache:
+            # Redis calls block, so keep them off the event loop
+            cached_answer = await asyncio.to_thread(self._get_cached_answer, question)
+            if cached_answer:
+                cached_answer.cached = True
+                logger.info(f"Returning cached answer for: {question[:50]}...")
+                for event in self._answer_stream_events(cached_answer):
+                    yield event
+                return
+
+        ctx = query_context or self.build_query_context(question)
+        if ctx.parsed_query.intent in (QueryIntent.GRAPH_RELATIONSHIP, QueryIntent.STATISTICS):
+            rag_answer = await self.answer_question_async(
+                question=question,
+                filters=filters,
+                num_context_docs=num_context_docs,
+                use_cache=False,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                query_context=ctx
+            )
+            for event in self._answer_stream_events(rag_answer):
+                yield event
+            return
+
+        parsed_query = ctx.parsed_query
+        combined_filters = self._with_language_filter(filters, ctx.language)
+
+        logger.info(f"🔍 Starting multi-tier search for: {question[:50]}...")
+        context_docs, tier_metadata = await self._multi_tier_search_async(
+            question=question,
+            filters=combined_filters,
+            num_context_docs=num_context_docs,
+            query_context=ctx
+        )
+        self._log_tier_outcome(tier_metadata)
+
+        if not context_docs:
+            rag_answer = self._no_context_answer(question, parsed_query, tier_metadata, start_time)
+            for event in self._answer_stream_events(rag_answer):
+                yield event
+            return
+
+        if not await self.gemini_client.is_available_async():
+            rag_answer = self._llm_unavailable_answer(question, parsed_query, context_docs, start_time)
+            for event in self._answer_stream_events(rag_answer):
+                yield event
+            return
+
+        # Retrieval is done: send metadata and citations before the first token
+        yield RAGStreamEvent('metadata', {
+            "question": question,
+            "intent": parsed_query.intent.value,
+            "language": ctx.language,
+            "cached": False,
+            "tier_used": tier_metadata.get('tier_used'),
+            "multi_tier_search": tier_metadata,
+            "source_documents": context_docs,
+        })
+        yield RAGStreamEvent('citations', {"citations": self._build_citations_from_context(context_docs)})
+
+        logger.info(f"Streaming answer with {len(context_docs)} context documents...")
+        chunks: List[str] = []
+        llm_error = None
+        system_prompt = self._build_system_prompt(ctx.language, tier_metadata)
+        context, packing_stats = self._pack_context(question, context_docs, system_prompt, max_tokens)
+        async for item in self.gemini_client.generate_with_context_stream(
+            query=question,
+            context=context,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens
+        ):
+            if isinstance(item, str):
+                chunks.append(item)
+                yield RAGStreamEvent('token', {"text": item})
+            else:
+                llm_error = item
+
+        rag_answer = self._build_rag_answer(
+            question=question,
+            parsed_query=parsed_query,
+            answer_text="".join(chunks),
+            llm_error=llm_error,
+            context_docs=context_docs,
+            tier_metadata=tier_metadata,
+            combined_filters=combined_filters,
+            temperature=temperature,
+            start_time=start_time,
+            packing_stats=packing_stats
+        )
+        if 'error' in rag_answer.metadata:
+            yield self._error_stream_event(rag_answer)
+        elif use_cache:
+            await asyncio.to_thread(self._cache_answer, question, rag_answer)
+
+        yield self._done_stream_event(rag_answer)
+
+    def _answer_stream_events(self, rag_answer: RAGAnswer) -> List[RAGStreamEvent]:
+        """Stream events for an answer that was produced in one piece (with an error event if it failed)."""
+        events = [
+            RAGStreamEvent('metadata', {
+                "question": rag_answer.question,
+                "intent": rag_answer.intent,
+                "cached": rag_answer.cached,
+                "tier_used": rag_answer.metadata.get('tier_used'),
+                "multi_tier_search": rag_answer.metadata.get('multi_tier_search'),
+                "source_documents": rag_answer.source_documents,
+            }),
+            RAGStreamEvent('citations', {"citations": rag_answer.citations}),
+            RAGStreamEvent('token', {"text": rag_answer.answer}),
+        ]
+        if 'error' in rag_answer.metadata:
+            events.append(self._error_stream_event(rag_answer))
+        events.append(self._done_stream_event(rag_answer))
+        return events
+
+    def _error_stream_event(self, rag_answer: RAGAnswer) -> RAGStreamEvent:
+        """Stream event reporting why an answer could not be generated."""
+        return RAGStreamEvent('error', {
+            "error": rag_answer.metadata['error'],
+            "message": rag_answer.answer
+        })
+
+    def _done_stream_event(self, rag_answer: RAGAnswer) -> RAGStreamEvent:
+        """Final stream event carrying the scores and the complete RAGAnswer."""
+        return RAGStreamEvent(
+            'done',
+            {
+                "confidence_score": rag_answer.confidence_score,
+                "processing_time_ms": rag_answer.processing_time_ms,
+                "cached": rag_answer.cached,
+                "metadata": rag_answer.metadata,
+            },
+            answer=rag_answer
+        )
+    
+    async def _multi_tier_search_async(
+        self,
+        question: str,
+        filters: Optional[Dict[str, Any]],
+        num_context_docs: int = 10,
+        query_context: Optional[QueryContext] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Async counterpart of _multi_tier_search.
+        
+        Tier order, quality gates and metadata are identical; only the I/O differs.
+        """
+        metadata = self._new_tier_metadata()
+        total_start = time.time()
+        self.total_queries += 1
+
+        ctx = self._prepare_search_terms(query_context or self.build_query_context(question))
+        parsed_query = ctx.parsed_query
+
+        tier_runners = {
+            1: lambda: self._tier1_elasticsearch_optimized_async(ctx.enhanced_query, filters, num_context_docs, act_names=ctx.act_names),
+            2: lambda: self._tier2_elasticsearch_relaxed_async(ctx.enhanced_query, filters, num_context_docs, expanded_query=ctx.expanded_query),
+            3: lambda: self._tier3_neo4j_graph_async(question, filters, num_context_docs),
+            4: lambda: asyncio.to_thread(self._tier4_postgres_fulltext, question, filters, num_context_docs),
+            5: lambda: asyncio.to_thread(self._tier5_metadata_only, filters, num_context_docs),
+        }
+        
+        speculative = {}
+        tiers = self._speculative_tier_order()
+        if tiers:
+            logger.info(f"⚡ Speculative search: launching tiers {tiers} concurrently")
+            metadata['speculative_tiers'] = tiers
+            speculative = {
+                tier: (asyncio.create_task(tier_runners[tier]()), time.time())
+                for tier in tiers
+            }
+        
+        try:
+            for tier, run_tier in tier_runners.items():
+                if tier in speculative:
+                    tier_results = await self._collect_speculative_tier_async(tier, speculative[tier], metadata)
+                else:
+                    logger.info(f"🔍 Tier {tier}: Trying {TIER_DESCRIPTIONS[tier]}...")
+                    tier_start = time.time()
+                    tier_results = await run_tier()
+                    metadata['tier_timings'][f'tier_{tier}_ms'] = (time.time() - tier_start) * 1000
+                
+                if not self._accept_tier_results(tier, tier_results, question, num_context_docs, metadata):
                     continue
+                
+                if tier in (1, 2):
+                    decision = self._should_apply_graph_enhancement(
+                        question=question,
+                        parsed_query=parsed_query,
+                        tier_results=tier_results,
+                        tier_num=tier
+                    )
+                    if decision['should_enhance']:
+                        base_results = tier_results[:num_context_docs]
+                        enhanced_results = await self._apply_graph_enhancement_async(
+                            base_results=base_results,
+                            question=question,
+                            num_additional=3
+                        )
+                        self._record_graph_enhancement(metadata, decision['reason'], base_results, enhanced_results)
+                        tier_results = enhanced_results
+                
+                return self._complete_tier(tier, tier_results, num_context_docs, metadata, total_start)
+            
+            return self._all_tiers_failed(metadata, total_start)
+        finally:
+            # Cancel speculative tiers that lost the race
+            for task, _ in speculative.values():
+                if not task.done():
+                    task.cancel()
+    
+    async def _collect_speculative_tier_async(
+        self,
+        tier: int,
+        launched: Tuple['asyncio.Task', float],
+        metadata: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of _collect_speculative_tier."""
+        task, launch_time = launched
+        remaining = self.tier_deadline_seconds - (time.time() - launch_time)
+        try:
+            tier_results = await asyncio.wait_for(task, timeout=max(remaining, 0))
+        except asyncio.TimeoutError:
+            self._record_tier_timeout(tier, metadata)
+            tier_results = []
+        except Exception as e:
+            logger.error(f"Tier {tier} search failed: {e}")
+            tier_results = []
+        metadata['tier_timings'][f'tier_{tier}_ms'] = (time.time() - launch_time) * 1000
+        return tier_results
+    
+    async def _tier1_elasticsearch_optimized_async(
+        self,
+        question: str,
+        filters: Optional[Dict[str, Any]],
+        num_docs: int,
+        act_names: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Async Tier 1: keyword and vector legs of the hybrid search run concurrently."""
+        try:
+            search_filters = filters.copy() if filters else {}
+            if self.passage_retrieval_enabled:
+                search_results = await self.search_service.passage_search_async(
+                    query=question,
+                    filters=search_filters,
+                    size=num_docs,
+                    act_names=act_names
+                )
+                if search_results.get('hits'):
+                    return self._format_tier1_hits(search_results)
+
+            search_results = await self.search_service.hybrid_search_async(
+                query=question,
+                filters=search_filters,
+                size=num_docs,
+                act_names=act_names,
+                source_profile="rag_context"
+            )
+            return self._format_tier1_hits(search_results)
+        except Exception as e:
+            logger.error(f"Tier 1 search failed: {e}")
+            return []
+    
+    async def _tier2_elasticsearch_relaxed_async(
+        self,
+        question: str,
+        filters: Optional[Dict[str, Any]],
+        num_docs: int,
+        expanded_query: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Async Tier 2: relaxed hybrid search on the async Elasticsearch client."""
+        try:
+            search_results = await self.search_service.hybrid_search_async(
+                **self._tier2_search_kwargs(question, filters, num_docs, expanded_query)
+            )
+            return self._format_tier2_hits(search_results)
+        except Exception as e:
+            logger.error(f"Tier 2 search failed: {e}")
+            return []
+    
+    async def _tier3_neo4j_graph_async(
+        self,
+        question: str,
+        filters: Optional[Dict[str, Any]],
+        num_docs: int
+    ) -> List[Dict[str, Any]]:
+        """Async Tier 3: semantic search and traversal run concurrently on the async driver."""
+        try:
+            language = filters.get('language', 'en') if filters else 'en'
             
-            # Deduplicate related docs and filter out docs already in base results
-            seen_ids = set(base_doc_ids)
-            unique_related = []
-            
-            for doc in related_docs:
-                doc_id = doc.get('id')
-                if doc_id and doc_id not in seen_ids:
-                    seen_ids.add(doc_id)
-                    unique_related.append(doc)
+            semantic_results, traversal_results = await asyncio.gather(
+                self.graph_service.semantic_search_for_rag_async(
+                    query=question,
+                    limit=num_docs // 2,
+                    language=language
+                ),
+                self.graph_service.find_related_documents_by_traversal_async(
+                    seed_query=question,
+                    max_depth=2,
+                    limit=num_docs // 2
+                )
+            )
+            return await asyncio.to_thread(
+                self._hydrate_graph_documents,
+                self._combine_tier3_results(semantic_results, traversal_results)
+            )
+        except Exception as e:
+            logger.error(f"Tier 3 search failed: {e}")
+            return []
+    
+    async def _apply_graph_enhancement_async(
+        self,
+        base_results: List[Dict[str, Any]],
+        question: str,
+        num_additional: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of _apply_graph_enhancement on the async Neo4j driver."""
+        try:
+            base_doc_ids = [doc['id'] for doc in base_results if 'id' in doc]
             
-            # Limit to num_additional
-            unique_related = unique_related[:num_additional]
+            if not base_doc_ids:
+                logger.warning("No document IDs in base results, cannot apply graph enhancement")
+                return base_results
             
-            logger.info(f"✅ Found {len(unique_related)} unique related documents via graph")
+            logger.info(f"🔍 Querying graph for relationships from {len(base_doc_ids)} seed documents...")
             
-            # Merge: base results + related documents
-            enhanced_results = base_results + unique_related
+            seed_ids = base_doc_ids[:3]
+            limit = num_additional + len(base_doc_ids)
+            related_docs = await self.graph_service.find_precomputed_neighbors_async(ids=seed_ids, limit=limit)
+            if not related_docs:
+                related_docs = await self.graph_service.expand_neighbors_async(
+                    ids=seed_ids,
+                    depth=1,
+                    limit=limit
+                )
             
-            return enhanced_results
+            enhanced = self._merge_related_documents(base_results, base_doc_ids, related_docs, num_additional)
+            return base_results + await asyncio.to_thread(
+                self._hydrate_graph_documents, enhanced[len(base_results):]
+            )
             
         except Exception as e:
             logger.error(f"Graph enhancement failed: {e}")
-            # Return original results on error
             return base_results
     
+    async def aclose(self) -> None:
+        """Close the async Elasticsearch, Neo4j and LLM clients and the speculative tier pool."""
+        if self._speculative_executor is not None:
+            self._speculative_executor.shutdown(wait=False, cancel_futures=True)
+            self._speculative_executor = None
+        for resource, closer in (
+            (self.search_service, 'aclose'),
+            (self.gemini_client, 'aclose'),
+            (getattr(self.graph_service, 'client', None), 'close_async'),
+        ):
+            close = getattr(resource, closer, None)
+            if close is None:
+                continue
+            try:
+                await close()
+            except Exception as e:
+                logger.warning(f"Error closing async client {type(resource).__name__}: {e}")
+    
     # ============================================
     # HELPER METHODS
     # ============================================
     
+    def _pack_context(
+        self,
+        question: str,
+        docs: List[Dict[str, Any]],
+        system_prompt: str,
+        max_tokens: Optional[int]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Build the context string within the model's token budget.
+        
+        The budget is the context window minus the system prompt, question,
+        per-document headers and the tokens reserved for the answer.
+        
+        Returns:
+            Tuple of (context string, packing stats or None when packing is disabled)
+        """
+        if not self.context_packing_enabled or not docs:
+            return self._build_context_string(docs), None
+        
+        header_tokens = sum(
+            estimate_tokens(f"Document {i}: {doc.get('title', '')}\nSection: {doc.get('section_number', '')}\n"
+                            f"Citation: {doc.get('citation', '')}\nContent:\n\n---\n\n")
+            for i, doc in enumerate(docs, 1)
+        )
+        overhead = estimate_tokens(system_prompt) + estimate_tokens(question) + (max_tokens or 0)
+        budget = max(self.context_window_tokens - overhead - header_tokens, MIN_CONTEXT_TOKENS)
+        
+        packed_docs, stats = self.context_packer.pack(question, docs, budget)
+        if stats.tokens_saved:
+            logger.info(
+                f"✂️  Context packed to {stats.packed_tokens}/{stats.original_tokens} tokens "
+                f"(budget {budget}, {stats.documents_trimmed} documents trimmed)"
+            )
+        return self._build_context_string(packed_docs), stats.to_dict()
+    
     def _build_context_string(self, docs: List[Dict[str, Any]]) -> str:
         """
         Build a context string from retrieved documents.
@@ -1832,6 +2670,23 @@ Be precise and cite specific sections when possible."""
         
         return round(confidence, 2)
     
+    CACHE_KEY_PREFIX = "rag:answer:"
+
+    def _create_cache_redis_client(self):
+        """Redis client for the shared answer cache (None if disabled or not installed)"""
+        if os.getenv("RAG_CACHE_REDIS", "true").lower() != "true":
+            return None
+        try:
+            import redis
+        except ImportError:
+            logger.warning("redis package not installed; RAG answer cache is per-process only")
+            return None
+        return redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379"),
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+
     def _get_cache_key(self, question: str) -> str:
         """
         Generate normalized cache key from question.
@@ -1845,13 +2700,13 @@ Be precise and cite specific sections when possible."""
             question: User's question
         
         Returns:
-            Cache key (hash)
+            Cache key (prefixed hash)
         """
         # Normalize question
         normalized = question.lower().strip()
         
         # Generate hash
-        return hashlib.md5(normalized.encode()).hexdigest()
+        return self.CACHE_KEY_PREFIX + hashlib.md5(normalized.encode()).hexdigest()
     
     def _get_cached_answer(self, question: str) -> Optional[RAGAnswer]:
         """
@@ -1863,20 +2718,19 @@ Be precise and cite specific sections when possible."""
         Returns:
             RAGAnswer if cached and valid, None otherwise
         """
-        cache_key = self._get_cache_key(question)
-        
-        if cache_key not in self.cache:
+        if not self.cache_enabled:
             return None
-        
-        answer, timestamp = self.cache[cache_key]
-        
-        # Check if expired
-        if datetime.now() - timestamp > self.cache_ttl:
-            # Remove expired entry
-            del self.cache[cache_key]
+
+        # Expiry is handled by the cache tiers (LRU TTL / Redis SETEX)
+        data = self.cache.get(self._get_cache_key(question))
+        if not data:
+            return None
+
+        try:
+            return RAGAnswer.from_dict(data)
+        except (KeyError, TypeError) as e:
+            logger.warning(f"Discarding malformed cached answer: {e}")
             return None
-        
-        return answer
     
     def _cache_answer(self, question: str, answer: RAGAnswer) -> None:
         """
@@ -1886,18 +2740,16 @@ Be precise and cite specific sections when possible."""
             question: User's question
             answer: RAGAnswer to cache
         """
-        cache_key = self._get_cache_key(question)
-        self.cache[cache_key] = (answer, datetime.now())
-        
-        # Simple cache size management (keep last 1000 entries)
-        if len(self.cache) > 1000:
-            # Remove oldest entry
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k][1])
-            del self.cache[oldest_key]
+        if not self.cache_enabled:
+            return
+
+        # Stored as plain dicts: each hit gets its own RAGAnswer and the same
+        # value is written to Redis as JSON
+        self.cache.set(self._get_cache_key(question), answer.to_dict())
     
     def clear_cache(self) -> None:
-        """Clear all cached answers."""
-        self.cache.clear()
+        """Clear all cached answers (local tier and shared Redis keys)."""
+        self.cache.clear(pattern=f"{self.CACHE_KEY_PREFIX}*")
         logger.info("RAG answer cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -1907,10 +2759,16 @@ Be precise and cite specific sections when possible."""
         Returns:
             Dictionary with cache statistics
         """
+        local_stats = self.cache.local.get_stats()
         return {
-            'total_entries': len(self.cache),
+            'total_entries': local_stats['size'],
             'cache_ttl_hours': self.cache_ttl.total_seconds() / 3600,
-            'max_size': 1000
+            'max_size': self.cache_max_entries,
+            'enabled': self.cache_enabled,
+            'hits': local_stats['hits'],
+            'misses': local_stats['misses'],
+            'evictions': local_stats['evictions'],
+            'redis_available': self.cache.redis_available
         }
     
     def health_check(self) -> Dict[str, Any]:
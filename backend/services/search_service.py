@@ -11,6 +11,7 @@ Author: Developer 2 (AI/ML Engineer)
 Created: 2025-11-22
 """
 
+import asyncio
 import json
 import os
 import re
@@ -19,10 +20,14 @@ from datetime import datetime
 from pathlib import Path
 import logging
 
-from elasticsearch import Elasticsearch, NotFoundError
-from elasticsearch.helpers import bulk
+from elasticsearch import AsyncElasticsearch, Elasticsearch, NotFoundError
+from elasticsearch.helpers import bulk, parallel_bulk
 from sentence_transformers import SentenceTransformer
 
+from utils.cache_optimizer import LRUCache
+from utils.embedding_cache import EmbeddingCache, FILE_LOCKING_AVAILABLE
+from utils.passage_chunker import split_passages
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,6 +43,21 @@ ACT_NAME_PATTERNS = [
     r'(?:the\s+)?([A-Z][A-Za-z]*(?:\s+[A-Z][A-Za-z]*)*)\s+Regulations?\b',
 ]
 
+# Query embeddings keyed by (model, normalized query text), shared by every
+# SearchService instance in the process (search routes, RAG tiers, batch API)
+_query_embedding_cache: Optional[LRUCache] = None
+
+
+def get_query_embedding_cache() -> LRUCache:
+    """Get or create the process-wide query embedding cache"""
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        _query_embedding_cache = LRUCache(
+            max_size=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048")),
+            default_ttl=None  # Embeddings of a given model never go stale
+        )
+    return _query_embedding_cache
+
 
 class SearchService:
     """
@@ -48,6 +68,49 @@ class SearchService:
     """
 
     INDEX_NAME = "regulatory_documents"
+    MAPPINGS_PATH = Path(__file__).parent.parent / "config" / "elasticsearch_mappings.json"
+    VECTOR_INDEX_TYPES = ("hnsw", "int8_hnsw")
+    PASSAGE_INDEX_NAME = "regulatory_passages"
+
+    # Fields added to the document mapping for the passage index
+    PASSAGE_PROPERTIES = {
+        "parent_id": {"type": "keyword"},
+        "passage_index": {"type": "integer"},
+        "passage_count": {"type": "integer"},
+    }
+    # Parent fields not copied onto passages
+    PASSAGE_EXCLUDED_FIELDS = {"id", "content", "embedding", "summary", "created_at", "updated_at"}
+    PASSAGE_FANOUT = 4  # Passages fetched per requested parent document
+    PASSAGES_PER_PARENT = 3  # Matching passages kept per rolled-up parent
+
+    # Metadata shown in result lists and used for hybrid ranking (no body text)
+    LIST_FIELDS = [
+        "title", "regulation_title", "regulation_id", "section_id", "section_number",
+        "citation", "legislation_name", "authority", "document_type", "node_type",
+        "jurisdiction", "language", "effective_date", "status", "programs", "summary"
+    ]
+    # Fields the RAG tiers turn into context documents
+    RAG_CONTEXT_FIELDS = [
+        "title", "regulation_title", "regulation_id", "section_number", "citation",
+        "legislation_name", "document_type", "language", "content"
+    ]
+    # Named _source projections; the embedding vector is never returned
+    SOURCE_PROFILES = {
+        "list": {"includes": LIST_FIELDS + ["content"]},  # content cut to a preview
+        "rag_context": {"includes": RAG_CONTEXT_FIELDS},
+        "full": {"excludes": ["embedding"]},
+    }
+    PREVIEW_CHARS = 300
+
+    # Highlighted fields (opt-in; see _highlight_hits)
+    HIGHLIGHT_FIELDS = {
+        "content": {
+            "fragment_size": 150,
+            "number_of_fragments": 3
+        },
+        "title": {},
+        "summary": {}
+    }
 
     def __init__(self, es_url: Optional[str] = None, embedding_model: Optional[str] = None):
         """
@@ -59,11 +122,48 @@ class SearchService:
         """
         self.es_url = es_url or os.getenv("ELASTICSEARCH_URL", "http://localhost:9200")
         self.es = Elasticsearch([self.es_url])
+        self.async_es: Optional[AsyncElasticsearch] = None  # Lazy load
 
         # Initialize embedding model for vector search
         self.embedding_model_name = embedding_model or "all-MiniLM-L6-v2"
         self.embedder = None  # Lazy load
 
+        # Bulk embedding settings: texts are encoded in mini-batches; large
+        # bulk loads can optionally fan out to a multi-process pool on CPU
+        self.embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+        self.embedding_multi_process = os.getenv("EMBEDDING_MULTI_PROCESS", "false").lower() == "true"
+        self._embedding_pool = None  # Lazy start
+
+        # Persistent content-addressed embedding cache so re-indexing unchanged
+        # text skips model inference (opt-in; relative paths are under backend/)
+        self.embedding_cache_enabled = os.getenv("EMBEDDING_CACHE_ENABLED", "false").lower() == "true"
+        self.embedding_cache_dir = str(
+            Path(__file__).parent.parent / os.getenv("EMBEDDING_CACHE_DIR", "data/embedding_cache")
+        )
+        self._embedding_cache: Optional[EmbeddingCache] = None  # Lazy open
+
+        # Hybrid search round trip: "msearch" sends the keyword and vector legs
+        # in one _msearch and fuses them here; "server" sends a single query+knn
+        # request and lets Elasticsearch combine the scores and intent boosts
+        self.hybrid_search_mode = os.getenv("HYBRID_SEARCH_MODE", "msearch").lower()
+
+        # Dense-vector index: HNSW graph type/shape applied to the embedding
+        # mapping at index creation (int8_hnsw quantizes vectors to 1 byte per
+        # dimension, needs Elasticsearch 8.12+) and kNN candidate policy
+        self.vector_index_type = os.getenv("VECTOR_INDEX_TYPE", "hnsw").lower()
+        self.hnsw_m = int(os.getenv("HNSW_M", "16"))
+        self.hnsw_ef_construction = int(os.getenv("HNSW_EF_CONSTRUCTION", "100"))
+        self.knn_candidates_factor = int(os.getenv("KNN_NUM_CANDIDATES_FACTOR", "10"))
+        self.knn_max_candidates = int(os.getenv("KNN_MAX_NUM_CANDIDATES", "100"))
+
+        # Bulk loading: parallel_bulk worker threads (1 = plain bulk) and docs per request
+        self.bulk_threads = int(os.getenv("ES_BULK_THREADS", "1"))
+        self.bulk_chunk_size = int(os.getenv("ES_BULK_CHUNK_SIZE", "500"))
+
+        # Passage chunking for the passage index (sized for the embedding window)
+        self.passage_max_words = int(os.getenv("PASSAGE_MAX_WORDS", "160"))
+        self.passage_overlap_words = int(os.getenv("PASSAGE_OVERLAP_WORDS", "40"))
+
         # Verify connection
         if not self.es.ping():
             logger.warning(f"Cannot connect to Elasticsearch at {self.es_url}")
@@ -76,6 +176,171 @@ class SearchService:
             logger.info(f"Loading embedding model: {self.embedding_model_name}")
             self.embedder = SentenceTransformer(self.embedding_model_name)
         return self.embedder
+
+    def _get_async_es(self) -> AsyncElasticsearch:
+        """Lazy load the async Elasticsearch client used by the *_async search methods"""
+        if self.async_es is None:
+            self.async_es = AsyncElasticsearch([self.es_url])
+        return self.async_es
+
+    def _query_cache_key(self, query: str) -> str:
+        """Cache key for a query embedding: model name + whitespace-normalized text"""
+        return f"{self.embedding_model_name}:{' '.join(query.split())}"
+
+    def _encode_query(self, query: str) -> List[float]:
+        """Encode a search query into its embedding vector (cached per model and text)"""
+        cache = get_query_embedding_cache()
+        key = self._query_cache_key(query)
+        cached = cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        embedding = self._get_embedder().encode(query).tolist()
+        cache.set(key, tuple(embedding))
+        return embedding
+
+    def encode_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Encode several search queries, sending all cache misses to the model
+        in a single encode() call.
+
+        Args:
+            queries: Query texts
+
+        Returns:
+            One embedding per query, in input order
+        """
+        cache = get_query_embedding_cache()
+        keys = [self._query_cache_key(query) for query in queries]
+        embeddings: List[Optional[List[float]]] = []
+        missing: Dict[str, str] = {}  # key -> query text (deduplicated)
+        for key, query in zip(keys, queries):
+            cached = cache.get(key)
+            embeddings.append(list(cached) if cached is not None else None)
+            if cached is None:
+                missing.setdefault(key, query)
+
+        if missing:
+            vectors = self._get_embedder().encode(
+                list(missing.values()), batch_size=self.embedding_batch_size
+            ).tolist()
+            encoded = dict(zip(missing.keys(), vectors))
+            for key, vector in encoded.items():
+                cache.set(key, tuple(vector))
+            embeddings = [
+                embedding if embedding is not None else list(encoded[key])
+                for key, embedding in zip(keys, embeddings)
+            ]
+
+        return embeddings
+
+    @staticmethod
+    def _document_embedding_text(document: Dict[str, Any]) -> str:
+        """Text embedded for a document (title + content)"""
+        return f"{document.get('title', '')} {document.get('content', '')}"
+
+    def _get_embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Open the persistent embedding cache on first use (None if disabled or unavailable)"""
+        if not self.embedding_cache_enabled:
+            return None
+        if not FILE_LOCKING_AVAILABLE:
+            logger.warning("Embedding cache needs fcntl file locking (unavailable on this platform); encoding without it")
+            self.embedding_cache_enabled = False
+            return None
+        if self._embedding_cache is None:
+            try:
+                dimension = self._get_embedder().get_sentence_embedding_dimension()
+                self._embedding_cache = EmbeddingCache(self.embedding_cache_dir, self.embedding_model_name, dimension)
+            except Exception as e:
+                logger.warning(f"Embedding cache unavailable, encoding without it: {e}")
+                self.embedding_cache_enabled = False
+                return None
+        return self._embedding_cache
+
+    def encode_texts(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
+        """
+        Encode many texts, reusing vectors from the persistent embedding cache.
+
+        Only texts whose (model, SHA-256) key is not cached are sent to the
+        model; their vectors are then added to the cache.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Mini-batch size (defaults to EMBEDDING_BATCH_SIZE)
+
+        Returns:
+            One embedding per input text
+        """
+        if not texts:
+            return []
+
+        cache = self._get_embedding_cache()
+        if cache is None:
+            return self._encode_batched(texts, batch_size)
+
+        embeddings = cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            vectors = self._encode_batched(missing_texts, batch_size)
+            for i, vector in zip(missing, vectors):
+                embeddings[i] = vector
+            try:
+                cache.put_many(missing_texts, vectors)
+            except Exception as e:
+                logger.warning(f"Failed to write embeddings to cache: {e}")
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} encoded")
+        return embeddings
+
+    def _encode_batched(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
+        """
+        Encode texts with the model in mini-batches.
+
+        Texts are sorted by length before encoding so each mini-batch pads to a
+        similar sequence length (this also keeps multi-process chunks balanced),
+        then the vectors are returned in the original order.
+        """
+        batch_size = batch_size or self.embedding_batch_size
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        sorted_texts = [texts[i] for i in order]
+
+        embedder = self._get_embedder()
+        pool = self._get_embedding_pool() if len(sorted_texts) >= batch_size * 4 else None
+        if pool is not None:
+            vectors = embedder.encode_multi_process(sorted_texts, pool, batch_size=batch_size)
+        else:
+            vectors = embedder.encode(
+                sorted_texts,
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True
+            )
+
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        for position, original_index in enumerate(order):
+            embeddings[original_index] = vectors[position].tolist()
+        return embeddings
+
+    def _get_embedding_pool(self):
+        """Start the multi-process encoding pool on first use (CPU only, opt-in)"""
+        if not self.embedding_multi_process:
+            return None
+        if self._embedding_pool is None:
+            embedder = self._get_embedder()
+            if str(embedder.device) != "cpu":
+                logger.info(f"Embedding model is on {embedder.device}; skipping multi-process pool")
+                self.embedding_multi_process = False
+                return None
+            self._embedding_pool = embedder.start_multi_process_pool()
+            logger.info(f"Started multi-process embedding pool with {len(self._embedding_pool['processes'])} workers")
+        return self._embedding_pool
+
+    def stop_embedding_pool(self) -> None:
+        """Stop the multi-process encoding pool if one was started"""
+        if self._embedding_pool is not None:
+            SentenceTransformer.stop_multi_process_pool(self._embedding_pool)
+            self._embedding_pool = None
+            logger.info("Stopped multi-process embedding pool")
     
     def _extract_act_names(self, query: str) -> List[str]:
         """
@@ -106,10 +371,14 @@ class SearchService:
         
         return list(set(act_names))  # Remove duplicates
     
-    def _detect_query_intent(self, query: str) -> Dict[str, Any]:
+    def _detect_query_intent(self, query: str, act_names: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Detect query intent to optimize search strategy.
         
+        Args:
+            query: Search query text
+            act_names: Act names already extracted for this request (extracted here if None)
+        
         Returns:
             Dict with intent information:
                 - type: "overview", "specific_question", "comparison", etc.
@@ -120,7 +389,8 @@ class SearchService:
         query_lower = query.lower()
         
         # Extract act names
-        act_names = self._extract_act_names(query)
+        if act_names is None:
+            act_names = self._extract_act_names(query)
         
         # Detect overview/summary requests (expanded to include coverage questions)
         overview_keywords = ['about', 'overview', 'summary', 'summarize', 'explain', 'what is', 
@@ -158,30 +428,49 @@ class SearchService:
         Returns:
             True if index created successfully
         """
+        return self._create_index(self.INDEX_NAME, force_recreate)
+
+    def create_passage_index(self, force_recreate: bool = False) -> bool:
+        """
+        Create the passage index (document mappings plus parent/passage fields).
+
+        Args:
+            force_recreate: If True, delete existing index first
+
+        Returns:
+            True if index created successfully
+        """
+        return self._create_index(self.PASSAGE_INDEX_NAME, force_recreate, self.PASSAGE_PROPERTIES)
+
+    def _create_index(self, index_name: str, force_recreate: bool,
+                      extra_properties: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Create a versioned index from config/elasticsearch_mappings.json behind
+        the ``index_name`` alias.
+        """
         try:
             # Check if index exists
-            if self.es.indices.exists(index=self.INDEX_NAME):
+            if self.es.indices.exists(index=index_name):
                 if force_recreate:
-                    logger.info(f"Deleting existing index: {self.INDEX_NAME}")
-                    self.es.indices.delete(index=self.INDEX_NAME)
+                    current = self._resolve_alias(index_name) or [index_name]
+                    logger.info(f"Deleting existing index: {', '.join(current)}")
+                    self.es.indices.delete(index=",".join(current))
                 else:
-                    logger.info(f"Index {self.INDEX_NAME} already exists")
+                    logger.info(f"Index {index_name} already exists")
                     return True
 
-            # Load mappings from config file
-            config_path = Path(__file__).parent.parent / "config" / "elasticsearch_mappings.json"
-
-            if not config_path.exists():
-                logger.error(f"Mappings file not found: {config_path}")
+            if not self.MAPPINGS_PATH.exists():
+                logger.error(f"Mappings file not found: {self.MAPPINGS_PATH}")
                 return False
 
-            with open(config_path, 'r') as f:
-                mappings = json.load(f)
+            mappings = self.build_index_body(extra_properties=extra_properties)
+            mappings['aliases'] = {index_name: {}}
 
             # Create index
-            logger.info(f"Creating index: {self.INDEX_NAME}")
-            self.es.indices.create(index=self.INDEX_NAME, body=mappings)
-            logger.info(f"Index {self.INDEX_NAME} created successfully")
+            physical_name = self._versioned_index_name(index_name)
+            logger.info(f"Creating index: {physical_name} (alias {index_name})")
+            self.es.indices.create(index=physical_name, body=mappings)
+            logger.info(f"Index {physical_name} created successfully")
 
             return True
 
@@ -189,6 +478,152 @@ class SearchService:
             logger.error(f"Failed to create index: {e}")
             return False
 
+    @staticmethod
+    def _versioned_index_name(alias: str) -> str:
+        """Physical index name for a new version of an aliased index"""
+        return f"{alias}_v{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+    def _resolve_alias(self, alias: str) -> List[str]:
+        """Physical indices behind an alias (empty if the name is not an alias)"""
+        try:
+            if not self.es.indices.exists_alias(name=alias):
+                return []
+            return sorted(self.es.indices.get_alias(name=alias).keys())
+        except NotFoundError:
+            return []
+
+    def create_versioned_index(self, alias: Optional[str] = None,
+                               extra_properties: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Create a new physical index for a full reindex, tuned for bulk loading.
+
+        Refresh is disabled and replicas are dropped until finalize_versioned_index;
+        searches keep hitting the current index through the alias meanwhile.
+
+        Args:
+            alias: Alias the index will be published under (defaults to the document index)
+            extra_properties: Additional field mappings
+
+        Returns:
+            Name of the new index, or None on failure
+        """
+        alias = alias or self.INDEX_NAME
+        try:
+            body = self.build_index_body(extra_properties=extra_properties)
+            body.setdefault('settings', {}).setdefault('index', {}).update({
+                "refresh_interval": "-1",
+                "number_of_replicas": 0
+            })
+            index_name = self._versioned_index_name(alias)
+            self.es.indices.create(index=index_name, body=body)
+            logger.info(f"Created {index_name} for bulk load (alias {alias} unchanged)")
+            return index_name
+
+        except Exception as e:
+            logger.error(f"Failed to create versioned index: {e}")
+            return None
+
+    def finalize_versioned_index(self, index_name: str) -> bool:
+        """Restore the configured refresh interval and replicas after a bulk load, then refresh"""
+        try:
+            with open(self.MAPPINGS_PATH, 'r') as f:
+                index_settings = json.load(f).get('settings', {}).get('index', {})
+            self.es.indices.put_settings(index=index_name, body={
+                "index": {
+                    "refresh_interval": index_settings.get("refresh_interval", "1s"),
+                    "number_of_replicas": index_settings.get("number_of_replicas", 1)
+                }
+            })
+            self.es.indices.refresh(index=index_name)
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to finalize index {index_name}: {e}")
+            return False
+
+    def swap_alias(self, index_name: str, alias: Optional[str] = None,
+                   delete_old: bool = True) -> bool:
+        """
+        Atomically point the alias at a new index, then drop the old one(s).
+
+        A pre-alias concrete index with the alias's name is removed in the
+        same atomic update, so existing deployments migrate without downtime.
+
+        Args:
+            index_name: Fully loaded index to publish
+            alias: Alias to move (defaults to the document index)
+            delete_old: Delete the indices that were behind the alias
+
+        Returns:
+            True if the alias now points at index_name
+        """
+        alias = alias or self.INDEX_NAME
+        try:
+            old_indices = [name for name in self._resolve_alias(alias) if name != index_name]
+            actions = [{"add": {"index": index_name, "alias": alias}}]
+            if old_indices:
+                actions.extend({"remove": {"index": name, "alias": alias}} for name in old_indices)
+            elif self.es.indices.exists(index=alias):
+                actions.append({"remove_index": {"index": alias}})
+            self.es.indices.update_aliases(actions=actions)
+            logger.info(f"Alias {alias} -> {index_name}")
+
+            if delete_old and old_indices:
+                self.es.indices.delete(index=",".join(old_indices))
+                logger.info(f"Deleted old index: {', '.join(old_indices)}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to swap alias {alias}: {e}")
+            return False
+
+    def build_index_body(self, vector_index_type: Optional[str] = None,
+                         extra_properties: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Index settings and mappings with the configured dense-vector index options.
+
+        Args:
+            vector_index_type: HNSW variant ('hnsw' or 'int8_hnsw'; defaults to VECTOR_INDEX_TYPE)
+            extra_properties: Additional field mappings
+
+        Returns:
+            Request body for indices.create
+        """
+        with open(self.MAPPINGS_PATH, 'r') as f:
+            body = json.load(f)
+        properties = body.setdefault('mappings', {}).setdefault('properties', {})
+        if extra_properties:
+            properties.update(extra_properties)
+
+        index_type = vector_index_type or self.vector_index_type
+        if index_type not in self.VECTOR_INDEX_TYPES:
+            raise ValueError(f"Unknown vector index type: {index_type}")
+        if index_type == "int8_hnsw" and not self._supports_int8_hnsw():
+            logger.warning("int8_hnsw needs Elasticsearch 8.12+; falling back to hnsw")
+            index_type = "hnsw"
+
+        if 'embedding' in properties:
+            properties['embedding']['index_options'] = {
+                "type": index_type,
+                "m": self.hnsw_m,
+                "ef_construction": self.hnsw_ef_construction
+            }
+        return body
+
+    def _supports_int8_hnsw(self) -> bool:
+        """Whether the cluster supports quantized HNSW (Elasticsearch 8.12+)"""
+        try:
+            version = self.es.info()['version']['number']
+            major, minor = (int(part) for part in version.split('.')[:2])
+            return (major, minor) >= (8, 12)
+        except Exception as e:
+            logger.warning(f"Could not determine Elasticsearch version: {e}")
+            return False
+
+    def _num_candidates(self, k: int) -> int:
+        """kNN candidates per shard: k * factor, capped, but never below k"""
+        return max(k, min(k * self.knn_candidates_factor, self.knn_max_candidates))
+
     def index_document(self, doc_id: str, document: Dict[str, Any],
                       generate_embedding: bool = True) -> bool:
         """
@@ -205,10 +640,7 @@ class SearchService:
         try:
             # Generate embedding if requested
             if generate_embedding and 'embedding' not in document:
-                text_to_embed = f"{document.get('title', '')} {document.get('content', '')}"
-                embedder = self._get_embedder()
-                embedding = embedder.encode(text_to_embed).tolist()
-                document['embedding'] = embedding
+                document['embedding'] = self.encode_texts([self._document_embedding_text(document)])[0]
 
             # Add timestamps
             if 'created_at' not in document:
@@ -230,13 +662,17 @@ class SearchService:
             return False
 
     def bulk_index_documents(self, documents: List[Dict[str, Any]],
-                            generate_embeddings: bool = True) -> Tuple[int, int]:
+                            generate_embeddings: bool = True,
+                            index_name: Optional[str] = None) -> Tuple[int, int]:
         """
         Bulk index multiple documents.
 
+        With ES_BULK_THREADS > 1 the requests go through parallel_bulk.
+
         Args:
             documents: List of document dictionaries with 'id' field
             generate_embeddings: Whether to generate embeddings
+            index_name: Target index (defaults to the document index)
 
         Returns:
             Tuple of (success_count, failure_count)
@@ -244,13 +680,12 @@ class SearchService:
         doc_count = len(documents)
         
         try:
-            # Generate embeddings if requested
+            # Generate embeddings if requested (one batched encode for the whole bulk)
             if generate_embeddings:
-                embedder = self._get_embedder()
-                for doc in documents:
-                    if 'embedding' not in doc:
-                        text = f"{doc.get('title', '')} {doc.get('content', '')}"
-                        doc['embedding'] = embedder.encode(text).tolist()
+                pending = [doc for doc in documents if 'embedding' not in doc]
+                embeddings = self.encode_texts([self._document_embedding_text(doc) for doc in pending])
+                for doc, embedding in zip(pending, embeddings):
+                    doc['embedding'] = embedding
 
             # Add timestamps
             now = datetime.now().isoformat()
@@ -262,7 +697,7 @@ class SearchService:
             # Prepare bulk actions (don't modify original docs)
             actions = [
                 {
-                    '_index': self.INDEX_NAME,
+                    '_index': index_name or self.INDEX_NAME,
                     '_id': doc['id'],
                     '_source': {k: v for k, v in doc.items() if k != 'id'}
                 }
@@ -270,17 +705,105 @@ class SearchService:
             ]
 
             # Execute bulk index
-            success, failed = bulk(self.es, actions, stats_only=True)
+            if self.bulk_threads > 1:
+                success, failed_count = self._parallel_bulk(actions)
+            else:
+                success, failed = bulk(self.es, actions, stats_only=True, chunk_size=self.bulk_chunk_size)
+                # stats_only returns a failure count; otherwise a list of errors
+                failed_count = len(failed) if isinstance(failed, list) else int(failed or 0)
 
-            logger.info(f"Bulk indexed: {success} successful, {len(failed) if isinstance(failed, list) else 0} failed")
-            return success, len(failed) if isinstance(failed, list) else 0
+            logger.info(f"Bulk indexed: {success} successful, {failed_count} failed")
+            return success, failed_count
 
         except Exception as e:
             logger.error(f"Bulk indexing failed: {e}")
             return 0, doc_count
 
+    def _parallel_bulk(self, actions: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Send bulk requests from several threads; returns (success_count, failure_count)"""
+        success = failed = 0
+        for ok, item in parallel_bulk(
+            self.es, actions,
+            thread_count=self.bulk_threads,
+            chunk_size=self.bulk_chunk_size,
+            raise_on_error=False
+        ):
+            if ok:
+                success += 1
+            else:
+                if not failed:
+                    logger.warning(f"Bulk item failed: {item}")
+                failed += 1
+        return success, failed
+
+    def build_passages(self, document: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a section/regulation document into passage documents.
+
+        Each passage carries the parent's metadata (title, citation, filters)
+        plus parent_id and its position, so hits can be rolled up to the parent.
+
+        Args:
+            document: Document dictionary with 'id' and 'content'
+
+        Returns:
+            Passage documents ready for bulk_index_documents
+        """
+        passages = split_passages(
+            document.get('content') or '',
+            max_words=self.passage_max_words,
+            overlap_words=self.passage_overlap_words
+        )
+        parent = {k: v for k, v in document.items() if k not in self.PASSAGE_EXCLUDED_FIELDS}
+        return [
+            {
+                **parent,
+                'id': f"{document['id']}:{index}",
+                'parent_id': document['id'],
+                'passage_index': index,
+                'passage_count': len(passages),
+                'content': passage
+            }
+            for index, passage in enumerate(passages)
+        ]
+
+    def bulk_index_passages(self, documents: List[Dict[str, Any]],
+                            generate_embeddings: bool = True,
+                            replace_existing: bool = False,
+                            index_name: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Chunk documents into passages and bulk index them into the passage index.
+
+        Args:
+            documents: Parent document dictionaries with 'id' field
+            generate_embeddings: Whether to generate passage embeddings
+            replace_existing: Delete the parents' existing passages first, so a
+                document that got shorter leaves no stale trailing passages
+            index_name: Target index (defaults to the passage index)
+
+        Returns:
+            Tuple of (success_count, failure_count) over passages
+        """
+        index_name = index_name or self.PASSAGE_INDEX_NAME
+        passages = [passage for doc in documents for passage in self.build_passages(doc)]
+        if replace_existing and documents:
+            try:
+                self.es.delete_by_query(
+                    index=index_name,
+                    body={"query": {"terms": {"parent_id": [doc['id'] for doc in documents]}}},
+                    conflicts="proceed"
+                )
+            except Exception as e:
+                logger.warning(f"Failed to delete existing passages: {e}")
+        if not passages:
+            return 0, 0
+        return self.bulk_index_documents(
+            passages, generate_embeddings=generate_embeddings, index_name=index_name
+        )
+
     def keyword_search(self, query: str, filters: Optional[Dict] = None,
-                      size: int = 10, from_: int = 0, boost_sections: bool = False) -> Dict[str, Any]:
+                      size: int = 10, from_: int = 0, boost_sections: bool = False,
+                      source_profile: str = "full", highlight: bool = False) -> Dict[str, Any]:
         """
         Perform keyword-based search using BM25.
 
@@ -290,64 +813,15 @@ class SearchService:
             size: Number of results to return
             from_: Offset for pagination
             boost_sections: If True, boost section documents over full acts
+            source_profile: Source projection ('list', 'rag_context' or 'full')
+            highlight: If True, return highlighted fragments for the returned page
 
         Returns:
             Search results dictionary
         """
         try:
-            # Build filter clauses
-            filter_clauses = self._build_filters(filters)
-            
-            # For specific queries (not act overviews), ONLY search sections
-            if boost_sections:
-                logger.info("🎯 Filtering to ONLY sections for specific query (excluding full acts)")
-                filter_clauses.append({"term": {"document_type": "section"}})
-            
-            # Build multi_match query - use best_fields for more flexible matching
-            multi_match_query = {
-                "query": query,
-                "fields": [
-                    "title^1.5",  # Moderate title boost
-                    "content^2",   # Boost content heavily for specific queries
-                    "summary^1.5",
-                    "legislation_name^1.5"
-                ],
-                "type": "best_fields",
-                "operator": "or"
-            }
-            
-            # Only use fuzziness when NOT filtering to sections (fuzziness too strict for multi-term queries)
-            if not boost_sections:
-                multi_match_query["fuzziness"] = "AUTO"
-            else:
-                logger.info("🔍 Disabled fuzziness for section-only search")
-            
-            # Build base query
-            base_query = {
-                "bool": {
-                    "must": [{"multi_match": multi_match_query}],
-                    "filter": filter_clauses
-                }
-            }
-            
-            search_query = base_query
-
-            # Construct query
-            search_body = {
-                "query": search_query,
-                "size": size,
-                "from": from_,
-                "highlight": {
-                    "fields": {
-                        "content": {
-                            "fragment_size": 150,
-                            "number_of_fragments": 3
-                        },
-                        "title": {},
-                        "summary": {}
-                    }
-                }
-            }
+            search_body = self._build_keyword_query(query, filters, size, from_, boost_sections, highlight)
+            search_body["_source"] = self._source_filter(source_profile)
 
             # Log the actual query for debugging
             logger.debug(f"🔍 Keyword query: {json.dumps(search_body, indent=2)}")
@@ -355,14 +829,67 @@ class SearchService:
             # Execute search
             response = self.es.search(index=self.INDEX_NAME, body=search_body)
 
-            return self._format_search_response(response, "keyword")
+            results = self._format_search_response(response, "keyword")
+            return self._apply_source_profile(results, source_profile)
 
         except Exception as e:
             logger.error(f"Keyword search failed: {e}")
             return {"hits": [], "total": 0, "error": str(e)}
 
+    def _build_keyword_query(self, query: str, filters: Optional[Dict],
+                             size: int, from_: int, boost_sections: bool,
+                             highlight: bool = False) -> Dict[str, Any]:
+        """Build the BM25 multi_match request body used by keyword_search"""
+        # Build filter clauses
+        filter_clauses = self._build_filters(filters)
+        
+        # For specific queries (not act overviews), ONLY search sections
+        if boost_sections:
+            logger.info("🎯 Filtering to ONLY sections for specific query (excluding full acts)")
+            filter_clauses.append({"term": {"document_type": "section"}})
+        
+        # Build multi_match query - use best_fields for more flexible matching
+        multi_match_query = {
+            "query": query,
+            "fields": [
+                "title^1.5",  # Moderate title boost
+                "content^2",   # Boost content heavily for specific queries
+                "summary^1.5",
+                "legislation_name^1.5"
+            ],
+            "type": "best_fields",
+            "operator": "or"
+        }
+        
+        # Only use fuzziness when NOT filtering to sections (fuzziness too strict for multi-term queries)
+        if not boost_sections:
+            multi_match_query["fuzziness"] = "AUTO"
+        else:
+            logger.info("🔍 Disabled fuzziness for section-only search")
+        
+        # Build base query
+        base_query = {
+            "bool": {
+                "must": [{"multi_match": multi_match_query}],
+                "filter": filter_clauses
+            }
+        }
+        
+        search_query = base_query
+
+        # Construct query
+        search_body = {
+            "query": search_query,
+            "size": size,
+            "from": from_
+        }
+        if highlight:
+            search_body["highlight"] = {"fields": self.HIGHLIGHT_FIELDS}
+        return search_body
+
     def vector_search(self, query: str, filters: Optional[Dict] = None,
-                     size: int = 10, from_: int = 0, boost_sections: bool = False) -> Dict[str, Any]:
+                     size: int = 10, from_: int = 0, boost_sections: bool = False,
+                     source_profile: str = "full", highlight: bool = False) -> Dict[str, Any]:
         """
         Perform vector-based semantic search using embeddings.
 
@@ -372,41 +899,18 @@ class SearchService:
             size: Number of results to return
             from_: Offset for pagination
             boost_sections: If True, filter to ONLY sections (exclude full acts)
+            source_profile: Source projection ('list', 'rag_context' or 'full')
+            highlight: If True, highlight the query terms in the returned hits
 
         Returns:
             Search results dictionary
         """
         try:
             # Generate query embedding
-            embedder = self._get_embedder()
-            query_embedding = embedder.encode(query).tolist()
+            query_embedding = self._encode_query(query)
 
-            # Add filters
-            filter_clauses = self._build_filters(filters)
-            
-            # Filter to sections only if requested
-            if boost_sections:
-                logger.info("🎯 Vector search: Filtering to ONLY sections (excluding full acts)")
-                filter_clauses.append({"term": {"document_type": "section"}})
-
-            # Construct kNN query for indexed dense vectors
-            search_body = {
-                "knn": {
-                    "field": "embedding",
-                    "query_vector": query_embedding,
-                    "k": size,
-                    "num_candidates": min(size * 10, 100)  # Search more candidates for better results
-                },
-                "size": size
-            }
-
-            # Add filters if present - kNN requires bool query wrapper
-            if filter_clauses:
-                search_body["knn"]["filter"] = {
-                    "bool": {
-                        "must": filter_clauses
-                    }
-                }
+            search_body = self._build_vector_query(query_embedding, filters, size, boost_sections)
+            search_body["_source"] = self._source_filter(source_profile)
 
             # Log the actual query for debugging
             logger.debug(f"🔍 Vector query: {json.dumps(search_body, indent=2)}")
@@ -414,19 +918,61 @@ class SearchService:
             # Execute search
             response = self.es.search(index=self.INDEX_NAME, body=search_body)
 
-            return self._format_search_response(response, "vector")
+            results = self._format_search_response(response, "vector")
+            if highlight:
+                self._highlight_hits(query, results['hits'])
+            return self._apply_source_profile(results, source_profile)
 
         except Exception as e:
             logger.error(f"Vector search failed: {e}")
             return {"hits": [], "total": 0, "error": str(e)}
 
+    def _build_vector_query(self, query_embedding: List[float], filters: Optional[Dict],
+                            size: int, boost_sections: bool) -> Dict[str, Any]:
+        """Build the kNN request body used by vector_search"""
+        # Add filters
+        filter_clauses = self._build_filters(filters)
+        
+        # Filter to sections only if requested
+        if boost_sections:
+            logger.info("🎯 Vector search: Filtering to ONLY sections (excluding full acts)")
+            filter_clauses.append({"term": {"document_type": "section"}})
+
+        # Construct kNN query for indexed dense vectors
+        search_body = {
+            "knn": {
+                "field": "embedding",
+                "query_vector": query_embedding,
+                "k": size,
+                "num_candidates": self._num_candidates(size)  # Search more candidates for better results
+            },
+            "size": size
+        }
+
+        # Add filters if present - kNN requires bool query wrapper
+        if filter_clauses:
+            search_body["knn"]["filter"] = {
+                "bool": {
+                    "must": filter_clauses
+                }
+            }
+
+        return search_body
+
     def hybrid_search(self, query: str, filters: Optional[Dict] = None,
                      size: int = 10, from_: int = 0,
                      keyword_weight: float = 0.5,
-                     vector_weight: float = 0.5) -> Dict[str, Any]:
+                     vector_weight: float = 0.5,
+                     act_names: Optional[List[str]] = None,
+                     source_profile: str = "full",
+                     highlight: bool = False) -> Dict[str, Any]:
         """
         Perform intelligent hybrid search with query-aware boosting.
 
+        The fused candidate lists carry metadata only; content for the final
+        top-k is fetched afterwards with a single mget, and highlights (when
+        requested) in a second pass over the same IDs.
+
         Args:
             query: Search query text
             filters: Filter criteria
@@ -434,158 +980,542 @@ class SearchService:
             from_: Offset for pagination
             keyword_weight: Weight for keyword search (0.0 to 1.0)
             vector_weight: Weight for vector search (0.0 to 1.0)
+            act_names: Act names already extracted by the caller (skips re-extraction)
+            source_profile: Source projection ('list', 'rag_context' or 'full')
+            highlight: If True, highlight the query terms in the final hits
 
         Returns:
             Combined and re-ranked search results
         """
         try:
-            # Detect query intent for intelligent search optimization
-            intent = self._detect_query_intent(query)
-            
-            # Log intent detection for debugging
-            if intent['act_names']:
-                logger.info(f"Detected act names in query: {intent['act_names']}")
-            logger.info(f"Query intent: {intent['type']}, prefers_acts: {intent['prefers_acts']}")
-            
-            # Adjust weights based on query type
-            # For overview queries about specific acts, favor keyword matching (titles)
-            # For complex/specific questions, favor semantic understanding
-            if intent['wants_summary'] and intent['act_names']:
-                # Override weights for overview queries - heavily favor exact title matches
-                keyword_weight = 0.7
-                vector_weight = 0.3
-                logger.info(f"Adjusted weights for overview query: keyword={keyword_weight}, vector={vector_weight}")
-            
-            # Perform both searches with section boost for specific queries
-            boost_sections = not intent['prefers_acts']
-            keyword_results = self.keyword_search(query, filters, size=size*2, from_=from_, boost_sections=boost_sections)
-            vector_results = self.vector_search(query, filters, size=size*2, from_=from_, boost_sections=boost_sections)
-
-            # Log what document types we got from Elasticsearch
-            keyword_doc_types = {}
-            for hit in keyword_results.get('hits', []):
-                doc_type = hit.get('source', {}).get('document_type', 'unknown')
-                keyword_doc_types[doc_type] = keyword_doc_types.get(doc_type, 0) + 1
-            logger.info(f"🔍 Keyword search returned: {keyword_doc_types}")
+            intent, keyword_weight, vector_weight = self._plan_hybrid_search(
+                query, keyword_weight, vector_weight, act_names
+            )
             
-            vector_doc_types = {}
-            for hit in vector_results.get('hits', []):
-                doc_type = hit.get('source', {}).get('document_type', 'unknown')
-                vector_doc_types[doc_type] = vector_doc_types.get(doc_type, 0) + 1
-            logger.info(f"🔍 Vector search returned: {vector_doc_types}")
-
-            # Combine and re-rank results
-            combined_scores = {}
-
-            # Add keyword scores
-            for hit in keyword_results.get('hits', []):
-                doc_id = hit['id']
+            query_embedding = self._encode_query(query)
+
+            if self.hybrid_search_mode == "server":
+                search_body = self._build_server_hybrid_query(
+                    query, query_embedding, filters, size, from_,
+                    intent, keyword_weight, vector_weight
+                )
+                search_body["_source"] = self._source_filter(source_profile)
+                logger.debug(f"🔍 Hybrid query: {json.dumps(search_body)[:2000]}")
+                response = self.es.search(
+                    index=self.INDEX_NAME, body=search_body, include_named_queries_score=True
+                )
+                results = self._format_server_hybrid_response(response, intent, keyword_weight, vector_weight)
+            else:
+                # Both legs (with section boost for specific queries) in one round trip
+                searches = self._build_hybrid_msearch(
+                    query, query_embedding, filters, size, from_, intent,
+                    self._source_filter(source_profile, include_content=False)
+                )
+                response = self.es.msearch(searches=searches)
+                keyword_results, vector_results = self._split_hybrid_msearch_response(response)
+
+                results = self._combine_hybrid_results(
+                    keyword_results, vector_results, intent,
+                    keyword_weight, vector_weight, size
+                )
+                self._hydrate_hits(results['hits'], source_profile)
+
+            if highlight:
+                self._highlight_hits(query, results['hits'])
+            return self._apply_source_profile(results, source_profile)
+
+        except Exception as e:
+            logger.error(f"Hybrid search failed: {e}")
+            return {"hits": [], "total": 0, "error": str(e)}
+
+    def passage_search(self, query: str, filters: Optional[Dict] = None,
+                       size: int = 10, keyword_weight: float = 0.5,
+                       vector_weight: float = 0.5,
+                       act_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Hybrid search over the passage index, rolled up to parent documents.
+
+        Long sections are embedded passage by passage, so a provision deep in
+        a section can match on its own. Scoring is the same query+knn request
+        as server-mode hybrid search, keeping scores on the document scale.
+
+        Args:
+            query: Search query text
+            filters: Filter criteria (applied to the parent metadata on passages)
+            size: Number of parent documents to return
+            keyword_weight: Weight for keyword search (0.0 to 1.0)
+            vector_weight: Weight for vector search (0.0 to 1.0)
+            act_names: Act names already extracted by the caller (skips re-extraction)
+
+        Returns:
+            Parent documents with their best matching passages
+        """
+        try:
+            intent, keyword_weight, vector_weight = self._plan_hybrid_search(
+                query, keyword_weight, vector_weight, act_names
+            )
+            query_embedding = self._encode_query(query)
+            search_body = self._build_passage_query(
+                query, query_embedding, filters, size, intent, keyword_weight, vector_weight
+            )
+            response = self.es.search(
+                index=self.PASSAGE_INDEX_NAME, body=search_body, include_named_queries_score=True
+            )
+            results = self._format_server_hybrid_response(response, intent, keyword_weight, vector_weight)
+            return self._rollup_passages(results, size)
+
+        except Exception as e:
+            logger.error(f"Passage search failed: {e}")
+            return {"hits": [], "total": 0, "error": str(e)}
+
+    def _build_passage_query(self, query: str, query_embedding: List[float],
+                             filters: Optional[Dict], size: int, intent: Dict[str, Any],
+                             keyword_weight: float, vector_weight: float) -> Dict[str, Any]:
+        """Server-side hybrid query over passages, fetching several per parent"""
+        search_body = self._build_server_hybrid_query(
+            query, query_embedding, filters, size * self.PASSAGE_FANOUT, 0,
+            intent, keyword_weight, vector_weight
+        )
+        search_body["_source"] = {"excludes": ["embedding"]}
+        return search_body
+
+    def _rollup_passages(self, results: Dict[str, Any], size: int) -> Dict[str, Any]:
+        """
+        Group passage hits by parent document.
+
+        The parent scores as its best passage; its content becomes its top
+        matching passages in document order, joined with an elision marker.
+        """
+        parents: Dict[str, Dict[str, Any]] = {}
+        for hit in results.get('hits', []):
+            source = hit['source']
+            parent_id = source.get('parent_id') or hit['id']
+            passage = {
+                'passage_index': source.get('passage_index', 0),
+                'score': hit['score'] or 0.0,
+                'content': source.get('content', '')
+            }
+            parent = parents.get(parent_id)
+            if parent is None:
+                parent_source = {
+                    k: v for k, v in source.items()
+                    if k not in ('parent_id', 'passage_index', 'passage_count')
+                }
+                parent = parents[parent_id] = {
+                    'id': parent_id,
+                    'score': passage['score'],
+                    'source': parent_source,
+                    'search_type': 'passage',
+                    'score_breakdown': hit.get('score_breakdown'),
+                    'passages': []
+                }
+            if len(parent['passages']) < self.PASSAGES_PER_PARENT:
+                parent['passages'].append(passage)
+
+        hits = sorted(parents.values(), key=lambda h: h['score'], reverse=True)[:size]
+        for hit in hits:
+            hit['passages'].sort(key=lambda p: p['passage_index'])
+            hit['source']['content'] = " [...] ".join(p['content'] for p in hit['passages'])
+
+        return {
+            **results,
+            "hits": hits,
+            "total": len(hits),
+            "search_type": "passage"
+        }
+
+    def _build_hybrid_msearch(self, query: str, query_embedding: List[float],
+                              filters: Optional[Dict], size: int, from_: int,
+                              intent: Dict[str, Any],
+                              source: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Build the _msearch header/body pairs for the keyword and vector legs"""
+        boost_sections = not intent['prefers_acts']
+        keyword_body = self._build_keyword_query(query, filters, size * 2, from_, boost_sections)
+        vector_body = self._build_vector_query(query_embedding, filters, size * 2, boost_sections)
+        if source is not None:
+            keyword_body["_source"] = source
+            vector_body["_source"] = source
+        return [
+            {"index": self.INDEX_NAME}, keyword_body,
+            {"index": self.INDEX_NAME}, vector_body
+        ]
+
+    def _split_hybrid_msearch_response(self, response: Dict) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Format the two _msearch responses; a failed leg becomes an empty result"""
+        results = []
+        for search_type, leg in zip(("keyword", "vector"), response['responses']):
+            if 'error' in leg:
+                logger.error(f"{search_type.capitalize()} search failed: {leg['error']}")
+                results.append({"hits": [], "total": 0, "error": str(leg['error'])})
+            else:
+                results.append(self._format_search_response(leg, search_type))
+        return results[0], results[1]
+
+    def _build_server_hybrid_query(self, query: str, query_embedding: List[float],
+                                   filters: Optional[Dict], size: int, from_: int,
+                                   intent: Dict[str, Any], keyword_weight: float,
+                                   vector_weight: float) -> Dict[str, Any]:
+        """
+        Build a single query+knn request that reproduces the hybrid scoring.
+
+        Elasticsearch sums the weighted BM25 score and the weighted kNN score;
+        the intent boosts from _combine_hybrid_results become named
+        constant_score clauses so their contributions can be read back per hit.
+        Boost clauses only score documents matched by the keyword leg.
+        """
+        boost_sections = not intent['prefers_acts']
+        search_body = self._build_keyword_query(query, filters, size, from_, boost_sections)
+
+        bool_query = search_body["query"]["bool"]
+        multi_match = bool_query["must"][0]["multi_match"]
+        multi_match["boost"] = keyword_weight
+        multi_match["_name"] = "keyword"
+
+        should = []
+        # BOOST 1: Exact act name matching
+        if intent['act_names']:
+            title_matches = []
+            for act_name in intent['act_names']:
+                title_matches.append({"match_phrase": {"title.raw": act_name}})
+                title_matches.append({"match_phrase": {"legislation_name": act_name}})
+            should.append({
+                "constant_score": {
+                    "filter": {"bool": {"should": title_matches}},
+                    "boost": 10.0,
+                    "_name": "title_boost"
+                }
+            })
+
+        # BOOST 2: Document type preference (act penalty is moot: acts are
+        # already filtered out for specific queries)
+        if intent['prefers_acts']:
+            doc_type_filter = {"terms": {"document_type": ["regulation", "legislation", "act"]}}
+            doc_type_boost = 5.0
+        else:
+            doc_type_filter = {"term": {"document_type": "section"}}
+            doc_type_boost = 8.0
+        should.append({
+            "constant_score": {
+                "filter": doc_type_filter,
+                "boost": doc_type_boost,
+                "_name": "doc_type_boost"
+            }
+        })
+        bool_query["should"] = should
+
+        knn = self._build_vector_query(query_embedding, filters, from_ + size * 2, boost_sections)["knn"]
+        knn["boost"] = vector_weight
+        search_body["knn"] = knn
+        return search_body
+
+    def _format_server_hybrid_response(self, es_response: Dict, intent: Dict[str, Any],
+                                       keyword_weight: float, vector_weight: float) -> Dict[str, Any]:
+        """Format a server-side hybrid response with per-hit score breakdowns"""
+        formatted = self._format_search_response(es_response, "hybrid")
+
+        for hit, raw_hit in zip(formatted['hits'], es_response['hits']['hits']):
+            named_scores = raw_hit.get('matched_queries') or {}
+            if not isinstance(named_scores, dict):
+                named_scores = {}
+            keyword_score = named_scores.get('keyword', 0.0)
+            title_boost = named_scores.get('title_boost', 0.0)
+            doc_type_boost = named_scores.get('doc_type_boost', 0.0)
+            combined = hit['score'] or 0.0
+            hit['score_breakdown'] = {
+                'keyword': keyword_score,
+                'vector': max(combined - keyword_score - title_boost - doc_type_boost, 0.0),
+                'title_boost': title_boost,
+                'doc_type_boost': doc_type_boost,
+                'combined': combined
+            }
+
+        return {
+            "hits": formatted['hits'],
+            "total": len(formatted['hits']),
+            "search_type": "hybrid_intelligent",
+            "intent": intent,
+            "weights": {
+                "keyword": keyword_weight,
+                "vector": vector_weight
+            },
+            "boosts_applied": {
+                "title_boost": "10x for exact act name matches",
+                "doc_type_boost": "5x for act-level documents on overview queries"
+            }
+        }
+
+    def _plan_hybrid_search(self, query: str, keyword_weight: float,
+                            vector_weight: float,
+                            act_names: Optional[List[str]] = None) -> Tuple[Dict[str, Any], float, float]:
+        """Detect query intent and resolve the keyword/vector weights for hybrid search"""
+        # Detect query intent for intelligent search optimization
+        intent = self._detect_query_intent(query, act_names)
+
+        # Log intent detection for debugging
+        if intent['act_names']:
+            logger.info(f"Detected act names in query: {intent['act_names']}")
+        logger.info(f"Query intent: {intent['type']}, prefers_acts: {intent['prefers_acts']}")
+
+        # Adjust weights based on query type
+        # For overview queries about specific acts, favor keyword matching (titles)
+        # For complex/specific questions, favor semantic understanding
+        if intent['wants_summary'] and intent['act_names']:
+            # Override weights for overview queries - heavily favor exact title matches
+            keyword_weight = 0.7
+            vector_weight = 0.3
+            logger.info(f"Adjusted weights for overview query: keyword={keyword_weight}, vector={vector_weight}")
+
+        return intent, keyword_weight, vector_weight
+
+    def _combine_hybrid_results(self, keyword_results: Dict[str, Any], vector_results: Dict[str, Any],
+                                intent: Dict[str, Any], keyword_weight: float,
+                                vector_weight: float, size: int) -> Dict[str, Any]:
+        """Fuse keyword and vector hits into one list with intent-aware boosting"""
+        # Log what document types we got from Elasticsearch
+        keyword_doc_types = {}
+        for hit in keyword_results.get('hits', []):
+            doc_type = hit.get('source', {}).get('document_type', 'unknown')
+            keyword_doc_types[doc_type] = keyword_doc_types.get(doc_type, 0) + 1
+        logger.info(f"🔍 Keyword search returned: {keyword_doc_types}")
+
+        vector_doc_types = {}
+        for hit in vector_results.get('hits', []):
+            doc_type = hit.get('source', {}).get('document_type', 'unknown')
+            vector_doc_types[doc_type] = vector_doc_types.get(doc_type, 0) + 1
+        logger.info(f"🔍 Vector search returned: {vector_doc_types}")
+
+        # Combine and re-rank results
+        combined_scores = {}
+
+        # Add keyword scores
+        for hit in keyword_results.get('hits', []):
+            doc_id = hit['id']
+            combined_scores[doc_id] = {
+                'document': hit,
+                'keyword_score': hit['score'] * keyword_weight,
+                'vector_score': 0.0,
+                'title_boost': 0.0,
+                'doc_type_boost': 0.0
+            }
+
+        # Add vector scores
+        for hit in vector_results.get('hits', []):
+            doc_id = hit['id']
+            if doc_id in combined_scores:
+                combined_scores[doc_id]['vector_score'] = hit['score'] * vector_weight
+            else:
                 combined_scores[doc_id] = {
                     'document': hit,
-                    'keyword_score': hit['score'] * keyword_weight,
-                    'vector_score': 0.0,
+                    'keyword_score': 0.0,
+                    'vector_score': hit['score'] * vector_weight,
                     'title_boost': 0.0,
                     'doc_type_boost': 0.0
                 }
 
-            # Add vector scores
-            for hit in vector_results.get('hits', []):
-                doc_id = hit['id']
-                if doc_id in combined_scores:
-                    combined_scores[doc_id]['vector_score'] = hit['score'] * vector_weight
-                else:
-                    combined_scores[doc_id] = {
-                        'document': hit,
-                        'keyword_score': 0.0,
-                        'vector_score': hit['score'] * vector_weight,
-                        'title_boost': 0.0,
-                        'doc_type_boost': 0.0
-                    }
-
-            # Apply intelligent boosting based on query intent
-            for doc_id, scores in combined_scores.items():
-                doc_source = scores['document']['source']
-                doc_title = doc_source.get('title', '').lower()
-                legislation_name = doc_source.get('legislation_name', '').lower()
-                doc_type = doc_source.get('document_type', '')
-                
-                # BOOST 1: Exact act name matching (10x boost)
-                # If query mentions "Employment Insurance Act", heavily boost docs with that exact title
-                for act_name in intent['act_names']:
-                    act_name_lower = act_name.lower()
-                    if act_name_lower in doc_title or act_name_lower in legislation_name:
-                        scores['title_boost'] = 10.0
-                        logger.debug(f"Applied title boost to: {doc_title[:50]}...")
-                        break
-                
-                # BOOST 2: Document type preference based on query intent
-                # When asking "Tell me about X Act", prefer regulation/act-level docs over sections
-                if intent['prefers_acts']:
-                    # Boost act-level documents (regulation, legislation, act overview)
-                    if doc_type in ['regulation', 'legislation', 'act'] or 'act' in doc_title:
-                        # Check if it's NOT a section (sections usually have "section X" in title)
-                        if not re.search(r'section\s+\d+', doc_title, re.IGNORECASE):
-                            scores['doc_type_boost'] = 5.0
-                            logger.debug(f"Applied act-level doc boost to: {doc_title[:50]}...")
-                else:
-                    # For specific queries (not overview), prefer sections over full acts
-                    if doc_type == 'section':
-                        scores['doc_type_boost'] = 8.0
-                        logger.debug(f"Applied section boost to: {doc_title[:50]}...")
-                    elif doc_type in ['regulation', 'legislation', 'act']:
-                        # Penalize full acts on specific queries
-                        scores['doc_type_boost'] = -3.0
-                        logger.debug(f"Applied act penalty to: {doc_title[:50]}...")
-                
-                # Calculate final combined score with boosts
-                scores['combined_score'] = (
-                    scores['keyword_score'] + 
-                    scores['vector_score'] + 
-                    scores['title_boost'] + 
-                    scores['doc_type_boost']
-                )
-                
-                scores['document']['score'] = scores['combined_score']
-                scores['document']['score_breakdown'] = {
-                    'keyword': scores['keyword_score'],
-                    'vector': scores['vector_score'],
-                    'title_boost': scores['title_boost'],
-                    'doc_type_boost': scores['doc_type_boost'],
-                    'combined': scores['combined_score']
-                }
-
-            # Sort by combined score
-            sorted_results = sorted(
-                combined_scores.values(),
-                key=lambda x: x['combined_score'],
-                reverse=True
+        # Apply intelligent boosting based on query intent
+        for doc_id, scores in combined_scores.items():
+            doc_source = scores['document']['source']
+            doc_title = doc_source.get('title', '').lower()
+            legislation_name = doc_source.get('legislation_name', '').lower()
+            doc_type = doc_source.get('document_type', '')
+
+            # BOOST 1: Exact act name matching (10x boost)
+            # If query mentions "Employment Insurance Act", heavily boost docs with that exact title
+            for act_name in intent['act_names']:
+                act_name_lower = act_name.lower()
+                if act_name_lower in doc_title or act_name_lower in legislation_name:
+                    scores['title_boost'] = 10.0
+                    logger.debug(f"Applied title boost to: {doc_title[:50]}...")
+                    break
+
+            # BOOST 2: Document type preference based on query intent
+            # When asking "Tell me about X Act", prefer regulation/act-level docs over sections
+            if intent['prefers_acts']:
+                # Boost act-level documents (regulation, legislation, act overview)
+                if doc_type in ['regulation', 'legislation', 'act'] or 'act' in doc_title:
+                    # Check if it's NOT a section (sections usually have "section X" in title)
+                    if not re.search(r'section\s+\d+', doc_title, re.IGNORECASE):
+                        scores['doc_type_boost'] = 5.0
+                        logger.debug(f"Applied act-level doc boost to: {doc_title[:50]}...")
+            else:
+                # For specific queries (not overview), prefer sections over full acts
+                if doc_type == 'section':
+                    scores['doc_type_boost'] = 8.0
+                    logger.debug(f"Applied section boost to: {doc_title[:50]}...")
+                elif doc_type in ['regulation', 'legislation', 'act']:
+                    # Penalize full acts on specific queries
+                    scores['doc_type_boost'] = -3.0
+                    logger.debug(f"Applied act penalty to: {doc_title[:50]}...")
+
+            # Calculate final combined score with boosts
+            scores['combined_score'] = (
+                scores['keyword_score'] + 
+                scores['vector_score'] + 
+                scores['title_boost'] + 
+                scores['doc_type_boost']
             )
 
-            # Return top results
-            final_hits = [item['document'] for item in sorted_results[:size]]
+            scores['document']['score'] = scores['combined_score']
+            scores['document']['score_breakdown'] = {
+                'keyword': scores['keyword_score'],
+                'vector': scores['vector_score'],
+                'title_boost': scores['title_boost'],
+                'doc_type_boost': scores['doc_type_boost'],
+                'combined': scores['combined_score']
+            }
 
-            return {
-                "hits": final_hits,
-                "total": len(final_hits),
-                "search_type": "hybrid_intelligent",
-                "intent": intent,
-                "weights": {
-                    "keyword": keyword_weight,
-                    "vector": vector_weight
-                },
-                "boosts_applied": {
-                    "title_boost": "10x for exact act name matches",
-                    "doc_type_boost": "5x for act-level documents on overview queries"
-                }
+        # Sort by combined score
+        sorted_results = sorted(
+            combined_scores.values(),
+            key=lambda x: x['combined_score'],
+            reverse=True
+        )
+
+        # Return top results
+        final_hits = [item['document'] for item in sorted_results[:size]]
+
+        return {
+            "hits": final_hits,
+            "total": len(final_hits),
+            "search_type": "hybrid_intelligent",
+            "intent": intent,
+            "weights": {
+                "keyword": keyword_weight,
+                "vector": vector_weight
+            },
+            "boosts_applied": {
+                "title_boost": "10x for exact act name matches",
+                "doc_type_boost": "5x for act-level documents on overview queries"
             }
+        }
+
+    async def keyword_search_async(self, query: str, filters: Optional[Dict] = None,
+                                   size: int = 10, from_: int = 0,
+                                   boost_sections: bool = False,
+                                   source_profile: str = "full",
+                                   highlight: bool = False) -> Dict[str, Any]:
+        """Async counterpart of keyword_search using AsyncElasticsearch"""
+        try:
+            search_body = self._build_keyword_query(query, filters, size, from_, boost_sections, highlight)
+            search_body["_source"] = self._source_filter(source_profile)
+            response = await self._get_async_es().search(index=self.INDEX_NAME, body=search_body)
+            results = self._format_search_response(response, "keyword")
+            return self._apply_source_profile(results, source_profile)
+
+        except Exception as e:
+            logger.error(f"Keyword search failed: {e}")
+            return {"hits": [], "total": 0, "error": str(e)}
+
+    async def vector_search_async(self, query: str, filters: Optional[Dict] = None,
+                                  size: int = 10, from_: int = 0,
+                                  boost_sections: bool = False,
+                                  source_profile: str = "full",
+                                  highlight: bool = False) -> Dict[str, Any]:
+        """
+        Async counterpart of vector_search using AsyncElasticsearch.
+
+        Query encoding is CPU-bound, so it runs in a worker thread to keep
+        the event loop free.
+        """
+        try:
+            query_embedding = await asyncio.to_thread(self._encode_query, query)
+            search_body = self._build_vector_query(query_embedding, filters, size, boost_sections)
+            search_body["_source"] = self._source_filter(source_profile)
+            response = await self._get_async_es().search(index=self.INDEX_NAME, body=search_body)
+            results = self._format_search_response(response, "vector")
+            if highlight:
+                await self._highlight_hits_async(query, results['hits'])
+            return self._apply_source_profile(results, source_profile)
+
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}")
+            return {"hits": [], "total": 0, "error": str(e)}
+
+    async def hybrid_search_async(self, query: str, filters: Optional[Dict] = None,
+                                  size: int = 10, from_: int = 0,
+                                  keyword_weight: float = 0.5,
+                                  vector_weight: float = 0.5,
+                                  act_names: Optional[List[str]] = None,
+                                  source_profile: str = "full",
+                                  highlight: bool = False) -> Dict[str, Any]:
+        """
+        Async counterpart of hybrid_search.
+
+        Query encoding runs in a worker thread; both legs then go to
+        Elasticsearch in a single request.
+        """
+        try:
+            intent, keyword_weight, vector_weight = self._plan_hybrid_search(
+                query, keyword_weight, vector_weight, act_names
+            )
+
+            query_embedding = await asyncio.to_thread(self._encode_query, query)
+
+            if self.hybrid_search_mode == "server":
+                search_body = self._build_server_hybrid_query(
+                    query, query_embedding, filters, size, from_,
+                    intent, keyword_weight, vector_weight
+                )
+                search_body["_source"] = self._source_filter(source_profile)
+                response = await self._get_async_es().search(
+                    index=self.INDEX_NAME, body=search_body, include_named_queries_score=True
+                )
+                results = self._format_server_hybrid_response(response, intent, keyword_weight, vector_weight)
+            else:
+                searches = self._build_hybrid_msearch(
+                    query, query_embedding, filters, size, from_, intent,
+                    self._source_filter(source_profile, include_content=False)
+                )
+                response = await self._get_async_es().msearch(searches=searches)
+                keyword_results, vector_results = self._split_hybrid_msearch_response(response)
+
+                results = self._combine_hybrid_results(
+                    keyword_results, vector_results, intent,
+                    keyword_weight, vector_weight, size
+                )
+                await self._hydrate_hits_async(results['hits'], source_profile)
+
+            if highlight:
+                await self._highlight_hits_async(query, results['hits'])
+            return self._apply_source_profile(results, source_profile)
 
         except Exception as e:
             logger.error(f"Hybrid search failed: {e}")
             return {"hits": [], "total": 0, "error": str(e)}
 
+    async def passage_search_async(self, query: str, filters: Optional[Dict] = None,
+                                   size: int = 10, keyword_weight: float = 0.5,
+                                   vector_weight: float = 0.5,
+                                   act_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Async counterpart of passage_search"""
+        try:
+            intent, keyword_weight, vector_weight = self._plan_hybrid_search(
+                query, keyword_weight, vector_weight, act_names
+            )
+            query_embedding = await asyncio.to_thread(self._encode_query, query)
+            search_body = self._build_passage_query(
+                query, query_embedding, filters, size, intent, keyword_weight, vector_weight
+            )
+            response = await self._get_async_es().search(
+                index=self.PASSAGE_INDEX_NAME, body=search_body, include_named_queries_score=True
+            )
+            results = self._format_server_hybrid_response(response, intent, keyword_weight, vector_weight)
+            return self._rollup_passages(results, size)
+
+        except Exception as e:
+            logger.error(f"Passage search failed: {e}")
+            return {"hits": [], "total": 0, "error": str(e)}
+
+    async def aclose(self) -> None:
+        """Close the async Elasticsearch client"""
+        if self.async_es is not None:
+            await self.async_es.close()
+            self.async_es = None
+
     def relaxed_search(self, query: str, filters: Optional[Dict] = None,
                       size: int = 20, language_only: bool = True,
-                      use_synonym_expansion: bool = True) -> Dict[str, Any]:
+                      use_synonym_expansion: bool = True,
+                      source_profile: str = "full") -> Dict[str, Any]:
         """
         Perform relaxed search with minimal filters and query expansion.
         
@@ -604,6 +1534,7 @@ class SearchService:
             size: Number of results to return (default: 20)
             language_only: If True, only apply language filter (default: True)
             use_synonym_expansion: If True, expand query with synonyms (default: True)
+            source_profile: Source projection ('list', 'rag_context' or 'full')
         
         Returns:
             Search results dictionary
@@ -637,7 +1568,8 @@ class SearchService:
                 size=size,
                 from_=0,
                 keyword_weight=0.4,  # Favor semantic search
-                vector_weight=0.6
+                vector_weight=0.6,
+                source_profile=source_profile
             )
             
             # Add metadata to indicate this was a relaxed search
@@ -719,6 +1651,127 @@ class SearchService:
 
         return filter_clauses
 
+    def _source_filter(self, profile: str, include_content: bool = True) -> Dict[str, Any]:
+        """
+        _source projection for a profile.
+
+        With include_content=False the body text is left out too; hybrid
+        search uses that for its candidate lists and hydrates the final hits.
+        """
+        if profile not in self.SOURCE_PROFILES:
+            raise ValueError(f"Unknown source profile: {profile}")
+        source = self.SOURCE_PROFILES[profile]
+        if include_content:
+            return source
+        if "includes" in source:
+            return {"includes": [field for field in source["includes"] if field != "content"]}
+        return {"excludes": source["excludes"] + ["content"]}
+
+    def _hydration_params(self, profile: str) -> Dict[str, Any]:
+        """mget source parameters that fill in what the candidate projection left out"""
+        if "includes" in self.SOURCE_PROFILES[profile]:
+            return {"source_includes": ["content"]}
+        return {"source_excludes": self.SOURCE_PROFILES[profile]["excludes"]}
+
+    @staticmethod
+    def _merge_hydrated(hits: List[Dict[str, Any]], mget_response: Dict) -> None:
+        """Merge mget sources into the hits, keeping their existing fields"""
+        sources = {
+            doc['_id']: doc.get('_source', {})
+            for doc in mget_response.get('docs', []) if doc.get('found')
+        }
+        for hit in hits:
+            hit['source'] = {**hit['source'], **sources.get(hit['id'], {})}
+
+    def _hydrate_hits(self, hits: List[Dict[str, Any]], profile: str) -> None:
+        """Fetch the content of the final hits in one mget (hits keep their metadata on failure)"""
+        if not hits:
+            return
+        try:
+            response = self.es.mget(
+                index=self.INDEX_NAME, ids=[hit['id'] for hit in hits], **self._hydration_params(profile)
+            )
+            self._merge_hydrated(hits, response)
+        except Exception as e:
+            logger.error(f"Hit hydration failed: {e}")
+
+    async def _hydrate_hits_async(self, hits: List[Dict[str, Any]], profile: str) -> None:
+        """Async counterpart of _hydrate_hits"""
+        if not hits:
+            return
+        try:
+            response = await self._get_async_es().mget(
+                index=self.INDEX_NAME, ids=[hit['id'] for hit in hits], **self._hydration_params(profile)
+            )
+            self._merge_hydrated(hits, response)
+        except Exception as e:
+            logger.error(f"Hit hydration failed: {e}")
+
+    def _build_highlight_query(self, query: str, ids: List[str]) -> Dict[str, Any]:
+        """Highlight-only request for a fixed set of documents"""
+        return {
+            "query": {"ids": {"values": ids}},
+            "size": len(ids),
+            "_source": False,
+            "highlight": {
+                "highlight_query": {
+                    "multi_match": {"query": query, "fields": list(self.HIGHLIGHT_FIELDS)}
+                },
+                "fields": self.HIGHLIGHT_FIELDS
+            }
+        }
+
+    @staticmethod
+    def _merge_highlights(hits: List[Dict[str, Any]], es_response: Dict) -> None:
+        """Attach highlights from a highlight pass to the matching hits"""
+        highlights = {
+            hit['_id']: hit['highlight']
+            for hit in es_response['hits']['hits'] if 'highlight' in hit
+        }
+        for hit in hits:
+            if hit['id'] in highlights:
+                hit['highlights'] = highlights[hit['id']]
+
+    def _highlight_hits(self, query: str, hits: List[Dict[str, Any]]) -> None:
+        """
+        Highlight the final hits in a second pass.
+
+        Highlighting long legal texts is expensive, so it runs only for the
+        documents actually returned, not for every fused candidate.
+        """
+        if not hits:
+            return
+        try:
+            response = self.es.search(
+                index=self.INDEX_NAME,
+                body=self._build_highlight_query(query, [hit['id'] for hit in hits])
+            )
+            self._merge_highlights(hits, response)
+        except Exception as e:
+            logger.error(f"Highlighting failed: {e}")
+
+    async def _highlight_hits_async(self, query: str, hits: List[Dict[str, Any]]) -> None:
+        """Async counterpart of _highlight_hits"""
+        if not hits:
+            return
+        try:
+            response = await self._get_async_es().search(
+                index=self.INDEX_NAME,
+                body=self._build_highlight_query(query, [hit['id'] for hit in hits])
+            )
+            self._merge_highlights(hits, response)
+        except Exception as e:
+            logger.error(f"Highlighting failed: {e}")
+
+    def _apply_source_profile(self, results: Dict[str, Any], profile: str) -> Dict[str, Any]:
+        """Finish hits for a profile: list hits carry a content preview only"""
+        if profile == "list":
+            for hit in results.get('hits', []):
+                content = hit['source'].get('content')
+                if content and len(content) > self.PREVIEW_CHARS:
+                    hit['source']['content'] = content[:self.PREVIEW_CHARS]
+        return results
+
     def _format_search_response(self, es_response: Dict, search_type: str) -> Dict[str, Any]:
         """Format Elasticsearch response to standard format"""
         hits = []
@@ -812,7 +1865,8 @@ class SearchService:
                 'elasticsearch_url': self.es_url,
                 'index': self.INDEX_NAME,
                 'document_count': stats.get('document_count', 0),
-                'embedding_model': self.embedding_model_name
+                'embedding_model': self.embedding_model_name,
+                'query_embedding_cache': get_query_embedding_cache().get_stats()
             }
 
         except Exception as e:
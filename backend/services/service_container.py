@@ -0,0 +1,126 @@
+"""
+Service Container - One Shared Service Stack per Process
+
+Route modules used to build their own services at import time, so every
+worker process held several SearchService instances (each with its own
+SentenceTransformer and Elasticsearch client) plus extra RAGService stacks.
+The container builds the stack once and the routes receive it through
+FastAPI dependencies:
+
+- one SearchService (embedding model, sync/async Elasticsearch clients)
+- one GraphService on the global Neo4j client
+- the global LLM client (Gemini or Ollama)
+- one LegalQueryParser
+- one RAGService and RegulatoryBatchAPI wired to the services above
+
+The FastAPI lifespan in main.py calls ``startup()`` so the embedding model is
+loaded once before the first request, and ``aclose()`` on shutdown.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional, TYPE_CHECKING
+
+from services.graph_service import GraphService, get_graph_service
+from services.llm_client_factory import get_llm_client
+from services.query_parser import LegalQueryParser
+from services.rag_service import RAGService
+from services.search_service import SearchService
+
+if TYPE_CHECKING:
+    from utils.regulatory_batch import RegulatoryBatchAPI
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Process-wide set of shared service instances"""
+
+    def __init__(self):
+        """Build the shared service stack (clients connect lazily where they can)"""
+        self.search_service = SearchService()
+        self.graph_service = get_graph_service()
+        self.llm_client = get_llm_client()
+        self.query_parser = LegalQueryParser(use_spacy=False)
+        self.rag_service = RAGService(
+            search_service=self.search_service,
+            llm_client=self.llm_client,
+            query_parser=self.query_parser,
+            graph_service=self.graph_service
+        )
+        self._batch_api: Optional["RegulatoryBatchAPI"] = None  # Lazy build
+
+    @property
+    def batch_api(self) -> "RegulatoryBatchAPI":
+        """Batch API sharing this container's search, RAG and parser services"""
+        if self._batch_api is None:
+            from utils.regulatory_batch import RegulatoryBatchAPI
+            self._batch_api = RegulatoryBatchAPI(
+                search_service=self.search_service,
+                rag_service=self.rag_service,
+                query_parser=self.query_parser
+            )
+        return self._batch_api
+
+    async def startup(self) -> None:
+        """Load the embedding model up front so the first request does not pay for it"""
+        if os.getenv("PRELOAD_EMBEDDING_MODEL", "true").lower() != "true":
+            return
+        try:
+            await asyncio.to_thread(self.search_service._get_embedder)
+            logger.info("Embedding model preloaded")
+        except Exception as e:
+            logger.warning(f"Embedding model preload failed (will load on first use): {e}")
+
+    async def aclose(self) -> None:
+        """Close the async clients and stop the embedding pool"""
+        await self.rag_service.aclose()
+        self.search_service.stop_embedding_pool()
+
+
+# Global container instance
+_container: Optional[ServiceContainer] = None
+
+
+def get_services() -> ServiceContainer:
+    """Get global service container instance."""
+    global _container
+    if _container is None:
+        _container = ServiceContainer()
+    return _container
+
+
+async def shutdown_services() -> None:
+    """Close and drop the global container (no-op if it was never built)."""
+    global _container
+    if _container is not None:
+        await _container.aclose()
+        _container = None
+
+
+# FastAPI dependencies
+
+def get_search_service() -> SearchService:
+    """Dependency: shared SearchService"""
+    return get_services().search_service
+
+
+def get_rag_service() -> RAGService:
+    """Dependency: shared RAGService"""
+    return get_services().rag_service
+
+
+def get_query_parser() -> LegalQueryParser:
+    """Dependency: shared LegalQueryParser"""
+    return get_services().query_parser
+
+
+def get_shared_graph_service() -> GraphService:
+    """Dependency: shared GraphService"""
+    return get_services().graph_service
+
+
+def get_batch_api() -> "RegulatoryBatchAPI":
+    """Dependency: shared RegulatoryBatchAPI"""
+    return get_services().batch_api
@@ -76,6 +76,7 @@ def populate_from_postgresql(
     
     Pass 1: Create all nodes (Regulation + Section nodes) using batch operations
     Pass 2: Create all relationships (HAS_SECTION, REFERENCES, ENACTED_UNDER, etc.)
+    Finally: Materialize each document's ranked related-document list
     
     This ensures all section nodes exist before creating citation relationships,
     which prevents errors when creating cross-regulation REFERENCES relationships.
@@ -205,6 +206,22 @@ def populate_from_postgresql(
     except Exception as e:
         logger.error(f"✗ Failed to create inter-document relationships: {e}")
     
+    # Precompute related-document lists now that every relationship exists
+    logger.info("\n" + "="*60)
+    logger.info("Materializing related-document lists...")
+    logger.info("="*60)
+    try:
+        stats["related_lists_updated"] = builder.materialize_related_documents()
+        logger.info("✓ Related-document lists materialized")
+    except Exception as e:
+        logger.error(f"✗ Failed to materialize related-document lists: {e}")
+        stats["related_lists_updated"] = 0
+        stats["errors"].append({
+            "regulation": "related-document lists",
+            "pass": 3,
+            "error": str(e)
+        })
+    
     # Print summary
     logger.info("\n" + "="*60)
     logger.info("GRAPH POPULATION SUMMARY")
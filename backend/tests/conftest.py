@@ -280,6 +280,13 @@ def setup_test_elasticsearch():
     #     pass
 
 
+@pytest.fixture(autouse=True)
+def reset_query_embedding_cache(monkeypatch):
+    """Give each test a fresh process-wide query embedding cache (entries and stats)"""
+    import services.search_service as search_service_module
+    monkeypatch.setattr(search_service_module, "_query_embedding_cache", None)
+
+
 @pytest.fixture(scope="function")
 def search_service():
     """Provide search service instance for tests"""
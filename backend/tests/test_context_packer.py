@@ -0,0 +1,57 @@
+"""
+Unit Tests for the Context Packer
+
+Tests token-budgeted packing of RAG context documents.
+"""
+
+from utils.context_packer import ContextPacker, estimate_tokens
+
+
+QUESTION = "Who can claim employment insurance benefits?"
+
+FILLER = " ".join(f"Sentence {i} covers fishing licences and vessels." for i in range(200))
+RELEVANT = "Employment insurance benefits are payable to claimants who lost their employment."
+
+
+def test_docs_within_budget_are_unchanged():
+    """Documents that fit the budget are passed through untouched"""
+    docs = [{'title': 'A', 'content': 'Short section about benefits.'}]
+    packed, stats = ContextPacker().pack(QUESTION, docs, token_budget=1000)
+
+    assert packed == docs
+    assert stats.tokens_saved == 0
+    assert stats.documents_trimmed == 0
+
+
+def test_long_document_keeps_relevant_sentences():
+    """An oversized document is trimmed to the sentences matching the question"""
+    docs = [
+        {'title': 'Short', 'content': 'Employment insurance overview.'},
+        {'title': 'Long', 'content': f"{FILLER} {RELEVANT}"},
+    ]
+    packed, stats = ContextPacker().pack(QUESTION, docs, token_budget=100)
+
+    assert packed[0]['content'] == 'Employment insurance overview.'
+    assert RELEVANT in packed[1]['content']
+    assert 'fishing' not in packed[1]['content']
+    assert stats.documents_trimmed == 1
+    assert stats.packed_tokens <= 100
+    assert stats.tokens_saved == stats.original_tokens - stats.packed_tokens
+    # Source documents are not modified
+    assert docs[1]['content'].startswith('Sentence 0')
+
+
+def test_unmatched_document_degrades_to_opening():
+    """With no query term matches the document keeps its opening sentences"""
+    docs = [{'title': 'Long', 'content': FILLER}]
+    packed, stats = ContextPacker().pack(QUESTION, docs, token_budget=50)
+
+    assert packed[0]['content'].startswith('Sentence 0 covers fishing')
+    assert estimate_tokens(packed[0]['content']) <= 50
+
+
+def test_budget_is_shared_across_documents():
+    """Leftover budget from short documents goes to the long ones"""
+    allocations = ContextPacker._allocate([10, 500, 500], token_budget=210)
+
+    assert allocations == [10, 100, 100]
@@ -0,0 +1,85 @@
+"""
+Unit Tests for Pipelined XML Ingestion
+
+Tests that files parsed in the process pool are stored by the single writer
+in file order, and that a file whose parse fails is counted as failed
+without stopping the run.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from ingestion.data_pipeline import DataIngestionPipeline
+
+
+def make_xml(title, section_text):
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<Consolidation>
+  <Identification>
+    <Chapter>S.C. 2024, c. 1</Chapter>
+    <TitleText>{title}</TitleText>
+  </Identification>
+  <Body>
+    <Section id="1">
+      <Number>1</Number>
+      <Text>{section_text}</Text>
+    </Section>
+  </Body>
+</Consolidation>"""
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Pipeline on a mocked session whose writer records each stored regulation"""
+    pipe = DataIngestionPipeline(
+        db_session=MagicMock(), graph_service=MagicMock(), search_service=MagicMock(),
+        data_dir=str(tmp_path / "regulations")
+    )
+    pipe.stored = []
+
+    async def ingest_xml_file(xml_path, force=False, parsed_reg=None):
+        pipe.stored.append((xml_path, parsed_reg.title))
+        return {'success': True}
+
+    pipe.ingest_xml_file = ingest_xml_file
+    return pipe
+
+
+@pytest.fixture
+def xml_dir(tmp_path):
+    """Two small acts under an en/ directory"""
+    en = tmp_path / "xml" / "en"
+    en.mkdir(parents=True)
+    (en / "a.xml").write_text(make_xml("First Act", "Benefits are payable."))
+    (en / "b.xml").write_text(make_xml("Second Act", "Pensions are payable."))
+    return tmp_path / "xml"
+
+
+TITLES = {"a.xml": "First Act", "b.xml": "Second Act"}
+
+
+@pytest.mark.asyncio
+async def test_pipelined_ingestion_stores_in_file_order(pipeline, xml_dir):
+    """Parsed files reach the writer in the order they were found"""
+    await pipeline.ingest_from_directory(str(xml_dir), postgres_only=True, parse_workers=2)
+
+    assert pipeline.stored == [(str(p), TITLES[p.name]) for p in xml_dir.rglob("*.xml")]
+    assert pipeline.stats['successful'] == 2
+    assert pipeline.stats['failed'] == 0
+
+
+@pytest.mark.asyncio
+async def test_pipelined_ingestion_counts_parse_failures(pipeline, xml_dir):
+    """A file whose parse raises is counted as failed and the rest are still stored"""
+    (xml_dir / "en" / "broken.xml").write_text("<Consolidation><Identification>")
+
+    await pipeline.ingest_from_directory(str(xml_dir), postgres_only=True, parse_workers=2)
+
+    assert pipeline.stored == [
+        (str(p), TITLES[p.name]) for p in xml_dir.rglob("*.xml") if p.name != "broken.xml"
+    ]
+    assert pipeline.stats['total_files'] == 3
+    assert pipeline.stats['successful'] == 2
+    assert pipeline.stats['failed'] == 1
+    pipeline.db.rollback.assert_called()
@@ -0,0 +1,109 @@
+"""
+Unit Tests for the Streaming PostgreSQL → Elasticsearch Sync
+
+Tests that regulations and sections are streamed, merged by regulation,
+bulk indexed in batches and checkpointed for resumption.
+"""
+
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from ingestion.data_pipeline import DataIngestionPipeline
+from models.models import Regulation
+
+
+def make_regulation(n):
+    return SimpleNamespace(
+        id=uuid.UUID(int=n), title=f"Act {n}", full_text=f"Full text {n}",
+        jurisdiction="federal", authority="Parliament", language="en",
+        effective_date=None, status="active", extra_metadata={'chapter': f"c. {n}"}
+    )
+
+
+def make_section(regulation, n):
+    return SimpleNamespace(
+        id=uuid.UUID(int=1000 + n), regulation_id=regulation.id,
+        section_number=str(n), title=None, content=f"Section {n}", extra_metadata={}
+    )
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Pipeline with a mocked session streaming two regulations and three sections"""
+    regulations = [make_regulation(1), make_regulation(2)]
+    sections = [
+        make_section(make_regulation(0), 0),  # Regulation no longer exists
+        make_section(regulations[0], 1),
+        make_section(regulations[0], 2),
+        make_section(regulations[1], 3),
+    ]
+
+    db = MagicMock()
+    db.queries = []
+
+    def query(model):
+        q = MagicMock()
+        q.order_by.return_value = q
+        q.filter.return_value = q
+        q.yield_per.return_value = regulations if model is Regulation else sections
+        db.queries.append(q)
+        return q
+
+    db.query.side_effect = query
+    search_service = MagicMock()
+    search_service.indexed_batches = []
+
+    def bulk_index(docs, **kwargs):
+        search_service.indexed_batches.append(list(docs))
+        return len(docs), 0
+
+    search_service.bulk_index_documents.side_effect = bulk_index
+
+    pipe = DataIngestionPipeline(
+        db_session=db, graph_service=MagicMock(), search_service=search_service,
+        data_dir=str(tmp_path / "regulations")
+    )
+    pipe.sync_checkpoint_path = str(tmp_path / "checkpoint.json")
+    return pipe
+
+
+def test_sync_streams_documents_in_batches(pipeline, tmp_path):
+    """Each regulation is followed by its sections; orphan sections are skipped"""
+    indexed = pipeline.sync_regulations_to_elasticsearch(batch_size=2)
+
+    assert indexed == 2
+    batches = pipeline.search_service.indexed_batches
+    assert [[doc['content'] for doc in batch] for batch in batches] == [
+        ["Full text 1", "Section 1", "Section 2"],
+        ["Full text 2", "Section 3"],
+    ]
+    assert batches[0][1]['citation'] == "c. 1"
+    assert batches[0][1]['regulation_title'] == "Act 1"
+    pipeline.search_service.index_document.assert_not_called()
+    # A completed sync clears its checkpoint
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_sync_checkpoints_completed_regulations(pipeline, tmp_path):
+    """A failure after the first batch leaves a checkpoint at the last full regulation"""
+    checkpoint = tmp_path / "checkpoint.json"
+    bulk = pipeline.search_service.bulk_index_documents
+    bulk_index = bulk.side_effect
+    # bulk_index_documents reports errors as failures rather than raising
+    bulk.side_effect = [(3, 0), (0, 2)]
+
+    with pytest.raises(RuntimeError, match="2 documents failed"):
+        pipeline.sync_regulations_to_elasticsearch(batch_size=2)
+
+    assert json.loads(checkpoint.read_text())['last_regulation_id'] == str(uuid.UUID(int=1))
+
+    # Resuming filters both streams past the checkpointed regulation
+    bulk.side_effect = bulk_index
+    pipeline.db.queries.clear()
+    pipeline.sync_regulations_to_elasticsearch(batch_size=2)
+    for query in pipeline.db.queries:
+        query.filter.assert_called_once()
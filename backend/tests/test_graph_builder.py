@@ -378,5 +378,80 @@ class TestErrorHandling:
             graph_builder.build_regulation_subgraph(regulation_id)
 
 
+class TestSlimNodes:
+    """Test slim-node text storage."""
+    
+    def test_full_text_by_default(self, graph_builder):
+        """Nodes keep their full text unless slim mode is enabled."""
+        text = "word " * 1000
+        assert graph_builder._node_text(text) == text
+        assert graph_builder._node_text(None) == ""
+    
+    def test_slim_mode_keeps_snippet(self, graph_builder):
+        """Slim nodes keep only the opening, cut at a word boundary."""
+        graph_builder.slim_nodes = True
+        graph_builder.node_snippet_chars = 12
+        
+        assert graph_builder._node_text("Employment insurance benefits") == "Employment"
+        assert graph_builder._node_text("Short text") == "Short text"
+
+
+class TestRelatedDocuments:
+    """Test materialized related-document lists."""
+    
+    def test_materializes_in_batches(self, graph_builder, mock_neo4j_client):
+        """All document nodes are processed in related_batch_size batches."""
+        mock_neo4j_client.execute_query = Mock(return_value=[{'id': f'n{i}'} for i in range(5)])
+        graph_builder.related_batch_size = 2
+        
+        updated = graph_builder.materialize_related_documents()
+        
+        assert updated == 5
+        batches = [call.args[1]['ids'] for call in mock_neo4j_client.execute_write.call_args_list]
+        assert batches == [['n0', 'n1'], ['n2', 'n3'], ['n4']]
+        query, params = mock_neo4j_client.execute_write.call_args.args
+        assert 'SET seed.related_ids' in query
+        assert params['weights'] == GraphBuilder.RELATED_TYPE_WEIGHTS
+        assert params['top_n'] == graph_builder.related_top_n
+    
+    def test_failed_batch_is_recorded(self, graph_builder, mock_neo4j_client):
+        """A failing batch is logged in stats and the rest still run."""
+        mock_neo4j_client.execute_write.side_effect = [Exception("timeout"), None]
+        graph_builder.related_batch_size = 1
+        
+        updated = graph_builder.materialize_related_documents(['a', 'b'])
+        
+        assert updated == 1
+        assert len(graph_builder.stats['errors']) == 1
+    
+    def test_refresh_covers_document_neighbourhood(self, graph_builder, mock_neo4j_client):
+        """Incremental refresh materializes the IDs found around the regulation."""
+        regulation_id = uuid.uuid4()
+        mock_neo4j_client.execute_query = Mock(return_value=[{'id': str(regulation_id)}, {'id': 's1'}])
+        
+        updated = graph_builder.refresh_related_documents(regulation_id)
+        
+        assert updated == 2
+        assert mock_neo4j_client.execute_query.call_args.args[1] == {'id': str(regulation_id)}
+        assert mock_neo4j_client.execute_write.call_args.args[1]['ids'] == [str(regulation_id), 's1']
+    
+    def test_refresh_failure_does_not_raise(self, graph_builder, mock_neo4j_client):
+        """A failed refresh leaves the lists stale instead of failing the build."""
+        mock_neo4j_client.execute_query = Mock(side_effect=Exception("Connection failed"))
+        
+        assert graph_builder.refresh_related_documents(uuid.uuid4()) == 0
+
+    def test_build_all_survives_materialize_failure(self, graph_builder, mock_db_session, mock_neo4j_client):
+        """A failed node-ID lookup is recorded instead of aborting the finished build."""
+        mock_db_session.query.return_value.all.return_value = []
+        mock_neo4j_client.execute_query = Mock(side_effect=Exception("Connection failed"))
+
+        with patch.object(graph_builder, 'create_inter_document_relationships'):
+            stats = graph_builder.build_all_documents()
+
+        assert stats['related_lists_updated'] == 0
+        assert stats['errors'] == ["Related documents error: Connection failed"]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
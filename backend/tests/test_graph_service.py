@@ -1,7 +1,7 @@
 """
 Unit tests for GraphService.
 
-Tests the get_graph_stats and get_graph_overview methods.
+Tests the get_graph_stats, get_graph_overview and expand_neighbors methods.
 """
 import pytest
 from unittest.mock import Mock, patch
@@ -258,5 +258,206 @@ class TestIntegrationWithRealQueries:
         assert '-[r]->' in rel_query
 
 
+class TestExpandNeighbors:
+    """Test ID-anchored neighbour expansion."""
+    
+    def test_single_query_anchored_on_ids(self, graph_service, mock_neo4j_client):
+        """All seeds are expanded in one UNWIND query matched by id."""
+        mock_neo4j_client.execute_query.return_value = []
+        
+        graph_service.expand_neighbors(['a', 'b', 'c'], rel_types=['REFERENCES', 'IMPLEMENTS'], limit=5)
+        
+        mock_neo4j_client.execute_query.assert_called_once()
+        query, params = mock_neo4j_client.execute_query.call_args[0]
+        assert 'UNWIND' in query
+        assert '{id: seed_id}' in query
+        assert '[:REFERENCES|IMPLEMENTS*1..1]' in query
+        assert 'queryNodes' not in query
+        assert params == {'ids': ['a', 'b', 'c'], 'limit': 5}
+    
+    def test_formats_and_normalises_scores(self, graph_service, mock_neo4j_client):
+        """Rows keep their server-side order; scores are scaled by the seed weight."""
+        mock_neo4j_client.execute_query.return_value = [
+            {'id': 'n1', 'title': 'Neighbour', 'content': 'text', 'document_type': 'Section',
+             'depth': 1, 'graph_score': 1.5, 'seed_count': 2, 'relationship_types': ['REFERENCES']},
+        ]
+        
+        results = graph_service.expand_neighbors(['a', 'b'])
+        
+        assert results[0]['id'] == 'n1'
+        assert results[0]['document_type'] == 'section'
+        assert results[0]['score'] == pytest.approx(1.0)
+        assert results[0]['seed_count'] == 2
+        assert results[0]['relationship_types'] == ['REFERENCES']
+    
+    def test_rejects_invalid_relationship_types(self, graph_service, mock_neo4j_client):
+        """Relationship types are interpolated, so anything but identifiers is refused."""
+        assert graph_service.expand_neighbors(['a'], rel_types=['REFERENCES]-() DETACH DELETE (']) == []
+        mock_neo4j_client.execute_query.assert_not_called()
+    
+    def test_empty_ids_skip_query(self, graph_service, mock_neo4j_client):
+        """No seeds means no round trip."""
+        assert graph_service.expand_neighbors([]) == []
+        mock_neo4j_client.execute_query.assert_not_called()
+
+
+class TestPrecomputedNeighbors:
+    """Test reads of the materialized related-document lists."""
+    
+    def test_reads_lists_by_id(self, graph_service, mock_neo4j_client):
+        """Seeds are matched by id and their stored lists aggregated, without traversal."""
+        mock_neo4j_client.execute_query.return_value = [
+            {'id': 'n1', 'document_type': 'Legislation', 'depth': 2, 'graph_score': 1.0,
+             'seed_count': 1, 'relationship_types': ['IMPLEMENTS']},
+        ]
+        
+        results = graph_service.find_precomputed_neighbors(['a'], limit=3)
+        
+        query, params = mock_neo4j_client.execute_query.call_args[0]
+        assert 'seed.related_ids' in query
+        assert '*1..' not in query
+        assert params == {'ids': ['a'], 'exclude_ids': ['a'], 'limit': 3, 'max_depth': 2}
+        assert results[0]['id'] == 'n1'
+        assert results[0]['traversal_depth'] == 2
+    
+    def test_disabled_skips_query(self, graph_service, mock_neo4j_client):
+        """With GRAPH_PRECOMPUTED_RELATED off, callers fall back to live expansion."""
+        graph_service.precomputed_related_enabled = False
+        
+        assert graph_service.find_precomputed_neighbors(['a']) == []
+        mock_neo4j_client.execute_query.assert_not_called()
+    
+    def test_traversal_falls_back_to_live_query(self, graph_service, mock_neo4j_client):
+        """Traversal runs the live variable-length query only when no lists exist."""
+        mock_neo4j_client.execute_query.side_effect = [
+            [],
+            [{'id': 'n1', 'document_type': 'Section', 'depth': 1, 'seed_score': 2.0}],
+        ]
+        
+        results = graph_service.find_related_documents_by_traversal("employment insurance", max_depth=1)
+        
+        first_query = mock_neo4j_client.execute_query.call_args_list[0][0][0]
+        second_query = mock_neo4j_client.execute_query.call_args_list[1][0][0]
+        assert 'seed.related_ids' in first_query
+        assert '[*1..1]' in second_query
+        assert results[0]['id'] == 'n1'
+        assert results[0]['score'] == pytest.approx(1.0)
+
+
+class TestFulltextSearch:
+    """Test the Tier 3 full-text search."""
+    
+    @pytest.fixture(autouse=True)
+    def skip_index_check(self, graph_service):
+        graph_service._indexes_checked = True
+    
+    def test_single_unioned_query(self, graph_service, mock_neo4j_client):
+        """All three indexes are searched in one capped query returning bounded text."""
+        mock_neo4j_client.execute_query.return_value = []
+        
+        graph_service._fulltext_search("employment insurance", limit=6, language='en')
+        
+        mock_neo4j_client.execute_query.assert_called_once()
+        query, params = mock_neo4j_client.execute_query.call_args[0]
+        for index_name in ('legislation_fulltext', 'regulation_fulltext', 'section_fulltext'):
+            assert index_name in query
+        assert query.count('UNION ALL') == 2
+        assert 'substring(text, snippet_start, $snippet_chars) as snippet' in query
+        assert params['limit'] == 6
+        assert params['snippet_chars'] == GraphService.FULLTEXT_SNIPPET_CHARS
+        assert all(term == term.lower() for term in params['terms'])
+    
+    def test_falls_back_to_per_index_queries(self, graph_service, mock_neo4j_client):
+        """A failing unioned query is retried one index at a time."""
+        mock_neo4j_client.execute_query.side_effect = [
+            Exception("There is no such fulltext schema index: legislation_fulltext"),
+            [],
+            [{'id': 'r1', 'snippet': 'Employment rules', 'snippet_start': 0,
+              'match_position': 0, 'text_length': 16, 'score': 1.0}],
+            [],
+        ]
+        
+        results = graph_service._fulltext_search("employment", limit=5, language='en')
+        
+        assert mock_neo4j_client.execute_query.call_count == 4
+        assert [doc['id'] for doc in results] == ['r1']
+    
+    def test_formats_server_snippets(self, graph_service, mock_neo4j_client):
+        """Snippets get ellipses where cut, highlights and the match boost."""
+        mock_neo4j_client.execute_query.return_value = [
+            {'id': 'a', 'snippet': 'claim employment insurance', 'snippet_start': 40,
+             'match_position': 46, 'text_length': 5000, 'full_content': 'Opening', 'score': 1.0},
+            {'id': 'b', 'snippet': 'Unrelated text', 'snippet_start': 0,
+             'match_position': -1, 'text_length': 14, 'score': 1.1},
+        ]
+        
+        results = graph_service._fulltext_search("employment", limit=5, language='en')
+        
+        assert results[0]['id'] == 'a'
+        assert results[0]['content'] == '...claim <mark>employment</mark> insurance...'
+        assert results[0]['score'] == pytest.approx(1.2)
+        assert results[0]['full_content'] == 'Opening'
+        assert results[1]['content'] == 'Unrelated text'
+        assert results[1]['has_highlight'] is False
+
+
+class TestSimilaritySearch:
+    """Test the index-backed similarity and fallback searches."""
+    
+    @pytest.fixture(autouse=True)
+    def skip_index_check(self, graph_service):
+        graph_service._indexes_checked = True
+    
+    def test_uses_fuzzy_index_queries(self, graph_service, mock_neo4j_client):
+        """Terms become fuzzy per-field Lucene queries instead of CONTAINS scans."""
+        mock_neo4j_client.execute_query.return_value = []
+        
+        graph_service.similarity_search("Employmnt benefits for EI?", limit=5)
+        
+        query, params = mock_neo4j_client.execute_query.call_args[0]
+        assert 'db.index.fulltext.queryNodes' in query
+        assert "'title:(' + t.lucene + ')'" in query
+        assert 'toLower(coalesce(r.full_text' not in query
+        assert params['fuzzy_terms'] == [
+            {'term': 'employmnt', 'lucene': 'employmnt~2'},
+            {'term': 'benefits', 'lucene': 'benefits~2'},
+            {'term': 'for', 'lucene': 'for'},
+        ]
+        assert params['min_sim'] == 0.3
+        assert params['limit'] == 5
+    
+    def test_keeps_scoring_shape(self, graph_service, mock_neo4j_client):
+        """Results keep similarity scores and title/content match counts."""
+        mock_neo4j_client.execute_query.return_value = [
+            {'id': 's1', 'title': 'Benefits', 'snippet': 'Employment benefits are payable',
+             'snippet_start': 0, 'match_position': 11, 'text_length': 31, 'score': 2.0,
+             'title_matches': 1, 'content_matches': 2, 'document_type': 'section'},
+        ]
+        
+        results = graph_service.similarity_search("employment benefits")
+        
+        assert results[0]['score'] == 2.0
+        assert results[0]['title_matches'] == 1
+        assert results[0]['content_matches'] == 2
+        assert results[0]['similarity_type'] == 'fuzzy'
+        assert '<mark>benefits</mark>' in results[0]['content']
+    
+    def test_fallback_scans_only_without_indexes(self, graph_service, mock_neo4j_client):
+        """The CONTAINS label scan only runs when the fuzzy index query fails."""
+        mock_neo4j_client.execute_query.side_effect = [
+            Exception("There is no such fulltext schema index: section_fulltext"),
+            [{'result': {'id': 'l1', 'title': 'GST Act', 'content': 'text', 'score': 2.0}}],
+        ]
+        
+        results = graph_service._fallback_contains_search("GST/HST rules", limit=5, language='en')
+        
+        fuzzy_params = mock_neo4j_client.execute_query.call_args_list[0][0][1]
+        scan_query = mock_neo4j_client.execute_query.call_args_list[1][0][0]
+        assert [t['term'] for t in fuzzy_params['fuzzy_terms']] == ['gst', 'hst', 'rules']
+        assert fuzzy_params['min_sim'] == 0.0
+        assert 'CONTAINS' in scan_query
+        assert results[0]['id'] == 'l1'
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
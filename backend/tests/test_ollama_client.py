@@ -10,7 +10,7 @@ Created: 2025-12-16
 
 import pytest
 import os
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from services.ollama_client import OllamaClient, LLMError
 
 
@@ -205,6 +205,39 @@ class TestOllamaClient:
             assert cost["total_cost"] == 0.00
             assert cost["provider"] == "ollama"
 
+    @pytest.mark.asyncio
+    async def test_generate_stream_yields_chunks(self):
+        """Test streaming yields each chunk and asks Ollama for a streamed response"""
+        requests_seen = []
+
+        async def fake_stream_request(endpoint, data, timeout=30):
+            requests_seen.append(data)
+            for chunk in ["Hello", " world", "!"]:
+                yield chunk
+
+        with patch.object(OllamaClient, '_check_availability', return_value=True):
+            client = OllamaClient()
+        client.is_available_async = AsyncMock(return_value=True)
+        client._stream_request_async = fake_stream_request
+
+        chunks = [chunk async for chunk in client.generate_stream("Test prompt")]
+
+        assert chunks == ["Hello", " world", "!"]
+        assert requests_seen[0]["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_generate_stream_unavailable(self):
+        """Test streaming reports unavailability as a trailing LLMError"""
+        with patch.object(OllamaClient, '_check_availability', return_value=False):
+            client = OllamaClient()
+        client.is_available_async = AsyncMock(return_value=False)
+
+        items = [item async for item in client.generate_stream("Test prompt")]
+
+        assert len(items) == 1
+        assert isinstance(items[0], LLMError)
+        assert "not available" in items[0].message
+
 
 class TestLLMError:
     """Test suite for LLMError dataclass"""
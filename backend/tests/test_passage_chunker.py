@@ -0,0 +1,36 @@
+"""
+Unit Tests for Passage Chunking
+
+Tests sentence-aligned, overlapping passage splitting for the passage index.
+"""
+
+from utils.passage_chunker import split_passages
+
+
+def test_short_text_is_one_passage():
+    """Text within the limit is returned as a single passage"""
+    assert split_passages("A short section.", max_words=10) == ["A short section."]
+    assert split_passages("   ", max_words=10) == []
+
+
+def test_passages_overlap_on_sentence_boundaries():
+    """Consecutive passages share trailing sentences and respect the word limit"""
+    text = " ".join(f"Sentence number {i} has six words." for i in range(20))
+    passages = split_passages(text, max_words=30, overlap_words=10)
+
+    assert len(passages) > 1
+    for previous, current in zip(passages, passages[1:]):
+        assert len(current.split()) <= 30
+        # The next passage starts with the last two sentences of the previous one
+        assert previous.endswith(" ".join(current.split()[:12]))
+    assert passages[0].startswith("Sentence number 0")
+    assert passages[-1].endswith("Sentence number 19 has six words.")
+
+
+def test_long_sentence_is_split_on_words():
+    """A sentence longer than the limit is cut into word windows"""
+    text = " ".join(f"w{i}" for i in range(50))
+    passages = split_passages(text, max_words=20, overlap_words=5)
+
+    assert [len(p.split()) for p in passages] == [20, 20, 10]
+    assert " ".join(passages).split() == text.split()
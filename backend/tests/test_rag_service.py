@@ -8,9 +8,11 @@ Author: Developer 2 (AI/ML Engineer)
 Created: 2025-11-22
 """
 
+import asyncio
+import json
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from services.rag_service import RAGService, RAGAnswer, Citation
+from unittest.mock import Mock, patch, MagicMock, AsyncMock
+from services.rag_service import RAGService, RAGAnswer, Citation, QueryContext
 
 
 class TestRAGService:
@@ -248,6 +250,32 @@ class TestRAGService:
         assert 'Content 2' in context
         assert '---' in context  # Separator
 
+    def test_pack_context_trims_to_budget(self, rag_service):
+        """Test oversized context documents are packed into the token budget"""
+        rag_service.context_window_tokens = 2000
+        relevant = "Employment insurance benefits are payable to claimants who lost their employment."
+        filler = " ".join(f"Clause {i} regulates fishing vessels." for i in range(2000))
+        docs = [{'id': 'doc1', 'title': 'Long Act', 'content': f"{filler} {relevant}"}]
+
+        context, stats = rag_service._pack_context(
+            "Who can claim employment insurance benefits?", docs, system_prompt="Answer briefly.", max_tokens=500
+        )
+
+        assert relevant in context
+        assert stats['tokens_saved'] > 0
+        assert stats['packed_tokens'] <= stats['token_budget']
+        assert docs[0]['content'].startswith('Clause 0')  # Source documents untouched
+
+    def test_pack_context_disabled(self, rag_service):
+        """Test packing can be switched off"""
+        rag_service.context_packing_enabled = False
+        docs = [{'id': 'doc1', 'title': 'Doc', 'content': 'Full content'}]
+
+        context, stats = rag_service._pack_context("Question?", docs, "Prompt", 100)
+
+        assert context == rag_service._build_context_string(docs)
+        assert stats is None
+
     def test_build_citations_from_context(self, rag_service):
         """Test citation building from context document metadata"""
         docs = [
@@ -360,6 +388,82 @@ class TestRAGService:
         call_args = mock_search_service.hybrid_search.call_args
         assert call_args is not None
 
+    def test_query_parsed_once_per_request(self, rag_service, mock_query_parser):
+        """Test the question is parsed and language-detected once per answer"""
+        with patch.object(rag_service, '_detect_language', return_value='en') as detect:
+            rag_service.answer_question("What is EI?", use_cache=False)
+
+        assert mock_query_parser.parse_query.call_count == 1
+        assert detect.call_count == 1
+
+    def test_query_context_reused(self, rag_service, mock_query_parser, mock_search_service):
+        """Test a caller-provided QueryContext skips parsing and carries search terms"""
+        with patch.object(rag_service, '_detect_language', return_value='en'):
+            ctx = rag_service.build_query_context("What does the Employment Insurance Act cover?")
+        mock_query_parser.parse_query.reset_mock()
+        mock_search_service._extract_act_names.return_value = ['Employment Insurance Act']
+
+        rag_service.answer_question(ctx.question, use_cache=False, query_context=ctx)
+
+        mock_query_parser.parse_query.assert_not_called()
+        assert ctx.enhanced_query is not None
+        assert ctx.act_names == ['Employment Insurance Act']
+        assert mock_search_service.hybrid_search.call_args_list[0].kwargs['act_names'] == ['Employment Insurance Act']
+
+    def test_speculative_tiers_prefer_best_ranked(self, rag_service):
+        """Test speculative mode takes tier 1 when it passes even if tier 2 also has results"""
+        rag_service.speculative_tiers_enabled = True
+        tier1_docs = [{'id': 'a', 'title': 'A', 'content': 'x', 'score': 2.0}]
+        tier2_docs = [{'id': 'b', 'title': 'B', 'content': 'y', 'score': 1.0}]
+
+        with patch.object(rag_service, '_tier1_elasticsearch_optimized', return_value=tier1_docs), \
+             patch.object(rag_service, '_tier2_elasticsearch_relaxed', return_value=tier2_docs), \
+             patch.object(rag_service, '_assess_result_quality', return_value=(True, {})), \
+             patch.object(rag_service, '_should_apply_graph_enhancement', return_value={'should_enhance': False}):
+            docs, metadata = rag_service._multi_tier_search("What is EI?", {'language': 'en'}, num_context_docs=1)
+
+        assert metadata['tier_used'] == 1
+        assert metadata['speculative_tiers'] == [1, 2]
+        assert metadata['tiers_attempted'] == [1]
+        assert docs == tier1_docs
+
+    def test_speculative_tiers_share_one_executor(self, rag_service):
+        """Test every request submits to the same bounded pool"""
+        rag_service.speculative_tiers_enabled = True
+        tier_docs = [{'id': 'a', 'title': 'A', 'content': 'x', 'score': 2.0}]
+
+        with patch.object(rag_service, '_tier1_elasticsearch_optimized', return_value=tier_docs), \
+             patch.object(rag_service, '_tier2_elasticsearch_relaxed', return_value=tier_docs), \
+             patch.object(rag_service, '_assess_result_quality', return_value=(True, {})), \
+             patch.object(rag_service, '_should_apply_graph_enhancement', return_value={'should_enhance': False}):
+            rag_service._multi_tier_search("What is EI?", {'language': 'en'}, num_context_docs=1)
+            executor = rag_service._speculative_executor
+            rag_service._multi_tier_search("What is CPP?", {'language': 'en'}, num_context_docs=1)
+
+        assert rag_service._speculative_executor is executor
+        assert executor._max_workers == rag_service.speculative_max_workers
+
+    def test_speculative_tier_deadline(self, rag_service):
+        """Test a speculative tier that misses its deadline counts as empty"""
+        import time as time_module
+        rag_service.speculative_tiers_enabled = True
+        rag_service.tier_deadline_seconds = 0.05
+        tier2_docs = [{'id': 'b', 'title': 'B', 'content': 'y', 'score': 1.0}]
+
+        def slow_tier1(*args, **kwargs):
+            time_module.sleep(0.5)
+            return [{'id': 'a', 'title': 'A', 'content': 'x', 'score': 2.0}]
+
+        with patch.object(rag_service, '_tier1_elasticsearch_optimized', side_effect=slow_tier1), \
+             patch.object(rag_service, '_tier2_elasticsearch_relaxed', return_value=tier2_docs), \
+             patch.object(rag_service, '_assess_result_quality', return_value=(True, {})), \
+             patch.object(rag_service, '_should_apply_graph_enhancement', return_value={'should_enhance': False}):
+            docs, metadata = rag_service._multi_tier_search("What is EI?", {'language': 'en'}, num_context_docs=1)
+
+        assert metadata['tier_timeouts'] == [1]
+        assert metadata['tier_used'] == 2
+        assert docs == tier2_docs
+
     def test_rag_answer_to_dict(self):
         """Test RAGAnswer serialization"""
         answer = RAGAnswer(
@@ -380,6 +484,404 @@ class TestRAGService:
         assert answer_dict['citations'][0]['section'] == "1"
 
 
+class TestRAGServiceAsync:
+    """Test the async RAG pipeline used by the API routes"""
+
+    @pytest.fixture
+    def hits(self):
+        """Elasticsearch hits returned by the async hybrid search (enough to pass the tier 1 quality gate)"""
+        return {
+            'hits': [
+                {
+                    'id': f'doc{n}',
+                    'score': 25.0,
+                    'source': {
+                        'title': f'Employment Insurance Act - Section {n + 6}',
+                        'content': 'Persons who have lost employment may apply for benefits.',
+                        'citation': f'S.C. 1996, c. 23, s. {n + 6}',
+                        'section_number': str(n + 6)
+                    }
+                }
+                for n in range(1, 6)
+            ],
+            'total': 5
+        }
+
+    @pytest.fixture
+    def mock_llm_client(self):
+        """Create a mock LLM client with async methods"""
+        mock = MagicMock()
+        mock.is_available_async = AsyncMock(return_value=True)
+        mock.generate_with_context_async = AsyncMock(
+            return_value=("Benefits are available to eligible workers [Employment Insurance Act, Section 7].", None)
+        )
+        mock.aclose = AsyncMock()
+        return mock
+
+    @pytest.fixture
+    def mock_graph_service(self):
+        """Create a mock graph service with async tier 3 methods"""
+        mock = MagicMock()
+        mock.semantic_search_for_rag_async = AsyncMock(return_value=[])
+        mock.find_related_documents_by_traversal_async = AsyncMock(return_value=[])
+        mock.find_precomputed_neighbors_async = AsyncMock(return_value=[])
+        mock.expand_neighbors_async = AsyncMock(return_value=[])
+        mock.client.close_async = AsyncMock()
+        return mock
+
+    @pytest.fixture
+    def rag_service(self, hits, mock_llm_client, mock_graph_service):
+        """Create RAG service with async-capable mocks"""
+        search_service = MagicMock()
+        search_service.hybrid_search_async = AsyncMock(return_value=hits)
+        search_service.aclose = AsyncMock()
+
+        postgres_search_service = MagicMock()
+        postgres_search_service.full_text_search.return_value = []
+        postgres_search_service.metadata_only_search.return_value = []
+
+        query_parser = MagicMock()
+        parsed = Mock()
+        parsed.intent.value = 'eligibility'
+        parsed.intent_confidence = 0.8
+        parsed.filters = {}
+        query_parser.parse_query.return_value = parsed
+
+        return RAGService(
+            search_service=search_service,
+            llm_client=mock_llm_client,
+            query_parser=query_parser,
+            statistics_service=MagicMock(),
+            postgres_search_service=postgres_search_service,
+            graph_service=mock_graph_service
+        )
+
+    @pytest.mark.asyncio
+    async def test_answer_question_async(self, rag_service, mock_llm_client):
+        """Test async question answering awaits the async clients"""
+        answer = await rag_service.answer_question_async(
+            question="Can I apply for EI?",
+            num_context_docs=1,
+            use_cache=False
+        )
+
+        assert isinstance(answer, RAGAnswer)
+        assert answer.question == "Can I apply for EI?"
+        assert 0.0 <= answer.confidence_score <= 1.0
+        rag_service.search_service.hybrid_search_async.assert_awaited()
+        rag_service.search_service.hybrid_search.assert_not_called()
+        assert answer.metadata['tier_used'] == 1
+        assert answer.source_documents
+        mock_llm_client.generate_with_context_async.assert_awaited_once()
+        mock_llm_client.generate_with_context.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_batch_does_not_share_language(self, rag_service):
+        """Test concurrent questions sharing one filters dict each get their own language"""
+        filters = {'jurisdiction': 'federal'}
+
+        await asyncio.gather(
+            rag_service.answer_question_async("Can I apply for EI?", filters=filters, use_cache=False),
+            rag_service.answer_question_async("Puis-je demander l'assurance-emploi?", filters=filters, use_cache=False)
+        )
+
+        assert filters == {'jurisdiction': 'federal'}
+        languages = {
+            call.kwargs['filters']['language']
+            for call in rag_service.search_service.hybrid_search_async.await_args_list
+        }
+        assert languages == {'en', 'fr'}
+
+    @pytest.mark.asyncio
+    async def test_async_no_context_found(self, rag_service):
+        """Test async path when every tier comes back empty"""
+        rag_service.search_service.hybrid_search_async.return_value = {'hits': [], 'total': 0}
+
+        answer = await rag_service.answer_question_async(
+            question="Unknown topic?",
+            use_cache=False
+        )
+
+        assert answer.confidence_score == 0.0
+        assert 'no_context_found' in answer.metadata.get('error', '')
+        assert answer.metadata['tiers_attempted'] == [1, 2, 3, 4, 5]
+        rag_service.graph_service.semantic_search_for_rag_async.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_async_llm_unavailable(self, rag_service, mock_llm_client):
+        """Test async path when the LLM is unavailable"""
+        mock_llm_client.is_available_async.return_value = False
+
+        answer = await rag_service.answer_question_async(
+            question="Can I apply for EI?",
+            num_context_docs=1,
+            use_cache=False
+        )
+
+        assert answer.source_documents
+        assert answer.metadata.get('error') == 'gemini_unavailable'
+        mock_llm_client.generate_with_context_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_async_graph_enhancement_single_expansion(self, rag_service, mock_graph_service):
+        """Test graph enhancement expands all seeds in one call and skips base documents"""
+        mock_graph_service.expand_neighbors_async.return_value = [
+            {'id': 'doc4', 'title': 'Already in base', 'content': 'x', 'score': 0.9},
+            {'id': 'related1', 'title': 'Related', 'content': 'x', 'score': 0.5},
+        ]
+        base = [{'id': 'doc1'}, {'id': 'doc2'}, {'id': 'doc3'}, {'id': 'doc4'}]
+
+        enhanced = await rag_service._apply_graph_enhancement_async(
+            base_results=base,
+            question="What does section 7 reference?",
+            num_additional=3
+        )
+
+        assert [doc['id'] for doc in enhanced] == ['doc1', 'doc2', 'doc3', 'doc4', 'related1']
+        mock_graph_service.expand_neighbors_async.assert_awaited_once()
+        assert mock_graph_service.expand_neighbors_async.call_args.kwargs['ids'] == ['doc1', 'doc2', 'doc3']
+        mock_graph_service.find_related_documents_by_traversal_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_async_tier3_hydrates_slim_nodes(self, rag_service, mock_graph_service):
+        """Test slim graph results get their text from PostgreSQL in one batch"""
+        rag_service.graph_slim_nodes = True
+        mock_graph_service.semantic_search_for_rag_async.return_value = [
+            {'id': 'sec1', 'title': 'Section 7', 'content': 'Snippet', 'score': 1.0},
+        ]
+        mock_graph_service.find_related_documents_by_traversal_async.return_value = [
+            {'id': 'sec2', 'title': 'Section 8', 'content': 'Snippet', 'score': 0.5},
+        ]
+        fetch = rag_service.postgres_search_service.fetch_document_texts
+        fetch.return_value = {'sec1': 'Full text of section 7'}
+
+        documents = await rag_service._tier3_neo4j_graph_async("Section 7?", None, 4)
+
+        fetch.assert_called_once_with(['sec1', 'sec2'])
+        assert [doc['content'] for doc in documents] == ['Full text of section 7', 'Snippet']
+
+    @pytest.mark.asyncio
+    async def test_async_graph_enhancement_prefers_precomputed(self, rag_service, mock_graph_service):
+        """Test graph enhancement reads precomputed neighbour lists before expanding live"""
+        mock_graph_service.find_precomputed_neighbors_async.return_value = [
+            {'id': 'related1', 'title': 'Related', 'content': 'x', 'score': 1.0},
+        ]
+
+        enhanced = await rag_service._apply_graph_enhancement_async(
+            base_results=[{'id': 'doc1'}],
+            question="What does section 7 reference?",
+            num_additional=3
+        )
+
+        assert [doc['id'] for doc in enhanced] == ['doc1', 'related1']
+        mock_graph_service.expand_neighbors_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_async_speculative_falls_through_to_tier2(self, rag_service):
+        """Test async speculative mode uses tier 2 when tier 1 fails its quality check"""
+        rag_service.speculative_tiers_enabled = True
+
+        def quality(results, question, tier):
+            return (tier != 1, {'reason': 'low_score'})
+
+        with patch.object(rag_service, '_assess_result_quality', side_effect=quality), \
+             patch.object(rag_service, '_should_apply_graph_enhancement', return_value={'should_enhance': False}):
+            docs, metadata = await rag_service._multi_tier_search_async(
+                "What is EI?", {'language': 'en'}, num_context_docs=1
+            )
+
+        assert metadata['tier_used'] == 2
+        assert metadata['tiers_attempted'] == [1, 2]
+        assert rag_service.search_service.hybrid_search_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_answer_question_stream(self, rag_service, mock_llm_client):
+        """Test streaming sends metadata and citations before tokens, then done"""
+        async def fake_stream(**kwargs):
+            for chunk in ["Benefits are available ", "to eligible workers."]:
+                yield chunk
+
+        mock_llm_client.generate_with_context_stream = fake_stream
+
+        events = [
+            event async for event in rag_service.answer_question_stream(
+                question="Can I apply for EI?",
+                num_context_docs=1,
+                use_cache=False
+            )
+        ]
+
+        names = [event.event for event in events]
+        assert names[:2] == ['metadata', 'citations']
+        assert names[-1] == 'done'
+        assert "".join(e.data['text'] for e in events if e.event == 'token') == \
+            "Benefits are available to eligible workers."
+        assert events[0].data['source_documents'][0]['id'] == 'doc1'
+        assert isinstance(events[-1].answer, RAGAnswer)
+        assert events[-1].answer.answer == "Benefits are available to eligible workers."
+        mock_llm_client.generate_with_context_async.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_answer_question_stream_llm_error(self, rag_service, mock_llm_client):
+        """Test a generation failure is reported as an error event and not cached"""
+        error = Mock()
+        error.error_type = 'rate_limit'
+        error.message = 'The AI service is busy.'
+        error.to_dict.return_value = {'error_type': 'rate_limit'}
+
+        async def failing_stream(**kwargs):
+            yield error
+
+        mock_llm_client.generate_with_context_stream = failing_stream
+
+        events = [
+            event async for event in rag_service.answer_question_stream(
+                question="Can I apply for EI?",
+                num_context_docs=1
+            )
+        ]
+
+        error_events = [e for e in events if e.event == 'error']
+        assert len(error_events) == 1
+        assert error_events[0].data == {'error': 'rate_limit', 'message': 'The AI service is busy.'}
+        assert events[-1].event == 'done'
+        assert rag_service.get_cache_stats()['total_entries'] == 0
+
+    @pytest.mark.asyncio
+    async def test_answer_question_stream_no_context(self, rag_service):
+        """Test a stream with no context documents ends with an error event"""
+        rag_service.search_service.hybrid_search_async.return_value = {'hits': [], 'total': 0}
+
+        events = [
+            event async for event in rag_service.answer_question_stream(
+                question="Unknown topic?",
+                use_cache=False
+            )
+        ]
+
+        assert [event.event for event in events] == ['metadata', 'citations', 'token', 'error', 'done']
+        assert events[3].data['error'] == 'no_context_found'
+
+    @pytest.mark.asyncio
+    async def test_aclose(self, rag_service, mock_llm_client, mock_graph_service):
+        """Test closing async clients"""
+        await rag_service.aclose()
+
+        rag_service.search_service.aclose.assert_awaited_once()
+        mock_llm_client.aclose.assert_awaited_once()
+        mock_graph_service.client.close_async.assert_awaited_once()
+
+
+class TestRAGAnswerCache:
+    """Test the two-tier (LRU + Redis) RAG answer cache"""
+
+    @pytest.fixture
+    def answer(self):
+        """A cacheable answer"""
+        return RAGAnswer(
+            question="Can I apply for EI?",
+            answer="Yes, if you meet the insurable hours requirement.",
+            citations=[Citation(text="S.C. 1996, c. 23, Section 7", document_id="doc1", section="7", confidence=1.0)],
+            confidence_score=0.85,
+            source_documents=[{'id': 'doc1', 'title': 'Employment Insurance Act', 'score': 1.5}],
+            intent='eligibility',
+            metadata={'tier_used': 1}
+        )
+
+    @pytest.fixture
+    def rag_service(self):
+        """RAG service with mocked dependencies and no Redis"""
+        with patch.dict('os.environ', {'RAG_CACHE_REDIS': 'false', 'RAG_CACHE_MAX_ENTRIES': '2'}):
+            return RAGService(
+                search_service=MagicMock(),
+                llm_client=MagicMock(),
+                query_parser=MagicMock(),
+                statistics_service=MagicMock(),
+                postgres_search_service=MagicMock(),
+                graph_service=MagicMock()
+            )
+
+    def test_answer_round_trip(self, rag_service, answer):
+        """Test answers are serialized into the cache and rebuilt on hit"""
+        rag_service.cache_enabled = True
+        rag_service._cache_answer(answer.question, answer)
+
+        cached = rag_service._get_cached_answer("  can I apply for EI?  ")
+
+        assert cached is not answer
+        assert cached.answer == answer.answer
+        assert cached.citations[0].text == "S.C. 1996, c. 23, Section 7"
+        assert cached.source_documents == answer.source_documents
+
+    def test_lru_eviction(self, rag_service, answer):
+        """Test the least recently used answer is evicted at capacity"""
+        rag_service.cache_enabled = True
+        for question in ["first question?", "second question?"]:
+            rag_service._cache_answer(question, answer)
+        rag_service._get_cached_answer("first question?")  # Mark as recently used
+        rag_service._cache_answer("third question?", answer)
+
+        assert rag_service._get_cached_answer("first question?") is not None
+        assert rag_service._get_cached_answer("second question?") is None
+        assert rag_service.get_cache_stats()['evictions'] == 1
+
+    def test_redis_hit_populates_local_tier(self, rag_service, answer):
+        """Test a miss in the local tier falls back to the shared Redis tier"""
+        rag_service.cache_enabled = True
+        redis_client = MagicMock()
+        redis_client.get.return_value = json.dumps(answer.to_dict())
+        rag_service.cache.redis = redis_client
+        rag_service.cache.redis_available = True
+
+        cached = rag_service._get_cached_answer(answer.question)
+
+        assert cached.answer == answer.answer
+        redis_client.get.assert_called_once_with(rag_service._get_cache_key(answer.question))
+        assert rag_service.get_cache_stats()['total_entries'] == 1
+
+    def test_redis_error_backs_off(self, rag_service, answer):
+        """Test a Redis error skips the shared tier until the retry interval passes"""
+        rag_service.cache_enabled = True
+        redis_client = MagicMock()
+        redis_client.get.side_effect = ConnectionError("timed out")
+        rag_service.cache.redis = redis_client
+        rag_service.cache.redis_available = True
+
+        assert rag_service._get_cached_answer("first question?") is None
+        assert rag_service._get_cached_answer("second question?") is None
+        rag_service._cache_answer(answer.question, answer)
+
+        redis_client.get.assert_called_once()
+        redis_client.setex.assert_not_called()
+        assert rag_service.get_cache_stats()['redis_available'] is False
+
+    def test_clear_cache_deletes_shared_keys(self, rag_service):
+        """Test clearing the cache removes only answer keys from Redis"""
+        redis_client = MagicMock()
+        redis_client.scan_iter.return_value = ['rag:answer:abc']
+        rag_service.cache.redis = redis_client
+        rag_service.cache.redis_available = True
+
+        rag_service.clear_cache()
+
+        redis_client.scan_iter.assert_called_once_with(match='rag:answer:*', count=500)
+        redis_client.delete.assert_called_once_with('rag:answer:abc')
+
+
+class TestQueryContext:
+    """Test QueryContext dataclass"""
+
+    def test_intent_property(self):
+        """Test intent is read from the parsed query"""
+        parsed = Mock()
+        parsed.intent.value = 'eligibility'
+        ctx = QueryContext(question="Can I apply for EI?", parsed_query=parsed, language='en')
+
+        assert ctx.intent == 'eligibility'
+        assert ctx.enhanced_query is None
+        assert ctx.act_names is None
+
+
 class TestCitation:
     """Test Citation dataclass"""
 
@@ -10,7 +10,10 @@ Created: 2025-11-22
 
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from services.search_service import SearchService
+import numpy as np
+from pathlib import Path
+from services.search_service import SearchService, get_query_embedding_cache
+from utils.embedding_cache import EmbeddingCache
 
 
 class TestSearchService:
@@ -30,6 +33,7 @@ class TestSearchService:
         with patch('services.search_service.Elasticsearch', return_value=mock_es):
             service = SearchService()
             service.es = mock_es
+            service.embedding_cache_enabled = False  # Keep unit tests off disk
             return service
 
     def test_init_service(self, search_service):
@@ -63,6 +67,70 @@ class TestSearchService:
 
         assert success is True or success is False
 
+    def test_build_index_body_vector_options(self, search_service, mock_es):
+        """Test the embedding mapping gets the configured HNSW options"""
+        search_service.hnsw_m = 32
+        search_service.hnsw_ef_construction = 200
+        mock_es.info.return_value = {'version': {'number': '8.13.4'}}
+
+        body = search_service.build_index_body(vector_index_type="int8_hnsw")
+
+        assert body['mappings']['properties']['embedding']['index_options'] == {
+            'type': 'int8_hnsw', 'm': 32, 'ef_construction': 200
+        }
+
+    def test_build_index_body_int8_falls_back_on_old_cluster(self, search_service, mock_es):
+        """Test int8_hnsw falls back to float HNSW before Elasticsearch 8.12"""
+        mock_es.info.return_value = {'version': {'number': '8.11.0'}}
+
+        body = search_service.build_index_body(vector_index_type="int8_hnsw")
+
+        assert body['mappings']['properties']['embedding']['index_options']['type'] == 'hnsw'
+
+    def test_num_candidates_policy(self, search_service):
+        """Test kNN candidates scale with k, are capped, and never drop below k"""
+        search_service.knn_candidates_factor = 10
+        search_service.knn_max_candidates = 100
+
+        assert search_service._num_candidates(5) == 50
+        assert search_service._num_candidates(20) == 100
+        assert search_service._num_candidates(150) == 150
+
+    def test_swap_alias_replaces_old_index(self, search_service, mock_es):
+        """Test the alias moves atomically and the previous index is deleted"""
+        mock_es.indices.exists_alias.return_value = True
+        mock_es.indices.get_alias.return_value = {'regulatory_documents_v1': {'aliases': {}}}
+
+        assert search_service.swap_alias('regulatory_documents_v2') is True
+
+        actions = mock_es.indices.update_aliases.call_args.kwargs['actions']
+        assert actions == [
+            {'add': {'index': 'regulatory_documents_v2', 'alias': 'regulatory_documents'}},
+            {'remove': {'index': 'regulatory_documents_v1', 'alias': 'regulatory_documents'}}
+        ]
+        mock_es.indices.delete.assert_called_once_with(index='regulatory_documents_v1')
+
+    def test_swap_alias_migrates_concrete_index(self, search_service, mock_es):
+        """Test a pre-alias concrete index is removed in the same alias update"""
+        mock_es.indices.exists_alias.return_value = False
+        mock_es.indices.exists.return_value = True
+
+        assert search_service.swap_alias('regulatory_documents_v2') is True
+
+        actions = mock_es.indices.update_aliases.call_args.kwargs['actions']
+        assert {'remove_index': {'index': 'regulatory_documents'}} in actions
+        mock_es.indices.delete.assert_not_called()
+
+    def test_create_versioned_index_disables_refresh(self, search_service, mock_es):
+        """Test bulk-load indices start with refresh off and no replicas"""
+        index_name = search_service.create_versioned_index()
+
+        assert index_name.startswith('regulatory_documents_v')
+        body = mock_es.indices.create.call_args.kwargs['body']
+        assert body['settings']['index']['refresh_interval'] == '-1'
+        assert body['settings']['index']['number_of_replicas'] == 0
+        assert 'aliases' not in body
+
     def test_build_filters_jurisdiction(self, search_service):
         """Test building jurisdiction filter"""
         filters = {'jurisdiction': 'federal'}
@@ -356,8 +424,8 @@ class TestSearchService:
             }
         }
 
-        # Mock both searches
-        mock_es.search.side_effect = [mock_keyword_response, mock_vector_response]
+        # Both legs come back from a single _msearch
+        mock_es.msearch.return_value = {'responses': [mock_keyword_response, mock_vector_response]}
 
         with patch.object(search_service, '_get_embedder') as mock_embedder:
             mock_model = Mock()
@@ -373,6 +441,127 @@ class TestSearchService:
             assert 'weights' in results
             assert results['weights']['keyword'] == 0.6
             assert results['weights']['vector'] == 0.4
+            mock_es.msearch.assert_called_once()
+            mock_es.search.assert_not_called()
+
+    def test_hybrid_search_server_mode(self, search_service, mock_es):
+        """Test server-side hybrid search sends one query+knn request with named boosts"""
+        search_service.hybrid_search_mode = "server"
+        mock_es.search.return_value = {
+            'hits': {
+                'total': {'value': 1},
+                'max_score': 20.0,
+                'hits': [
+                    {
+                        '_id': 'doc1',
+                        '_score': 20.0,
+                        '_source': {'title': 'Employment Insurance Act', 'document_type': 'regulation'},
+                        'matched_queries': {'keyword': 4.0, 'title_boost': 10.0, 'doc_type_boost': 5.0}
+                    }
+                ]
+            }
+        }
+
+        with patch.object(search_service, '_get_embedder') as mock_embedder:
+            mock_model = Mock()
+            mock_embedding = Mock()
+            mock_embedding.tolist.return_value = [0.1] * 384
+            mock_model.encode.return_value = mock_embedding
+            mock_embedder.return_value = mock_model
+
+            results = search_service.hybrid_search("Tell me about the Employment Insurance Act")
+
+        mock_es.search.assert_called_once()
+        body = mock_es.search.call_args.kwargs['body']
+        assert 'knn' in body and 'query' in body
+        boost_names = [clause['constant_score']['_name'] for clause in body['query']['bool']['should']]
+        assert boost_names == ['title_boost', 'doc_type_boost']
+
+        assert results['search_type'] == 'hybrid_intelligent'
+        breakdown = results['hits'][0]['score_breakdown']
+        assert breakdown['title_boost'] == 10.0
+        assert breakdown['vector'] == pytest.approx(1.0)
+        assert breakdown['combined'] == 20.0
+
+    def test_hybrid_search_fetches_content_for_top_k_only(self, search_service, mock_es):
+        """Test hybrid candidates skip content and the final hits are hydrated by mget"""
+        def leg(doc_id, score):
+            return {
+                'hits': {
+                    'total': {'value': 1},
+                    'max_score': score,
+                    'hits': [{'_id': doc_id, '_score': score, '_source': {'title': doc_id}}]
+                }
+            }
+
+        mock_es.msearch.return_value = {'responses': [leg('doc1', 1.0), leg('doc2', 0.9)]}
+        mock_es.mget.return_value = {
+            'docs': [
+                {'_id': 'doc1', 'found': True, '_source': {'content': 'x' * 1000}},
+                {'_id': 'doc2', 'found': True, '_source': {'content': 'y' * 1000}}
+            ]
+        }
+
+        with patch.object(search_service, '_encode_query', return_value=[0.1] * 384):
+            results = search_service.hybrid_search("test query", size=1, source_profile="list")
+
+        searches = mock_es.msearch.call_args.kwargs['searches']
+        for body in (searches[1], searches[3]):
+            assert 'content' not in body['_source']['includes']
+            assert 'embedding' not in body['_source']['includes']
+
+        mget_kwargs = mock_es.mget.call_args.kwargs
+        assert mget_kwargs['ids'] == [hit['id'] for hit in results['hits']]
+        assert mget_kwargs['source_includes'] == ['content']
+        hit = results['hits'][0]
+        assert hit['source']['title'] == hit['id']
+        # List hits carry a preview rather than the full text
+        assert len(hit['source']['content']) == SearchService.PREVIEW_CHARS
+
+    def test_full_profile_never_returns_embeddings(self, search_service, mock_es):
+        """Test the default profile excludes the embedding vector"""
+        mock_es.search.return_value = {'hits': {'total': {'value': 0}, 'max_score': None, 'hits': []}}
+
+        search_service.keyword_search("test")
+
+        body = mock_es.search.call_args.kwargs['body']
+        assert body['_source'] == {'excludes': ['embedding']}
+        # Highlighting is opt-in
+        assert 'highlight' not in body
+
+    def test_hybrid_search_highlights_final_hits_only(self, search_service, mock_es):
+        """Test hybrid highlighting runs as a second pass restricted to the returned IDs"""
+        def leg(doc_id, score):
+            return {
+                'hits': {
+                    'total': {'value': 1},
+                    'max_score': score,
+                    'hits': [{'_id': doc_id, '_score': score, '_source': {'title': doc_id}}]
+                }
+            }
+
+        mock_es.msearch.return_value = {'responses': [leg('doc1', 1.0), leg('doc2', 0.9)]}
+        mock_es.mget.return_value = {'docs': []}
+        mock_es.search.return_value = {
+            'hits': {
+                'total': {'value': 2},
+                'max_score': None,
+                'hits': [{'_id': 'doc1', '_score': None, 'highlight': {'content': ['<em>benefits</em>']}}]
+            }
+        }
+
+        with patch.object(search_service, '_encode_query', return_value=[0.1] * 384):
+            results = search_service.hybrid_search("benefits", highlight=True)
+
+        searches = mock_es.msearch.call_args.kwargs['searches']
+        assert 'highlight' not in searches[1]
+
+        body = mock_es.search.call_args.kwargs['body']
+        assert sorted(body['query']['ids']['values']) == ['doc1', 'doc2']
+        assert body['_source'] is False
+        hits = {hit['id']: hit for hit in results['hits']}
+        assert hits['doc1']['highlights'] == {'content': ['<em>benefits</em>']}
+        assert 'highlights' not in hits['doc2']
 
     def test_get_document_success(self, search_service, mock_es):
         """Test retrieving a document"""
@@ -476,9 +665,8 @@ class TestSearchService:
 
         with patch.object(search_service, '_get_embedder') as mock_embedder:
             mock_model = Mock()
-            mock_embedding = Mock()
-            mock_embedding.tolist.return_value = [0.1] * 384
-            mock_model.encode.return_value = mock_embedding
+            # Embeddings are batch-encoded: one (n, d) row per text
+            mock_model.encode.return_value = np.full((1, 384), 0.1, dtype=np.float32)
             mock_embedder.return_value = mock_model
 
             doc = {
@@ -492,8 +680,9 @@ class TestSearchService:
             assert success is True
             mock_es.index.assert_called_once()
             # Verify embedding was added
-            call_args = mock_es.index.call_args
-            assert 'embedding' in call_args[1]['document']
+            embedding = mock_es.index.call_args[1]['document']['embedding']
+            assert len(embedding) == 384
+            assert embedding[0] == pytest.approx(0.1)
 
     def test_index_document_no_embedding(self, search_service, mock_es):
         """Test indexing without generating embedding"""
@@ -527,7 +716,7 @@ class TestSearchService:
             mock_model = Mock()
             mock_embedding = Mock()
             mock_embedding.tolist.return_value = [0.1] * 384
-            mock_model.encode.return_value = mock_embedding
+            mock_model.encode.return_value = [mock_embedding, mock_embedding]
             mock_embedder.return_value = mock_model
 
             with patch('services.search_service.bulk') as mock_bulk:
@@ -538,6 +727,192 @@ class TestSearchService:
                 assert success == 2
                 assert failed == 0
                 mock_bulk.assert_called_once()
+                # All documents are embedded in a single batched call
+                mock_model.encode.assert_called_once()
+
+    def test_build_passages_carries_parent_metadata(self, search_service):
+        """Test passages copy parent metadata and link back to the parent"""
+        search_service.passage_max_words = 20
+        search_service.passage_overlap_words = 5
+        content = " ".join(f"Provision {i} applies to every claimant." for i in range(10))
+        doc = {'id': 'sec1', 'title': 'Section 7', 'document_type': 'section',
+               'content': content, 'embedding': [0.1]}
+
+        passages = search_service.build_passages(doc)
+
+        assert len(passages) > 1
+        assert [p['id'] for p in passages] == [f"sec1:{i}" for i in range(len(passages))]
+        for index, passage in enumerate(passages):
+            assert passage['parent_id'] == 'sec1'
+            assert passage['passage_index'] == index
+            assert passage['passage_count'] == len(passages)
+            assert passage['title'] == 'Section 7'
+            assert 'embedding' not in passage
+            assert len(passage['content'].split()) <= 20
+
+    def test_passage_search_rolls_up_to_parents(self, search_service, mock_es):
+        """Test passage hits are grouped per parent with the best passage score"""
+        def passage_hit(parent_id, index, score):
+            return {
+                '_id': f"{parent_id}:{index}",
+                '_score': score,
+                '_source': {'parent_id': parent_id, 'passage_index': index, 'passage_count': 3,
+                            'title': parent_id.upper(), 'content': f"{parent_id} passage {index}"},
+                'matched_queries': {'keyword': 1.0}
+            }
+
+        mock_es.search.return_value = {
+            'hits': {
+                'total': {'value': 4},
+                'max_score': 9.0,
+                'hits': [
+                    passage_hit('sec2', 2, 9.0),
+                    passage_hit('sec1', 1, 7.0),
+                    passage_hit('sec2', 0, 5.0),
+                    passage_hit('sec1', 0, 3.0),
+                ]
+            }
+        }
+
+        with patch.object(search_service, '_encode_query', return_value=[0.1] * 384):
+            results = search_service.passage_search("claimant benefits", size=5)
+
+        assert mock_es.search.call_args.kwargs['index'] == SearchService.PASSAGE_INDEX_NAME
+        assert results['search_type'] == 'passage'
+        assert [hit['id'] for hit in results['hits']] == ['sec2', 'sec1']
+        top = results['hits'][0]
+        assert top['score'] == 9.0
+        assert top['source']['title'] == 'SEC2'
+        assert 'parent_id' not in top['source']
+        # Passages are joined in document order
+        assert top['source']['content'] == "sec2 passage 0 [...] sec2 passage 2"
+
+    def test_bulk_index_documents_parallel(self, search_service, mock_es):
+        """Test bulk indexing with worker threads counts per-item results"""
+        search_service.bulk_threads = 4
+        docs = [{'id': f'doc{i}', 'title': f'Doc {i}', 'content': 'Content'} for i in range(3)]
+
+        with patch('services.search_service.parallel_bulk') as mock_parallel:
+            mock_parallel.return_value = iter([(True, {}), (False, {'index': {'error': 'x'}}), (True, {})])
+
+            success, failed = search_service.bulk_index_documents(
+                docs, generate_embeddings=False, index_name='regulatory_documents_v2'
+            )
+
+        assert (success, failed) == (2, 1)
+        actions = mock_parallel.call_args[0][1]
+        assert {action['_index'] for action in actions} == {'regulatory_documents_v2'}
+        assert mock_parallel.call_args.kwargs['thread_count'] == 4
+
+    def test_encode_texts_preserves_order(self, search_service):
+        """Test that length-sorted batch encoding returns vectors in input order"""
+        texts = ['a', 'ccc', 'bb']
+
+        def fake_encode(batch, **kwargs):
+            vectors = []
+            for text in batch:
+                vector = Mock()
+                vector.tolist.return_value = [float(len(text))]
+                vectors.append(vector)
+            return vectors
+
+        with patch.object(search_service, '_get_embedder') as mock_embedder:
+            mock_model = Mock()
+            mock_model.encode.side_effect = fake_encode
+            mock_embedder.return_value = mock_model
+
+            embeddings = search_service.encode_texts(texts, batch_size=2)
+
+            assert embeddings == [[1.0], [3.0], [2.0]]
+            # Longest text is encoded first so mini-batches pad to similar lengths
+            assert mock_model.encode.call_args[0][0] == ['ccc', 'bb', 'a']
+            assert mock_model.encode.call_args[1]['batch_size'] == 2
+
+    def test_encode_texts_uses_embedding_cache(self, search_service, tmp_path):
+        """Test that cached texts skip the model and new vectors are persisted"""
+        search_service.embedding_cache_enabled = True
+        search_service.embedding_cache_dir = str(tmp_path)
+
+        def fake_encode(batch, **kwargs):
+            return np.array([[float(len(text))] * 4 for text in batch], dtype=np.float32)
+
+        with patch.object(search_service, '_get_embedder') as mock_embedder:
+            mock_model = Mock()
+            mock_model.get_sentence_embedding_dimension.return_value = 4
+            mock_model.encode.side_effect = fake_encode
+            mock_embedder.return_value = mock_model
+
+            first = search_service.encode_texts(['aa', 'bbbb'])
+            second = search_service.encode_texts(['bbbb', 'cccccc', 'aa'])
+
+            assert first == [[2.0] * 4, [4.0] * 4]
+            assert second == [[4.0] * 4, [6.0] * 4, [2.0] * 4]
+            # Second call only encodes the one unseen text
+            assert mock_model.encode.call_args[0][0] == ['cccccc']
+            assert search_service._embedding_cache.stats()['vectors'] == 3
+
+        # A fresh cache instance reads the vectors back from disk
+        reopened = EmbeddingCache(str(tmp_path), search_service.embedding_model_name, 4)
+        assert reopened.get_many(['cccccc', 'missing']) == [[6.0] * 4, None]
+
+    def test_embedding_cache_defaults(self, mock_es, monkeypatch):
+        """Test the persistent cache is opt-in and relative dirs resolve under backend/"""
+        monkeypatch.delenv("EMBEDDING_CACHE_ENABLED", raising=False)
+        monkeypatch.setenv("EMBEDDING_CACHE_DIR", "data/embedding_cache")
+        with patch('services.search_service.Elasticsearch', return_value=mock_es):
+            service = SearchService()
+
+        assert service.embedding_cache_enabled is False
+        backend_dir = Path(__file__).resolve().parent.parent
+        assert Path(service.embedding_cache_dir).resolve() == backend_dir / "data" / "embedding_cache"
+
+    def test_embedding_cache_disabled_without_file_locking(self, search_service, tmp_path):
+        """Test that platforms without fcntl encode without the persistent cache"""
+        search_service.embedding_cache_enabled = True
+        search_service.embedding_cache_dir = str(tmp_path)
+
+        with patch('services.search_service.FILE_LOCKING_AVAILABLE', False):
+            assert search_service._get_embedding_cache() is None
+
+        assert search_service.embedding_cache_enabled is False
+        assert not any(tmp_path.iterdir())
+
+    def test_encode_query_is_cached(self, search_service):
+        """Test that repeated queries (modulo whitespace) reuse the cached embedding"""
+        with patch.object(search_service, '_get_embedder') as mock_embedder:
+            mock_model = Mock()
+            mock_model.encode.return_value = np.array([0.5, 0.25])
+            mock_embedder.return_value = mock_model
+
+            first = search_service._encode_query("employment insurance")
+            second = search_service._encode_query("  employment   insurance ")
+
+            assert first == second == [0.5, 0.25]
+            mock_model.encode.assert_called_once()
+            stats = get_query_embedding_cache().get_stats()
+            assert stats['hits'] == 1
+            assert stats['misses'] == 1
+
+    def test_encode_queries_single_model_call(self, search_service):
+        """Test that batch query encoding sends all misses to the model at once"""
+        def fake_encode(batch, **kwargs):
+            # A single string encodes to one vector, a list to one row per text
+            if isinstance(batch, str):
+                return np.array([float(len(batch))])
+            return np.array([[float(len(text))] for text in batch])
+
+        with patch.object(search_service, '_get_embedder') as mock_embedder:
+            mock_model = Mock()
+            mock_model.encode.side_effect = fake_encode
+            mock_embedder.return_value = mock_model
+
+            search_service._encode_query("a")
+            embeddings = search_service.encode_queries(["bb", "a", "ccc", "bb"])
+
+            assert embeddings == [[2.0], [1.0], [3.0], [2.0]]
+            assert mock_model.encode.call_count == 2
+            # Cached and duplicate queries are not re-encoded
+            assert mock_model.encode.call_args[0][0] == ["bb", "ccc"]
 
     def test_pagination(self, search_service, mock_es):
         """Test search pagination"""
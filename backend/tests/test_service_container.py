@@ -0,0 +1,81 @@
+"""
+Unit Tests for the Service Container
+
+Tests that the process-wide container builds one shared service stack and
+wires the same instances into RAG and batch processing.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+import services.service_container as service_container
+from services.service_container import ServiceContainer, get_services, shutdown_services
+
+
+@pytest.fixture
+def patched_services():
+    """Patch the expensive service constructors used by the container"""
+    with patch.object(service_container, 'SearchService') as search_cls, \
+         patch.object(service_container, 'get_graph_service') as graph_getter, \
+         patch.object(service_container, 'get_llm_client') as llm_getter, \
+         patch.object(service_container, 'LegalQueryParser') as parser_cls, \
+         patch.object(service_container, 'RAGService') as rag_cls:
+        rag_cls.return_value.aclose = AsyncMock()
+        service_container._container = None
+        yield {
+            'search': search_cls,
+            'graph': graph_getter,
+            'llm': llm_getter,
+            'parser': parser_cls,
+            'rag': rag_cls,
+        }
+        service_container._container = None
+
+
+def test_container_shares_one_stack(patched_services):
+    """RAG service receives the container's search service, LLM client and parser"""
+    container = ServiceContainer()
+
+    patched_services['search'].assert_called_once_with()
+    patched_services['rag'].assert_called_once_with(
+        search_service=container.search_service,
+        llm_client=container.llm_client,
+        query_parser=container.query_parser,
+        graph_service=container.graph_service
+    )
+
+
+def test_get_services_is_singleton(patched_services):
+    """get_services builds the container once per process"""
+    assert get_services() is get_services()
+    assert patched_services['search'].call_count == 1
+
+
+def test_batch_api_reuses_shared_services(patched_services):
+    """Batch API is built lazily on the shared search, RAG and parser services"""
+    container = ServiceContainer()
+
+    with patch('utils.regulatory_batch.RegulatoryBatchAPI') as batch_cls:
+        batch_api = container.batch_api
+        assert container.batch_api is batch_api
+
+    batch_cls.assert_called_once_with(
+        search_service=container.search_service,
+        rag_service=container.rag_service,
+        query_parser=container.query_parser
+    )
+
+
+@pytest.mark.asyncio
+async def test_startup_preloads_embedder_and_shutdown_closes(patched_services, monkeypatch):
+    """Lifespan hooks load the embedding model once and close the clients"""
+    monkeypatch.setenv("PRELOAD_EMBEDDING_MODEL", "true")
+    container = get_services()
+
+    await container.startup()
+    container.search_service._get_embedder.assert_called_once()
+
+    await shutdown_services()
+    container.rag_service.aclose.assert_awaited_once()
+    container.search_service.stop_embedding_pool.assert_called_once()
+    assert service_container._container is None
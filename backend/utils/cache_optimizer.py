@@ -19,7 +19,7 @@ Created: 2025-11-22
 import time
 import hashlib
 import threading
-from typing import Any, Optional, Callable, Dict, List, Tuple
+from typing import Any, Optional, Callable, Dict, List, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import OrderedDict
@@ -332,21 +332,108 @@ class InMemoryCache:
             }
 
 
+# === O(1) LRU Cache ===
+
+class LRUCache:
+    """
+    OrderedDict-backed LRU cache with per-entry TTL
+
+    Drop-in local tier for MultiTierCache: get/set/delete are O(1) because
+    the least recently used entry is always at the front of the OrderedDict
+    (no scan over all entries on eviction, unlike InMemoryCache).
+    """
+
+    def __init__(self, max_size: int = 1000, default_ttl: Optional[int] = 3600):
+        """
+        Initialize cache
+
+        Args:
+            max_size: Maximum number of entries
+            default_ttl: Default TTL in seconds (None = no expiry)
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.cache: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache (None if missing or expired)"""
+        with self._lock:
+            item = self.cache.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = item
+            if expires_at is not None and time.time() > expires_at:
+                del self.cache[key]
+                self.misses += 1
+                return None
+
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Set value in cache, evicting the least recently used entry if full"""
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self.cache[key] = (value, expires_at)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Delete entry from cache"""
+        with self._lock:
+            return self.cache.pop(key, None) is not None
+
+    def clear(self):
+        """Clear all cache entries"""
+        with self._lock:
+            self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            total_requests = self.hits + self.misses
+            hit_rate = (self.hits / total_requests * 100) if total_requests > 0 else 0
+
+            return {
+                'size': len(self.cache),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(hit_rate, 2),
+                'evictions': self.evictions
+            }
+
+
 # === Multi-Tier Cache ===
 
 class MultiTierCache:
     """
     Multi-tier cache with local (in-memory) and remote (Redis) layers
 
-    Implements cache-aside pattern with automatic fallback
+    Implements cache-aside pattern with automatic fallback. After a Redis
+    error the remote tier is skipped for ``redis_retry_seconds`` so an
+    unreachable server does not cost a socket timeout on every call.
     """
 
     def __init__(
         self,
-        local_cache: Optional[InMemoryCache] = None,
+        local_cache: Optional[Union[InMemoryCache, LRUCache]] = None,
         redis_client = None,
         local_ttl: int = 300,  # 5 minutes
-        redis_ttl: int = 3600  # 1 hour
+        redis_ttl: int = 3600,  # 1 hour
+        redis_retry_seconds: float = 30.0
     ):
         """
         Initialize multi-tier cache
@@ -356,6 +443,7 @@ class MultiTierCache:
             redis_client: Redis client instance
             local_ttl: TTL for local cache
             redis_ttl: TTL for Redis cache
+            redis_retry_seconds: How long to skip Redis after an error
         """
         self.local = local_cache or InMemoryCache(
             max_size=1000,
@@ -365,16 +453,30 @@ class MultiTierCache:
 
         self.redis = redis_client
         self.redis_ttl = redis_ttl
-        self.redis_available = False
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis_down_until = 0.0
 
         if redis_client:
             try:
                 redis_client.ping()
-                self.redis_available = True
                 logger.info("Multi-tier cache: Redis available")
-            except:
+            except Exception:
+                self._mark_redis_down()
                 logger.warning("Multi-tier cache: Redis unavailable, using local only")
 
+    @property
+    def redis_available(self) -> bool:
+        """Whether the Redis tier is configured and not backing off after an error"""
+        return self.redis is not None and time.monotonic() >= self._redis_down_until
+
+    @redis_available.setter
+    def redis_available(self, available: bool):
+        self._redis_down_until = 0.0 if available else float('inf')
+
+    def _mark_redis_down(self):
+        """Skip the Redis tier until the retry interval has passed"""
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache (checks local, then Redis)
@@ -403,6 +505,7 @@ class MultiTierCache:
 
                     return value
             except Exception as e:
+                self._mark_redis_down()
                 logger.error(f"Redis get error: {e}")
 
         return None
@@ -423,9 +526,10 @@ class MultiTierCache:
         if self.redis_available:
             try:
                 redis_ttl = ttl if ttl else self.redis_ttl
-                serialized = json.dumps(value)
+                serialized = json.dumps(value, default=str)
                 self.redis.setex(key, redis_ttl, serialized)
             except Exception as e:
+                self._mark_redis_down()
                 logger.error(f"Redis set error: {e}")
 
     def delete(self, key: str):
@@ -436,8 +540,27 @@ class MultiTierCache:
             try:
                 self.redis.delete(key)
             except Exception as e:
+                self._mark_redis_down()
                 logger.error(f"Redis delete error: {e}")
 
+    def clear(self, pattern: Optional[str] = None):
+        """
+        Clear the local tier and, if a pattern is given, matching Redis keys
+
+        Args:
+            pattern: Redis key pattern to delete (e.g. "rag:answer:*")
+        """
+        self.local.clear()
+
+        if self.redis_available and pattern:
+            try:
+                keys = list(self.redis.scan_iter(match=pattern, count=500))
+                if keys:
+                    self.redis.delete(*keys)
+            except Exception as e:
+                self._mark_redis_down()
+                logger.error(f"Redis clear error: {e}")
+
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics from both tiers"""
         stats = {
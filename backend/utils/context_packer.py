@@ -0,0 +1,226 @@
+"""
+Token-Budgeted Context Packing
+
+Fits retrieved documents into the LLM prompt budget. Documents that fit their
+share of the budget are kept whole; longer ones (full regulations from the
+PostgreSQL tiers, long graph bodies) are cut down to the sentences that score
+highest against the question with BM25, kept in their original order.
+
+Token counts are estimated from character length (about 4 characters per
+token for English/French legal text), so no tokenizer is needed for either
+Gemini or Ollama models.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Tuple
+
+CHARS_PER_TOKEN = 4
+ELISION = " [...] "
+
+# Sentence boundaries: end punctuation followed by whitespace, or line breaks
+_SENTENCE_SPLIT = re.compile(r'(?<=[.;:!?])\s+|\n+')
+_TERM = re.compile(r'\w+', re.UNICODE)
+
+_STOPWORDS = {
+    # English
+    'the', 'and', 'for', 'are', 'was', 'were', 'with', 'that', 'this', 'from',
+    'what', 'which', 'who', 'how', 'can', 'does', 'any', 'all', 'not', 'but',
+    'has', 'have', 'had', 'its', 'into', 'under', 'such', 'may', 'shall', 'about',
+    # French
+    'les', 'des', 'une', 'est', 'pour', 'dans', 'par', 'sur', 'que', 'qui',
+    'aux', 'avec', 'son', 'ses', 'ces', 'cette', 'sont', 'pas', 'peut', 'quel',
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for a piece of text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _terms(text: str) -> List[str]:
+    """Lowercased content terms used for BM25 scoring"""
+    return [t for t in _TERM.findall(text.lower()) if len(t) > 2 and t not in _STOPWORDS]
+
+
+@dataclass
+class ContextPackingStats:
+    """Token accounting for one packed context"""
+    token_budget: int
+    original_tokens: int
+    packed_tokens: int
+    tokens_saved: int
+    documents: int
+    documents_trimmed: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+
+class ContextPacker:
+    """Packs context documents into a token budget using BM25 sentence selection"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize the packer.
+
+        Args:
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+        """
+        self.k1 = k1
+        self.b = b
+
+    def pack(
+        self,
+        question: str,
+        docs: List[Dict[str, Any]],
+        token_budget: int
+    ) -> Tuple[List[Dict[str, Any]], ContextPackingStats]:
+        """
+        Fit document contents into a token budget.
+
+        Args:
+            question: User question the sentences are scored against
+            docs: Context documents in rank order (each with a 'content' field)
+            token_budget: Tokens available for all document contents
+
+        Returns:
+            Tuple of (documents with trimmed 'content', packing statistics).
+            Input documents are not modified.
+        """
+        contents = [doc.get('content') or '' for doc in docs]
+        sizes = [estimate_tokens(content) for content in contents]
+        original_tokens = sum(sizes)
+
+        if original_tokens <= token_budget:
+            return list(docs), ContextPackingStats(
+                token_budget=token_budget,
+                original_tokens=original_tokens,
+                packed_tokens=original_tokens,
+                tokens_saved=0,
+                documents=len(docs),
+                documents_trimmed=0
+            )
+
+        allocations = self._allocate(sizes, token_budget)
+        sentences = [self._split_sentences(content) for content in contents]
+        scores = self._score_sentences(question, sentences)
+
+        packed_docs = []
+        packed_tokens = 0
+        trimmed = 0
+        for doc, content, size, allocation, doc_sentences, doc_scores in zip(
+            docs, contents, sizes, allocations, sentences, scores
+        ):
+            if size > allocation:
+                content = self._select_sentences(doc_sentences, doc_scores, allocation)
+                doc = {**doc, 'content': content}
+                trimmed += 1
+            packed_tokens += estimate_tokens(content)
+            packed_docs.append(doc)
+
+        return packed_docs, ContextPackingStats(
+            token_budget=token_budget,
+            original_tokens=original_tokens,
+            packed_tokens=packed_tokens,
+            tokens_saved=original_tokens - packed_tokens,
+            documents=len(docs),
+            documents_trimmed=trimmed
+        )
+
+    @staticmethod
+    def _allocate(sizes: List[int], token_budget: int) -> List[int]:
+        """
+        Split the budget across documents (water-filling).
+
+        Short documents keep everything; the leftover is shared evenly among
+        the documents that still need more.
+        """
+        allocations = [0] * len(sizes)
+        remaining = token_budget
+        pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+        while pending:
+            share = remaining // len(pending)
+            i = pending[0]
+            if sizes[i] <= share:
+                allocations[i] = sizes[i]
+                remaining -= sizes[i]
+                pending.pop(0)
+                continue
+            for i in pending:
+                allocations[i] = share
+            break
+        return allocations
+
+    @staticmethod
+    def _split_sentences(content: str) -> List[str]:
+        """Split content into sentences/lines, dropping empty fragments"""
+        return [s.strip() for s in _SENTENCE_SPLIT.split(content) if s and s.strip()]
+
+    def _score_sentences(self, question: str, sentences: List[List[str]]) -> List[List[float]]:
+        """BM25 score of every sentence against the question (IDF over all sentences)"""
+        query_terms = set(_terms(question))
+        tokenized = [[_terms(sentence) for sentence in doc] for doc in sentences]
+        all_sentences = [terms for doc in tokenized for terms in doc]
+        if not query_terms or not all_sentences:
+            return [[0.0] * len(doc) for doc in sentences]
+
+        n = len(all_sentences)
+        avg_len = sum(len(terms) for terms in all_sentences) / n or 1.0
+        doc_freq = Counter(term for terms in all_sentences for term in set(terms) & query_terms)
+        idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+        scores = []
+        for doc in tokenized:
+            doc_scores = []
+            for terms in doc:
+                tf = Counter(terms)
+                norm = self.k1 * (1 - self.b + self.b * len(terms) / avg_len)
+                doc_scores.append(sum(
+                    weight * tf[term] * (self.k1 + 1) / (tf[term] + norm)
+                    for term, weight in idf.items() if tf[term]
+                ))
+            scores.append(doc_scores)
+        return scores
+
+    @staticmethod
+    def _select_sentences(sentences: List[str], scores: List[float], allocation: int) -> str:
+        """
+        Keep the best-scoring sentences that fit the allocation, in document order.
+
+        Sentences with no query term are dropped unless nothing in the
+        document matches, in which case it degrades to its opening.
+        """
+        ranked = sorted(range(len(sentences)), key=lambda i: (-scores[i], i))
+        if any(scores):
+            ranked = [i for i in ranked if scores[i] > 0]
+        budget_chars = allocation * CHARS_PER_TOKEN
+        chosen = []
+        used = 0
+        for i in ranked:
+            cost = len(sentences[i]) + len(ELISION)
+            if used + cost > budget_chars:
+                continue
+            chosen.append(i)
+            used += cost
+
+        if not chosen:
+            # Even the best sentence is too long: keep its head
+            best = ranked[0] if ranked else None
+            return sentences[best][:budget_chars] if best is not None else ''
+
+        chosen.sort()
+        parts = [sentences[chosen[0]]]
+        for prev, i in zip(chosen, chosen[1:]):
+            parts.append((' ' if i == prev + 1 else ELISION) + sentences[i])
+        text = ''.join(parts)
+        if chosen[0] > 0:
+            text = ELISION.lstrip() + text
+        return text
@@ -0,0 +1,195 @@
+"""
+Persistent Embedding Cache
+
+Content-addressed, on-disk store of document embeddings so re-indexing
+(mapping/analyzer changes, full rebuilds) only pays for the Elasticsearch
+bulk write instead of re-running the embedding model over every section.
+
+Layout (one directory per embedding model):
+    <cache_dir>/<model>/vectors.f32   float32 matrix, one row per text (memory-mapped)
+    <cache_dir>/<model>/keys.bin      SHA-256 digest of each row's text, in row order
+    <cache_dir>/<model>/meta.json     model name and embedding dimension
+
+Entries are append-only. Vectors are written before their key, so a crash
+can leave an orphan vector row but never a key pointing at missing data.
+Appends take an exclusive file lock, so the API and a reindex script can
+share one cache directory.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, callers should not open the cache
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Appends rely on flock to serialize writers across processes
+FILE_LOCKING_AVAILABLE = fcntl is not None
+
+DIGEST_SIZE = 32  # SHA-256
+
+
+class EmbeddingCache:
+    """Memory-mapped embedding store keyed by (model name, SHA-256 of text)"""
+
+    def __init__(self, cache_dir: str, model_name: str, dimension: int):
+        """
+        Open (or create) the cache for one embedding model.
+
+        Args:
+            cache_dir: Root cache directory
+            model_name: Embedding model name (each model gets its own store)
+            dimension: Embedding dimension
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.row_bytes = dimension * 4
+
+        safe_name = model_name.replace("/", "__")
+        self.path = Path(cache_dir) / safe_name
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.path / "vectors.f32"
+        self.keys_path = self.path / "keys.bin"
+        self.lock_path = self.path / ".lock"
+
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, int] = {}
+        self._keys_offset = 0  # Bytes of keys.bin already loaded into _index
+        self._vectors: Optional[np.memmap] = None
+
+        self.hits = 0
+        self.misses = 0
+
+        self._check_meta()
+        self._refresh_index()
+        logger.info(f"Embedding cache ready at {self.path} ({len(self._index)} vectors)")
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        """SHA-256 digest used as the content address of a text"""
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def _check_meta(self) -> None:
+        """Write meta.json on first use; reset the store if the dimension changed"""
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta.get("dimension") == self.dimension:
+                return
+            logger.warning(
+                f"Embedding cache dimension mismatch ({meta.get('dimension')} != {self.dimension}); resetting {self.path}"
+            )
+            for stale in (self.vectors_path, self.keys_path):
+                if stale.exists():
+                    stale.unlink()
+        meta_path.write_text(json.dumps({"model": self.model_name, "dimension": self.dimension}))
+
+    def _refresh_index(self) -> None:
+        """Load keys appended since the last refresh (by this or another process)"""
+        if not self.keys_path.exists():
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        usable = len(data) - len(data) % DIGEST_SIZE
+        row = self._keys_offset // DIGEST_SIZE
+        for start in range(0, usable, DIGEST_SIZE):
+            self._index.setdefault(data[start:start + DIGEST_SIZE], row)
+            row += 1
+        self._keys_offset += usable
+
+    def _row(self, row: int) -> np.ndarray:
+        """Read one vector row, re-mapping the file if it has grown"""
+        if self._vectors is None or row >= self._vectors.shape[0]:
+            rows = os.path.getsize(self.vectors_path) // self.row_bytes
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+        return self._vectors[row]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            One entry per text: the cached vector, or None on a miss
+        """
+        results: List[Optional[List[float]]] = []
+        with self._lock:
+            self._refresh_index()
+            for text in texts:
+                row = self._index.get(self.digest(text))
+                if row is None:
+                    results.append(None)
+                    self.misses += 1
+                else:
+                    results.append(self._row(row).tolist())
+                    self.hits += 1
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> int:
+        """
+        Store embeddings for texts that are not cached yet.
+
+        Args:
+            texts: Embedded texts
+            vectors: Embedding for each text
+
+        Returns:
+            Number of new vectors written
+        """
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh_index()
+
+                new_keys: List[bytes] = []
+                new_vectors = []
+                seen = set()
+                for text, vector in zip(texts, vectors):
+                    key = self.digest(text)
+                    if key in self._index or key in seen:
+                        continue
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_vectors.append(vector)
+                if not new_keys:
+                    return 0
+
+                first_row = self._keys_offset // DIGEST_SIZE
+                matrix = np.asarray(new_vectors, dtype=np.float32).reshape(len(new_keys), self.dimension)
+
+                # Vectors first, then keys; both are written at the last complete
+                # row so leftovers from an interrupted write are overwritten
+                for path, payload, offset in (
+                    (self.vectors_path, matrix.tobytes(), first_row * self.row_bytes),
+                    (self.keys_path, b"".join(new_keys), self._keys_offset),
+                ):
+                    with open(path, "r+b" if path.exists() else "wb") as f:
+                        f.seek(offset)
+                        f.write(payload)
+                        f.truncate()
+                        f.flush()
+                        os.fsync(f.fileno())
+
+                for offset, key in enumerate(new_keys):
+                    self._index[key] = first_row + offset
+                self._keys_offset += len(new_keys) * DIGEST_SIZE
+                return len(new_keys)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss counters"""
+        return {"vectors": len(self._index), "hits": self.hits, "misses": self.misses}
@@ -2,7 +2,7 @@
 Neo4j database client for knowledge graph operations.
 Provides connection management and query execution utilities.
 """
-from neo4j import GraphDatabase, Driver, Session
+from neo4j import AsyncDriver, AsyncGraphDatabase, GraphDatabase, Driver, Session
 from typing import Dict, List, Any, Optional
 import os
 import json
@@ -38,6 +38,7 @@ class Neo4jClient:
         self.password = password or os.getenv("NEO4J_PASSWORD", "password123")
         
         self._driver: Optional[Driver] = None
+        self._async_driver: Optional[AsyncDriver] = None
         
     def connect(self) -> Driver:
         """Establish connection to Neo4j."""
@@ -52,6 +53,19 @@ class Neo4jClient:
             logger.info(f"Connected to Neo4j at {self.uri}")
         return self._driver
     
+    def connect_async(self) -> AsyncDriver:
+        """Establish the async connection used by async routes."""
+        if not self._async_driver:
+            self._async_driver = AsyncGraphDatabase.driver(
+                self.uri,
+                auth=(self.user, self.password),
+                max_connection_lifetime=3600,
+                max_connection_pool_size=50,
+                connection_acquisition_timeout=60
+            )
+            logger.info(f"Connected to Neo4j (async) at {self.uri}")
+        return self._async_driver
+    
     def close(self):
         """Close Neo4j connection."""
         if self._driver:
@@ -59,6 +73,13 @@ class Neo4jClient:
             self._driver = None
             logger.info("Neo4j connection closed")
     
+    async def close_async(self):
+        """Close the async Neo4j connection."""
+        if self._async_driver:
+            await self._async_driver.close()
+            self._async_driver = None
+            logger.info("Neo4j async connection closed")
+    
     def verify_connectivity(self) -> bool:
         """
         Verify Neo4j connection.
@@ -94,6 +115,26 @@ class Neo4jClient:
             result = session.run(query, parameters or {})
             return [dict(record) for record in result]
     
+    async def execute_query_async(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute a Cypher query on the async driver and return results.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters
+            
+        Returns:
+            List of result records as dictionaries
+        """
+        driver = self.connect_async()
+        async with driver.session() as session:
+            result = await session.run(query, parameters or {})
+            return [dict(record) async for record in result]
+    
     def execute_write(
         self,
         query: str,
@@ -0,0 +1,67 @@
+"""
+Passage Chunking
+
+Splits section and regulation text into overlapping, sentence-aligned
+passages small enough for the sentence-transformer window (all-MiniLM-L6-v2
+truncates input at 256 word pieces, roughly 180 English words), so every part
+of a long document gets embedded and can be retrieved on its own.
+"""
+
+import re
+from typing import List
+
+# Sentence boundaries: end punctuation followed by whitespace, or line breaks
+_SENTENCE_SPLIT = re.compile(r'(?<=[.;:!?])\s+|\n+')
+
+
+def split_passages(text: str, max_words: int = 160, overlap_words: int = 40) -> List[str]:
+    """
+    Split text into overlapping passages of at most ``max_words`` words.
+
+    Passages end on sentence boundaries where possible; each passage after the
+    first repeats the trailing sentences of the previous one (at least
+    ``overlap_words`` words) so a statement spanning a boundary appears whole
+    in one passage. Sentences longer than ``max_words`` are split on words.
+
+    Args:
+        text: Text to split
+        max_words: Maximum words per passage
+        overlap_words: Minimum words carried over between consecutive passages
+
+    Returns:
+        Passages in document order (a single passage for short text)
+    """
+    words = text.split()
+    if len(words) <= max_words:
+        return [text.strip()] if words else []
+
+    overlap_words = min(overlap_words, max_words // 2)
+
+    # Sentence word lists, with over-long sentences cut into max_words pieces
+    sentences: List[List[str]] = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        sentence_words = sentence.split() if sentence else []
+        for start in range(0, len(sentence_words), max_words):
+            sentences.append(sentence_words[start:start + max_words])
+
+    passages = []
+    current: List[List[str]] = []
+    current_words = 0
+    for sentence in sentences:
+        if current and current_words + len(sentence) > max_words:
+            passages.append(" ".join(word for s in current for word in s))
+            # Carry trailing sentences into the next passage as overlap
+            carried: List[List[str]] = []
+            carried_words = 0
+            for previous in reversed(current):
+                if carried_words >= overlap_words or carried_words + len(previous) + len(sentence) > max_words:
+                    break
+                carried.insert(0, previous)
+                carried_words += len(previous)
+            current, current_words = carried, carried_words
+        current.append(sentence)
+        current_words += len(sentence)
+
+    if current:
+        passages.append(" ".join(word for s in current for word in s))
+    return passages
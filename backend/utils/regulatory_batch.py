@@ -248,6 +248,15 @@ class SearchBatchProcessor:
         Returns:
             BatchResult with search results
         """
+        # Encode every semantic query in one model call up front; the
+        # per-query searches then hit the query embedding cache
+        semantic_queries = [item.query for item in queries if item.search_type != "keyword"]
+        if semantic_queries:
+            try:
+                self.search_service.encode_queries(semantic_queries)
+            except Exception as e:
+                logger.warning(f"Batch query encoding failed, encoding per query: {e}")
+
         return self.processor.process_batch(
             queries,
             self._execute_search,
@@ -379,16 +388,18 @@ class NLPBatchProcessor:
 
     def __init__(
         self,
+        query_parser: Optional[LegalQueryParser] = None,
         max_workers: int = 10
     ):
         """
         Initialize NLP batch processor
 
         Args:
+            query_parser: LegalQueryParser instance
             max_workers: Maximum concurrent NLP operations
         """
         self.entity_extractor = LegalEntityExtractor()
-        self.query_parser = LegalQueryParser()
+        self.query_parser = query_parser or LegalQueryParser()
         self.processor = BatchProcessor[NLPBatchItem, NLPBatchResult](
             max_workers=max_workers,
             use_processes=True  # CPU-bound for NLP
@@ -450,12 +461,27 @@ class RegulatoryBatchAPI:
     search, RAG, and NLP operations.
     """
 
-    def __init__(self):
-        """Initialize batch API"""
-        self.document_processor = DocumentBatchProcessor()
-        self.search_processor = SearchBatchProcessor()
-        self.rag_processor = RAGBatchProcessor()
-        self.nlp_processor = NLPBatchProcessor()
+    def __init__(
+        self,
+        search_service: Optional[SearchService] = None,
+        rag_service: Optional[RAGService] = None,
+        query_parser: Optional[LegalQueryParser] = None
+    ):
+        """
+        Initialize batch API
+
+        Args:
+            search_service: Shared SearchService (one is created if None)
+            rag_service: Shared RAGService (one is created if None)
+            query_parser: Shared LegalQueryParser (one is created if None)
+        """
+        search_service = search_service or SearchService()
+        self.document_processor = DocumentBatchProcessor(search_service=search_service)
+        self.search_processor = SearchBatchProcessor(search_service=search_service)
+        self.rag_processor = RAGBatchProcessor(
+            rag_service=rag_service or RAGService(search_service=search_service)
+        )
+        self.nlp_processor = NLPBatchProcessor(query_parser=query_parser)
 
     def batch_index_documents(
         self,